@@ -1,3 +1,4 @@
+from colorpedia.arrays import ColorArray, ColorView
 from colorpedia.color import Color
 from colorpedia.converters import (
     cmyk_to_rgb,
@@ -6,10 +7,10 @@ from colorpedia.converters import (
     hsl_to_rgb_shades,
     hsv_to_rgb,
     name_to_rgb,
-    palette_to_rgbs,
     rgb_to_cmyk,
     rgb_to_hex,
     rgb_to_hsl,
     rgb_to_hsv,
     rgb_to_names,
 )
+from colorpedia.palettes import palette_to_rgbs
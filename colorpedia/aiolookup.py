@@ -0,0 +1,164 @@
+"""Asynchronous bulk color lookups with backpressure.
+
+Inputs are read from an async iterable in chunks, and each chunk is
+converted by the bulk functions in colorpedia.lookup in an executor
+(the event loop's default thread pool unless another one is given). At
+most max_in_flight chunks are converted or waiting to be consumed at any
+time, so a slow consumer stops the input from being read further.
+
+Example:
+
+    from concurrent.futures import ProcessPoolExecutor
+    from colorpedia import aiolookup
+
+    async def main(hex_codes):
+        with ProcessPoolExecutor() as executor:
+            async for color in aiolookup.from_hexes(hex_codes, executor=executor):
+                print(color.name)
+"""
+
+import asyncio
+from collections import deque
+from concurrent.futures import Executor
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Deque,
+    List,
+    Optional,
+    Tuple,
+)
+
+from colorpedia import lookup
+from colorpedia.config import Config
+from colorpedia.exceptions import InputValueError
+from colorpedia.lookup import ColorResult
+
+DEFAULT_CHUNK_SIZE = 256
+DEFAULT_MAX_IN_FLIGHT = 4
+
+
+def _validate_window(chunk_size: int, max_in_flight: int) -> None:
+    if not (type(chunk_size) == int and chunk_size > 0):
+        raise InputValueError("chunk size", "a positive integer")
+    if not (type(max_in_flight) == int and max_in_flight > 0):
+        raise InputValueError("max in-flight chunks", "a positive integer")
+
+
+async def _map_chunks(
+    function: Callable[..., List[ColorResult]],
+    values: AsyncIterable[Any],
+    config: Optional[Config],
+    as_dict: bool,
+    chunk_size: int,
+    max_in_flight: int,
+    executor: Optional[Executor],
+) -> AsyncIterator[ColorResult]:
+    _validate_window(chunk_size, max_in_flight)
+    loop = asyncio.get_event_loop()
+    pending: Deque["asyncio.Future[List[ColorResult]]"] = deque()
+    chunk: List[Any] = []
+
+    try:
+        async for value in values:
+            chunk.append(value)
+            if len(chunk) < chunk_size:
+                continue
+            pending.append(
+                loop.run_in_executor(executor, function, chunk, config, as_dict)
+            )
+            chunk = []
+            if len(pending) >= max_in_flight:
+                for result in await pending.popleft():
+                    yield result
+
+        if chunk:
+            pending.append(
+                loop.run_in_executor(executor, function, chunk, config, as_dict)
+            )
+        while pending:
+            for result in await pending.popleft():
+                yield result
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def from_hexes(
+    hex_codes: AsyncIterable[str],
+    config: Optional[Config] = None,
+    as_dict: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    executor: Optional[Executor] = None,
+) -> AsyncIterator[ColorResult]:
+    """Look up colors by hexadecimal codes asynchronously.
+
+    :param hex_codes: Hex color codes without the hash (#) prefix.
+    :param config: Configuration (default: default configuration).
+    :param as_dict: Yield dictionaries with keys in config.json_keys.
+    :param chunk_size: Number of inputs converted per executor call.
+    :param max_in_flight: Max number of chunks not yet consumed.
+    :param executor: Executor (default: event loop's default executor).
+    :return: Async iterator of colors or dictionaries in input order.
+    :raise colorpedia.exceptions.InputValueError: If any input is invalid.
+    """
+    return _map_chunks(
+        lookup.from_hexes,
+        hex_codes,
+        config,
+        as_dict,
+        chunk_size,
+        max_in_flight,
+        executor,
+    )
+
+
+def from_rgbs(
+    rgbs: AsyncIterable[Tuple[int, int, int]],
+    config: Optional[Config] = None,
+    as_dict: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    executor: Optional[Executor] = None,
+) -> AsyncIterator[ColorResult]:
+    """Look up colors by RGB (Red Green Blue) values asynchronously.
+
+    :param rgbs: RGB tuples (0 to 255 inclusive).
+    :param config: Configuration (default: default configuration).
+    :param as_dict: Yield dictionaries with keys in config.json_keys.
+    :param chunk_size: Number of inputs converted per executor call.
+    :param max_in_flight: Max number of chunks not yet consumed.
+    :param executor: Executor (default: event loop's default executor).
+    :return: Async iterator of colors or dictionaries in input order.
+    :raise colorpedia.exceptions.InputValueError: If any input is invalid.
+    """
+    return _map_chunks(
+        lookup.from_rgbs, rgbs, config, as_dict, chunk_size, max_in_flight, executor
+    )
+
+
+def from_hsls(
+    hsls: AsyncIterable[Tuple[float, float, float]],
+    config: Optional[Config] = None,
+    as_dict: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    executor: Optional[Executor] = None,
+) -> AsyncIterator[ColorResult]:
+    """Look up colors by HSL (Hue Saturation Lightness) values asynchronously.
+
+    :param hsls: HSL tuples in degree angle and percent (e.g. 360, 100, 50).
+    :param config: Configuration (default: default configuration).
+    :param as_dict: Yield dictionaries with keys in config.json_keys.
+    :param chunk_size: Number of inputs converted per executor call.
+    :param max_in_flight: Max number of chunks not yet consumed.
+    :param executor: Executor (default: event loop's default executor).
+    :return: Async iterator of colors or dictionaries in input order.
+    :raise colorpedia.exceptions.InputValueError: If any input is invalid.
+    """
+    return _map_chunks(
+        lookup.from_hsls, hsls, config, as_dict, chunk_size, max_in_flight, executor
+    )
@@ -0,0 +1,448 @@
+from array import array
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+    overload,
+)
+
+from colorpedia.color import Color
+from colorpedia.converters import (
+    hex_to_rgb,
+    hsl_to_rgb_shades,
+    rgb_to_cmyk,
+    rgb_to_hex,
+    rgb_to_hsl,
+    rgb_to_hsv,
+    rgb_to_lab,
+    rgb_to_names,
+)
+
+RGB = Tuple[int, int, int]
+
+# Number of bytes per pixel in each supported packed buffer format.
+BUFFER_FORMATS = {"rgb24": 3, "rgba32": 4}
+
+# Uppercase hexadecimal digits of each byte value, as in rgb_to_hex.
+HEX_DIGITS = [f"{i:02X}" for i in range(256)]
+
+# Max number of distinct shade rows shared between colors in iter_shades.
+SHADES_CACHE_SIZE = 256
+
+
+class ColorView:
+    """Lightweight view of a single color in a ColorArray.
+
+    Views expose the same attributes as Color and can be passed anywhere a
+    Color is formatted, but hold only a reference to the array and an index.
+
+    :param colors: Color array.
+    :param index: Index of the color in the array.
+    """
+
+    __slots__ = ("colors", "index")
+
+    def __init__(self, colors: "ColorArray", index: int) -> None:
+        self.colors = colors
+        self.index = index
+
+    def __repr__(self) -> str:
+        return f"ColorView(r={self.r}, g={self.g}, b={self.b})"
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (Color, ColorView)):
+            return self.rgb == other.rgb
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.rgb)
+
+    @property
+    def r(self) -> int:
+        return self.colors.r[self.index]
+
+    @property
+    def g(self) -> int:
+        return self.colors.g[self.index]
+
+    @property
+    def b(self) -> int:
+        return self.colors.b[self.index]
+
+    @property
+    def rgb(self) -> RGB:
+        return self.colors.get_rgb(self.index)
+
+    @property
+    def hex(self) -> str:
+        return rgb_to_hex(*self.rgb)
+
+    @property
+    def hsl(self) -> Tuple[float, float, float]:
+        return self.colors.hsl[self.index]
+
+    @property
+    def hsv(self) -> Tuple[float, float, float]:
+        return self.colors.hsv[self.index]
+
+    @property
+    def cmyk(self) -> Tuple[float, float, float, float]:
+        return self.colors.cmyk[self.index]
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        return self.colors.names[self.index][0]
+
+    @property
+    def name(self) -> str:
+        return "/".join(self.names)
+
+    @property
+    def is_name_exact(self) -> bool:
+        return self.colors.names[self.index][1]
+
+    def get_shades(self, size: int) -> "ColorArray":
+        h, s, l = self.hsl
+        return ColorArray.from_rgbs(hsl_to_rgb_shades(h, s, l, size))
+
+    def get_dict(self, keys: Union[FrozenSet[str], Set[str]]) -> Dict[str, Any]:
+        return self.colors.get_dict(self.index, keys)
+
+
+# Anything with the attributes of a Color (for formatting and JSON output).
+ColorLike = Union[Color, ColorView]
+
+
+class ColorArray:
+    """Columnar container for many colors.
+
+    Red, green and blue are stored as unsigned byte arrays (3 bytes per
+    color) or as strided memoryviews into a packed pixel buffer. HSL, HSV,
+    CMYK, CIELAB and name columns are computed on first access and kept for
+    the lifetime of the array. Indexing returns a ColorView, and slicing,
+    filtering and sorting return new arrays without creating per color
+    objects.
+
+    :param r: Red column (0 to 255 inclusive).
+    :param g: Green column (0 to 255 inclusive).
+    :param b: Blue column (0 to 255 inclusive).
+    """
+
+    __slots__ = ("r", "g", "b", "_hsl", "_hsv", "_cmyk", "_lab", "_names")
+
+    def __init__(self, r: Iterable[int], g: Iterable[int], b: Iterable[int]) -> None:
+        self.r = r if isinstance(r, (array, memoryview)) else array("B", r)
+        self.g = g if isinstance(g, (array, memoryview)) else array("B", g)
+        self.b = b if isinstance(b, (array, memoryview)) else array("B", b)
+        if not len(self.r) == len(self.g) == len(self.b):
+            raise ValueError("Color columns must have the same length")
+
+        self._hsl: Optional[List[Tuple[float, float, float]]] = None
+        self._hsv: Optional[List[Tuple[float, float, float]]] = None
+        self._cmyk: Optional[List[Tuple[float, float, float, float]]] = None
+        self._lab: Optional[List[Tuple[float, float, float]]] = None
+        self._names: Optional[List[Tuple[Tuple[str, ...], bool]]] = None
+
+    @classmethod
+    def from_rgbs(cls, rgbs: Iterable[RGB]) -> "ColorArray":
+        """Create an array from RGB tuples.
+
+        :param rgbs: RGB tuples (0 to 255 inclusive).
+        :return: Color array.
+        """
+        r, g, b = array("B"), array("B"), array("B")
+        for _r, _g, _b in rgbs:
+            r.append(_r)
+            g.append(_g)
+            b.append(_b)
+        return cls(r, g, b)
+
+    @classmethod
+    def from_hex_codes(cls, hex_codes: Iterable[str]) -> "ColorArray":
+        """Create an array from 6-digit hexadecimal color codes.
+
+        :param hex_codes: Hex color codes without the hash (#) prefix.
+        :return: Color array.
+        """
+        return cls.from_rgbs(hex_to_rgb(hex_code) for hex_code in hex_codes)
+
+    @classmethod
+    def from_buffer(
+        cls, buffer: Any, format: str = "rgb24", stride: Optional[int] = None
+    ) -> "ColorArray":
+        """Create an array backed by a packed pixel buffer without copying it.
+
+        The color columns are strided memoryviews into the buffer, so the
+        buffer must not be modified or closed while the array is in use. The
+        alpha channel of RGBA32 pixels is ignored.
+
+        :param buffer: Object supporting the buffer protocol (e.g. bytes,
+            bytearray, mmap.mmap or memoryview).
+        :param format: Pixel format ("rgb24" or "rgba32").
+        :param stride: Bytes from the start of one pixel to the next
+            (default: pixel size of the format).
+        :return: Color array.
+        :raise ValueError: If format, stride or buffer size is invalid.
+        """
+        try:
+            pixel_size = BUFFER_FORMATS[format]
+        except KeyError:
+            raise ValueError(f'Unknown buffer format "{format}"')
+        if stride is None:
+            stride = pixel_size
+        if stride < pixel_size:
+            raise ValueError(f"Stride must be at least {pixel_size} for {format}")
+
+        view = memoryview(buffer).cast("B")
+        if 0 < len(view) % stride < pixel_size:
+            raise ValueError("Buffer size is not a whole number of pixels")
+        return cls(view[0::stride], view[1::stride], view[2::stride])
+
+    @classmethod
+    def iter_buffer(
+        cls,
+        buffer: Any,
+        format: str = "rgb24",
+        stride: Optional[int] = None,
+        chunk_size: int = 65536,
+    ) -> Iterator["ColorArray"]:
+        """Yield arrays backed by consecutive chunks of a packed pixel buffer.
+
+        Computed columns are kept only for the lifetime of each chunk, so
+        memory stays flat regardless of the buffer size.
+
+        :param buffer: Object supporting the buffer protocol.
+        :param format: Pixel format ("rgb24" or "rgba32").
+        :param stride: Bytes from the start of one pixel to the next.
+        :param chunk_size: Max number of pixels per chunk.
+        :return: Iterator of color arrays.
+        :raise ValueError: If format, stride or buffer size is invalid.
+        """
+        colors = cls.from_buffer(buffer, format, stride)
+        for start in range(0, len(colors), chunk_size):
+            yield colors[start : start + chunk_size]
+
+    @classmethod
+    def concatenate(cls, arrays: Iterable["ColorArray"]) -> "ColorArray":
+        """Create an array from the colors of other arrays, one after another.
+
+        :param arrays: Color arrays.
+        :return: Color array.
+        """
+        r, g, b = array("B"), array("B"), array("B")
+        for colors in arrays:
+            r.extend(colors.r)
+            g.extend(colors.g)
+            b.extend(colors.b)
+        return cls(r, g, b)
+
+    def __len__(self) -> int:
+        return len(self.r)
+
+    def __repr__(self) -> str:
+        return f"ColorArray(<{len(self)} colors>)"
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, ColorArray):
+            return self.r == other.r and self.g == other.g and self.b == other.b
+        return NotImplemented
+
+    @overload
+    def __getitem__(self, index: int) -> ColorView: ...  # pragma: no cover
+
+    @overload
+    def __getitem__(self, index: slice) -> "ColorArray": ...  # pragma: no cover
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[ColorView, "ColorArray"]:
+        if isinstance(index, slice):
+            result = ColorArray(self.r[index], self.g[index], self.b[index])
+            # Computed columns are sliced along with the color columns.
+            if self._hsl is not None:
+                result._hsl = self._hsl[index]
+            if self._hsv is not None:
+                result._hsv = self._hsv[index]
+            if self._cmyk is not None:
+                result._cmyk = self._cmyk[index]
+            if self._lab is not None:
+                result._lab = self._lab[index]
+            if self._names is not None:
+                result._names = self._names[index]
+            return result
+
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("ColorArray index out of range")
+        return ColorView(self, index)
+
+    def __iter__(self) -> Iterator[ColorView]:
+        return (ColorView(self, index) for index in range(len(self)))
+
+    def get_rgb(self, index: int) -> RGB:
+        return self.r[index], self.g[index], self.b[index]
+
+    def iter_rgbs(self) -> Iterator[RGB]:
+        return zip(self.r, self.g, self.b)
+
+    @property
+    def hex_codes(self) -> List[str]:
+        digits = HEX_DIGITS
+        return [digits[r] + digits[g] + digits[b] for r, g, b in self.iter_rgbs()]
+
+    @property
+    def hsl(self) -> List[Tuple[float, float, float]]:
+        if self._hsl is None:
+            self._hsl = self._compute(rgb_to_hsl)
+        return self._hsl
+
+    @property
+    def hsv(self) -> List[Tuple[float, float, float]]:
+        if self._hsv is None:
+            self._hsv = self._compute(rgb_to_hsv)
+        return self._hsv
+
+    @property
+    def cmyk(self) -> List[Tuple[float, float, float, float]]:
+        if self._cmyk is None:
+            self._cmyk = self._compute(rgb_to_cmyk)
+        return self._cmyk
+
+    @property
+    def lab(self) -> List[Tuple[float, float, float]]:
+        if self._lab is None:
+            self._lab = self._compute(rgb_to_lab)
+        return self._lab
+
+    @property
+    def names(self) -> List[Tuple[Tuple[str, ...], bool]]:
+        if self._names is None:
+            self._names = self._compute(rgb_to_names)
+        return self._names
+
+    def _compute(self, function: Callable[..., Any]) -> List[Any]:
+        # Large arrays tend to repeat colors, so convert each one only once.
+        results: Dict[RGB, Any] = {}
+        column = []
+        for rgb in self.iter_rgbs():
+            try:
+                result = results[rgb]
+            except KeyError:
+                result = results[rgb] = function(*rgb)
+            column.append(result)
+        return column
+
+    def take(self, indices: Iterable[int]) -> "ColorArray":
+        """Return the colors at the given indices.
+
+        :param indices: Indices of colors.
+        :return: Color array.
+        """
+        indices = list(indices)
+        r, g, b = self.r, self.g, self.b
+        result = ColorArray(
+            array("B", [r[i] for i in indices]),
+            array("B", [g[i] for i in indices]),
+            array("B", [b[i] for i in indices]),
+        )
+        if self._hsl is not None:
+            result._hsl = [self._hsl[i] for i in indices]
+        if self._hsv is not None:
+            result._hsv = [self._hsv[i] for i in indices]
+        if self._cmyk is not None:
+            result._cmyk = [self._cmyk[i] for i in indices]
+        if self._lab is not None:
+            result._lab = [self._lab[i] for i in indices]
+        if self._names is not None:
+            result._names = [self._names[i] for i in indices]
+        return result
+
+    def filter(self, predicate: Callable[[ColorView], bool]) -> "ColorArray":
+        """Return the colors for which the predicate is true.
+
+        :param predicate: Callable invoked with a view of each color.
+        :return: Color array.
+        """
+        return self.take(i for i, view in enumerate(self) if predicate(view))
+
+    def sort(
+        self, key: Callable[[ColorView], Any], reverse: bool = False
+    ) -> "ColorArray":
+        """Return the colors sorted by key.
+
+        :param key: Callable invoked with a view of each color.
+        :param reverse: Sort in descending order.
+        :return: Color array.
+        """
+        keys = [key(view) for view in self]
+        indices = sorted(range(len(self)), key=keys.__getitem__, reverse=reverse)
+        return self.take(indices)
+
+    def iter_shades(self, size: int) -> Iterator["ColorArray"]:
+        """Yield the shades of each color, one array per color.
+
+        This is the same as calling ColorView.get_shades on every color, but
+        the HSL column is computed in one pass and colors with the same hue
+        and saturation (e.g. all grays) share one array of shades, including
+        any columns computed on it later.
+
+        :param size: Number of shades per color (positive integer).
+        :return: Iterator of color arrays, darkest to lightest.
+        """
+        rows: Dict[Tuple[float, ...], ColorArray] = {}
+        for h, s, l in self.hsl:
+            # With more than one shade, lightness does not affect the result.
+            # Hue does not matter without saturation.
+            key: Tuple[float, ...] = (h if s else 0.0, s)
+            if size == 1:
+                key += (l,)
+            row = rows.get(key)
+            if row is None:
+                row = ColorArray.from_rgbs(hsl_to_rgb_shades(h, s, l, size))
+                if len(rows) < SHADES_CACHE_SIZE:
+                    rows[key] = row
+            yield row
+
+    def get_dict(
+        self, index: int, keys: Union[FrozenSet[str], Set[str]]
+    ) -> Dict[str, Any]:
+        """Return the color at the given index as a dictionary.
+
+        Keys are in the same order as in Color.get_dict.
+
+        :param index: Index of the color.
+        :param keys: Keys to include.
+        :return: Dictionary.
+        """
+        result: Dict[str, Any] = {}
+        if "hex" in keys:
+            result["hex"] = rgb_to_hex(*self.get_rgb(index))
+        if "rgb" in keys:
+            result["rgb"] = self.get_rgb(index)
+        if "hsl" in keys:
+            result["hsl"] = self.hsl[index]
+        if "hsv" in keys:
+            result["hsv"] = self.hsv[index]
+        if "cmyk" in keys:
+            result["cmyk"] = self.cmyk[index]
+        if "name" in keys:
+            result["name"] = "/".join(self.names[index][0])
+        if "is_name_exact" in keys:
+            result["is_name_exact"] = self.names[index][1]
+        return result
+
+    def get_dicts(self, keys: Union[FrozenSet[str], Set[str]]) -> List[Dict[str, Any]]:
+        """Return all colors as dictionaries.
+
+        :param keys: Keys to include.
+        :return: List of dictionaries.
+        """
+        return [self.get_dict(index, keys) for index in range(len(self))]
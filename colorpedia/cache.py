@@ -0,0 +1,151 @@
+import hashlib
+import os
+import tempfile
+from json import dump as json_dump
+from json import dumps as json_dumps
+from json import load as json_load
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from colorpedia.config import CACHE_DIR, Config
+from colorpedia.exceptions import CacheError
+
+RESULT_CACHE_DIR = CACHE_DIR / "results"
+RESULT_FILE_SUFFIX = ".json"
+
+
+def get_cache_key(
+    namespace: str,
+    content: bytes,
+    config: Optional[Config] = None,
+    fields: Iterable[str] = (),
+) -> str:
+    """Return the cache key for the result of an expensive operation.
+
+    :param namespace: Name of the operation (e.g. "scan").
+    :param content: Input content the result depends on.
+    :param config: Configuration the result depends on.
+    :param fields: Names of the configuration fields the result depends on.
+    :return: SHA-256 hex digest.
+    """
+    digest = hashlib.sha256(namespace.encode("utf-8") + b"\0")
+    if config is not None:
+        data = config.dump()
+        options = {field: data[field] for field in fields}
+        digest.update(json_dumps(options, sort_keys=True).encode("utf-8") + b"\0")
+    digest.update(content)
+    return digest.hexdigest()
+
+
+def _get_result_path(key: str) -> str:
+    return os.path.join(RESULT_CACHE_DIR, key[:2], key + RESULT_FILE_SUFFIX)
+
+
+def _iter_result_files() -> Iterator[Tuple[str, os.stat_result]]:
+    try:
+        subdirectories = list(os.scandir(RESULT_CACHE_DIR))
+    except FileNotFoundError:
+        return
+    for subdirectory in subdirectories:
+        if not subdirectory.is_dir():
+            continue
+        for entry in os.scandir(subdirectory.path):
+            if entry.name.endswith(RESULT_FILE_SUFFIX):
+                try:
+                    yield entry.path, entry.stat()
+                except FileNotFoundError:  # Removed by another process.
+                    continue
+
+
+def load_cached_result(key: str) -> Optional[Any]:
+    """Return a cached result, or None on cache miss.
+
+    The modification time of the cache entry is updated on every hit and
+    used as its last access time for LRU eviction.
+
+    :param key: Cache key.
+    :return: Cached JSON-serializable result or None.
+    """
+    path = _get_result_path(key)
+    try:
+        with open(path, "r") as fp:
+            result = json_load(fp)
+        os.utime(path)
+    except (OSError, ValueError):
+        return None
+    return result
+
+
+def save_cached_result(key: str, result: Any) -> None:
+    """Save a result in the cache.
+
+    The result is written to a temporary file which then atomically replaces
+    the entry, so concurrent readers and writers never see partial entries.
+
+    :param key: Cache key.
+    :param result: JSON-serializable result.
+    """
+    path = _get_result_path(key)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as fp:
+                json_dump(result, fp)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError:  # The cache is an optimization only.
+        pass
+
+
+def evict_cached_results(max_size: int) -> int:
+    """Remove the least recently used cache entries above a total size.
+
+    :param max_size: Max total size of cache entries in bytes.
+    :return: Number of entries removed.
+    """
+    entries = sorted(_iter_result_files(), key=lambda entry: entry[1].st_mtime)
+    total_size = sum(stat.st_size for _, stat in entries)
+    removed = 0
+    for path, stat in entries:
+        if total_size <= max_size:
+            break
+        try:
+            os.unlink(path)
+            removed += 1
+        except FileNotFoundError:
+            pass
+        total_size -= stat.st_size
+    return removed
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """Return the location, number of entries and total size of the cache.
+
+    :return: Cache statistics.
+    """
+    sizes: List[int] = [stat.st_size for _, stat in _iter_result_files()]
+    return {
+        "directory": str(RESULT_CACHE_DIR),
+        "entries": len(sizes),
+        "size": sum(sizes),
+    }
+
+
+def clear_cache() -> int:
+    """Remove all cache entries.
+
+    :return: Number of entries removed.
+    """
+    removed = 0
+    try:
+        for path, _ in list(_iter_result_files()):
+            try:
+                os.unlink(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+    except OSError as err:
+        raise CacheError(f"Cannot clear {RESULT_CACHE_DIR}", err)
+    return removed
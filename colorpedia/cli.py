@@ -1,42 +1,109 @@
 import os
+import shutil
 import sys
 from distutils.util import strtobool
+from itertools import chain, islice
 from json import dumps as json_dumps
+from pathlib import Path
 from typing import Any, Callable, Dict, Iterable, Optional
 
 from fire import Fire
 from pkg_resources import get_distribution
 
+from colorpedia.arrays import ColorArray, ColorLike
+from colorpedia.cache import clear_cache, evict_cached_results, get_cache_stats
 from colorpedia.color import Color
 from colorpedia.config import (
     CONFIG_FILE,
+    DEFAULT_SHADES_COUNT,
+    GRID_VIEW_BUFFER_SIZE,
     Config,
     edit_config_file,
     init_config_file,
     load_config_file,
 )
+from colorpedia.contrast import (
+    get_luminances,
+    get_text_colors,
+    iter_contrast_pairs,
+    iter_contrast_rows,
+)
 from colorpedia.converters import (
     cmyk_to_rgb,
     hex_to_rgb,
     hsl_to_rgb,
+    hsl_to_rgb_shades,
     hsv_to_rgb,
-    name_to_rgb,
-    palette_to_rgbs,
 )
-from colorpedia.exceptions import ColorpediaError
-from colorpedia.formatters import format_get_view, format_list_view
-from colorpedia.hexcodes import NAME_TO_HEX_CODE
+from colorpedia.cvd import DEFAULT_CVD_THRESHOLD, find_confusable_pairs, simulate_cvd
+from colorpedia.distinct import get_distinct_colors
+from colorpedia.exceptions import ColorpediaError, ConfigValueError, InputValueError
+from colorpedia.formatters import (
+    format_contrast,
+    format_cvd_color,
+    format_cvd_pair,
+    format_get_view,
+    format_grid_rows,
+    format_grid_view,
+    format_list_view,
+    format_name_match,
+    format_palette_match,
+    format_scan_count,
+    format_scan_hit,
+    format_similar_palette,
+    get_grid_column_count,
+)
+from colorpedia.gradients import iter_gradient_chunks
+from colorpedia.harmony import get_harmonies, iter_harmonies
 from colorpedia.inputs import (
     normalize_degree_angle,
     normalize_hex_code,
     normalize_percent_value,
     validate_boolean_flag,
+    validate_color_space,
+    validate_contrast_level,
+    validate_cvd_type,
+    validate_delta_e,
+    validate_distinct_count,
     validate_editor,
+    validate_export_format,
+    validate_float_precision,
+    validate_gradient_steps,
+    validate_harmony_scheme,
     validate_indent_width,
+    validate_match_count,
+    validate_name_query,
+    validate_output_columns,
+    validate_output_format,
+    validate_palette_count,
+    validate_palette_name,
+    validate_palette_ordering,
+    validate_port_number,
+    validate_random_seed,
     validate_rgb_value,
     validate_shades_count,
+    validate_worker_count,
+)
+from colorpedia.members import DEFAULT_MEMBER_THRESHOLD, find_palettes
+from colorpedia.names import list_name_dictionaries, set_name_dictionary
+from colorpedia.palettes import PALETTES, palette_to_rgbs
+from colorpedia.parsers import parse_color_argument
+from colorpedia.recolor import recolor_files
+from colorpedia.scanner import get_hex_code_names, scan_directory, summarize_scan_hits
+from colorpedia.search import DEFAULT_FIND_COUNT, find_color_name, find_color_names
+from colorpedia.server import serve
+from colorpedia.similarity import (
+    DEFAULT_SIMILAR_CANDIDATES,
+    DEFAULT_SIMILAR_COUNT,
+    find_similar_palettes,
+)
+from colorpedia.swatches import convert_palette_files, write_palette
+from colorpedia.writers import (
+    round_floats,
+    write_colors,
+    write_json,
+    write_json_matrix,
 )
-from colorpedia.palettes import PALETTES
 
 
 def prompt_user(question: str) -> bool:
@@ -48,20 +115,78 @@ def prompt_user(question: str) -> bool:
             print('Please respond with "y" or "n"\n')
 
 
-def print_colors(config: Config, colors: Iterable[Color]) -> None:
-    if config.always_output_json:
-        print(json_dumps([c.get_dict(config.json_keys) for c in colors]))
+def load_config() -> Config:
+    config = load_config_file()
+    try:
+        set_name_dictionary(config.name_dictionary)
+    except ValueError:
+        raise ConfigValueError("name_dictionary", f"one of {list_name_dictionaries()}")
+    return config
+
+
+def print_grid(config: Config, colors: Iterable[ColorLike]) -> None:
+    width = shutil.get_terminal_size().columns
+    colors = iter(colors)
+    head = list(islice(colors, GRID_VIEW_BUFFER_SIZE + 1))
+
+    if len(head) <= GRID_VIEW_BUFFER_SIZE:
+        # Small enough to lay out the whole screen and write it at once.
+        sys.stdout.write(format_grid_view(config, head, width) + "\n")
     else:
-        for color in colors:
-            print(format_list_view(config, color))
+        columns = get_grid_column_count(config, width)
+        for row in format_grid_rows(config, chain(head, colors), columns):
+            sys.stdout.write(row + "\n")
 
 
-def print_color(config: Config, color: Color) -> None:
-    if config.default_shades_count:
-        print_colors(config, color.get_shades(config.default_shades_count))
+def print_colors(config: Config, colors: Iterable[ColorLike]) -> None:
+    if not isinstance(colors, ColorArray):
+        colors = ColorArray.from_rgbs(color.rgb for color in colors)
+    print_color_chunks(config, [colors])
+
+
+def print_color_chunks(config: Config, chunks: Iterable[ColorArray]) -> None:
+    if config.output_format != "default":
+        write_colors(sys.stdout, chunks, config)
+    elif config.always_output_json:
+        write_json(sys.stdout, chunks, config.json_keys, config.float_precision)
+    elif config.always_output_grid:
+        print_grid(config, chain.from_iterable(chunks))
+    else:
+        for chunk in chunks:
+            for color in chunk:
+                print(format_list_view(config, color))
+
 
+def print_color_rows(config: Config, rows: Iterable[ColorArray]) -> None:
+    if config.output_format != "default":
+        write_colors(sys.stdout, rows, config)
     elif config.always_output_json:
-        print(json_dumps(color.get_dict(config.json_keys)))
+        write_json_matrix(sys.stdout, rows, config.json_keys, config.float_precision)
+    elif config.always_output_grid:
+        columns = get_grid_column_count(config, shutil.get_terminal_size().columns)
+        for row in rows:
+            for line in format_grid_rows(config, row, columns):
+                sys.stdout.write(line + "\n")
+    else:
+        for index, row in enumerate(rows):
+            if index:
+                print()
+            for color in row:
+                print(format_list_view(config, color))
+
+
+def print_color(config: Config, color: Color) -> None:
+    if config.default_shades_count:
+        h, s, l = color.hsl
+        shades = hsl_to_rgb_shades(h, s, l, config.default_shades_count)
+        print_colors(config, ColorArray.from_rgbs(shades))
+
+    elif config.output_format not in ("default", "json"):
+        print_colors(config, [color])
+    elif config.output_format == "json" or config.always_output_json:
+        # A single color is a JSON object in both cases, not an array.
+        data = color.get_dict(config.json_keys)
+        print(json_dumps(round_floats(data, config.float_precision)))
     else:
         print(format_get_view(config, color))
 
@@ -132,57 +257,175 @@ def edit_config(editor: Optional[str] = None) -> None:
         print_config(config)
 
 
+def show_cache_stats(json: Optional[bool] = None) -> None:
+    """Display the location, number of entries and size of the result cache.
+
+    Results of expensive commands (e.g. directory scans) are cached in
+    ~/.cache/colorpedia by input content. Least recently used entries are
+    removed when the cache grows over "cache_size_limit" megabytes.
+
+    :param json: Display in JSON format.
+    """
+    config = load_config()
+    config.set_flags(json=validate_boolean_flag(json))
+    stats = get_cache_stats()
+    stats["limit"] = config.cache_size_limit * 2**20
+    if config.always_output_json:
+        print(json_dumps(stats))
+    else:
+        print(f"Directory : {stats['directory']}")
+        print(f"Entries   : {stats['entries']}")
+        print(f"Size      : {stats['size'] / 2 ** 20:.1f} MB")
+        print(f"Limit     : {config.cache_size_limit} MB")
+
+
+def clear_result_cache() -> None:
+    """Remove all entries from the result cache."""
+    print(f"Removed {clear_cache()} cache entries.")
+
+
 def get_palette_func(name: str) -> Callable[..., None]:
     def function(
+        ramp: int = 0,
+        sort: Optional[str] = None,
+        export: Optional[str] = None,
         json: Optional[bool] = None,
         all: bool = False,
         units: Optional[bool] = None,
+        grid: Optional[bool] = None,
+        format: Optional[str] = None,
+        columns: Optional[str] = None,
+        precision: Optional[int] = None,
     ) -> None:
-        config = load_config_file()
+        config = load_config()
         config.set_flags(
+            shades=validate_shades_count(ramp),
             json=validate_boolean_flag(json),
             all=validate_boolean_flag(all),
             units=validate_boolean_flag(units),
+            grid=validate_boolean_flag(grid),
+            format=validate_output_format(format),
+            columns=validate_output_columns(columns),
+            precision=validate_float_precision(precision),
         )
-        print_colors(config, [Color(*rgb) for rgb in palette_to_rgbs(name)])
+        ordering = validate_palette_ordering(sort)
+        export_format = validate_export_format(export)
+        colors = ColorArray.from_rgbs(palette_to_rgbs(name, ordering))
+        if export_format is not None:
+            swatches = ((hex_code, "") for hex_code in colors.hex_codes)
+            write_palette(sys.stdout, swatches, name, export_format)
+            return
+        if config.default_shades_count:
+            print_color_rows(config, colors.iter_shades(config.default_shades_count))
+        else:
+            print_colors(config, colors)
 
     function.__doc__ = "\n".join(
         (
             f'Display colors in palette "{name}".',
+            ":param ramp: Display shades of each color, one row per color.",
+            ":param sort: One of hue, lightness, hilbert or tsp (default: none).",
+            ":param export: Write as a palette file (json, gpl, ase or css).",
             ":param json: Display in JSON format.",
             ":param all: Bypass user configuration and display all keys.",
             ":param units: Bypass user configuration and display units.",
+            ":param grid: Display in columns fitted to the terminal width.",
+            ":param format: One of default, json, csv, tsv, binary or columnar.",
+            ":param columns: Comma-separated JSON keys to output (e.g. hex,name).",
+            ":param precision: Number of decimal places for floats in text formats.",
         )
     )
     return function
 
 
-def get_color_by_name_func(name: str, hex_code: str) -> Callable[..., None]:
-    def function(
-        shades: int = 0,
-        json: Optional[bool] = None,
-        all: bool = False,
-        units: Optional[bool] = None,
-    ) -> None:
-        config = load_config_file()
-        config.set_flags(
-            shades=validate_shades_count(shades),
-            json=validate_boolean_flag(json),
-            all=validate_boolean_flag(all),
-            units=validate_boolean_flag(units),
-        )
-        print_color(config, Color(*name_to_rgb(name)))
+def import_palettes(
+    *paths: str,
+    workers: Optional[int] = None,
+    json: Optional[bool] = None,
+) -> None:
+    """Import palette files as user palettes.
 
-    function.__doc__ = "\n".join(
-        (
-            f"Display color {name} (hex code #{hex_code.upper()}).",
-            ":param json: Display in JSON format.",
-            ":param shades: Display different shades of the specified color.",
-            ":param all: Bypass user configuration and display all keys.",
-            ":param units: Bypass user configuration and display units.",
-        )
+    Files in JSON, GIMP (.gpl), Adobe Swatch Exchange (.ase) or CSS format
+    are converted to GIMP palettes in the user palette directory, named
+    after the files (e.g. "Brand.ase" becomes palette "brand"). Directories
+    are expanded to the palette files in them and converted in parallel.
+    Existing user palettes of the same name are replaced.
+
+    Usage examples:
+
+        color palette import brand.ase
+        color palette import ~/swatches --workers 4
+
+    :param paths: Palette files or directories to import.
+    :param workers: Max number of worker processes (default: CPU count).
+    :param json: Display in JSON format.
+    """
+    config = load_config()
+    config.set_flags(json=validate_boolean_flag(json))
+    workers = validate_worker_count(workers)
+    if not paths:
+        raise InputValueError("paths", "at least one palette file or directory")
+
+    results = convert_palette_files(
+        (Path(path).expanduser() for path in paths),
+        PALETTES.directory,
+        workers=workers,
     )
-    return function
+    if config.always_output_json:
+        print(json_dumps([{"path": str(p), "count": c} for p, c in results]))
+    else:
+        for path, count in results:
+            print(f"{'error' if count is None else count:>7}|{path}")
+
+
+def get_color_by_name(
+    *name: str,
+    shades: int = 0,
+    json: Optional[bool] = None,
+    all: bool = False,
+    units: Optional[bool] = None,
+    grid: Optional[bool] = None,
+    format: Optional[str] = None,
+    columns: Optional[str] = None,
+    precision: Optional[int] = None,
+) -> None:
+    """Look up a color by name.
+
+    Names are matched in the name dictionary ignoring case, spaces and
+    punctuation. If no name matches exactly, the best match listed by
+    "color find" is displayed.
+
+    Usage examples:
+
+        color name green --shades
+        color name Dark Slate Blue
+        color name "light goldenrod yelow"
+
+    :param name: Color name.
+    :param shades: Display different shades of the specified color.
+    :param json: Display in JSON format.
+    :param all: Bypass user configuration and display all keys.
+    :param units: Bypass user configuration and display units.
+    :param grid: Display shades in columns fitted to the terminal width.
+    :param format: One of default, json, csv, tsv, binary or columnar.
+    :param columns: Comma-separated JSON keys to output (e.g. hex,name).
+    :param precision: Number of decimal places for floats in text formats.
+    """
+    config = load_config()
+    config.set_flags(
+        shades=validate_shades_count(shades),
+        json=validate_boolean_flag(json),
+        all=validate_boolean_flag(all),
+        units=validate_boolean_flag(units),
+        grid=validate_boolean_flag(grid),
+        format=validate_output_format(format),
+        columns=validate_output_columns(columns),
+        precision=validate_float_precision(precision),
+    )
+    match = find_color_name(validate_name_query(" ".join(map(str, name))))
+    if match is None:
+        raise InputValueError("color name", 'a name listed by "color find"')
+    print_color(config, Color(*hex_to_rgb(match.hex_code)))
 
 
 def get_color_by_cmyk(
@@ -194,6 +437,10 @@ def get_color_by_cmyk(
     json: Optional[bool] = None,
     all: bool = False,
     units: Optional[bool] = None,
+    grid: Optional[bool] = None,
+    format: Optional[str] = None,
+    columns: Optional[str] = None,
+    precision: Optional[int] = None,
 ) -> None:
     """Look up colors by CMYK (Cyan Magenta Yellow Black) values.
 
@@ -215,13 +462,21 @@ def get_color_by_cmyk(
     :param json: Display in JSON format.
     :param all: Bypass user configuration and display all keys.
     :param units: Bypass user configuration and display units.
+    :param grid: Display shades in columns fitted to the terminal width.
+    :param format: One of default, json, csv, tsv, binary or columnar.
+    :param columns: Comma-separated JSON keys to output (e.g. hex,name).
+    :param precision: Number of decimal places for floats in text formats.
     """
-    config = load_config_file()
+    config = load_config()
     config.set_flags(
         shades=validate_shades_count(shades),
         json=validate_boolean_flag(json),
         all=validate_boolean_flag(all),
         units=validate_boolean_flag(units),
+        grid=validate_boolean_flag(grid),
+        format=validate_output_format(format),
+        columns=validate_output_columns(columns),
+        precision=validate_float_precision(precision),
     )
     c = normalize_percent_value(c)
     m = normalize_percent_value(m)
@@ -236,6 +491,10 @@ def get_color_by_hex(
     json: Optional[bool] = None,
     all: bool = False,
     units: Optional[bool] = None,
+    grid: Optional[bool] = None,
+    format: Optional[str] = None,
+    columns: Optional[str] = None,
+    precision: Optional[int] = None,
 ) -> None:
     """Look up colors by hexadecimal (web) code.
 
@@ -253,13 +512,21 @@ def get_color_by_hex(
     :param json: Display in JSON format.
     :param all: Bypass user configuration and display all keys.
     :param units: Bypass user configuration and display units.
+    :param grid: Display shades in columns fitted to the terminal width.
+    :param format: One of default, json, csv, tsv, binary or columnar.
+    :param columns: Comma-separated JSON keys to output (e.g. hex,name).
+    :param precision: Number of decimal places for floats in text formats.
     """
-    config = load_config_file()
+    config = load_config()
     config.set_flags(
         shades=validate_shades_count(shades),
         json=validate_boolean_flag(json),
         all=validate_boolean_flag(all),
         units=validate_boolean_flag(units),
+        grid=validate_boolean_flag(grid),
+        format=validate_output_format(format),
+        columns=validate_output_columns(columns),
+        precision=validate_float_precision(precision),
     )
     hex_code = normalize_hex_code(hex_code)
     print_color(config, Color(*hex_to_rgb(hex_code)))
@@ -273,6 +540,10 @@ def get_color_by_hsl(
     json: Optional[bool] = None,
     all: bool = False,
     units: Optional[bool] = None,
+    grid: Optional[bool] = None,
+    format: Optional[str] = None,
+    columns: Optional[str] = None,
+    precision: Optional[int] = None,
 ) -> None:
     """Look up colors by HSL (Hue Saturation Lightness) values.
 
@@ -294,13 +565,21 @@ def get_color_by_hsl(
     :param json: Display in JSON format.
     :param all: Bypass user configuration and display all keys.
     :param units: Bypass user configuration and display units.
+    :param grid: Display shades in columns fitted to the terminal width.
+    :param format: One of default, json, csv, tsv, binary or columnar.
+    :param columns: Comma-separated JSON keys to output (e.g. hex,name).
+    :param precision: Number of decimal places for floats in text formats.
     """
-    config = load_config_file()
+    config = load_config()
     config.set_flags(
         shades=validate_shades_count(shades),
         json=validate_boolean_flag(json),
         all=validate_boolean_flag(all),
         units=validate_boolean_flag(units),
+        grid=validate_boolean_flag(grid),
+        format=validate_output_format(format),
+        columns=validate_output_columns(columns),
+        precision=validate_float_precision(precision),
     )
     h = normalize_degree_angle(h)
     s = normalize_percent_value(s)
@@ -316,6 +595,10 @@ def get_color_by_hsv(
     json: Optional[bool] = None,
     all: bool = False,
     units: Optional[bool] = None,
+    grid: Optional[bool] = None,
+    format: Optional[str] = None,
+    columns: Optional[str] = None,
+    precision: Optional[int] = None,
 ) -> None:
     """Look up colors by HSV (Hue Saturation Brightness/Value) values.
 
@@ -338,13 +621,21 @@ def get_color_by_hsv(
     :param json: Display in JSON format.
     :param all: Bypass user configuration and display all keys.
     :param units: Bypass user configuration and display units.
+    :param grid: Display shades in columns fitted to the terminal width.
+    :param format: One of default, json, csv, tsv, binary or columnar.
+    :param columns: Comma-separated JSON keys to output (e.g. hex,name).
+    :param precision: Number of decimal places for floats in text formats.
     """
-    config = load_config_file()
+    config = load_config()
     config.set_flags(
         shades=validate_shades_count(shades),
         json=validate_boolean_flag(json),
         all=validate_boolean_flag(all),
         units=validate_boolean_flag(units),
+        grid=validate_boolean_flag(grid),
+        format=validate_output_format(format),
+        columns=validate_output_columns(columns),
+        precision=validate_float_precision(precision),
     )
     h = normalize_degree_angle(h)
     s = normalize_percent_value(s)
@@ -360,6 +651,10 @@ def get_color_by_rgb(
     json: Optional[bool] = None,
     all: bool = False,
     units: Optional[bool] = None,
+    grid: Optional[bool] = None,
+    format: Optional[str] = None,
+    columns: Optional[str] = None,
+    precision: Optional[int] = None,
 ) -> None:
     """Look up colors by RGB (Red Green Blue) values.
 
@@ -380,13 +675,21 @@ def get_color_by_rgb(
     :param json: Display in JSON format.
     :param all: Bypass user configuration and display all keys.
     :param units: Bypass user configuration and display units.
+    :param grid: Display shades in columns fitted to the terminal width.
+    :param format: One of default, json, csv, tsv, binary or columnar.
+    :param columns: Comma-separated JSON keys to output (e.g. hex,name).
+    :param precision: Number of decimal places for floats in text formats.
     """
-    config = load_config_file()
+    config = load_config()
     config.set_flags(
         shades=validate_shades_count(shades),
         json=validate_boolean_flag(json),
         all=validate_boolean_flag(all),
         units=validate_boolean_flag(units),
+        grid=validate_boolean_flag(grid),
+        format=validate_output_format(format),
+        columns=validate_output_columns(columns),
+        precision=validate_float_precision(precision),
     )
     r = validate_rgb_value(r)
     g = validate_rgb_value(g)
@@ -394,6 +697,632 @@ def get_color_by_rgb(
     print_color(config, Color(r, g, b))
 
 
+def get_color_gradient(
+    *stops: str,
+    steps: Optional[int] = None,
+    space: str = "oklab",
+    json: Optional[bool] = None,
+    all: bool = False,
+    units: Optional[bool] = None,
+    grid: Optional[bool] = None,
+    format: Optional[str] = None,
+    columns: Optional[str] = None,
+    precision: Optional[int] = None,
+) -> None:
+    """Display a gradient through two or more colors.
+
+    Colors can be hex codes (without the hash prefix) or CSS color values.
+    Steps are evenly spaced and include both ends. Colors are interpolated
+    in the chosen color space (rgb, hsl, hsv, lab or oklab) and streamed to
+    the output, so even millions of steps use constant memory.
+
+    Usage examples:
+
+        color gradient FF0000 0000FF
+        color gradient red white blue --steps 20 --space lab --grid
+        color gradient 000 FFF --steps 1000000 --format csv
+
+    :param stops: Color stops (two or more).
+    :param steps: Number of colors (default: "default_shades_count").
+    :param space: Interpolation color space (default: oklab).
+    :param json: Display in JSON format.
+    :param all: Bypass user configuration and display all keys.
+    :param units: Bypass user configuration and display units.
+    :param grid: Display colors in columns fitted to the terminal width.
+    :param format: One of default, json, csv, tsv, binary or columnar.
+    :param columns: Comma-separated JSON keys to output (e.g. hex,name).
+    :param precision: Number of decimal places for floats in text formats.
+    """
+    config = load_config()
+    config.set_flags(
+        json=validate_boolean_flag(json),
+        all=validate_boolean_flag(all),
+        units=validate_boolean_flag(units),
+        grid=validate_boolean_flag(grid),
+        format=validate_output_format(format),
+        columns=validate_output_columns(columns),
+        precision=validate_float_precision(precision),
+    )
+    if len(stops) < 2:
+        raise InputValueError("color stops", "at least two colors")
+    rgbs = [parse_color_argument(stop) for stop in stops]
+    steps = validate_gradient_steps(steps)
+    if steps is None:
+        steps = config.default_shades_count or DEFAULT_SHADES_COUNT
+    space = validate_color_space(space)
+    print_color_chunks(config, iter_gradient_chunks(rgbs, steps, space))
+
+
+def get_contrast(
+    palette: str,
+    level: str = "AA",
+    best: bool = False,
+    matrix: bool = False,
+    json: Optional[bool] = None,
+    precision: Optional[int] = None,
+) -> None:
+    """Check WCAG 2 contrast ratios between the colors of a palette.
+
+    Pairs of colors with a contrast ratio of at least 4.5:1 pass level AA
+    and at least 7:1 pass level AAA (for normal size text). Pairs passing
+    the level are listed first, followed by the color with the highest
+    contrast against each color as a background.
+
+    Usage examples:
+
+        color contrast solarized
+        color contrast css3 --level AAA
+        color contrast nord --best --json
+        color contrast molokai --matrix
+
+    :param palette: Palette name.
+    :param level: Minimum WCAG level of listed pairs: AA or AAA (default: AA).
+    :param best: Display the best text color for each background only.
+    :param matrix: Display the contrast ratios of all pairs as a table.
+    :param json: Display in JSON format.
+    :param precision: Number of decimal places for ratios in JSON format.
+    """
+    config = load_config()
+    config.set_flags(
+        json=validate_boolean_flag(json),
+        precision=validate_float_precision(precision),
+    )
+    palette = validate_palette_name(palette)
+    level = validate_contrast_level(level)
+    validate_boolean_flag(best)
+    validate_boolean_flag(matrix)
+
+    colors = ColorArray.from_rgbs(palette_to_rgbs(palette))
+    hex_codes = colors.hex_codes
+    luminances = get_luminances(colors)
+    precision = config.float_precision
+
+    if matrix:
+        rows = iter_contrast_rows(luminances)
+        if config.always_output_json:
+            sys.stdout.write(f'{{"colors": {json_dumps(hex_codes)}, "matrix": [')
+            for index, row in enumerate(rows):
+                values = round_floats(row.tolist(), precision)
+                sys.stdout.write((", " if index else "") + json_dumps(values))
+            sys.stdout.write("]}\n")
+        else:
+            print("\t".join(["hex", *hex_codes]))
+            for hex_code, row in zip(hex_codes, rows):
+                print("\t".join([hex_code, *(f"{ratio:.2f}" for ratio in row)]))
+        return
+
+    pairs = [] if best else iter_contrast_pairs(luminances, level)
+    text_colors = get_text_colors(luminances)
+    if config.always_output_json:
+        output: Dict[str, Any] = {
+            "best": [
+                {
+                    "background": hex_codes[t.background],
+                    "text": hex_codes[t.text],
+                    "ratio": round_floats(t.ratio, precision),
+                    "level": t.level,
+                }
+                for t in text_colors
+            ]
+        }
+        if not best:
+            output["pairs"] = [
+                {
+                    "dark": hex_codes[p.dark],
+                    "light": hex_codes[p.light],
+                    "ratio": round_floats(p.ratio, precision),
+                    "level": p.level,
+                }
+                for p in pairs
+            ]
+        print(json_dumps(output))
+    else:
+        lines = [
+            format_contrast(
+                config, hex_codes[p.dark], hex_codes[p.light], p.ratio, p.level
+            )
+            for p in pairs
+        ]
+        if lines and text_colors:
+            lines.append("")
+        lines.extend(
+            format_contrast(
+                config, hex_codes[t.background], hex_codes[t.text], t.ratio, t.level
+            )
+            for t in text_colors
+        )
+        if lines:
+            print("\n".join(lines))
+
+
+def check_cvd(
+    palette: Optional[str] = None,
+    type: str = "deutan",
+    threshold: float = DEFAULT_CVD_THRESHOLD,
+    json: Optional[bool] = None,
+    precision: Optional[int] = None,
+) -> None:
+    """Simulate color vision deficiency and find colors that become similar.
+
+    Each palette color is displayed next to how it appears with protanopia
+    (red-blind), deuteranopia (green-blind) or tritanopia (blue-blind).
+    Pairs of colors that are distinct with normal vision but closer than
+    the Delta E (CIE76) threshold with the deficiency are listed after. If
+    no palette is specified, pairs are listed for every palette.
+
+    Usage examples:
+
+        color cvd solarized
+        color cvd nord --type protan --threshold 15
+        color cvd --type tritan --json
+
+    :param palette: Palette name (default: all palettes).
+    :param type: One of protan, deutan or tritan (default: deutan).
+    :param threshold: Delta E below which colors are hard to tell apart
+        (default: 10).
+    :param json: Display in JSON format.
+    :param precision: Number of decimal places for Delta E in JSON format.
+    """
+    config = load_config()
+    config.set_flags(
+        json=validate_boolean_flag(json),
+        precision=validate_float_precision(precision),
+    )
+    names = list(PALETTES) if palette is None else [validate_palette_name(palette)]
+    deficiency = validate_cvd_type(type)
+    threshold = validate_delta_e(threshold)
+    precision = config.float_precision
+
+    output: Dict[str, Any] = {"colors": [], "pairs": []}
+    lines = []
+    for name in names:
+        colors = ColorArray.from_rgbs(palette_to_rgbs(name))
+        hex_codes = colors.hex_codes
+        if palette is not None:
+            simulated = simulate_cvd(colors, deficiency).hex_codes
+            for hex_code, simulated_hex in zip(hex_codes, simulated):
+                output["colors"].append({"hex": hex_code, "simulated": simulated_hex})
+                lines.append(format_cvd_color(config, hex_code, simulated_hex))
+            lines.append("")
+
+        for pair in find_confusable_pairs(colors, deficiency, threshold):
+            first, second = hex_codes[pair.first], hex_codes[pair.second]
+            delta_e, simulated_delta_e = pair.delta_e, pair.simulated_delta_e
+            output["pairs"].append(
+                {
+                    "palette": name,
+                    "colors": [first, second],
+                    "delta_e": round_floats(delta_e, precision),
+                    "simulated_delta_e": round_floats(simulated_delta_e, precision),
+                }
+            )
+            line = format_cvd_pair(config, first, second, delta_e, simulated_delta_e)
+            lines.append(line if palette else f"{name}|{line}")
+
+    if config.always_output_json:
+        if palette is None:
+            del output["colors"]
+        print(json_dumps(output))
+    elif lines:
+        print("\n".join(lines).rstrip("\n"))
+
+
+def generate_distinct_colors(
+    count: int,
+    palette: Optional[str] = None,
+    seed: int = 0,
+    json: Optional[bool] = None,
+    all: bool = False,
+    units: Optional[bool] = None,
+    grid: Optional[bool] = None,
+    format: Optional[str] = None,
+    columns: Optional[str] = None,
+    precision: Optional[int] = None,
+) -> None:
+    """Generate colors that are as visually distinct as possible.
+
+    Colors are picked one at a time, each as far as possible (in CIELAB)
+    from the colors picked before it, so any number of leading colors are
+    distinct from each other too. If a palette is specified, colors are
+    also kept away from the palette colors (which are not displayed).
+
+    Usage examples:
+
+        color distinct 12
+        color distinct 2000 --seed 7 --format csv --columns hex
+        color distinct 5 --palette nord --grid
+
+    :param count: Number of colors.
+    :param palette: Palette whose colors to keep away from.
+    :param seed: Random seed choosing the first color (default: 0).
+    :param json: Display in JSON format.
+    :param all: Bypass user configuration and display all keys.
+    :param units: Bypass user configuration and display units.
+    :param grid: Display colors in columns fitted to the terminal width.
+    :param format: One of default, json, csv, tsv, binary or columnar.
+    :param columns: Comma-separated JSON keys to output (e.g. hex,name).
+    :param precision: Number of decimal places for floats in text formats.
+    """
+    config = load_config()
+    config.set_flags(
+        json=validate_boolean_flag(json),
+        all=validate_boolean_flag(all),
+        units=validate_boolean_flag(units),
+        grid=validate_boolean_flag(grid),
+        format=validate_output_format(format),
+        columns=validate_output_columns(columns),
+        precision=validate_float_precision(precision),
+    )
+    count = validate_distinct_count(count)
+    seed = validate_random_seed(seed)
+    seed_colors = (
+        [] if palette is None else palette_to_rgbs(validate_palette_name(palette))
+    )
+    print_colors(config, get_distinct_colors(count, seed, seed_colors))
+
+
+def get_color_harmony(
+    *colors: str,
+    scheme: str = "complementary",
+    palette: Optional[str] = None,
+    json: Optional[bool] = None,
+    all: bool = False,
+    units: Optional[bool] = None,
+    grid: Optional[bool] = None,
+    format: Optional[str] = None,
+    columns: Optional[str] = None,
+    precision: Optional[int] = None,
+) -> None:
+    """Display the color harmony of one or more colors.
+
+    Colors can be hex codes (without the hash prefix) or CSS color values.
+    Harmonies are rotations of the hue in HSL: complementary (180 degrees),
+    triadic (120), tetradic (90), analogous (-30 and 30) or split (150 and
+    210). With more than one color (or a palette), one harmony is displayed
+    per color.
+
+    Usage examples:
+
+        color harmony FF0000
+        color harmony red teal --scheme triadic --grid
+        color harmony --palette css3 --scheme split --format csv
+
+    :param colors: Colors.
+    :param scheme: Harmony scheme (default: complementary).
+    :param palette: Palette whose colors to use as well.
+    :param json: Display in JSON format.
+    :param all: Bypass user configuration and display all keys.
+    :param units: Bypass user configuration and display units.
+    :param grid: Display colors in columns fitted to the terminal width.
+    :param format: One of default, json, csv, tsv, binary or columnar.
+    :param columns: Comma-separated JSON keys to output (e.g. hex,name).
+    :param precision: Number of decimal places for floats in text formats.
+    """
+    config = load_config()
+    config.set_flags(
+        json=validate_boolean_flag(json),
+        all=validate_boolean_flag(all),
+        units=validate_boolean_flag(units),
+        grid=validate_boolean_flag(grid),
+        format=validate_output_format(format),
+        columns=validate_output_columns(columns),
+        precision=validate_float_precision(precision),
+    )
+    scheme = validate_harmony_scheme(scheme)
+    rgbs = [parse_color_argument(color) for color in colors]
+    if palette is not None:
+        rgbs.extend(palette_to_rgbs(validate_palette_name(palette)))
+    if not rgbs:
+        raise InputValueError("colors", "at least one color or a palette")
+    seeds = ColorArray.from_rgbs(rgbs)
+    if len(seeds) == 1:
+        print_colors(config, get_harmonies(seeds, scheme))
+    else:
+        print_color_rows(config, iter_harmonies(seeds, scheme))
+
+
+def find_color_palettes(
+    color: str,
+    threshold: float = DEFAULT_MEMBER_THRESHOLD,
+    json: Optional[bool] = None,
+    precision: Optional[int] = None,
+) -> None:
+    """Find the palettes with colors near a color.
+
+    The color can be a hex code (without the hash prefix) or a CSS color
+    value. Each palette with a color closer than the Delta E (CIE76)
+    threshold is listed with its nearest color, closest first.
+
+    Usage examples:
+
+        color where E10600
+        color where "rgb(46 52 64)" --threshold 10 --json
+
+    :param color: Color.
+    :param threshold: Delta E below which palette colors are near the color
+        (default: 5).
+    :param json: Display in JSON format.
+    :param precision: Number of decimal places for Delta E in JSON format.
+    """
+    config = load_config()
+    config.set_flags(
+        json=validate_boolean_flag(json),
+        precision=validate_float_precision(precision),
+    )
+    rgb = parse_color_argument(color)
+    threshold = validate_delta_e(threshold)
+
+    matches = find_palettes(rgb, threshold)
+    if config.always_output_json:
+        output = [
+            {
+                "palette": match.palette,
+                "hex": match.hex_code,
+                "delta_e": round_floats(match.delta_e, config.float_precision),
+            }
+            for match in matches
+        ]
+        print(json_dumps(output))
+    elif matches:
+        print(
+            "\n".join(
+                format_palette_match(config, m.palette, m.hex_code, m.delta_e)
+                for m in matches
+            )
+        )
+
+
+def get_similar_palettes(
+    palette: str,
+    count: int = DEFAULT_SIMILAR_COUNT,
+    candidates: int = DEFAULT_SIMILAR_CANDIDATES,
+    json: Optional[bool] = None,
+    precision: Optional[int] = None,
+) -> None:
+    """Find the palettes most similar to a palette.
+
+    Palettes are compared as sets of colors by optimal matching in CIELAB:
+    the distance is the mean Delta E (CIE76) between matched colors, with
+    the extra colors of the larger palette matched to their nearest color.
+    Palettes are prefiltered by precomputed embeddings, so only the top
+    candidates are compared exactly.
+
+    Usage examples:
+
+        color similar nord
+        color similar solarized --count 3 --json
+
+    :param palette: Palette name.
+    :param count: Number of palettes to display (default: 10).
+    :param candidates: Max number of palettes to compare exactly (default:
+        50). Higher is more accurate but slower.
+    :param json: Display in JSON format.
+    :param precision: Number of decimal places for distances in JSON format.
+    """
+    config = load_config()
+    config.set_flags(
+        json=validate_boolean_flag(json),
+        precision=validate_float_precision(precision),
+    )
+    palette = validate_palette_name(palette)
+    count = validate_palette_count(count)
+    candidates = validate_palette_count(candidates)
+
+    results = find_similar_palettes(palette, count, candidates)
+    if config.always_output_json:
+        output = [
+            {
+                "palette": result.palette,
+                "distance": round_floats(result.distance, config.float_precision),
+            }
+            for result in results
+        ]
+        print(json_dumps(output))
+    elif results:
+        print(
+            "\n".join(
+                format_similar_palette(
+                    config, result.palette, PALETTES[result.palette], result.distance
+                )
+                for result in results
+            )
+        )
+
+
+def find_colors_by_name(
+    *query: str,
+    count: int = DEFAULT_FIND_COUNT,
+    json: Optional[bool] = None,
+) -> None:
+    """Find colors by full or partial name.
+
+    Names are matched in the name dictionary ignoring case, spaces and
+    punctuation: exact matches first, then names starting with the query,
+    names containing it and names within a few typos of it.
+
+    Usage examples:
+
+        color find slat
+        color find dark slate
+        color find aqumarine --count 3 --json
+
+    :param query: Full or partial color name.
+    :param count: Max number of colors to display (default: 10).
+    :param json: Display in JSON format.
+    """
+    config = load_config()
+    config.set_flags(json=validate_boolean_flag(json))
+    name = validate_name_query(" ".join(map(str, query)))
+    count = validate_match_count(count)
+
+    matches = find_color_names(name, count)
+    if config.always_output_json:
+        output = [
+            {
+                "name": match.name,
+                "hex": match.hex_code,
+                "match": match.kind,
+                "typos": match.typos,
+            }
+            for match in matches
+        ]
+        print(json_dumps(output))
+    elif matches:
+        print(
+            "\n".join(
+                format_name_match(config, match.name, match.hex_code)
+                for match in matches
+            )
+        )
+
+
+def scan_colors(
+    directory: str = ".",
+    summary: bool = False,
+    workers: Optional[int] = None,
+    cache: bool = True,
+    json: Optional[bool] = None,
+) -> None:
+    """Find color literals in stylesheets, JSON themes and source files.
+
+    Hex codes, rgb(), rgba(), hsl() and hsla() are found in all files. CSS3
+    color names are found in stylesheets only. Files are scanned in parallel
+    and unchanged files are not scanned again on repeat scans.
+
+    Usage examples:
+
+        color scan
+        color scan src/styles --summary
+        color scan src --json --nocache
+
+    :param directory: Directory to scan (default: current directory).
+    :param summary: Display the usage count per color only.
+    :param workers: Max number of worker processes (default: CPU count).
+    :param cache: Skip files unchanged since the previous scan (default: True).
+    :param json: Display in JSON format.
+    """
+    config = load_config()
+    config.set_flags(json=validate_boolean_flag(json))
+    validate_boolean_flag(summary)
+    validate_boolean_flag(cache)
+    workers = validate_worker_count(workers)
+
+    hits = scan_directory(directory, workers=workers, use_index=cache)
+    evict_cached_results(config.cache_size_limit * 2**20)
+    counts = [
+        (hex_code, *get_hex_code_names(hex_code), count)
+        for hex_code, count in summarize_scan_hits(hits)
+    ]
+    if config.always_output_json:
+        output: Dict[str, Any] = {
+            "summary": [
+                {"hex": h, "name": n, "is_name_exact": e, "count": c}
+                for h, n, e, c in counts
+            ]
+        }
+        if not summary:
+            output["hits"] = [hit.get_dict() for hit in hits]
+        print(json_dumps(output))
+    else:
+        lines = [] if summary else [format_scan_hit(config, hit) for hit in hits]
+        if lines and counts:
+            lines.append("")
+        lines.extend(format_scan_count(config, *count) for count in counts)
+        if lines:
+            print("\n".join(lines))
+
+
+def recolor(
+    *paths: str,
+    palette: Optional[str] = None,
+    dry_run: bool = False,
+    workers: Optional[int] = None,
+    json: Optional[bool] = None,
+) -> None:
+    """Rewrite color literals in files to the nearest colors in a palette.
+
+    Hex codes, rgb(), rgba(), hsl() and hsla() keep their original syntax
+    (letter case, short form, separators and alpha). CSS3 color names in
+    stylesheets are replaced with names, or hex codes if there is none.
+    Directories are expanded to the files "color scan" would read.
+
+    Usage examples:
+
+        color recolor src --palette solarized
+        color recolor main.css theme.json --palette nord --dry_run
+
+    :param paths: Files or directories to rewrite.
+    :param palette: Target palette name.
+    :param dry_run: Display the number of literals to change without
+        rewriting any file.
+    :param workers: Max number of worker processes (default: CPU count).
+    :param json: Display in JSON format.
+    """
+    config = load_config()
+    config.set_flags(json=validate_boolean_flag(json))
+    palette = validate_palette_name(palette)
+    dry_run = bool(validate_boolean_flag(dry_run))
+    workers = validate_worker_count(workers)
+
+    results = recolor_files(paths, palette, dry_run=dry_run, workers=workers)
+    if config.always_output_json:
+        print(json_dumps([{"path": p, "count": c} for p, c in results]))
+    else:
+        for path, count in results:
+            print(f"{'error' if count is None else count:>7}|{path}")
+
+
+def serve_http(port: int = 8000, host: str = "127.0.0.1") -> None:
+    """Start a local HTTP JSON API server.
+
+    The server speaks HTTP/1.1 with keep-alive and loads the configuration
+    only once. Color objects contain the keys in "json_keys" configuration.
+
+    Endpoints:
+
+        GET  /hex/{code}          Look up a hex code without the hash prefix
+        GET  /rgb/{r}/{g}/{b}     Look up RGB values
+        GET  /name/{name}         Look up a color name
+        GET  /palette/{name}      Look up a palette
+        POST /batch               Look up a JSON array of CSS color strings
+        GET  /metrics             Request counts and latency (Prometheus)
+
+    Usage examples:
+
+        color serve
+        color serve --port 9000 --host 0.0.0.0
+
+    :param port: Port to listen on (default: 8000).
+    :param host: Host to bind to (default: 127.0.0.1).
+    """
+    config = load_config()
+    port = validate_port_number(port)
+    try:
+        serve(config, host, port, ready=lambda a: print(f"Serving on {a[0]}:{a[1]}"))
+    except OSError as err:
+        raise InputValueError(f'host "{host}" or port {port}', f"bindable ({err})")
+
+
 class MainCommand(Dict[str, Any]):
     """Colorpedia CLI.
 
@@ -411,9 +1340,57 @@ class MainCommand(Dict[str, Any]):
         color name green --shades
         color hex FFFFFF --shades=5
 
+    Display gradients between colors:
+
+        color gradient FF0000 0000FF --steps 10
+        color gradient red white blue --space lab
+
+    Generate color harmonies:
+
+        color harmony FF0000 --scheme triadic
+        color harmony --palette nord --scheme split
+
+    Check contrast ratios between palette colors:
+
+        color contrast solarized --level AAA
+
+    Check palettes for color vision deficiency:
+
+        color cvd nord --type protan
+
+    Generate visually distinct colors:
+
+        color distinct 12 --grid
+
+    Find colors by full or partial name:
+
+        color find slat
+        color name Dark Slate Blue
+
     Look up color palettes:
 
         color palette molokai
+        color palette css3 --grid
+
+    Find palettes with colors near a color:
+
+        color where E10600 --threshold 10
+
+    Find the palettes most similar to a palette:
+
+        color similar nord --count 5
+
+    Find color literals in a source tree:
+
+        color scan src --summary
+
+    Rewrite color literals to the nearest colors in a palette:
+
+        color recolor src --palette solarized
+
+    Start a local HTTP JSON API server:
+
+        color serve --port 8000
 
     Control output with global flags:
 
@@ -424,28 +1401,51 @@ class MainCommand(Dict[str, Any]):
         color config init
         color config show
         color config edit
-    """
 
+    Manage the result cache:
 
-class NameSubCommand(Dict[str, Any]):
-    """Look up colors by CSS3 name."""
+        color cache stats
+        color cache clear
+    """
 
 
 class PaletteSubCommand(Dict[str, Any]):
     """Look up color palettes."""
 
+    # Palette commands are created on demand, as there may be thousands of
+    # user palettes.
+
+    def __contains__(self, name: object) -> bool:
+        return super().__contains__(name) or name in PALETTES
+
+    def __missing__(self, name: str) -> Callable[..., None]:
+        if name in PALETTES:
+            return get_palette_func(name)
+        raise KeyError(name)
+
+    def items(self):  # type: ignore
+        commands = {name: get_palette_func(name) for name in PALETTES}
+        commands.update(super().items())
+        return commands.items()
+
 
 class ConfigSubCommand(Dict[str, Any]):
     """Manage CLI configuration."""
 
 
+class CacheSubCommand(Dict[str, Any]):
+    """Manage the result cache."""
+
+
 def entry_point(name: str) -> None:
     # Workaround for python-fire's argument parsing
     args = sys.argv[1:]
-    if args and args[0] == "hex":
+    if args and args[0] in ("hex", "gradient", "harmony", "where", "name", "find"):
+        # Quote the colors only, so that option values are still parsed.
         for i in range(1, len(args)):
-            if not args[i].startswith("-"):
-                args[i] = f'"{args[i]}"'
+            if args[i].startswith("-"):
+                break
+            args[i] = f'"{args[i]}"'
     try:
         # We need this to get colors working on windows.
         os.system("")
@@ -462,20 +1462,30 @@ def entry_point(name: str) -> None:
                             "show": show_config,
                         }
                     ),
-                    "name": NameSubCommand(
+                    "cache": CacheSubCommand(
                         {
-                            name: get_color_by_name_func(name, hex_code)
-                            for name, hex_code in NAME_TO_HEX_CODE.items()
+                            "clear": clear_result_cache,
+                            "stats": show_cache_stats,
                         }
                     ),
-                    "palette": PaletteSubCommand(
-                        {name: get_palette_func(name) for name in PALETTES.keys()}
-                    ),
+                    "name": get_color_by_name,
+                    "palette": PaletteSubCommand({"import": import_palettes}),
                     "cmyk": get_color_by_cmyk,
+                    "contrast": get_contrast,
+                    "cvd": check_cvd,
+                    "distinct": generate_distinct_colors,
+                    "find": find_colors_by_name,
+                    "gradient": get_color_gradient,
+                    "harmony": get_color_harmony,
                     "hex": get_color_by_hex,
                     "hsl": get_color_by_hsl,
                     "hsv": get_color_by_hsv,
                     "rgb": get_color_by_rgb,
+                    "recolor": recolor,
+                    "scan": scan_colors,
+                    "serve": serve_http,
+                    "similar": get_similar_palettes,
+                    "where": find_color_palettes,
                 }
             ),
         )
@@ -1,5 +1,5 @@
-from dataclasses import dataclass
-from typing import Any, Dict, FrozenSet, Iterable, Set, Union
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Iterable, Optional, Set, Union
 
 from colorpedia.converters import (
     hsl_to_rgb_shades,
@@ -9,6 +9,7 @@ from colorpedia.converters import (
     rgb_to_hsv,
     rgb_to_names,
 )
+from colorpedia.names import load_name_dictionary
 
 
 @dataclass(eq=True, unsafe_hash=True)
@@ -16,10 +17,15 @@ class Color:
     r: int
     g: int
     b: int
+    # Name dictionary of the color names (default: the active dictionary).
+    name_dictionary: Optional[str] = field(default=None, compare=False, repr=False)
 
     def __post_init__(self) -> None:
         self.rgb = (self.r, self.g, self.b)
-        self.names, self.is_name_exact = rgb_to_names(*self.rgb)
+        dictionary = None
+        if self.name_dictionary is not None:
+            dictionary = load_name_dictionary(self.name_dictionary)
+        self.names, self.is_name_exact = rgb_to_names(*self.rgb, dictionary)
         self.name = "/".join(self.names)
         self.hex = rgb_to_hex(*self.rgb)
         self.hsv = rgb_to_hsv(*self.rgb)
@@ -28,7 +34,10 @@ class Color:
 
     def get_shades(self, size: int) -> Iterable["Color"]:
         h, s, l = self.hsl
-        return (Color(*rgb) for rgb in hsl_to_rgb_shades(h, s, l, size))
+        return (
+            Color(*rgb, self.name_dictionary)
+            for rgb in hsl_to_rgb_shades(h, s, l, size)
+        )
 
     def get_dict(self, keys: Union[FrozenSet[str], Set[str]]) -> Dict[str, Any]:
         result: Dict[str, Any] = {}
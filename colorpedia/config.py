@@ -13,28 +13,45 @@ from colorpedia.exceptions import ConfigFileError, ConfigKeyError, ConfigValueEr
 CONFIG_DIR = Path.home() / ".config" / "colorpedia"
 CONFIG_FILE = CONFIG_DIR / "config.json"
 TMP_CONFIG_FILE = CONFIG_DIR / "config.json.tmp"
+CACHE_DIR = Path.home() / ".cache" / "colorpedia"
 
 VIEW_KEYS = frozenset(("name", "rgb", "cmyk", "hex", "hsv", "hsl", "color"))
 JSON_KEYS = frozenset(("is_name_exact", "name", "rgb", "cmyk", "hex", "hsv", "hsl"))
+CACHE_SIZE_LIMIT = 64
 DEFAULT_SHADES_COUNT = 15
+DEFAULT_NAME_DICTIONARY = "css3"
+# Floats are not rounded at this precision (17 significant digits).
+FULL_FLOAT_PRECISION = 17
 GET_VIEW_COLOR_HEIGHT = 10
 GET_VIEW_COLOR_WIDTH = 20
+GRID_VIEW_COLOR_WIDTH = 4
+GRID_VIEW_BUFFER_SIZE = 10000
 LIST_VIEW_COLOR_WIDTH = 20
+OUTPUT_FORMATS = ("default", "json", "csv", "tsv", "binary", "columnar")
+# Files are scanned, recolored or converted inline below this count, since
+# starting a process pool costs more than processing a handful of files.
+MIN_POOL_FILE_COUNT = 16
 
 
 @dataclass
 class Config:
+    always_output_grid: bool = False
     always_output_json: bool = False
     approx_name_suffix: str = "~"
+    cache_size_limit: int = CACHE_SIZE_LIMIT
     default_shades_count: int = DEFAULT_SHADES_COUNT
     display_degree_symbol: bool = False
     display_percent_symbol: bool = False
+    float_precision: int = FULL_FLOAT_PRECISION
     get_view_color_height: int = GET_VIEW_COLOR_HEIGHT
     get_view_color_width: int = GET_VIEW_COLOR_WIDTH
     get_view_keys: FrozenSet[str] = VIEW_KEYS
+    grid_view_color_width: int = GRID_VIEW_COLOR_WIDTH
     list_view_color_width: int = LIST_VIEW_COLOR_WIDTH
     list_view_keys: FrozenSet[str] = VIEW_KEYS
+    name_dictionary: str = DEFAULT_NAME_DICTIONARY
     json_keys: FrozenSet[str] = JSON_KEYS
+    output_format: str = "default"
     uppercase_hex_codes: bool = True
 
     def update(self, data: Dict[str, Any]) -> None:
@@ -54,6 +71,17 @@ class Config:
             if not (type(value) == int and 1 <= value <= 100):
                 raise ConfigValueError(name, "an integer between 1 and 100")
 
+        def validate_precision(name: str) -> None:
+            value = getattr(self, name)
+            if not (type(value) == int and 0 <= value <= FULL_FLOAT_PRECISION):
+                raise ConfigValueError(
+                    name, f"an integer between 0 and {FULL_FLOAT_PRECISION}"
+                )
+
+        def validate_output_format(name: str) -> None:
+            if getattr(self, name) not in OUTPUT_FORMATS:
+                raise ConfigValueError(name, f"one of {list(OUTPUT_FORMATS)}")
+
         def validate_view_keys(name: str) -> None:
             keys = getattr(self, name)
             if not (
@@ -83,17 +111,23 @@ class Config:
                 raise ConfigKeyError(key)
 
         validate_string("approx_name_suffix")
+        validate_string("name_dictionary")
+        validate_boolean("always_output_grid")
         validate_boolean("always_output_json")
         validate_boolean("display_degree_symbol")
         validate_boolean("display_percent_symbol")
         validate_boolean("uppercase_hex_codes")
+        validate_number("cache_size_limit")
         validate_number("default_shades_count")
         validate_number("get_view_color_height")
         validate_number("get_view_color_width")
+        validate_number("grid_view_color_width")
         validate_number("list_view_color_width")
         validate_view_keys("get_view_keys")
         validate_view_keys("list_view_keys")
         validate_json_keys("json_keys")
+        validate_precision("float_precision")
+        validate_output_format("output_format")
 
         self.get_view_keys = frozenset(self.get_view_keys)
         self.list_view_keys = frozenset(self.list_view_keys)
@@ -114,17 +148,35 @@ class Config:
         all: Optional[bool] = None,
         units: Optional[bool] = None,
         shades: Optional[Union[bool, int]] = None,
+        grid: Optional[bool] = None,
+        format: Optional[str] = None,
+        columns: Optional[FrozenSet[str]] = None,
+        precision: Optional[int] = None,
     ) -> None:
         if json is True:
             self.always_output_json = True
         elif json is False:
             self.always_output_json = False
 
+        if grid is True:
+            self.always_output_grid = True
+        elif grid is False:
+            self.always_output_grid = False
+
+        if format is not None:
+            self.output_format = format
+
         if all is True:
             self.get_view_keys = VIEW_KEYS
             self.list_view_keys = VIEW_KEYS
             self.json_keys = JSON_KEYS
 
+        if columns is not None:
+            self.json_keys = columns
+
+        if precision is not None:
+            self.float_precision = precision
+
         if units is True:
             self.display_degree_symbol = True
             self.display_percent_symbol = True
@@ -0,0 +1,158 @@
+"""WCAG 2 relative luminance and contrast ratios of palette colors.
+
+Luminance is computed once per color from a 256-entry sRGB linearization
+table. The contrast ratio of two colors grows with the distance between
+their luminances, so colors are sorted by luminance once and the colors
+that pass a level against another are found by binary search instead of
+comparing every pair. For the same reason, the best text color for any
+background is either the darkest or the lightest color of the palette.
+"""
+
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Tuple
+
+from colorpedia.arrays import ColorArray
+from colorpedia.converters import LINEAR_RGB
+
+# Minimum contrast ratio of each WCAG 2 conformance level for normal text.
+WCAG_LEVELS = {"AA": 4.5, "AAA": 7.0}
+
+# Relative tolerance of the binary search, so that pairs exactly at a level
+# threshold are not lost to rounding. Candidates are checked exactly after.
+_SEARCH_TOLERANCE = 1e-9
+
+
+@dataclass
+class ContrastPair:
+    """Indices of two colors with enough contrast for a WCAG level."""
+
+    dark: int
+    light: int
+    ratio: float
+    level: str
+
+
+@dataclass
+class TextColor:
+    """Indices of a background and its highest contrast text color."""
+
+    background: int
+    text: int
+    ratio: float
+    level: Optional[str]
+
+
+def get_luminances(colors: ColorArray) -> "array[float]":
+    """Return the WCAG relative luminance of each color.
+
+    :param colors: Colors.
+    :return: Luminances (0.0 to 1.0 inclusive).
+    """
+    lr = [0.2126 * value for value in LINEAR_RGB]
+    lg = [0.7152 * value for value in LINEAR_RGB]
+    lb = [0.0722 * value for value in LINEAR_RGB]
+    return array("d", [lr[r] + lg[g] + lb[b] for r, g, b in colors.iter_rgbs()])
+
+
+def get_contrast_ratio(l1: float, l2: float) -> float:
+    """Return the WCAG contrast ratio of two relative luminances.
+
+    :param l1: Relative luminance of the first color.
+    :param l2: Relative luminance of the second color.
+    :return: Contrast ratio (1.0 to 21.0 inclusive).
+    """
+    if l1 < l2:
+        l1, l2 = l2, l1
+    return (l1 + 0.05) / (l2 + 0.05)
+
+
+def get_contrast_level(ratio: float) -> Optional[str]:
+    """Return the highest WCAG level a contrast ratio passes.
+
+    :param ratio: Contrast ratio.
+    :return: "AAA", "AA" or None.
+    """
+    if ratio >= WCAG_LEVELS["AAA"]:
+        return "AAA"
+    if ratio >= WCAG_LEVELS["AA"]:
+        return "AA"
+    return None
+
+
+def iter_contrast_rows(luminances: "array[float]") -> Iterator["array[float]"]:
+    """Yield the rows of the contrast ratio matrix of colors.
+
+    Rows are computed one at a time, so the whole N x N matrix is never
+    held in memory.
+
+    :param luminances: Relative luminances (see get_luminances).
+    :return: Iterator of contrast ratios against each color, one per color.
+    """
+    offsets = [value + 0.05 for value in luminances]
+    for a in offsets:
+        yield array("d", [a / b if a > b else b / a for b in offsets])
+
+
+def get_contrast_matrix(colors: ColorArray) -> List["array[float]"]:
+    """Return the contrast ratio of every pair of colors.
+
+    :param colors: Colors.
+    :return: N x N matrix of contrast ratios.
+    """
+    return list(iter_contrast_rows(get_luminances(colors)))
+
+
+def _sort_by_luminance(luminances: "array[float]") -> Tuple[List[int], List[float]]:
+    order = sorted(range(len(luminances)), key=luminances.__getitem__)
+    return order, [luminances[i] + 0.05 for i in order]
+
+
+def iter_contrast_pairs(
+    luminances: "array[float]", level: str = "AA"
+) -> Iterator[ContrastPair]:
+    """Yield the pairs of colors that pass a WCAG level.
+
+    Each pair is yielded once, ordered by the luminance of the darker color
+    and then by contrast ratio (highest first).
+
+    :param luminances: Relative luminances (see get_luminances).
+    :param level: Minimum WCAG level ("AA" or "AAA").
+    :return: Iterator of color index pairs.
+    :raise ValueError: If the level is unknown.
+    """
+    try:
+        threshold = WCAG_LEVELS[level]
+    except KeyError:
+        raise ValueError(f'Unknown WCAG level "{level}"')
+
+    order, offsets = _sort_by_luminance(luminances)
+    for i, dark in enumerate(offsets):
+        start = bisect_left(offsets, dark * threshold * (1 - _SEARCH_TOLERANCE), i + 1)
+        for j in range(len(offsets) - 1, start - 1, -1):
+            ratio = offsets[j] / dark
+            if ratio >= threshold:
+                pair_level = get_contrast_level(ratio) or level
+                yield ContrastPair(order[i], order[j], ratio, pair_level)
+
+
+def get_text_colors(luminances: "array[float]") -> List[TextColor]:
+    """Return the color with the highest contrast against each color.
+
+    :param luminances: Relative luminances (see get_luminances).
+    :return: Best text color for each background, in input order.
+    """
+    if len(luminances) < 2:
+        return []
+    order, _ = _sort_by_luminance(luminances)
+    darkest, lightest = order[0], order[-1]
+
+    result = []
+    for index, value in enumerate(luminances):
+        candidates = [i for i in (darkest, lightest) if i != index]
+        ratios = [get_contrast_ratio(value, luminances[i]) for i in candidates]
+        ratio = max(ratios)
+        text = candidates[ratios.index(ratio)]
+        result.append(TextColor(index, text, ratio, get_contrast_level(ratio)))
+    return result
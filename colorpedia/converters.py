@@ -1,12 +1,12 @@
+from bisect import bisect_right
 from colorsys import hls_to_rgb as _hls_to_rgb
 from colorsys import hsv_to_rgb as _hsv_to_rgb
 from colorsys import rgb_to_hls as _rgb_to_hls
 from colorsys import rgb_to_hsv as _rgb_to_hsv
-from sys import maxsize
-from typing import Iterable, List, Tuple
+from typing import Iterable, List, Optional, Tuple
 
-from colorpedia.hexcodes import HEX_CODE_TO_NAMES, NAME_TO_HEX_CODE
-from colorpedia.palettes import PALETTES
+from colorpedia.names import NameDictionary, get_name_dictionary
+from colorpedia.search import get_name_search_index
 
 
 def cmyk_to_rgb(c: float, m: float, y: float, k: float) -> Tuple[int, int, int]:
@@ -119,57 +119,158 @@ def rgb_to_hsv(r: int, g: int, b: int) -> Tuple[float, float, float]:
     return _rgb_to_hsv(r / 255, g / 255, b / 255)
 
 
-def name_to_rgb(name: str) -> Tuple[int, int, int]:
-    """Convert CSS3 color name to RGB (Red Green Blue).
+def _srgb_to_linear(value: float) -> float:
+    if value <= 0.04045:
+        return value / 12.92
+    return ((value + 0.055) / 1.055) ** 2.4
 
-    :param name: CSS3 color name.
+
+# Linear light value of each 8-bit sRGB channel value.
+LINEAR_RGB = tuple(_srgb_to_linear(value / 255) for value in range(256))
+
+# Linear light values halfway between consecutive 8-bit sRGB channel values.
+# Encoding by binary search over these is exact and much faster than pow().
+LINEAR_RGB_BOUNDS = tuple(_srgb_to_linear((value + 0.5) / 255) for value in range(255))
+
+
+def linear_to_srgb(value: float) -> int:
+    """Convert a linear light channel value to the nearest 8-bit sRGB value.
+
+    :param value: Linear light value (clipped to 0.0 to 1.0).
+    :return: sRGB channel value (0 to 255 inclusive).
+    """
+    return bisect_right(LINEAR_RGB_BOUNDS, value)
+
+
+# CIE XYZ tristimulus values of the D65 reference white.
+D65_WHITE = (0.95047, 1.0, 1.08883)
+
+
+def _lab_f(t: float) -> float:
+    if t > 216 / 24389:
+        return t ** (1 / 3)
+    return (24389 / 27 * t + 16) / 116
+
+
+def _lab_f_inverse(t: float) -> float:
+    if t > 6 / 29:
+        return t**3
+    return (116 * t - 16) * 27 / 24389
+
+
+def rgb_to_lab(r: int, g: int, b: int) -> Tuple[float, float, float]:
+    """Convert RGB (Red Green Blue) to CIELAB (D65 white point).
+
+    :param r: Red (0 to 255 inclusive).
+    :param g: Green (0 to 255 inclusive).
+    :param b: Blue (0 to 255 inclusive).
+    :return: Lab tuple (L from 0.0 to 100.0, a and b roughly -128.0 to 128.0).
+    """
+    r_, g_, b_ = LINEAR_RGB[r], LINEAR_RGB[g], LINEAR_RGB[b]
+    x = 0.4124564 * r_ + 0.3575761 * g_ + 0.1804375 * b_
+    y = 0.2126729 * r_ + 0.7151522 * g_ + 0.0721750 * b_
+    z = 0.0193339 * r_ + 0.1191920 * g_ + 0.9503041 * b_
+
+    fx = _lab_f(x / D65_WHITE[0])
+    fy = _lab_f(y / D65_WHITE[1])
+    fz = _lab_f(z / D65_WHITE[2])
+    return 116 * fy - 16, 500 * (fx - fy), 200 * (fy - fz)
+
+
+def lab_to_rgb(l: float, a: float, b: float) -> Tuple[int, int, int]:
+    """Convert CIELAB (D65 white point) to RGB (Red Green Blue).
+
+    Colors outside of the sRGB gamut are clipped.
+
+    :param l: Lightness (0.0 to 100.0 inclusive).
+    :param a: Green-red axis.
+    :param b: Blue-yellow axis.
     :return: RGB tuple.
     """
-    try:
-        return hex_to_rgb(NAME_TO_HEX_CODE[name])
-    except KeyError:
-        raise ValueError("Unknown color name (expecting a CSS3 color name)")
+    fy = (l + 16) / 116
+    x = _lab_f_inverse(fy + a / 500) * D65_WHITE[0]
+    y = _lab_f_inverse(fy) * D65_WHITE[1]
+    z = _lab_f_inverse(fy - b / 200) * D65_WHITE[2]
+
+    r_ = 3.2404542 * x - 1.5371385 * y - 0.4985314 * z
+    g_ = -0.9692660 * x + 1.8760108 * y + 0.0415560 * z
+    b_ = 0.0556434 * x - 0.2040259 * y + 1.0572252 * z
+    return linear_to_srgb(r_), linear_to_srgb(g_), linear_to_srgb(b_)
 
 
-def rgb_to_names(r: int, g: int, b: int) -> Tuple[Tuple[str, ...], bool]:
-    """Convert RGB (Red Green Blue) to the nearest CSS3 name(s).
+def rgb_to_oklab(r: int, g: int, b: int) -> Tuple[float, float, float]:
+    """Convert RGB (Red Green Blue) to Oklab.
 
     :param r: Red (0 to 255 inclusive).
     :param g: Green (0 to 255 inclusive).
     :param b: Blue (0 to 255 inclusive).
-    :return: Color name(s) and a boolean indicating exact match.
+    :return: Oklab tuple (L from 0.0 to 1.0, a and b roughly -0.4 to 0.4).
     """
-    try:
-        return HEX_CODE_TO_NAMES[f"{r:02x}{g:02x}{b:02x}".upper()], True
-    except KeyError:
-        minimum_diff = maxsize
-        nearest_names: Tuple[str, ...] = tuple()
+    r_, g_, b_ = LINEAR_RGB[r], LINEAR_RGB[g], LINEAR_RGB[b]
+    l_ = (0.4122214708 * r_ + 0.5363325363 * g_ + 0.0514459929 * b_) ** (1 / 3)
+    m_ = (0.2119034982 * r_ + 0.6806995451 * g_ + 0.1073969566 * b_) ** (1 / 3)
+    s_ = (0.0883024619 * r_ + 0.2817188376 * g_ + 0.6299787005 * b_) ** (1 / 3)
+    return (
+        0.2104542553 * l_ + 0.7936177850 * m_ - 0.0040720468 * s_,
+        1.9779984951 * l_ - 2.4285922050 * m_ + 0.4505937099 * s_,
+        0.0259040371 * l_ + 0.7827717662 * m_ - 0.8086757660 * s_,
+    )
 
-        for hex_code, names in HEX_CODE_TO_NAMES.items():
-            _r, _g, _b = hex_to_rgb(hex_code)
 
-            dr = (_r - r) ** 2
-            dg = (_g - g) ** 2
-            db = (_b - b) ** 2
-            diff = dr + dg + db
+def oklab_to_rgb(l: float, a: float, b: float) -> Tuple[int, int, int]:
+    """Convert Oklab to RGB (Red Green Blue).
 
-            if diff < minimum_diff:
-                minimum_diff = diff
-                nearest_names = names
+    Colors outside of the sRGB gamut are clipped.
 
-        return nearest_names, False
+    :param l: Lightness (0.0 to 1.0 inclusive).
+    :param a: Green-red axis.
+    :param b: Blue-yellow axis.
+    :return: RGB tuple.
+    """
+    l_ = (l + 0.3963377774 * a + 0.2158037573 * b) ** 3
+    m_ = (l - 0.1055613458 * a - 0.0638541728 * b) ** 3
+    s_ = (l - 0.0894841775 * a - 1.2914855480 * b) ** 3
 
+    r_ = 4.0767416621 * l_ - 3.3077115913 * m_ + 0.2309699292 * s_
+    g_ = -1.2684380046 * l_ + 2.6097574011 * m_ - 0.3413193965 * s_
+    b_ = -0.0041960863 * l_ - 0.7034186147 * m_ + 1.7076147010 * s_
+    return linear_to_srgb(r_), linear_to_srgb(g_), linear_to_srgb(b_)
 
-def palette_to_rgbs(palette: str) -> List[Tuple[int, int, int]]:
-    """Return the hex codes in the given palette in sorted order.
 
-    :param palette: Palette name.
-    :return: List of RGB tuples.
+def name_to_rgb(
+    name: str, dictionary: Optional[NameDictionary] = None
+) -> Tuple[int, int, int]:
+    """Convert color name to RGB (Red Green Blue).
+
+    Names are looked up ignoring case, spaces and punctuation.
+
+    :param name: Color name (e.g. "darkslateblue" or "Dark Slate Blue").
+    :param dictionary: Name dictionary (default: the active name dictionary,
+        CSS3 unless changed with colorpedia.names.set_name_dictionary).
+    :return: RGB tuple.
     """
-    try:
-        return [hex_to_rgb(hex_code) for hex_code in PALETTES[palette]]
-    except KeyError:
-        raise ValueError(f'Unknown color palette "{palette}"')
+    index = get_name_search_index(dictionary)
+    match = index.find_exact(name) if type(name) == str else None
+    if match is None:
+        raise ValueError(f'Unknown color name "{name}"')
+    return hex_to_rgb(match.hex_code)
+
+
+def rgb_to_names(
+    r: int, g: int, b: int, dictionary: Optional[NameDictionary] = None
+) -> Tuple[Tuple[str, ...], bool]:
+    """Convert RGB (Red Green Blue) to the nearest color name(s).
+
+    :param r: Red (0 to 255 inclusive).
+    :param g: Green (0 to 255 inclusive).
+    :param b: Blue (0 to 255 inclusive).
+    :param dictionary: Name dictionary (default: the active name dictionary,
+        CSS3 unless changed with colorpedia.names.set_name_dictionary).
+    :return: Color name(s) and a boolean indicating exact match.
+    """
+    if dictionary is None:
+        dictionary = get_name_dictionary()
+    return dictionary.rgb_to_names(r, g, b)
 
 
 def hsl_to_rgb_shades(
@@ -190,3 +291,23 @@ def hsl_to_rgb_shades(
     else:
         r, g, b = _hls_to_rgb(h, l, s)
         yield round(r * 255), round(g * 255), round(b * 255)
+
+
+def palette_to_rgbs(
+    palette: str, ordering: Optional[str] = None
+) -> List[Tuple[int, int, int]]:
+    """Return the colors in the given palette.
+
+    Kept here for backward compatibility. Same as
+    colorpedia.palettes.palette_to_rgbs.
+
+    :param palette: Palette name.
+    :param ordering: One of hue, lightness, hilbert or tsp (default: the
+        order of the palette declaration or file).
+    :return: List of RGB tuples.
+    :raise ValueError: If the palette or ordering is unknown.
+    """
+    # Imported here, since the palettes module imports this one.
+    from colorpedia import palettes
+
+    return palettes.palette_to_rgbs(palette, ordering)
@@ -0,0 +1,128 @@
+"""Color vision deficiency (CVD) simulation and distinguishability checks.
+
+Colors are simulated by applying the matrices of Machado, Oliveira and
+Fernandes (2009, severity 1.0) in linear RGB. Each matrix row is split
+into per-channel lookup tables over the 256 possible channel values, so
+a simulated color is three table sums per channel followed by exact sRGB
+encoding. Distinguishability is measured as CIE76 Delta E (Euclidean
+distance in CIELAB), and close pairs are found with a grid index.
+"""
+
+from array import array
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+from colorpedia.arrays import ColorArray
+from colorpedia.converters import LINEAR_RGB, linear_to_srgb
+from colorpedia.spatial import iter_close_pairs
+
+Matrix = Tuple[Tuple[float, float, float], ...]
+
+CVD_MATRICES: Dict[str, Matrix] = {
+    "protan": (
+        (0.152286, 1.052583, -0.204868),
+        (0.114503, 0.786281, 0.099216),
+        (-0.003882, -0.048116, 1.051998),
+    ),
+    "deutan": (
+        (0.367322, 0.860646, -0.227968),
+        (0.280085, 0.672501, 0.047413),
+        (-0.011820, 0.042940, 0.968881),
+    ),
+    "tritan": (
+        (1.255528, -0.076749, -0.178779),
+        (-0.078411, 0.930809, 0.147602),
+        (0.004733, 0.691367, 0.303900),
+    ),
+}
+
+# Delta E below which two colors are reported as hard to tell apart.
+DEFAULT_CVD_THRESHOLD = 10.0
+
+_tables: Dict[str, List[List[List[float]]]] = {}
+
+
+@dataclass
+class ConfusablePair:
+    """Indices of two colors that are hard to tell apart under a CVD."""
+
+    first: int
+    second: int
+    delta_e: float
+    simulated_delta_e: float
+
+
+def _get_tables(deficiency: str) -> List[List[List[float]]]:
+    tables = _tables.get(deficiency)
+    if tables is None:
+        try:
+            matrix = CVD_MATRICES[deficiency]
+        except KeyError:
+            raise ValueError(f'Unknown color vision deficiency "{deficiency}"')
+        tables = _tables[deficiency] = [
+            [[weight * value for value in LINEAR_RGB] for weight in row]
+            for row in matrix
+        ]
+    return tables
+
+
+def simulate_cvd(colors: ColorArray, deficiency: str) -> ColorArray:
+    """Simulate how colors appear with a color vision deficiency.
+
+    :param colors: Colors.
+    :param deficiency: Type of deficiency (protan, deutan or tritan).
+    :return: Simulated colors.
+    :raise ValueError: If the deficiency is unknown.
+    """
+    (rr, rg, rb), (gr, gg, gb), (br, bg, bb) = _get_tables(deficiency)
+    encode = linear_to_srgb
+    cache: Dict[Tuple[int, int, int], Tuple[int, int, int]] = {}
+    r_column, g_column, b_column = array("B"), array("B"), array("B")
+    for rgb in colors.iter_rgbs():
+        result = cache.get(rgb)
+        if result is None:
+            r, g, b = rgb
+            result = cache[rgb] = (
+                encode(rr[r] + rg[g] + rb[b]),
+                encode(gr[r] + gg[g] + gb[b]),
+                encode(br[r] + bg[g] + bb[b]),
+            )
+        r_column.append(result[0])
+        g_column.append(result[1])
+        b_column.append(result[2])
+    return ColorArray(r_column, g_column, b_column)
+
+
+def get_delta_e(lab1: Sequence[float], lab2: Sequence[float]) -> float:
+    """Return the CIE76 color difference of two CIELAB colors.
+
+    :param lab1: First color (L, a, b).
+    :param lab2: Second color (L, a, b).
+    :return: Delta E.
+    """
+    return sum((x - y) ** 2 for x, y in zip(lab1, lab2)) ** 0.5
+
+
+def find_confusable_pairs(
+    colors: ColorArray, deficiency: str, threshold: float = DEFAULT_CVD_THRESHOLD
+) -> List[ConfusablePair]:
+    """Return the pairs of colors that become hard to tell apart under a CVD.
+
+    Pairs already closer than the threshold without the deficiency are
+    not included.
+
+    :param colors: Colors.
+    :param deficiency: Type of deficiency (protan, deutan or tritan).
+    :param threshold: Delta E below which colors are hard to tell apart.
+    :return: Pairs ordered by simulated Delta E (closest first).
+    :raise ValueError: If the deficiency is unknown.
+    """
+    labs = colors.lab
+    simulated_labs = simulate_cvd(colors, deficiency).lab
+    pairs = []
+    for i, j, simulated_delta_e in iter_close_pairs(simulated_labs, threshold):
+        delta_e = get_delta_e(labs[i], labs[j])
+        if delta_e >= threshold:
+            pairs.append(ConfusablePair(i, j, delta_e, simulated_delta_e))
+    pairs.sort(key=lambda pair: (pair.simulated_delta_e, pair.first, pair.second))
+    return pairs
@@ -0,0 +1,123 @@
+"""Generation of visually distinct colors by farthest-point sampling.
+
+Candidates are a lattice of sRGB colors converted to CIELAB. Colors are
+picked one at a time, each being the candidate farthest from all colors
+picked so far (and from any seed colors). The distance of every candidate
+to its nearest picked color is kept up to date, with a lazy max-heap to
+find the farthest one. A newly picked color can only reduce the distances
+of candidates closer to it than the current maximum distance, so only
+those are visited through a grid index. As the maximum distance shrinks,
+the grid is rebuilt with smaller cells, which keeps the total work close
+to (candidates + picks) * log(candidates) instead of their product.
+"""
+
+from heapq import heapify, heappop, heappush
+from random import Random
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from colorpedia.arrays import ColorArray
+from colorpedia.converters import rgb_to_lab
+from colorpedia.spatial import Point, PointGrid
+
+RGB = Tuple[int, int, int]
+
+# Number of lattice values per RGB channel. The smallest lattice with at
+# least 8 candidates per requested color is used.
+LATTICE_SIZES = (16, 24, 32, 40, 48)
+MAX_DISTINCT_COLORS = 48**3 // 8
+
+# The grid is rebuilt when the search radius falls below this fraction of
+# its cell size.
+_GRID_REBUILD_RATIO = 0.85
+
+
+def _get_lattice(count: int) -> List[RGB]:
+    size = next(
+        (size for size in LATTICE_SIZES if size**3 >= count * 8), LATTICE_SIZES[-1]
+    )
+    values = [round(i * 255 / (size - 1)) for i in range(size)]
+    return [(r, g, b) for r in values for g in values for b in values]
+
+
+class _FarthestPointSampler:
+    # Distances are kept squared, as only their order matters.
+
+    def __init__(self, points: Sequence[Point]) -> None:
+        self.points = points
+        self.distances: List[float] = []
+        self.heap: List[Tuple[float, int]] = []
+        self.grid: Optional[PointGrid] = None
+
+    def get_farthest(self) -> Tuple[int, float]:
+        heap, distances = self.heap, self.distances
+        while True:
+            negative_distance, index = heap[0]
+            if -negative_distance == distances[index]:
+                return index, distances[index]
+            heappop(heap)
+
+    def add(self, point: Point) -> None:
+        x, y, z = point
+        if not self.distances:
+            self.distances = [
+                (px - x) ** 2 + (py - y) ** 2 + (pz - z) ** 2
+                for px, py, pz in self.points
+            ]
+            self.heap = [(-d, i) for i, d in enumerate(self.distances)]
+            heapify(self.heap)
+            return
+
+        radius = self.get_farthest()[1] ** 0.5
+        grid = self.grid
+        if grid is None or radius < grid.cell_size * _GRID_REBUILD_RATIO:
+            grid = self.grid = PointGrid(max(radius, 1e-9), self.points)
+
+        # Only candidates closer than the current max distance can get closer,
+        # and those are all in the cells around the point.
+        heap, distances, points = self.heap, self.distances, self.points
+        for cell in grid.get_nearby_cells(point):
+            for index in cell:
+                px, py, pz = points[index]
+                distance = (px - x) ** 2 + (py - y) ** 2 + (pz - z) ** 2
+                if distance < distances[index]:
+                    distances[index] = distance
+                    heappush(heap, (-distance, index))
+
+
+def get_distinct_colors(
+    count: int, seed: int = 0, seed_colors: Iterable[RGB] = ()
+) -> ColorArray:
+    """Generate colors that are as far apart from each other as possible.
+
+    Distance is measured in CIELAB. The output is deterministic for given
+    arguments.
+
+    :param count: Number of colors (1 to MAX_DISTINCT_COLORS inclusive).
+    :param seed: Random seed choosing the first color, if there are no
+        seed colors.
+    :param seed_colors: Existing colors (e.g. a palette) to keep away from.
+        They are not included in the output.
+    :return: Colors in the order they were picked (most distinct first).
+        There are fewer than count colors only if the seed colors leave no
+        other candidates.
+    :raise ValueError: If the count is out of range.
+    """
+    if not 1 <= count <= MAX_DISTINCT_COLORS:
+        raise ValueError(f"Color count must be between 1 and {MAX_DISTINCT_COLORS}")
+
+    candidates = _get_lattice(count)
+    sampler = _FarthestPointSampler([rgb_to_lab(*rgb) for rgb in candidates])
+    for rgb in seed_colors:
+        sampler.add(rgb_to_lab(*rgb))
+
+    picked = []
+    if not sampler.distances:
+        picked.append(Random(seed).randrange(len(candidates)))
+        sampler.add(sampler.points[picked[0]])
+    while len(picked) < count:
+        index, distance = sampler.get_farthest()
+        if not distance:
+            break
+        picked.append(index)
+        sampler.add(sampler.points[index])
+    return ColorArray.from_rgbs(candidates[index] for index in picked)
@@ -16,6 +16,39 @@ class ConfigFileError(ColorpediaError):
         super().__init__(message)
 
 
+class CacheError(ColorpediaError):
+    """Result cache cannot be accessed or cleared."""
+
+    def __init__(self, message: str, err: Optional[Exception] = None):
+        if isinstance(err, OSError):
+            message = f"{message}: {err.strerror} (errno: {err.errno})"
+        elif err:
+            message = f"{message}: {err}"
+        super().__init__(message)
+
+
+class NameDictionaryError(ColorpediaError):
+    """Color name dictionary cannot be loaded."""
+
+    def __init__(self, message: str, err: Optional[Exception] = None):
+        if isinstance(err, OSError):
+            message = f"{message}: {err.strerror} (errno: {err.errno})"
+        elif err:
+            message = f"{message}: {err}"
+        super().__init__(message)
+
+
+class PaletteFileError(ColorpediaError):
+    """Palette file cannot be loaded."""
+
+    def __init__(self, message: str, err: Optional[Exception] = None):
+        if isinstance(err, OSError):
+            message = f"{message}: {err.strerror} (errno: {err.errno})"
+        elif err:
+            message = f"{message}: {err}"
+        super().__init__(message)
+
+
 class ConfigKeyError(ColorpediaError):
     """Configuration key is invalid."""
 
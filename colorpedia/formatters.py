@@ -1,5 +1,16 @@
-from colorpedia.color import Color
+from typing import Iterable, Iterator, List, Optional, Sequence
+
+from colorpedia.arrays import ColorLike
 from colorpedia.config import Config
+from colorpedia.converters import hex_to_rgb
+from colorpedia.scanner import ScanHit
+
+# Visible width of a grid view label (hex code with the hash prefix).
+GRID_VIEW_LABEL_WIDTH = 7
+# Number of spaces between grid view cells.
+GRID_VIEW_GAP_WIDTH = 2
+# Max number of colors displayed per similar palette.
+MAX_SIMILAR_SWATCHES = 16
 
 
 def format_degree(value: float) -> str:
@@ -31,6 +42,10 @@ def format_list_color(config: Config, r: int, g: int, b: int) -> str:
     return f'\033[48;2;{r};{g};{b}m{" " * config.list_view_color_width}\033[0m'
 
 
+def format_grid_color(config: Config, r: int, g: int, b: int) -> str:
+    return f'\033[48;2;{r};{g};{b}m{" " * config.grid_view_color_width}\033[0m'
+
+
 def format_name(config: Config, name: str, is_exact: bool) -> str:
     return name if is_exact else f"{name}{config.approx_name_suffix}"
 
@@ -86,7 +101,7 @@ def format_rgb(config: Config, r: int, g: int, b: int) -> str:
     return f"R:{r_str} G:{g_str} B:{b_str}"
 
 
-def format_get_view(config: Config, color: Color) -> str:
+def format_get_view(config: Config, color: ColorLike) -> str:
     keys = config.get_view_keys
     buf = []
     if "name" in keys:
@@ -106,7 +121,7 @@ def format_get_view(config: Config, color: Color) -> str:
     return "\n".join(buf)
 
 
-def format_list_view(config: Config, color: Color) -> str:
+def format_list_view(config: Config, color: ColorLike) -> str:
     keys = config.list_view_keys
     buf = []
     if "color" in keys:
@@ -124,3 +139,141 @@ def format_list_view(config: Config, color: Color) -> str:
     if "name" in keys:
         buf.append(format_name(config, color.name, color.is_name_exact))
     return "|".join(buf)
+
+
+def get_grid_column_count(config: Config, width: int) -> int:
+    cell_width = config.grid_view_color_width + 1 + GRID_VIEW_LABEL_WIDTH
+    return max(1, (width + GRID_VIEW_GAP_WIDTH) // (cell_width + GRID_VIEW_GAP_WIDTH))
+
+
+def format_grid_cell(config: Config, color: ColorLike) -> str:
+    swatch = format_grid_color(config, *color.rgb)
+    return f"{swatch} {format_hex(config, color.hex)}"
+
+
+def format_grid_rows(
+    config: Config, colors: Iterable[ColorLike], columns: int
+) -> Iterator[str]:
+    gap = " " * GRID_VIEW_GAP_WIDTH
+    row: List[str] = []
+    for color in colors:
+        row.append(format_grid_cell(config, color))
+        if len(row) == columns:
+            yield gap.join(row)
+            row = []
+    if row:
+        yield gap.join(row)
+
+
+def format_grid_view(config: Config, colors: Iterable[ColorLike], width: int) -> str:
+    columns = get_grid_column_count(config, width)
+    return "\n".join(format_grid_rows(config, colors, columns))
+
+
+def format_scan_hit(config: Config, hit: ScanHit) -> str:
+    return "|".join(
+        (
+            format_grid_color(config, *hex_to_rgb(hit.hex)),
+            f"{hit.path}:{hit.line}:{hit.column}",
+            hit.literal,
+            format_hex(config, hit.hex),
+            format_name(config, hit.name, hit.is_name_exact),
+        )
+    )
+
+
+def format_scan_count(
+    config: Config, hex_code: str, name: str, is_exact: bool, count: int
+) -> str:
+    return "|".join(
+        (
+            f"{count:>7d}",
+            format_grid_color(config, *hex_to_rgb(hex_code)),
+            format_hex(config, hex_code),
+            format_name(config, name, is_exact),
+        )
+    )
+
+
+def format_contrast_sample(config: Config, background: str, text: str) -> str:
+    br, bg, bb = hex_to_rgb(background)
+    tr, tg, tb = hex_to_rgb(text)
+    sample = "Aa".center(config.list_view_color_width)
+    return f"\033[48;2;{br};{bg};{bb};38;2;{tr};{tg};{tb}m{sample}\033[0m"
+
+
+def format_contrast(
+    config: Config, background: str, text: str, ratio: float, level: Optional[str]
+) -> str:
+    return "|".join(
+        (
+            format_contrast_sample(config, background, text),
+            format_hex(config, background),
+            format_hex(config, text),
+            f"{ratio:5.2f}:1",
+            level or "-",
+        )
+    )
+
+
+def format_palette_match(
+    config: Config, palette: str, hex_code: str, delta_e: float
+) -> str:
+    return "|".join(
+        (
+            format_grid_color(config, *hex_to_rgb(hex_code)),
+            format_hex(config, hex_code),
+            f"{delta_e:5.1f}",
+            palette,
+        )
+    )
+
+
+def format_name_match(config: Config, name: str, hex_code: str) -> str:
+    return "|".join(
+        (
+            format_grid_color(config, *hex_to_rgb(hex_code)),
+            format_hex(config, hex_code),
+            name,
+        )
+    )
+
+
+def format_similar_palette(
+    config: Config, palette: str, hex_codes: Sequence[str], distance: float
+) -> str:
+    return "|".join(
+        (
+            f"{distance:5.1f}",
+            palette,
+            "".join(
+                format_grid_color(config, *hex_to_rgb(hex_code))
+                for hex_code in hex_codes[:MAX_SIMILAR_SWATCHES]
+            ),
+        )
+    )
+
+
+def format_cvd_color(config: Config, hex_code: str, simulated: str) -> str:
+    return "|".join(
+        (
+            format_grid_color(config, *hex_to_rgb(hex_code))
+            + format_grid_color(config, *hex_to_rgb(simulated)),
+            format_hex(config, hex_code),
+            format_hex(config, simulated),
+        )
+    )
+
+
+def format_cvd_pair(
+    config: Config, first: str, second: str, delta_e: float, simulated: float
+) -> str:
+    return "|".join(
+        (
+            format_grid_color(config, *hex_to_rgb(first))
+            + format_grid_color(config, *hex_to_rgb(second)),
+            format_hex(config, first),
+            format_hex(config, second),
+            f"{delta_e:5.1f} -> {simulated:4.1f}",
+        )
+    )
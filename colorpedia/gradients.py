@@ -0,0 +1,152 @@
+from array import array
+from itertools import groupby, repeat
+from typing import Callable, Iterator, List, Sequence, Tuple
+
+from colorpedia.arrays import ColorArray
+from colorpedia.converters import (
+    hsl_to_rgb,
+    hsv_to_rgb,
+    lab_to_rgb,
+    oklab_to_rgb,
+    rgb_to_hsl,
+    rgb_to_hsv,
+    rgb_to_lab,
+    rgb_to_oklab,
+)
+
+RGB = Tuple[int, int, int]
+Coordinates = Tuple[float, float, float]
+
+# Color spaces available for interpolation. Each maps to conversions from and
+# to RGB, and whether the first coordinate is a hue (0.0 to 1.0, circular).
+GRADIENT_SPACES = {
+    "rgb": (lambda r, g, b: (r, g, b), lambda r, g, b: (r, g, b), False),
+    "hsl": (rgb_to_hsl, hsl_to_rgb, True),
+    "hsv": (rgb_to_hsv, hsv_to_rgb, True),
+    "lab": (rgb_to_lab, lab_to_rgb, False),
+    "oklab": (rgb_to_oklab, oklab_to_rgb, False),
+}
+GRADIENT_CHUNK_SIZE = 65536
+
+
+def _get_segments(
+    stops: Sequence[RGB], space: str
+) -> Tuple[List[Tuple[Coordinates, Coordinates]], Callable[..., RGB], bool]:
+    try:
+        from_rgb, to_rgb, is_hue = GRADIENT_SPACES[space]
+    except KeyError:
+        raise ValueError(f'Unknown color space "{space}"')
+    if len(stops) < 2:
+        raise ValueError("At least two color stops are required")
+
+    coordinates = [from_rgb(*stop) for stop in stops]
+    segments = []
+    for start, end in zip(coordinates, coordinates[1:]):
+        delta = [e - s for s, e in zip(start, end)]
+        if is_hue:
+            # Interpolate hue along the shorter arc of the color wheel.
+            delta[0] = (delta[0] + 0.5) % 1.0 - 0.5
+        segments.append((start, (delta[0], delta[1], delta[2])))
+    return segments, to_rgb, is_hue
+
+
+def _get_scale(steps: int, segment_count: int) -> float:
+    return segment_count / (steps - 1) if steps > 1 else 0.0
+
+
+def _interpolate(
+    segments: List[Tuple[Coordinates, Coordinates]],
+    to_rgb: Callable[..., RGB],
+    is_hue: bool,
+    space: str,
+    scale: float,
+    start: int,
+    stop: int,
+) -> Iterator[RGB]:
+    last_segment = len(segments) - 1
+    segment = -1
+    x = y = z = dx = dy = dz = 0.0
+    for index in range(start, stop):
+        t = index * scale
+        if int(t) != segment:
+            segment = min(int(t), last_segment)
+            (x, y, z), (dx, dy, dz) = segments[segment]
+        u = t - segment
+        if space == "rgb":
+            yield round(x + dx * u), round(y + dy * u), round(z + dz * u)
+        elif is_hue:
+            yield to_rgb((x + dx * u) % 1.0, y + dy * u, z + dz * u)
+        else:
+            yield to_rgb(x + dx * u, y + dy * u, z + dz * u)
+
+
+def iter_gradient(stops: Sequence[RGB], steps: int, space: str) -> Iterator[RGB]:
+    """Yield the colors of a gradient through two or more color stops.
+
+    Steps are evenly spaced over the whole gradient and include both ends.
+    Colors are computed one at a time, so memory use does not depend on the
+    number of steps.
+
+    :param stops: RGB tuples of the color stops.
+    :param steps: Number of colors (positive integer).
+    :param space: Interpolation color space (rgb, hsl, hsv, lab or oklab).
+    :return: RGB tuple iterator.
+    :raise ValueError: If the color space or number of stops is invalid.
+    """
+    segments, to_rgb, is_hue = _get_segments(stops, space)
+    scale = _get_scale(steps, len(segments))
+    return _interpolate(segments, to_rgb, is_hue, space, scale, 0, steps)
+
+
+def get_gradient(
+    stops: Sequence[RGB], steps: int, space: str, start: int = 0, stop: int = -1
+) -> ColorArray:
+    """Return a range of the colors of a gradient as a ColorArray.
+
+    This is the bulk counterpart of iter_gradient. Colors are written
+    straight into the color columns, and consecutive steps that map to the
+    same RGB (common with many steps) are appended as runs.
+
+    :param stops: RGB tuples of the color stops.
+    :param steps: Number of colors in the whole gradient (positive integer).
+    :param space: Interpolation color space (rgb, hsl, hsv, lab or oklab).
+    :param start: Index of the first color in the range.
+    :param stop: Index after the last color in the range (default: steps).
+    :return: Color array.
+    :raise ValueError: If the color space or number of stops is invalid.
+    """
+    segments, to_rgb, is_hue = _get_segments(stops, space)
+    scale = _get_scale(steps, len(segments))
+    if stop < 0:
+        stop = steps
+
+    r, g, b = array("B"), array("B"), array("B")
+    rgbs = _interpolate(segments, to_rgb, is_hue, space, scale, start, stop)
+    for (_r, _g, _b), run in groupby(rgbs):
+        count = sum(1 for _ in run)
+        r.extend(repeat(_r, count))
+        g.extend(repeat(_g, count))
+        b.extend(repeat(_b, count))
+    return ColorArray(r, g, b)
+
+
+def iter_gradient_chunks(
+    stops: Sequence[RGB],
+    steps: int,
+    space: str,
+    chunk_size: int = GRADIENT_CHUNK_SIZE,
+) -> Iterator[ColorArray]:
+    """Yield the colors of a gradient in fixed-size ColorArray chunks.
+
+    :param stops: RGB tuples of the color stops.
+    :param steps: Number of colors (positive integer).
+    :param space: Interpolation color space (rgb, hsl, hsv, lab or oklab).
+    :param chunk_size: Max number of colors per chunk.
+    :return: Iterator of color arrays.
+    :raise ValueError: If the color space or number of stops is invalid.
+    """
+    _get_segments(stops, space)
+    return (
+        get_gradient(stops, steps, space, start, min(start + chunk_size, steps))
+        for start in range(0, steps, chunk_size)
+    )
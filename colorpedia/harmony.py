@@ -0,0 +1,67 @@
+"""Color harmonies by hue rotation in HSL.
+
+Harmonies of many colors are generated from the HSL column of a ColorArray,
+which is computed once, without creating a Color object per color. The hue
+rotation itself is not vectorized (there is no array math dependency): each
+offset of a scheme calls hsl_to_rgb once per color. Only the writes of the
+results into the output byte columns are done a whole column at a time,
+with strided slice assignments.
+"""
+
+from array import array
+from typing import Dict, Iterator, Tuple
+
+from colorpedia.arrays import ColorArray
+from colorpedia.converters import hsl_to_rgb
+
+# Hue offsets (in turns) of the colors in each harmony scheme. The input
+# color is the first color of each scheme except analogous, where it is
+# in the middle.
+HARMONY_SCHEMES: Dict[str, Tuple[float, ...]] = {
+    "complementary": (0.0, 1 / 2),
+    "triadic": (0.0, 1 / 3, 2 / 3),
+    "tetradic": (0.0, 1 / 4, 1 / 2, 3 / 4),
+    "analogous": (-1 / 12, 0.0, 1 / 12),
+    "split": (0.0, 5 / 12, 7 / 12),
+}
+
+
+def get_harmonies(colors: ColorArray, scheme: str) -> ColorArray:
+    """Return the harmony colors of each color, one scheme after another.
+
+    The colors of the scheme for colors[i] are at indices i * k to
+    (i + 1) * k - 1, where k is the number of colors in the scheme.
+
+    :param colors: Colors.
+    :param scheme: One of complementary, triadic, tetradic, analogous or
+        split.
+    :return: Color array.
+    :raise ValueError: If the scheme is unknown.
+    """
+    try:
+        offsets = HARMONY_SCHEMES[scheme]
+    except KeyError:
+        raise ValueError(f'Unknown harmony scheme "{scheme}"')
+
+    size = len(offsets)
+    hsls = colors.hsl
+    result = [array("B", bytes(len(colors) * size)) for _ in range(3)]
+    for index, offset in enumerate(offsets):
+        rgbs = [hsl_to_rgb((h + offset) % 1.0, s, l) for h, s, l in hsls]
+        for column, values in zip(result, zip(*rgbs)):
+            column[index::size] = array("B", values)
+    return ColorArray(*result)
+
+
+def iter_harmonies(colors: ColorArray, scheme: str) -> Iterator[ColorArray]:
+    """Yield the harmony colors of each color, one array per color.
+
+    :param colors: Colors.
+    :param scheme: One of complementary, triadic, tetradic, analogous or
+        split.
+    :return: Iterator of color arrays.
+    :raise ValueError: If the scheme is unknown.
+    """
+    harmonies = get_harmonies(colors, scheme)
+    size = len(HARMONY_SCHEMES[scheme])
+    return (harmonies[i : i + size] for i in range(0, len(harmonies), size))
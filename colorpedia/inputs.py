@@ -1,8 +1,20 @@
 import re
-from typing import Optional, Union
+from typing import FrozenSet, Optional, Sequence, Union
 
+from colorpedia.config import FULL_FLOAT_PRECISION, JSON_KEYS, OUTPUT_FORMATS
+from colorpedia.contrast import WCAG_LEVELS
+from colorpedia.cvd import CVD_MATRICES
+from colorpedia.distinct import MAX_DISTINCT_COLORS
 from colorpedia.exceptions import InputValueError
+from colorpedia.gradients import GRADIENT_SPACES
+from colorpedia.harmony import HARMONY_SCHEMES
 from colorpedia.hexcodes import HEX_REGEX
+from colorpedia.ordering import PALETTE_ORDERINGS
+from colorpedia.palettes import PALETTES
+from colorpedia.swatches import PALETTE_EXPORT_FORMATS
+
+HEX_PATTERN = re.compile(HEX_REGEX)
+MAX_GRADIENT_STEPS = 100_000_000
 
 
 def validate_indent_width(value: int) -> int:
@@ -29,12 +41,145 @@ def validate_editor(value: Optional[str]) -> Optional[str]:
     raise InputValueError("editor", "a shell-executable command without whitespaces")
 
 
+def validate_port_number(value: int) -> int:
+    if type(value) == int and 0 <= value <= 65535:
+        return value
+    raise InputValueError("port number", "an integer between 0 and 65535")
+
+
 def validate_rgb_value(value: int) -> int:
     if type(value) == int and 0 <= value <= 255:
         return value
     raise InputValueError("RGB value", "an integer between 0 and 255")
 
 
+def validate_palette_name(value: Optional[str]) -> str:
+    if isinstance(value, str) and value in PALETTES:
+        return value
+    raise InputValueError("palette name", 'a name listed by "color palette --help"')
+
+
+def validate_name_query(value: Optional[str]) -> str:
+    if isinstance(value, str) and any(char.isalnum() for char in value):
+        return value
+    raise InputValueError("color name", "a full or partial color name")
+
+
+def validate_match_count(value: int) -> int:
+    if type(value) == int and 1 <= value <= 1000:
+        return value
+    raise InputValueError("match count", "an integer between 1 and 1000")
+
+
+def validate_worker_count(value: Optional[int]) -> Optional[int]:
+    if value is None or (type(value) == int and 1 <= value <= 256):
+        return value
+    raise InputValueError("worker count", "an integer between 1 and 256")
+
+
+def validate_output_format(value: Optional[str]) -> Optional[str]:
+    if value is None or value in OUTPUT_FORMATS:
+        return value
+    raise InputValueError("output format", f"one of {', '.join(OUTPUT_FORMATS)}")
+
+
+def validate_export_format(value: Optional[str]) -> Optional[str]:
+    if value is None or value in PALETTE_EXPORT_FORMATS:
+        return value
+    raise InputValueError(
+        "export format", f"one of {', '.join(PALETTE_EXPORT_FORMATS)}"
+    )
+
+
+def validate_output_columns(
+    value: Optional[Union[str, Sequence[str]]],
+) -> Optional[FrozenSet[str]]:
+    if value is None:
+        return value
+    columns = value.split(",") if isinstance(value, str) else value
+    if (
+        isinstance(columns, (list, tuple))
+        and len(columns) > 0
+        and set(columns).issubset(JSON_KEYS)
+    ):
+        return frozenset(columns)
+    raise InputValueError(
+        "columns", f"comma-separated names in {', '.join(sorted(JSON_KEYS))}"
+    )
+
+
+def validate_float_precision(value: Optional[int]) -> Optional[int]:
+    if value is None or (type(value) == int and 0 <= value <= FULL_FLOAT_PRECISION):
+        return value
+    raise InputValueError(
+        "precision", f"an integer between 0 and {FULL_FLOAT_PRECISION}"
+    )
+
+
+def validate_gradient_steps(value: Optional[int]) -> Optional[int]:
+    if value is None or (type(value) == int and 1 <= value <= MAX_GRADIENT_STEPS):
+        return value
+    raise InputValueError(
+        "gradient steps", f"an integer between 1 and {MAX_GRADIENT_STEPS}"
+    )
+
+
+def validate_color_space(value: str) -> str:
+    if isinstance(value, str) and value in GRADIENT_SPACES:
+        return value
+    raise InputValueError("color space", f"one of {', '.join(GRADIENT_SPACES)}")
+
+
+def validate_contrast_level(value: str) -> str:
+    if isinstance(value, str) and value.upper() in WCAG_LEVELS:
+        return value.upper()
+    raise InputValueError("WCAG level", f"one of {', '.join(WCAG_LEVELS)}")
+
+
+def validate_cvd_type(value: str) -> str:
+    if isinstance(value, str) and value in CVD_MATRICES:
+        return value
+    raise InputValueError("deficiency type", f"one of {', '.join(CVD_MATRICES)}")
+
+
+def validate_delta_e(value: Union[float, int]) -> float:
+    if type(value) in (float, int) and 0 < value <= 100:
+        return value
+    raise InputValueError("Delta E threshold", "a number between 0 and 100")
+
+
+def validate_distinct_count(value: int) -> int:
+    if type(value) == int and 1 <= value <= MAX_DISTINCT_COLORS:
+        return value
+    raise InputValueError(
+        "color count", f"an integer between 1 and {MAX_DISTINCT_COLORS}"
+    )
+
+
+def validate_random_seed(value: int) -> int:
+    if type(value) == int:
+        return value
+    raise InputValueError("random seed", "an integer")
+
+
+def validate_harmony_scheme(value: str) -> str:
+    if isinstance(value, str) and value in HARMONY_SCHEMES:
+        return value
+    raise InputValueError("harmony scheme", f"one of {', '.join(HARMONY_SCHEMES)}")
+
+
+def validate_palette_ordering(value: Optional[str]) -> Optional[str]:
+    if value is None or value in PALETTE_ORDERINGS:
+        return value
+    raise InputValueError("sort order", f"one of {', '.join(PALETTE_ORDERINGS)}")
+
+
+def validate_palette_count(value: int) -> int:
+    if type(value) == int and 1 <= value <= 10000:
+        return value
+    raise InputValueError("palette count", "an integer between 1 and 10000")
+
+
 def normalize_degree_angle(value: Union[float, int]) -> float:
     if (type(value) in (float, int)) and 0 <= value <= 360:
         return value / 360
@@ -42,7 +187,7 @@ def normalize_degree_angle(value: Union[float, int]) -> float:
 
 
 def normalize_hex_code(value: Union[int, str]) -> str:
-    if isinstance(value, str) and re.search(HEX_REGEX, value):
+    if isinstance(value, str) and HEX_PATTERN.search(value):
         return value if len(value) == 6 else "".join(c * 2 for c in value)
     raise InputValueError("hex code", f"a string matching {HEX_REGEX}")
 
@@ -0,0 +1,276 @@
+"""In-process color lookups without CLI overhead.
+
+Functions in this module never print, never read configuration files and
+do not import the CLI (or its dependencies). Pass a reusable Config object
+to control JSON keys and the name dictionary; otherwise the default JSON
+keys and the active name dictionary (see colorpedia.names) are used. An
+unknown config.name_dictionary raises ConfigValueError. Bulk functions
+convert each distinct input once.
+
+Example:
+
+    from colorpedia import lookup
+    from colorpedia.config import Config
+
+    config = Config(json_keys=frozenset(("hex", "name")))
+    lookup.from_hex("FF0000").name                     # "red"
+    lookup.from_rgb(0, 0, 255, config, as_dict=True)   # {"hex": ..., "name": ...}
+    lookup.from_hexes(["FFF", "000"], config, as_dict=True)
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from colorpedia.color import Color
+from colorpedia.config import Config
+from colorpedia.converters import (
+    hex_to_rgb,
+    hsl_to_rgb,
+    hsl_to_rgb_shades,
+    name_to_rgb,
+)
+from colorpedia.exceptions import ConfigValueError, InputValueError
+from colorpedia.inputs import (
+    normalize_degree_angle,
+    normalize_hex_code,
+    normalize_percent_value,
+    validate_palette_name,
+    validate_palette_ordering,
+    validate_rgb_value,
+    validate_shades_count,
+)
+from colorpedia.names import list_name_dictionaries, load_name_dictionary
+from colorpedia.palettes import palette_to_rgbs
+
+DEFAULT_CONFIG = Config()
+
+RGB = Tuple[int, int, int]
+ColorResult = Union[Color, Dict[str, Any]]
+
+
+def _to_result(color: Color, config: Optional[Config], as_dict: bool) -> ColorResult:
+    if as_dict:
+        return color.get_dict((config or DEFAULT_CONFIG).json_keys)
+    return color
+
+
+def _get_name_dictionary(config: Optional[Config]) -> Optional[str]:
+    if config is None:
+        return None
+    try:
+        load_name_dictionary(config.name_dictionary)
+    except ValueError:
+        raise ConfigValueError("name_dictionary", f"one of {list_name_dictionaries()}")
+    return config.name_dictionary
+
+
+def _hex_to_rgb(hex_code: str) -> RGB:
+    return hex_to_rgb(normalize_hex_code(hex_code))
+
+
+def _validate_rgb(r: int, g: int, b: int) -> RGB:
+    return validate_rgb_value(r), validate_rgb_value(g), validate_rgb_value(b)
+
+
+def _hsl_to_rgb(h: float, s: float, l: float) -> RGB:
+    return hsl_to_rgb(
+        normalize_degree_angle(h),
+        normalize_percent_value(s),
+        normalize_percent_value(l),
+    )
+
+
+def _bulk(
+    function: Callable[..., RGB],
+    values: Iterable[Any],
+    config: Optional[Config],
+    as_dict: bool,
+) -> List[ColorResult]:
+    # Inputs often repeat, so each distinct value is converted only once.
+    # Results are made per position, so that no two dicts are the same object.
+    name_dictionary = _get_name_dictionary(config)
+    cache: Dict[Any, Color] = {}
+    results = []
+    for value in values:
+        args = value if isinstance(value, tuple) else (value,)
+        try:
+            color = cache.get(value)
+        except TypeError:  # Unhashable, so left to the validators.
+            color = Color(*function(*args), name_dictionary)
+        if color is None:
+            color = cache[value] = Color(*function(*args), name_dictionary)
+        results.append(_to_result(color, config, as_dict))
+    return results
+
+
+def from_hex(
+    hex_code: str, config: Optional[Config] = None, as_dict: bool = False
+) -> ColorResult:
+    """Look up a color by hexadecimal code.
+
+    :param hex_code: Hex color code without the hash (#) prefix.
+    :param config: Configuration (default: default configuration).
+    :param as_dict: Return a dictionary with keys in config.json_keys.
+    :return: Color or dictionary.
+    :raise colorpedia.exceptions.InputValueError: If input is invalid.
+    """
+    color = Color(*_hex_to_rgb(hex_code), _get_name_dictionary(config))
+    return _to_result(color, config, as_dict)
+
+
+def from_rgb(
+    r: int, g: int, b: int, config: Optional[Config] = None, as_dict: bool = False
+) -> ColorResult:
+    """Look up a color by RGB (Red Green Blue) values.
+
+    :param r: Red (0 to 255 inclusive).
+    :param g: Green (0 to 255 inclusive).
+    :param b: Blue (0 to 255 inclusive).
+    :param config: Configuration (default: default configuration).
+    :param as_dict: Return a dictionary with keys in config.json_keys.
+    :return: Color or dictionary.
+    :raise colorpedia.exceptions.InputValueError: If input is invalid.
+    """
+    color = Color(*_validate_rgb(r, g, b), _get_name_dictionary(config))
+    return _to_result(color, config, as_dict)
+
+
+def from_hsl(
+    h: float,
+    s: float,
+    l: float,
+    config: Optional[Config] = None,
+    as_dict: bool = False,
+) -> ColorResult:
+    """Look up a color by HSL (Hue Saturation Lightness) values.
+
+    :param h: Hue in degree angle (0.0 to 360.0 inclusive).
+    :param s: Saturation % (0.0 to 100.0 inclusive).
+    :param l: Lightness % (0.0 to 100.0 inclusive).
+    :param config: Configuration (default: default configuration).
+    :param as_dict: Return a dictionary with keys in config.json_keys.
+    :return: Color or dictionary.
+    :raise colorpedia.exceptions.InputValueError: If input is invalid.
+    """
+    color = Color(*_hsl_to_rgb(h, s, l), _get_name_dictionary(config))
+    return _to_result(color, config, as_dict)
+
+
+def from_name(
+    name: str, config: Optional[Config] = None, as_dict: bool = False
+) -> ColorResult:
+    """Look up a color by name.
+
+    Names are looked up in config.name_dictionary (default: the active name
+    dictionary), ignoring case, spaces and punctuation.
+
+    :param name: Color name.
+    :param config: Configuration (default: default configuration).
+    :param as_dict: Return a dictionary with keys in config.json_keys.
+    :return: Color or dictionary.
+    :raise colorpedia.exceptions.InputValueError: If input is invalid.
+    """
+    name_dictionary = _get_name_dictionary(config)
+    dictionary = None
+    if name_dictionary is not None:
+        dictionary = load_name_dictionary(name_dictionary)
+    try:
+        rgb = name_to_rgb(name, dictionary)
+    except (TypeError, ValueError):
+        raise InputValueError("color name", "a name in the name dictionary")
+    return _to_result(Color(*rgb, name_dictionary), config, as_dict)
+
+
+def from_hexes(
+    hex_codes: Iterable[str], config: Optional[Config] = None, as_dict: bool = False
+) -> List[ColorResult]:
+    """Look up colors by hexadecimal codes in bulk.
+
+    :param hex_codes: Hex color codes without the hash (#) prefix.
+    :param config: Configuration (default: default configuration).
+    :param as_dict: Return dictionaries with keys in config.json_keys.
+    :return: List of colors or dictionaries in input order.
+    :raise colorpedia.exceptions.InputValueError: If any input is invalid.
+    """
+    return _bulk(_hex_to_rgb, hex_codes, config, as_dict)
+
+
+def from_rgbs(
+    rgbs: Iterable[Tuple[int, int, int]],
+    config: Optional[Config] = None,
+    as_dict: bool = False,
+) -> List[ColorResult]:
+    """Look up colors by RGB (Red Green Blue) values in bulk.
+
+    :param rgbs: RGB tuples (0 to 255 inclusive).
+    :param config: Configuration (default: default configuration).
+    :param as_dict: Return dictionaries with keys in config.json_keys.
+    :return: List of colors or dictionaries in input order.
+    :raise colorpedia.exceptions.InputValueError: If any input is invalid.
+    """
+    return _bulk(_validate_rgb, (tuple(rgb) for rgb in rgbs), config, as_dict)
+
+
+def from_hsls(
+    hsls: Iterable[Tuple[float, float, float]],
+    config: Optional[Config] = None,
+    as_dict: bool = False,
+) -> List[ColorResult]:
+    """Look up colors by HSL (Hue Saturation Lightness) values in bulk.
+
+    :param hsls: HSL tuples in degree angle and percent (e.g. 360, 100, 50).
+    :param config: Configuration (default: default configuration).
+    :param as_dict: Return dictionaries with keys in config.json_keys.
+    :return: List of colors or dictionaries in input order.
+    :raise colorpedia.exceptions.InputValueError: If any input is invalid.
+    """
+    return _bulk(_hsl_to_rgb, (tuple(hsl) for hsl in hsls), config, as_dict)
+
+
+def palette(
+    name: str,
+    config: Optional[Config] = None,
+    as_dict: bool = False,
+    sort: Optional[str] = None,
+) -> List[ColorResult]:
+    """Look up the colors in a palette.
+
+    :param name: Palette name.
+    :param config: Configuration (default: default configuration).
+    :param as_dict: Return dictionaries with keys in config.json_keys.
+    :param sort: One of hue, lightness, hilbert or tsp (default: palette
+        order).
+    :return: List of colors or dictionaries.
+    :raise colorpedia.exceptions.InputValueError: If input is invalid.
+    """
+    rgbs = palette_to_rgbs(validate_palette_name(name), validate_palette_ordering(sort))
+    name_dictionary = _get_name_dictionary(config)
+    return [_to_result(Color(*rgb, name_dictionary), config, as_dict) for rgb in rgbs]
+
+
+def shades(
+    color: Color,
+    count: Optional[int] = None,
+    config: Optional[Config] = None,
+    as_dict: bool = False,
+) -> List[ColorResult]:
+    """Look up different shades of a color.
+
+    :param color: Color.
+    :param count: Number of shades (default: config.default_shades_count).
+    :param config: Configuration (default: default configuration).
+    :param as_dict: Return dictionaries with keys in config.json_keys.
+    :return: List of colors or dictionaries, from darkest to lightest.
+    :raise colorpedia.exceptions.InputValueError: If input is invalid.
+    """
+    if count is None:
+        count = (config or DEFAULT_CONFIG).default_shades_count
+    count = validate_shades_count(count)
+    if config is None:
+        name_dictionary = color.name_dictionary
+    else:
+        name_dictionary = _get_name_dictionary(config)
+    h, s, l = color.hsl
+    return [
+        _to_result(Color(*rgb, name_dictionary), config, as_dict)
+        for rgb in hsl_to_rgb_shades(h, s, l, count)
+    ]
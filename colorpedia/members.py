@@ -0,0 +1,319 @@
+"""Reverse index from colors to the palettes that contain them.
+
+Every distinct color of every palette is a single CIELAB point in a grid
+index (see spatial.PointGrid), with back-pointers to the palettes that
+contain it in compressed sparse row form: the palettes of the i-th color
+are palette_ids[offsets[i]:offsets[i + 1]]. Finding the palettes near a
+color only visits the grid cells around it, no matter how many palettes
+there are.
+
+The index is built once per process and saved in a binary file in
+CACHE_DIR, which is reused until a palette changes. Changes are detected
+through a digest of the built-in palettes and the names, modification
+times and sizes of the user palette files. User palette files that fail to
+load are left out of the index, so that one bad file does not break every
+lookup.
+"""
+
+import hashlib
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from dataclasses import dataclass
+from typing import IO, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from colorpedia.config import CACHE_DIR
+from colorpedia.converters import rgb_to_lab
+from colorpedia.exceptions import PaletteFileError
+from colorpedia.palettes import PALETTES, PaletteLibrary
+from colorpedia.spatial import PointGrid
+
+MEMBER_INDEX_FILE = CACHE_DIR / "palette-members.idx"
+MEMBER_INDEX_MAGIC = b"CLRM"
+MEMBER_INDEX_VERSION = 1
+# Magic, version, palette digest, palette count, color count, member count
+# and size of the palette names.
+MEMBER_INDEX_HEADER = struct.Struct("<4sB20sIIII")
+
+# Delta E below which a palette color is reported as near a query color.
+DEFAULT_MEMBER_THRESHOLD = 5.0
+
+# Edge length of the grid cells in Delta E. Searches within the default
+# threshold only visit the 27 cells around the query.
+MEMBER_GRID_CELL_SIZE = DEFAULT_MEMBER_THRESHOLD
+
+_index: Optional["MemberIndex"] = None
+
+
+@dataclass
+class PaletteMatch:
+    """Palette with a color near a query color."""
+
+    palette: str
+    hex_code: str
+    delta_e: float
+
+
+class MemberIndex:
+    """Palette colors indexed by CIELAB coordinates.
+
+    Use MemberIndex.from_palettes to build an index.
+    """
+
+    __slots__ = (
+        "digest",
+        "palettes",
+        "codes",
+        "labs",
+        "offsets",
+        "palette_ids",
+        "_grid",
+    )
+
+    def __init__(
+        self,
+        digest: bytes,
+        palettes: List[str],
+        codes: array,
+        labs: array,
+        offsets: array,
+        palette_ids: array,
+    ) -> None:
+        self.digest = digest
+        self.palettes = palettes
+        self.codes = codes
+        self.labs = labs
+        self.offsets = offsets
+        self.palette_ids = palette_ids
+        self._grid = PointGrid(
+            MEMBER_GRID_CELL_SIZE,
+            zip(labs[0::3], labs[1::3], labs[2::3]),  # type: ignore
+        )
+
+    @classmethod
+    def from_palettes(
+        cls, palettes: Mapping[str, Sequence[str]], digest: bytes = b""
+    ) -> "MemberIndex":
+        """Build an index of palettes.
+
+        :param palettes: Hex codes (without the hash prefix) by palette name.
+        :param digest: Digest of the palettes, to tell if the index is stale.
+        :return: Member index.
+        """
+        names = list(palettes)
+        members: Dict[int, List[int]] = {}
+        for palette_id, name in enumerate(names):
+            for hex_code in palettes[name]:
+                ids = members.setdefault(int(hex_code, 16), [])
+                if not ids or ids[-1] != palette_id:
+                    ids.append(palette_id)
+
+        codes = array("I", sorted(members))
+        labs = array("d")
+        offsets = array("I", [0])
+        palette_ids = array("I")
+        for code in codes:
+            labs.extend(rgb_to_lab(code >> 16, code >> 8 & 255, code & 255))
+            palette_ids.extend(members[code])
+            offsets.append(len(palette_ids))
+        return cls(digest, names, codes, labs, offsets, palette_ids)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def find(self, rgb: Tuple[int, int, int], threshold: float) -> List[PaletteMatch]:
+        """Return the palettes with a color within a Delta E (CIE76) threshold.
+
+        :param rgb: RGB tuple.
+        :param threshold: Max Delta E (exclusive).
+        :return: Each palette with its nearest color, closest first (ties in
+            palette order).
+        """
+        matches: Dict[int, Tuple[float, int]] = {}
+        offsets, palette_ids = self.offsets, self.palette_ids
+        for index, delta_e in self._grid.iter_within(rgb_to_lab(*rgb), threshold):
+            # Codes are sorted, so ties go to the lowest code.
+            match = delta_e, index
+            for palette_id in palette_ids[offsets[index] : offsets[index + 1]]:
+                if match < matches.get(palette_id, (threshold, 0)):
+                    matches[palette_id] = match
+        return [
+            PaletteMatch(self.palettes[palette_id], f"{self.codes[index]:06X}", delta_e)
+            for palette_id, (delta_e, index) in sorted(
+                matches.items(), key=lambda item: (item[1][0], item[0])
+            )
+        ]
+
+
+def write_member_index(fp: IO[bytes], index: MemberIndex) -> None:
+    """Write a member index in the binary index format.
+
+    The file starts with a header (magic, version, palette digest, the
+    palette, color and member counts and the size of the names), followed
+    by the arrays of the index in little-endian byte order and the palette
+    names (UTF-8, one per line).
+
+    :param fp: Binary stream.
+    :param index: Member index.
+    """
+    names = "\n".join(index.palettes).encode("utf-8")
+    fp.write(
+        MEMBER_INDEX_HEADER.pack(
+            MEMBER_INDEX_MAGIC,
+            MEMBER_INDEX_VERSION,
+            index.digest,
+            len(index.palettes),
+            len(index.codes),
+            len(index.palette_ids),
+            len(names),
+        )
+    )
+    for values in (index.codes, index.offsets, index.palette_ids, index.labs):
+        if sys.byteorder == "big":  # pragma: no cover
+            values = array(values.typecode, values)
+            values.byteswap()
+        fp.write(values.tobytes())
+    fp.write(names)
+
+
+def read_member_index(
+    fp: IO[bytes], digest: Optional[bytes] = None
+) -> Optional[MemberIndex]:
+    """Read a member index written by write_member_index.
+
+    :param fp: Binary stream.
+    :param digest: Expected digest of the palettes, if any.
+    :return: Member index, or None if the index is not in the binary index
+        format or is out of date.
+    """
+    header = fp.read(MEMBER_INDEX_HEADER.size)
+    if len(header) != MEMBER_INDEX_HEADER.size:
+        return None
+    (
+        magic,
+        version,
+        index_digest,
+        palette_count,
+        count,
+        member_count,
+        names_size,
+    ) = MEMBER_INDEX_HEADER.unpack(header)
+    if magic != MEMBER_INDEX_MAGIC or version != MEMBER_INDEX_VERSION:
+        return None
+    if digest is not None and digest != index_digest:
+        return None
+
+    arrays = []
+    for typecode, length in (
+        ("I", count),
+        ("I", count + 1),
+        ("I", member_count),
+        ("d", count * 3),
+    ):
+        values = array(typecode)
+        data = fp.read(values.itemsize * length)
+        if len(data) != values.itemsize * length:
+            return None
+        values.frombytes(data)
+        if sys.byteorder == "big":  # pragma: no cover
+            values.byteswap()
+        arrays.append(values)
+    codes, offsets, palette_ids, labs = arrays
+
+    names = fp.read()
+    if len(names) != names_size:
+        return None
+    try:
+        palettes = names.decode("utf-8").split("\n") if palette_count else []
+    except UnicodeDecodeError:
+        return None
+    if len(palettes) != palette_count or (
+        member_count and max(palette_ids) >= palette_count
+    ):
+        return None
+    return MemberIndex(index_digest, palettes, codes, labs, offsets, palette_ids)
+
+
+def get_palette_digest(library: PaletteLibrary) -> bytes:
+    """Return a digest of the palettes in a palette library.
+
+    User palette files are not read, so the digest changes when a file is
+    added, removed, renamed, modified or resized.
+
+    :param library: Palette library.
+    :return: SHA-1 digest (20 bytes).
+    """
+    digest = hashlib.sha1()
+    for name, hex_codes in library.palettes.items():
+        digest.update(f"{name}:{','.join(hex_codes)}\n".encode("utf-8"))
+    digest.update(f"{library.directory}\n".encode("utf-8"))
+    for name, file_name in sorted(library.get_files().items()):
+        try:
+            stat = os.stat(library.directory / file_name)
+        except OSError:
+            stat_key = "-"
+        else:
+            stat_key = f"{stat.st_mtime_ns}:{stat.st_size}"
+        digest.update(f"{name}:{file_name}:{stat_key}\n".encode("utf-8"))
+    return digest.digest()
+
+
+def _save_member_index(index: MemberIndex) -> None:
+    try:
+        os.makedirs(MEMBER_INDEX_FILE.parent, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=MEMBER_INDEX_FILE.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fp:
+                write_member_index(fp, index)
+            os.replace(tmp_path, MEMBER_INDEX_FILE)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError:  # The index is an optimization only.
+        pass
+
+
+def _load_palettes(library: PaletteLibrary) -> Dict[str, Tuple[str, ...]]:
+    palettes = {}
+    for name in library:
+        try:
+            palettes[name] = library[name]
+        except PaletteFileError:
+            continue
+    return palettes
+
+
+def get_member_index() -> MemberIndex:
+    """Return the member index of all palettes, building it if needed.
+
+    User palette files that cannot be loaded are left out.
+
+    :return: Member index.
+    """
+    global _index
+    digest = get_palette_digest(PALETTES)
+    if _index is not None and _index.digest == digest:
+        return _index
+
+    try:
+        with open(MEMBER_INDEX_FILE, "rb") as fp:
+            index = read_member_index(fp, digest)
+    except OSError:
+        index = None
+    if index is None:
+        index = MemberIndex.from_palettes(_load_palettes(PALETTES), digest)
+        _save_member_index(index)
+    _index = index
+    return index
+
+
+def find_palettes(rgb: Tuple[int, int, int], threshold: float) -> List[PaletteMatch]:
+    """Return the palettes with a color within a Delta E (CIE76) threshold.
+
+    :param rgb: RGB tuple.
+    :param threshold: Max Delta E (exclusive).
+    :return: Each palette with its nearest color, closest first.
+    """
+    return get_member_index().find(rgb, threshold)
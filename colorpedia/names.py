@@ -0,0 +1,466 @@
+"""Color name dictionaries with indexed exact and nearest name lookups.
+
+The built-in dictionary holds the CSS3 names. Other dictionaries are data
+files in NAMES_DIR, selected with the "name_dictionary" configuration key
+(e.g. "xkcd" for "xkcd.txt"). Text files have one color per line, a name
+followed by a hex code (as in XKCD's rgb.txt), and JSON files map names to
+hex codes (as in hexcodes.NAME_TO_HEX_CODE).
+
+Each file is parsed once into a compact binary index in NAME_INDEX_DIR,
+which is reused until the file changes. The index holds the 24-bit RGB
+code of each color, the colors of each cell of a uniform grid over the RGB
+cube, and the names in a single UTF-8 blob decoded on demand. Nearest
+names are found by visiting grid cells in rings around the query color
+until no closer color can exist, so lookups only compare a few colors even
+with tens of thousands of names.
+"""
+
+import json
+import os
+import re
+import struct
+import sys
+import tempfile
+from array import array
+from pathlib import Path
+from typing import IO, Dict, Iterable, List, Optional, Tuple
+
+from colorpedia.config import CACHE_DIR, CONFIG_DIR, DEFAULT_NAME_DICTIONARY
+from colorpedia.exceptions import NameDictionaryError
+from colorpedia.hexcodes import HEX_REGEX, NAME_TO_HEX_CODE
+
+NAMES_DIR = CONFIG_DIR / "names"
+NAME_INDEX_DIR = CACHE_DIR / "names"
+NAME_FILE_EXTENSIONS = (".txt", ".json")
+
+NAME_INDEX_MAGIC = b"CLRN"
+NAME_INDEX_VERSION = 1
+# Magic, version, grid shift, color count, source file mtime and size.
+NAME_INDEX_HEADER = struct.Struct("<4sBBIqq")
+
+# Max number of nearest name results cached per dictionary.
+NEAREST_CACHE_SIZE = 65536
+
+_hex_regex = re.compile(HEX_REGEX)
+_hex_digits_regex = re.compile(r"^[0-9a-fA-F]+$")
+_dictionaries: Dict[str, "NameDictionary"] = {}
+_active_name = DEFAULT_NAME_DICTIONARY
+
+
+def _get_grid_shift(count: int) -> int:
+    # Cells are 128 to 8 values wide, for about 8 colors per cell or less.
+    shift = 7
+    while shift > 3 and count > 8 * (256 >> shift) ** 3:
+        shift -= 1
+    return shift
+
+
+class NameDictionary:
+    """Color names indexed by RGB for exact and nearest lookups.
+
+    Use NameDictionary.from_items to build a dictionary.
+
+    :param name: Dictionary name.
+    :param shift: Bit shift from RGB values to grid cell coordinates.
+    :param codes: 24-bit RGB code of each color.
+    :param cell_offsets: Offsets of each grid cell into cell_items.
+    :param cell_items: Color indices ordered by grid cell and index.
+    :param name_offsets: Offsets of the names of each color into name_blob.
+    :param name_blob: Names of all colors in UTF-8, null-separated per color.
+    """
+
+    __slots__ = (
+        "name",
+        "shift",
+        "codes",
+        "cell_offsets",
+        "cell_items",
+        "name_offsets",
+        "name_blob",
+        "_nearest",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        shift: int,
+        codes: "array[int]",
+        cell_offsets: "array[int]",
+        cell_items: "array[int]",
+        name_offsets: "array[int]",
+        name_blob: bytes,
+    ) -> None:
+        self.name = name
+        self.shift = shift
+        self.codes = codes
+        self.cell_offsets = cell_offsets
+        self.cell_items = cell_items
+        self.name_offsets = name_offsets
+        self.name_blob = name_blob
+        self._nearest: Dict[int, Tuple[int, bool]] = {}
+
+    @classmethod
+    def from_items(
+        cls, name: str, items: Iterable[Tuple[str, str]]
+    ) -> "NameDictionary":
+        """Build a dictionary from color names and hex codes.
+
+        Names of the same color are grouped, and colors are kept in order of
+        first appearance. When two colors are equally close to a query, the
+        first one wins.
+
+        :param name: Dictionary name.
+        :param items: Color names and hex codes (3 or 6 digits, without the
+            hash prefix).
+        :return: Name dictionary.
+        :raise ValueError: If a hex code is invalid.
+        """
+        code_names: Dict[int, List[str]] = {}
+        for color_name, hex_code in items:
+            if not _hex_regex.match(hex_code):
+                raise ValueError(f'Bad hex code "{hex_code}" for "{color_name}"')
+            if len(hex_code) == 3:
+                hex_code = "".join(digit * 2 for digit in hex_code)
+            code_names.setdefault(int(hex_code, 16), []).append(color_name)
+
+        codes = array("I", code_names)
+        shift = _get_grid_shift(len(codes))
+        size = 256 >> shift
+        cells: List[List[int]] = [[] for _ in range(size**3)]
+        for index, code in enumerate(codes):
+            r, g, b = code >> 16, (code >> 8) & 255, code & 255
+            cells[((r >> shift) * size + (g >> shift)) * size + (b >> shift)].append(
+                index
+            )
+        cell_offsets = array("I", [0])
+        for cell in cells:
+            cell_offsets.append(cell_offsets[-1] + len(cell))
+        cell_items = array("I", [index for cell in cells for index in cell])
+
+        name_offsets = array("I", [0])
+        blob = bytearray()
+        for names in code_names.values():
+            blob += "\0".join(names).encode("utf-8")
+            name_offsets.append(len(blob))
+        return cls(
+            name, shift, codes, cell_offsets, cell_items, name_offsets, bytes(blob)
+        )
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def get_names(self, index: int) -> Tuple[str, ...]:
+        """Return the names of a color in the dictionary.
+
+        :param index: Color index.
+        :return: Color names.
+        """
+        start, end = self.name_offsets[index], self.name_offsets[index + 1]
+        return tuple(self.name_blob[start:end].decode("utf-8").split("\0"))
+
+    def get_rgb(self, index: int) -> Tuple[int, int, int]:
+        """Return the RGB of a color in the dictionary.
+
+        :param index: Color index.
+        :return: RGB tuple.
+        """
+        code = self.codes[index]
+        return code >> 16, (code >> 8) & 255, code & 255
+
+    def find_nearest(self, r: int, g: int, b: int) -> Tuple[int, int]:
+        """Return the color nearest to an RGB in Euclidean distance.
+
+        :param r: Red (0 to 255 inclusive).
+        :param g: Green (0 to 255 inclusive).
+        :param b: Blue (0 to 255 inclusive).
+        :return: Color index and squared distance, or -1 for an empty
+            dictionary.
+        """
+        shift, codes = self.shift, self.codes
+        offsets, items = self.cell_offsets, self.cell_items
+        size = 256 >> shift
+        cr, cg, cb = r >> shift, g >> shift, b >> shift
+        best_distance, best_index = sys.maxsize, -1
+
+        ring = 0
+        while True:
+            for dr in range(-ring, ring + 1):
+                x = cr + dr
+                if not 0 <= x < size:
+                    continue
+                for dg in range(-ring, ring + 1):
+                    y = cg + dg
+                    if not 0 <= y < size:
+                        continue
+                    if dr in (-ring, ring) or dg in (-ring, ring):
+                        dbs = range(-ring, ring + 1)
+                    else:
+                        dbs = range(-ring, ring + 1, 2 * ring)
+                    for db in dbs:
+                        z = cb + db
+                        if not 0 <= z < size:
+                            continue
+                        cell = (x * size + y) * size + z
+                        for index in items[offsets[cell] : offsets[cell + 1]]:
+                            code = codes[index]
+                            distance = (
+                                ((code >> 16) - r) ** 2
+                                + (((code >> 8) & 255) - g) ** 2
+                                + ((code & 255) - b) ** 2
+                            )
+                            if distance < best_distance or (
+                                distance == best_distance and index < best_index
+                            ):
+                                best_distance, best_index = distance, index
+
+            # Colors outside the rings visited so far are at least this far.
+            bound = sys.maxsize
+            for value, cell in ((r, cr), (g, cg), (b, cb)):
+                if cell - ring > 0:
+                    bound = min(bound, value - ((cell - ring) << shift) + 1)
+                if cell + ring < size - 1:
+                    bound = min(bound, ((cell + ring + 1) << shift) - value)
+            if bound == sys.maxsize or best_distance < bound * bound:
+                return best_index, best_distance
+            ring += 1
+
+    def rgb_to_names(self, r: int, g: int, b: int) -> Tuple[Tuple[str, ...], bool]:
+        """Return the names of the color nearest to an RGB.
+
+        :param r: Red (0 to 255 inclusive).
+        :param g: Green (0 to 255 inclusive).
+        :param b: Blue (0 to 255 inclusive).
+        :return: Color name(s) and a boolean indicating exact match.
+        """
+        code = (r << 16) | (g << 8) | b
+        result = self._nearest.get(code)
+        if result is None:
+            if len(self._nearest) >= NEAREST_CACHE_SIZE:
+                self._nearest.clear()
+            index, distance = self.find_nearest(r, g, b)
+            result = self._nearest[code] = (index, distance == 0)
+        if result[0] < 0:
+            return (), False
+        return self.get_names(result[0]), result[1]
+
+
+def write_name_index(
+    fp: IO[bytes], dictionary: NameDictionary, mtime: int = 0, size: int = 0
+) -> None:
+    """Write a name dictionary in the binary index format.
+
+    The file starts with a header (magic, version, grid shift, color count
+    and the modification time and size of the source file), followed by the
+    arrays of the dictionary in little-endian byte order and the name blob.
+
+    :param fp: Binary stream.
+    :param dictionary: Name dictionary.
+    :param mtime: Modification time of the source file in nanoseconds.
+    :param size: Size of the source file in bytes.
+    """
+    fp.write(
+        NAME_INDEX_HEADER.pack(
+            NAME_INDEX_MAGIC,
+            NAME_INDEX_VERSION,
+            dictionary.shift,
+            len(dictionary),
+            mtime,
+            size,
+        )
+    )
+    for values in (
+        dictionary.codes,
+        dictionary.cell_offsets,
+        dictionary.cell_items,
+        dictionary.name_offsets,
+    ):
+        if sys.byteorder == "big":  # pragma: no cover
+            values = array(values.typecode, values)
+            values.byteswap()
+        fp.write(values.tobytes())
+    fp.write(dictionary.name_blob)
+
+
+def read_name_index(
+    fp: IO[bytes], name: str, mtime: Optional[int] = None, size: Optional[int] = None
+) -> Optional[NameDictionary]:
+    """Read a name dictionary written by write_name_index.
+
+    :param fp: Binary stream.
+    :param name: Dictionary name.
+    :param mtime: Expected modification time of the source file, if any.
+    :param size: Expected size of the source file, if any.
+    :return: Name dictionary, or None if the index is not in the binary
+        index format or is out of date.
+    """
+    header = fp.read(NAME_INDEX_HEADER.size)
+    if len(header) != NAME_INDEX_HEADER.size:
+        return None
+    magic, version, shift, count, index_mtime, index_size = NAME_INDEX_HEADER.unpack(
+        header
+    )
+    if magic != NAME_INDEX_MAGIC or version != NAME_INDEX_VERSION:
+        return None
+    if (mtime is not None and mtime != index_mtime) or (
+        size is not None and size != index_size
+    ):
+        return None
+
+    arrays = []
+    for length in (count, (256 >> shift) ** 3 + 1, count, count + 1):
+        values = array("I")
+        data = fp.read(values.itemsize * length)
+        if len(data) != values.itemsize * length:
+            return None
+        values.frombytes(data)
+        if sys.byteorder == "big":  # pragma: no cover
+            values.byteswap()
+        arrays.append(values)
+    codes, cell_offsets, cell_items, name_offsets = arrays
+    name_blob = fp.read()
+    if len(name_blob) != name_offsets[-1]:
+        return None
+    return NameDictionary(
+        name, shift, codes, cell_offsets, cell_items, name_offsets, name_blob
+    )
+
+
+def parse_name_file(path: Path) -> List[Tuple[str, str]]:
+    """Parse the color names and hex codes in a name dictionary file.
+
+    In text files, blank lines, comments (starting with "#") and header
+    lines whose last word is neither hex digits nor prefixed with "#" (e.g.
+    "License: http://..." in XKCD's rgb.txt) are skipped.
+
+    :param path: Path to a text or JSON file.
+    :return: Color names and hex codes (without the hash prefix).
+    :raise NameDictionaryError: If the file cannot be read or parsed.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as fp:
+            if path.suffix == ".json":
+                data = json.load(fp)
+                if type(data) != dict or not all(
+                    type(value) == str for value in data.values()
+                ):
+                    raise ValueError("expecting an object of hex codes")
+                return [(key, value.lstrip("#")) for key, value in data.items()]
+
+            items = []
+            for number, line in enumerate(fp, start=1):
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                parts = line.rsplit(None, 1)
+                if len(parts) != 2:
+                    raise ValueError(f"expecting a name and hex code on line {number}")
+                # Other lines are headers, but bad hex codes are still errors.
+                if parts[1].startswith("#") or _hex_digits_regex.match(parts[1]):
+                    items.append((parts[0], parts[1].lstrip("#")))
+            return items
+    except (OSError, ValueError) as err:
+        raise NameDictionaryError(f"Cannot load {path}", err)
+
+
+def get_name_file_paths() -> Dict[str, Path]:
+    """Return the paths of the name dictionary files by dictionary name.
+
+    :return: Paths to files in NAMES_DIR, by file name without extension.
+    """
+    try:
+        entries = sorted(os.scandir(NAMES_DIR), key=lambda entry: entry.name)
+    except OSError:
+        return {}
+    paths: Dict[str, Path] = {}
+    for entry in entries:
+        path = Path(entry.path)
+        if path.suffix in NAME_FILE_EXTENSIONS and entry.is_file():
+            paths.setdefault(path.stem, path)
+    return paths
+
+
+def list_name_dictionaries() -> List[str]:
+    """Return the names of all available name dictionaries.
+
+    :return: Dictionary names, built-in dictionary first.
+    """
+    names = [DEFAULT_NAME_DICTIONARY]
+    names.extend(name for name in get_name_file_paths() if name not in names)
+    return names
+
+
+def _load_name_file(name: str, path: Path) -> NameDictionary:
+    try:
+        stat = os.stat(path)
+    except OSError as err:
+        raise NameDictionaryError(f"Cannot load {path}", err)
+
+    index_path = NAME_INDEX_DIR / f"{name}.idx"
+    try:
+        with open(index_path, "rb") as fp:
+            dictionary = read_name_index(fp, name, stat.st_mtime_ns, stat.st_size)
+        if dictionary is not None:
+            return dictionary
+    except OSError:
+        pass
+
+    try:
+        dictionary = NameDictionary.from_items(name, parse_name_file(path))
+    except ValueError as err:
+        raise NameDictionaryError(f"Cannot load {path}", err)
+    try:
+        os.makedirs(NAME_INDEX_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=NAME_INDEX_DIR, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fp:
+                write_name_index(fp, dictionary, stat.st_mtime_ns, stat.st_size)
+            os.replace(tmp_path, index_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError:  # The index is an optimization only.
+        pass
+    return dictionary
+
+
+def load_name_dictionary(name: str) -> NameDictionary:
+    """Load a name dictionary.
+
+    Dictionaries are loaded once per process.
+
+    :param name: Dictionary name.
+    :return: Name dictionary.
+    :raise ValueError: If the dictionary does not exist.
+    :raise NameDictionaryError: If the dictionary file cannot be loaded.
+    """
+    dictionary = _dictionaries.get(name)
+    if dictionary is None:
+        if name == DEFAULT_NAME_DICTIONARY:
+            dictionary = NameDictionary.from_items(name, NAME_TO_HEX_CODE.items())
+        else:
+            path = get_name_file_paths().get(name)
+            if path is None:
+                raise ValueError(f'Unknown name dictionary "{name}"')
+            dictionary = _load_name_file(name, path)
+        _dictionaries[name] = dictionary
+    return dictionary
+
+
+def get_name_dictionary() -> NameDictionary:
+    """Return the name dictionary used for color names.
+
+    :return: Name dictionary.
+    """
+    return load_name_dictionary(_active_name)
+
+
+def set_name_dictionary(name: str) -> None:
+    """Set the name dictionary used for color names.
+
+    :param name: Dictionary name.
+    :raise ValueError: If the dictionary does not exist.
+    :raise NameDictionaryError: If the dictionary file cannot be loaded.
+    """
+    global _active_name
+    load_name_dictionary(name)
+    _active_name = name
@@ -0,0 +1,174 @@
+"""Perceptual orderings of palette colors.
+
+- hue: grays (CIELAB chroma below GRAY_CHROMA) from dark to light, then
+  the other colors by CIELAB hue angle starting at red.
+- lightness: CIELAB lightness, dark to light.
+- hilbert: position along a Hilbert curve through the RGB cube, so colors
+  close on the curve are close in RGB. Keys are computed with integer bit
+  operations (Skilling's transposed Hilbert index).
+- tsp: a short path through the colors in CIELAB, from the darkest color.
+  The path is built by nearest-neighbor search and improved with 2-opt
+  moves (reversing a section of the path if that shortens it).
+
+Orders are cached per palette (by its hex codes), so a palette is only
+ordered once per process.
+"""
+
+from functools import lru_cache
+from math import atan2, pi
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from colorpedia.converters import hex_to_rgb, rgb_to_lab
+
+PALETTE_ORDERINGS = ("hue", "lightness", "hilbert", "tsp")
+
+# CIELAB chroma below which colors are sorted as grays by hue ordering.
+GRAY_CHROMA = 5.0
+
+# Max number of 2-opt passes over the path of a TSP ordering.
+MAX_TWO_OPT_PASSES = 32
+
+
+def get_hilbert_key(r: int, g: int, b: int, bits: int = 8) -> int:
+    """Return the position of a color along a Hilbert curve in the RGB cube.
+
+    :param r: Red (0 to 2 ** bits - 1 inclusive).
+    :param g: Green (0 to 2 ** bits - 1 inclusive).
+    :param b: Blue (0 to 2 ** bits - 1 inclusive).
+    :param bits: Number of bits per channel.
+    :return: Hilbert index (0 to 2 ** (3 * bits) - 1 inclusive).
+    """
+    x = [r, g, b]
+    top = 1 << (bits - 1)
+
+    # Undo excess work: rotate and reflect each level of the curve.
+    q = top
+    while q > 1:
+        p = q - 1
+        for i in range(3):
+            if x[i] & q:
+                x[0] ^= p
+            else:
+                t = (x[0] ^ x[i]) & p
+                x[0] ^= t
+                x[i] ^= t
+        q >>= 1
+
+    # Gray encode.
+    x[1] ^= x[0]
+    x[2] ^= x[1]
+    t = 0
+    q = top
+    while q > 1:
+        if x[2] & q:
+            t ^= q - 1
+        q >>= 1
+    x[0] ^= t
+    x[1] ^= t
+    x[2] ^= t
+
+    # Interleave the bits of the transposed index, most significant first.
+    key = 0
+    for bit in range(bits - 1, -1, -1):
+        for value in x:
+            key = key << 1 | value >> bit & 1
+    return key
+
+
+def get_hue_key(r: int, g: int, b: int) -> Tuple[int, float, float]:
+    """Return the sort key of a color for hue ordering.
+
+    :param r: Red (0 to 255 inclusive).
+    :param g: Green (0 to 255 inclusive).
+    :param b: Blue (0 to 255 inclusive).
+    :return: Sort key (grays first, then hue angle and lightness).
+    """
+    lightness, a, b_ = rgb_to_lab(r, g, b)
+    if (a * a + b_ * b_) ** 0.5 < GRAY_CHROMA:
+        return 0, 0.0, lightness
+    return 1, atan2(b_, a) % (2 * pi), lightness
+
+
+def get_lightness_key(r: int, g: int, b: int) -> float:
+    """Return the sort key of a color for lightness ordering.
+
+    :param r: Red (0 to 255 inclusive).
+    :param g: Green (0 to 255 inclusive).
+    :param b: Blue (0 to 255 inclusive).
+    :return: CIELAB lightness.
+    """
+    return rgb_to_lab(r, g, b)[0]
+
+
+def get_tsp_order(labs: Sequence[Tuple[float, float, float]]) -> List[int]:
+    """Return a short path through colors (approximate traveling salesman).
+
+    :param labs: CIELAB colors.
+    :return: Color indices in path order, starting at the darkest color.
+    """
+    size = len(labs)
+    if size < 3:
+        return sorted(range(size), key=lambda i: labs[i][0])
+    distances = [
+        [
+            ((l1 - l2) ** 2 + (a1 - a2) ** 2 + (b1 - b2) ** 2) ** 0.5
+            for l2, a2, b2 in labs
+        ]
+        for l1, a1, b1 in labs
+    ]
+
+    # Nearest-neighbor path from the darkest color.
+    path = [min(range(size), key=lambda i: labs[i][0])]
+    remaining = set(range(size))
+    remaining.remove(path[0])
+    while remaining:
+        row = distances[path[-1]]
+        nearest = min(remaining, key=lambda i: (row[i], i))
+        remaining.remove(nearest)
+        path.append(nearest)
+
+    # 2-opt: reverse path[i:j + 1] if that shortens the path. The first
+    # color stays in place, and the last edge may be removed.
+    for _ in range(MAX_TWO_OPT_PASSES):
+        improved = False
+        for i in range(1, size - 1):
+            before = distances[path[i - 1]]
+            for j in range(i + 1, size):
+                first, last = path[i], path[j]
+                delta = before[last] - before[first]
+                if j + 1 < size:
+                    after = path[j + 1]
+                    delta += distances[first][after] - distances[last][after]
+                if delta < -1e-9:
+                    path[i : j + 1] = path[j : i - 1 : -1]
+                    improved = True
+        if not improved:
+            break
+    return path
+
+
+_key_functions: Dict[str, Callable[[int, int, int], object]] = {
+    "hue": get_hue_key,
+    "lightness": get_lightness_key,
+    "hilbert": get_hilbert_key,
+}
+
+
+@lru_cache(maxsize=1024)
+def get_palette_order(hex_codes: Tuple[str, ...], ordering: str) -> Tuple[int, ...]:
+    """Return the order of palette colors.
+
+    :param hex_codes: Hex codes (without the hash prefix) of the palette.
+    :param ordering: One of hue, lightness, hilbert or tsp.
+    :return: Color indices in order (ties in palette order).
+    :raise ValueError: If the ordering is unknown.
+    """
+    rgbs = [hex_to_rgb(hex_code) for hex_code in hex_codes]
+    if ordering == "tsp":
+        return tuple(get_tsp_order([rgb_to_lab(*rgb) for rgb in rgbs]))
+    try:
+        key_function = _key_functions[ordering]
+    except KeyError:
+        raise ValueError(f'Unknown palette ordering "{ordering}"')
+    keys = [key_function(*rgb) for rgb in rgbs]
+    return tuple(sorted(range(len(rgbs)), key=keys.__getitem__))  # type: ignore
@@ -1,8 +1,20 @@
-from typing import Dict, Tuple
+import os
+from json import dump as json_dump
+from json import load as json_load
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
 
+from colorpedia.config import CACHE_DIR, CONFIG_DIR
+from colorpedia.converters import hex_to_rgb
+from colorpedia.exceptions import PaletteFileError
 from colorpedia.hexcodes import HEX_CODE_TO_NAMES
+from colorpedia.ordering import get_palette_order
+from colorpedia.swatches import PALETTE_FILE_EXTENSIONS, read_palette_file
 
-PALETTES: Dict[str, Tuple[str, ...]] = {
+PALETTES_DIR = CONFIG_DIR / "palettes"
+PALETTE_INDEX_FILE = CACHE_DIR / "palette-index.json"
+
+BUILTIN_PALETTES: Dict[str, Tuple[str, ...]] = {
     "red": (
         "FFA07A",
         "FA8072",
@@ -308,5 +320,152 @@ PALETTES: Dict[str, Tuple[str, ...]] = {
     ),
     "zenburn": ("3F3F3F", "8FAF9F", "DCA3A3", "F0DFAF", "EFEFEF"),
 }
-PALETTES["aqua"] = PALETTES["cyan"]
-PALETTES["css3"] = tuple(HEX_CODE_TO_NAMES.keys())
+BUILTIN_PALETTES["aqua"] = BUILTIN_PALETTES["cyan"]
+BUILTIN_PALETTES["css3"] = tuple(HEX_CODE_TO_NAMES.keys())
+
+
+class PaletteLibrary(Mapping[str, Tuple[str, ...]]):
+    """Built-in palettes and user palettes loaded lazily from a directory.
+
+    User palettes are JSON or GIMP (.gpl) palette files in the directory,
+    named after the file without extension in lowercase. They take
+    precedence over built-in palettes of the same name.
+
+    The palette names and file names are kept in a manifest file, which is
+    only rebuilt when the modification time of the directory changes (i.e.
+    when files are added, removed or renamed), so the directory is not
+    scanned on every run. Files are parsed only when their palettes are
+    requested, and parsed again only when they change.
+
+    :param palettes: Built-in palettes.
+    :param directory: Directory of user palette files.
+    :param index_file: Manifest file.
+    """
+
+    def __init__(
+        self, palettes: Dict[str, Tuple[str, ...]], directory: Path, index_file: Path
+    ) -> None:
+        self.palettes = palettes
+        self.directory = directory
+        self.index_file = index_file
+        self._manifest: Dict[str, Any] = {}
+        self._loaded: Dict[str, Tuple[str, int, int, Tuple[str, ...]]] = {}
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        try:
+            with open(self.index_file, "r") as fp:
+                manifest = json_load(fp)
+        except (OSError, ValueError):
+            return {}
+        if not (isinstance(manifest, dict) and isinstance(manifest.get("files"), dict)):
+            return {}
+        return manifest
+
+    def _save_manifest(self, manifest: Dict[str, Any]) -> None:
+        tmp_file = self.index_file.with_name(
+            f"{self.index_file.name}.{os.getpid()}.tmp"
+        )
+        try:
+            self.index_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_file, "w") as fp:
+                json_dump(manifest, fp)
+            os.replace(tmp_file, self.index_file)
+        except OSError:  # The manifest is an optimization only.
+            pass
+
+    def _scan_files(self) -> Dict[str, str]:
+        files: Dict[str, str] = {}
+        try:
+            entries = sorted(os.scandir(self.directory), key=lambda e: e.name)
+        except OSError:
+            return files
+        for entry in entries:
+            stem, extension = os.path.splitext(entry.name)
+            if extension.lower() in PALETTE_FILE_EXTENSIONS and entry.is_file():
+                files.setdefault(stem.lower(), entry.name)
+        return files
+
+    def get_files(self) -> Dict[str, str]:
+        """Return the file names of the user palettes.
+
+        :return: File names in the directory, by palette name.
+        """
+        try:
+            mtime = os.stat(self.directory).st_mtime_ns
+        except OSError:
+            return {}
+
+        key = {"directory": str(self.directory), "mtime": mtime}
+        manifest = self._manifest
+        if {k: manifest.get(k) for k in key} != key:
+            manifest = self._load_manifest()
+            if {k: manifest.get(k) for k in key} != key:
+                manifest = dict(key, files=self._scan_files())
+                self._save_manifest(manifest)
+            self._manifest = manifest
+        files: Dict[str, str] = manifest["files"]
+        return files
+
+    def get_path(self, name: str) -> Path:
+        """Return the path to the file of a user palette.
+
+        :param name: Palette name.
+        :return: Path to the palette file.
+        :raise KeyError: If there is no user palette with the name.
+        """
+        return self.directory / self.get_files()[name]
+
+    def __getitem__(self, name: str) -> Tuple[str, ...]:
+        file_name = self.get_files().get(name)
+        if file_name is None:
+            return self.palettes[name]
+
+        path = self.directory / file_name
+        try:
+            stat = os.stat(path)
+        except OSError as err:
+            raise PaletteFileError(f"Cannot load {path}", err)
+        loaded = self._loaded.get(name)
+        if loaded is None or loaded[:3] != (file_name, stat.st_mtime_ns, stat.st_size):
+            loaded = (
+                file_name,
+                stat.st_mtime_ns,
+                stat.st_size,
+                read_palette_file(path),
+            )
+            self._loaded[name] = loaded
+        return loaded[3]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.palettes or name in self.get_files()
+
+    def __iter__(self) -> Iterator[str]:
+        files = self.get_files()
+        yield from self.palettes
+        yield from (name for name in sorted(files) if name not in self.palettes)
+
+    def __len__(self) -> int:
+        return len(self.palettes.keys() | self.get_files().keys())
+
+
+PALETTES = PaletteLibrary(BUILTIN_PALETTES, PALETTES_DIR, PALETTE_INDEX_FILE)
+
+
+def palette_to_rgbs(
+    palette: str, ordering: Optional[str] = None
+) -> List[Tuple[int, int, int]]:
+    """Return the colors in the given palette.
+
+    :param palette: Palette name.
+    :param ordering: One of hue, lightness, hilbert or tsp (default: the
+        order of the palette declaration or file).
+    :return: List of RGB tuples.
+    :raise ValueError: If the palette or ordering is unknown.
+    """
+    try:
+        hex_codes = PALETTES[palette]
+    except KeyError:
+        raise ValueError(f'Unknown color palette "{palette}"')
+    if ordering is not None:
+        hex_codes = tuple(hex_codes[i] for i in get_palette_order(hex_codes, ordering))
+    return [hex_to_rgb(hex_code) for hex_code in hex_codes]
@@ -0,0 +1,173 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from colorpedia.converters import hex_to_rgb, hsl_to_rgb
+from colorpedia.exceptions import InputValueError
+from colorpedia.hexcodes import NAME_TO_HEX_CODE
+from colorpedia.inputs import HEX_PATTERN, normalize_hex_code
+
+RGBA = Tuple[int, int, int, float]
+
+HEX_DIGITS = frozenset("0123456789abcdef")
+ANGLE_UNITS = {"": 1.0, "deg": 1.0, "grad": 0.9, "rad": 57.29577951308232, "turn": 360}
+TRANSPARENT: RGBA = (0, 0, 0, 0.0)
+
+
+def _error(value: str) -> InputValueError:
+    return InputValueError(
+        f'CSS color "{value}"',
+        "a hex code, rgb(), rgba(), hsl(), hsla() or named color",
+    )
+
+
+def _clamp(value: float, upper: float) -> float:
+    return 0.0 if value < 0 else upper if value > upper else value
+
+
+def _split_unit(token: str) -> Tuple[float, str]:
+    end = len(token)
+    if token.endswith("%"):
+        end -= 1
+    else:
+        while end > 0 and token[end - 1].isalpha():
+            end -= 1
+    return float(token[:end]), token[end:]
+
+
+def _tokenize_args(args: str) -> Tuple[List[Tuple[float, str]], Optional[str]]:
+    """Split function arguments into (number, unit) tokens and an alpha token.
+
+    Both the legacy comma syntax "rgba(1, 2, 3, 0.5)" and the Level 4 space
+    syntax "rgb(1 2 3 / 50%)" are accepted.
+    """
+    main, slash, alpha = args.partition("/")
+    tokens = main.replace(",", " ").split()
+    if slash:
+        alpha = alpha.strip()
+        if not alpha or " " in alpha or "," in main:
+            raise ValueError(args)
+        return [_split_unit(token) for token in tokens], alpha
+    if len(tokens) == 4:
+        return [_split_unit(token) for token in tokens[:3]], tokens[3]
+    return [_split_unit(token) for token in tokens], None
+
+
+def _parse_alpha(token: Optional[str]) -> float:
+    if token is None:
+        return 1.0
+    value, unit = _split_unit(token)
+    if unit == "%":
+        value /= 100
+    elif unit:
+        raise ValueError(token)
+    return _clamp(value, 1.0)
+
+
+def _parse_hex(digits: str) -> RGBA:
+    size = len(digits)
+    if size not in (3, 4, 6, 8) or not HEX_DIGITS.issuperset(digits):
+        raise ValueError(digits)
+    if size < 6:
+        digits = "".join(c * 2 for c in digits)
+    alpha = int(digits[6:8], 16) / 255 if len(digits) == 8 else 1.0
+    return int(digits[:2], 16), int(digits[2:4], 16), int(digits[4:6], 16), alpha
+
+
+def _parse_rgb(args: str) -> RGBA:
+    tokens, alpha = _tokenize_args(args)
+    if len(tokens) != 3:
+        raise ValueError(args)
+    rgb = []
+    for value, unit in tokens:
+        if unit == "%":
+            value = value * 255 / 100
+        elif unit:
+            raise ValueError(args)
+        rgb.append(round(_clamp(value, 255)))
+    return rgb[0], rgb[1], rgb[2], _parse_alpha(alpha)
+
+
+def _parse_hsl(args: str) -> RGBA:
+    tokens, alpha = _tokenize_args(args)
+    if len(tokens) != 3:
+        raise ValueError(args)
+    (h, h_unit), (s, s_unit), (l, l_unit) = tokens
+    if s_unit not in ("", "%") or l_unit not in ("", "%"):
+        raise ValueError(args)
+    h = h * ANGLE_UNITS[h_unit] % 360
+    s = _clamp(s, 100)
+    l = _clamp(l, 100)
+    r, g, b = hsl_to_rgb(h / 360, s / 100, l / 100)
+    return r, g, b, _parse_alpha(alpha)
+
+
+def parse_css_color(value: str) -> RGBA:
+    """Parse a CSS Color Level 4 value to RGBA (Red Green Blue Alpha).
+
+    Supported forms are #rgb, #rgba, #rrggbb, #rrggbbaa, rgb(), rgba(),
+    hsl(), hsla(), CSS3 color names and "transparent".
+
+    :param value: CSS color value (e.g. "#FFF", "rgb(0 0 0 / 50%)").
+    :return: RGBA tuple with alpha between 0.0 and 1.0 inclusive.
+    :raise colorpedia.exceptions.InputValueError: If the value is invalid.
+    """
+    try:
+        text = value.strip().lower()
+        if text.startswith("#"):
+            return _parse_hex(text[1:])
+
+        paren = text.find("(")
+        if paren == -1:
+            if text == "transparent":
+                return TRANSPARENT
+            r, g, b, _ = _parse_hex(NAME_TO_HEX_CODE[text].lower())
+            return r, g, b, 1.0
+
+        if not text.endswith(")"):
+            raise ValueError(text)
+        function = text[:paren].rstrip()
+        args = text[paren + 1 : -1]
+        if function in ("rgb", "rgba"):
+            return _parse_rgb(args)
+        if function in ("hsl", "hsla"):
+            return _parse_hsl(args)
+        raise ValueError(text)
+
+    except (AttributeError, IndexError, KeyError, ValueError):
+        raise _error(value)
+
+
+def parse_color_argument(value: str) -> Tuple[int, int, int]:
+    """Parse a color given on the command line to RGB (Red Green Blue).
+
+    Hex codes may be given without the hash (#) prefix. Any other value is
+    parsed as a CSS color, ignoring the alpha channel.
+
+    :param value: Hex code or CSS color value (e.g. "FFF", "red").
+    :return: RGB tuple.
+    :raise colorpedia.exceptions.InputValueError: If the value is invalid.
+    """
+    if isinstance(value, str) and HEX_PATTERN.match(value):
+        return hex_to_rgb(normalize_hex_code(value))
+    r, g, b, _ = parse_css_color(value)
+    return r, g, b
+
+
+def parse_css_colors(values: Iterable[str]) -> List[RGBA]:
+    """Parse CSS Color Level 4 values in bulk.
+
+    Values repeat often in real stylesheets, so each distinct value is
+    parsed only once per call.
+
+    :param values: CSS color values.
+    :return: List of RGBA tuples in the same order as the values.
+    :raise colorpedia.exceptions.InputValueError: If any value is invalid.
+    """
+    cache: Dict[str, RGBA] = {}
+    result = []
+    for value in values:
+        try:
+            rgba = cache[value]
+        except KeyError:
+            rgba = cache[value] = parse_css_color(value)
+        result.append(rgba)
+    return result
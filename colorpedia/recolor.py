@@ -0,0 +1,298 @@
+import os
+import re
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from colorpedia.config import MIN_POOL_FILE_COUNT
+from colorpedia.converters import rgb_to_hex, rgb_to_hsl
+from colorpedia.exceptions import InputValueError
+from colorpedia.hexcodes import HEX_CODE_TO_NAMES
+from colorpedia.inputs import validate_palette_name
+from colorpedia.palettes import palette_to_rgbs
+from colorpedia.parsers import ANGLE_UNITS, parse_css_color
+from colorpedia.scanner import (
+    SOURCE_REGEX,
+    STYLESHEET_EXTENSIONS,
+    STYLESHEET_REGEX,
+    is_scannable,
+    iter_scannable_files,
+)
+
+SOURCE_TEXT_PATTERN = re.compile(SOURCE_REGEX)
+STYLESHEET_TEXT_PATTERN = re.compile(STYLESHEET_REGEX)
+
+
+# Numeric function arguments with their unit (e.g. "50%", "120deg").
+ARGUMENT_PATTERN = re.compile(r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?(%|[a-zA-Z]*)")
+
+
+def _format_number(value: float, digits: int = 1) -> str:
+    return f"{round(value, digits):g}"
+
+
+def _format_hue(degrees: float, unit: str) -> str:
+    # Radians and turns are large units, so they keep more decimal places.
+    digits = 3 if unit.lower() in ("rad", "turn") else 1
+    return _format_number(degrees / ANGLE_UNITS[unit.lower()], digits) + unit
+
+
+def format_hex_literal(literal: str, rgb: Tuple[int, int, int]) -> str:
+    """Format RGB as a hex literal in the style of the original literal.
+
+    :param literal: Original hex literal with the hash (#) prefix.
+    :param rgb: RGB tuple.
+    :return: Hex literal with the same case, length and alpha.
+    """
+    digits = literal[1:]
+    alpha = ""
+    if len(digits) in (4, 8):
+        alpha = digits[-len(digits) // 4 :]
+        digits = digits[: -len(alpha)]
+
+    hex_code = rgb_to_hex(*rgb)
+    if len(digits) == 3 and all(hex_code[i] == hex_code[i + 1] for i in (0, 2, 4)):
+        hex_code = hex_code[::2]
+    elif len(alpha) == 1:
+        alpha *= 2
+
+    hex_code += alpha
+    if any(c.islower() for c in digits):
+        hex_code = hex_code.lower()
+    return f"#{hex_code}"
+
+
+def format_function_literal(literal: str, rgb: Tuple[int, int, int]) -> str:
+    """Format RGB as an rgb() or hsl() literal in the style of the original.
+
+    Only the numbers of the color channels are replaced. The unit of each
+    channel (e.g. "%" or "deg"), separators, spacing and alpha are kept as
+    they are in the original literal.
+
+    :param literal: Original rgb(), rgba(), hsl() or hsla() literal.
+    :param rgb: RGB tuple.
+    :return: Literal with the same function name, units, separators and alpha.
+    """
+    start = literal.index("(") + 1
+    matches = list(islice(ARGUMENT_PATTERN.finditer(literal, start), 3))
+
+    if literal[: start - 1].lower().startswith("rgb"):
+        args = [
+            f"{_format_number(v / 2.55)}%" if match.group(1) == "%" else str(v)
+            for v, match in zip(rgb, matches)
+        ]
+    else:
+        h, s, l = rgb_to_hsl(*rgb)
+        args = [_format_hue(h * 360, matches[0].group(1))]
+        for value, match in zip((s, l), matches[1:]):
+            args.append(_format_number(value * 100) + match.group(1))
+
+    parts, end = [], 0
+    for arg, match in zip(args, matches):
+        parts.append(literal[end : match.start()])
+        parts.append(arg)
+        end = match.end()
+    parts.append(literal[end:])
+    return "".join(parts)
+
+
+def format_name_literal(literal: str, rgb: Tuple[int, int, int]) -> str:
+    """Format RGB as a CSS3 color name, or a hex code if there is no name.
+
+    :param literal: Original color name.
+    :param rgb: RGB tuple.
+    :return: Color name or hex literal.
+    """
+    hex_code = rgb_to_hex(*rgb)
+    try:
+        name = HEX_CODE_TO_NAMES[hex_code][0]
+    except KeyError:
+        return f"#{hex_code}" if literal.isupper() else f"#{hex_code.lower()}"
+    return name.upper() if literal.isupper() else name
+
+
+@lru_cache(maxsize=None)
+def get_palette_rgbs(palette: str) -> Tuple[Tuple[int, int, int], ...]:
+    return tuple(palette_to_rgbs(palette))
+
+
+@lru_cache(maxsize=None)
+def get_nearest_palette_rgb(
+    palette: str, r: int, g: int, b: int
+) -> Tuple[int, int, int]:
+    """Return the palette member with the minimum RGB delta.
+
+    :param palette: Palette name.
+    :param r: Red (0 to 255 inclusive).
+    :param g: Green (0 to 255 inclusive).
+    :param b: Blue (0 to 255 inclusive).
+    :return: RGB tuple.
+    """
+    return min(
+        get_palette_rgbs(palette),
+        key=lambda rgb: (rgb[0] - r) ** 2 + (rgb[1] - g) ** 2 + (rgb[2] - b) ** 2,
+    )
+
+
+@lru_cache(maxsize=65536)
+def recolor_literal(literal: str, palette: str) -> str:
+    """Replace a color literal with its nearest palette member.
+
+    Literals repeat heavily across large code bases, so results are cached
+    for the lifetime of the process.
+
+    :param literal: Hex, rgb(), rgba(), hsl(), hsla() or named color literal.
+    :param palette: Palette name.
+    :return: Literal in the same syntax, or the original literal if it cannot
+        be parsed.
+    """
+    try:
+        r, g, b, _ = parse_css_color(literal)
+    except InputValueError:
+        return literal
+
+    rgb = get_nearest_palette_rgb(palette, r, g, b)
+    if literal.startswith("#"):
+        return format_hex_literal(literal, rgb)
+    if literal.endswith(")"):
+        return format_function_literal(literal, rgb)
+    if literal.lower() == "transparent":
+        return literal
+    return format_name_literal(literal, rgb)
+
+
+def _recolor_stylesheet_line(
+    line: str, in_comment: bool, replace: Callable[["re.Match[str]"], str]
+) -> Tuple[str, bool]:
+    # Color names in comments are usually prose (e.g. "red border"), so only
+    # hex and function literals are replaced there. Comments may span lines.
+    parts = []
+    start = close_start = 0
+    while start < len(line):
+        if in_comment:
+            end = line.find("*/", close_start)
+            if end == -1:
+                end = len(line)
+            else:
+                end += 2
+                in_comment = False
+            parts.append(SOURCE_TEXT_PATTERN.sub(replace, line[start:end]))
+        else:
+            end = line.find("/*", start)
+            if end == -1:
+                end = len(line)
+            else:
+                in_comment = True
+                close_start = end + 2
+            parts.append(STYLESHEET_TEXT_PATTERN.sub(replace, line[start:end]))
+        start = end
+    return "".join(parts), in_comment
+
+
+def recolor_file(path: str, palette: str, dry_run: bool = False) -> int:
+    """Rewrite the color literals in a file to their nearest palette members.
+
+    The file is streamed line by line into a temporary file, which atomically
+    replaces the original only if any literal changed. Color names in
+    stylesheet comments are left as they are.
+
+    :param path: File path.
+    :param palette: Palette name.
+    :param dry_run: Count the literals to change without writing the file.
+    :return: Number of literals changed.
+    """
+    stylesheet = os.path.splitext(path)[1].lower() in STYLESHEET_EXTENSIONS
+    count = 0
+
+    def replace(match: "re.Match[str]") -> str:
+        nonlocal count
+        literal = match.group()
+        new_literal = recolor_literal(literal, palette)
+        if new_literal != literal:
+            count += 1
+        return new_literal
+
+    directory = os.path.dirname(os.path.abspath(path))
+    with open(path, "r", encoding="utf-8", errors="surrogateescape", newline="") as src:
+        with tempfile.NamedTemporaryFile(
+            "w",
+            encoding="utf-8",
+            errors="surrogateescape",
+            newline="",
+            dir=directory,
+            prefix=".colorpedia-",
+            delete=False,
+        ) as dst:
+            try:
+                if stylesheet:
+                    in_comment = False
+                    for line in src:
+                        text, in_comment = _recolor_stylesheet_line(
+                            line, in_comment, replace
+                        )
+                        dst.write(text)
+                else:
+                    for line in src:
+                        dst.write(SOURCE_TEXT_PATTERN.sub(replace, line))
+            except BaseException:
+                dst.close()
+                os.unlink(dst.name)
+                raise
+
+    if count == 0 or dry_run:
+        os.unlink(dst.name)
+    else:
+        shutil.copymode(path, dst.name)
+        os.replace(dst.name, path)
+    return count
+
+
+def _recolor_file_safely(args: Tuple[str, str, bool]) -> Optional[int]:
+    try:
+        return recolor_file(*args)
+    except (OSError, UnicodeError):
+        return None
+
+
+def iter_recolor_paths(paths: Iterable[str]) -> Iterable[str]:
+    for path in paths:
+        if os.path.isdir(path):
+            yield from iter_scannable_files(path)
+        elif os.path.isfile(path) and is_scannable(path):
+            yield path
+        elif not os.path.exists(path):
+            raise InputValueError(f'path "{path}"', "an existing file or directory")
+
+
+def recolor_files(
+    paths: Iterable[str],
+    palette: str,
+    dry_run: bool = False,
+    workers: Optional[int] = None,
+) -> List[Tuple[str, Optional[int]]]:
+    """Rewrite the color literals in files to their nearest palette members.
+
+    Directories are expanded to the files "color scan" would read. Files are
+    processed in parallel.
+
+    :param paths: File and directory paths.
+    :param palette: Palette name.
+    :param dry_run: Count the literals to change without writing the files.
+    :param workers: Max number of worker processes (default: CPU count).
+    :return: List of (path, number of literals changed) tuples. The number is
+        None if the file could not be rewritten.
+    """
+    validate_palette_name(palette)
+    files = list(dict.fromkeys(iter_recolor_paths(paths)))
+    jobs = [(path, palette, dry_run) for path in files]
+
+    if len(jobs) < MIN_POOL_FILE_COUNT or workers == 1:
+        results = list(map(_recolor_file_safely, jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_recolor_file_safely, jobs, chunksize=8))
+
+    return list(zip(files, results))
@@ -0,0 +1,275 @@
+import hashlib
+import mmap
+import os
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from json import dump as json_dump
+from json import load as json_load
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from colorpedia.cache import get_cache_key, load_cached_result, save_cached_result
+from colorpedia.config import CACHE_DIR, MIN_POOL_FILE_COUNT
+from colorpedia.converters import rgb_to_hex, rgb_to_names
+from colorpedia.exceptions import InputValueError
+from colorpedia.hexcodes import NAME_TO_HEX_CODE
+from colorpedia.parsers import parse_css_color
+
+SCAN_INDEX_FILE = CACHE_DIR / "scan-index.json"
+
+SOURCE_EXTENSIONS = frozenset(
+    (".html", ".js", ".json", ".jsx", ".py", ".svg", ".ts", ".tsx", ".vue", ".xml")
+)
+STYLESHEET_EXTENSIONS = frozenset((".css", ".less", ".sass", ".scss"))
+EXCLUDED_DIRECTORIES = frozenset(("node_modules", "site-packages", "venv"))
+
+# Regular expressions for color literals. They are shared by the scanner
+# (compiled to bytes patterns) and text rewriters (compiled to str patterns).
+HEX_LITERAL = r"(?<![&\w])#(?:[0-9a-fA-F]{8}|[0-9a-fA-F]{6}|[0-9a-fA-F]{3,4})(?![\w-])"
+# Function arguments are ASCII other than parentheses and newlines, so that
+# bytes matches always decode (e.g. "rgb(é)" in a comment is not a literal).
+FUNCTION_LITERAL = (
+    r"(?<![\w-])(?:[rR][gG][bB][aA]?|[hH][sS][lL][aA]?)\([\t\x20-\x27\x2a-\x7e]*\)"
+)
+NAME_LITERAL = r"(?<=[:\s,(])(?i:{})(?![\w-])".format(
+    "|".join(sorted(list(NAME_TO_HEX_CODE) + ["transparent"], key=len, reverse=True))
+)
+SOURCE_REGEX = f"{HEX_LITERAL}|{FUNCTION_LITERAL}"
+STYLESHEET_REGEX = f"{HEX_LITERAL}|{FUNCTION_LITERAL}|{NAME_LITERAL}"
+
+SOURCE_PATTERN = re.compile(SOURCE_REGEX.encode("ascii"))
+STYLESHEET_PATTERN = re.compile(STYLESHEET_REGEX.encode("ascii"))
+
+# Hits are stored in the scan index as (line, column, literal, hex code).
+RawHit = Tuple[int, int, str, str]
+
+
+@dataclass
+class ScanHit:
+    path: str
+    line: int
+    column: int
+    literal: str
+    hex: str
+    name: str
+    is_name_exact: bool
+
+    def get_dict(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "line": self.line,
+            "column": self.column,
+            "literal": self.literal,
+            "hex": self.hex,
+            "name": self.name,
+            "is_name_exact": self.is_name_exact,
+        }
+
+
+def get_hex_code_names(hex_code: str) -> Tuple[str, bool]:
+    names, is_exact = rgb_to_names(
+        int(hex_code[:2], 16), int(hex_code[2:4], 16), int(hex_code[4:6], 16)
+    )
+    return "/".join(names), is_exact
+
+
+def is_scannable(path: str) -> bool:
+    extension = os.path.splitext(path)[1].lower()
+    return extension in SOURCE_EXTENSIONS or extension in STYLESHEET_EXTENSIONS
+
+
+def iter_scannable_files(root: str) -> Iterator[str]:
+    """Yield paths of files that may contain color literals.
+
+    Hidden directories and well-known dependency directories are skipped.
+
+    :param root: Root directory.
+    :return: File path iterator.
+    """
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(
+            d
+            for d in dirnames
+            if not d.startswith(".") and d not in EXCLUDED_DIRECTORIES
+        )
+        for filename in sorted(filenames):
+            if is_scannable(filename):
+                yield os.path.join(dirpath, filename)
+
+
+def find_color_literals(data: Any, stylesheet: bool = False) -> List[RawHit]:
+    """Return the color literals in a bytes-like object.
+
+    :param data: Bytes-like object (e.g. bytes or mmap).
+    :param stylesheet: If True, CSS3 color names are matched as well.
+    :return: List of (line, column, literal, hex code) tuples.
+    """
+    pattern = STYLESHEET_PATTERN if stylesheet else SOURCE_PATTERN
+    hits = []
+    line = 1
+    line_start = 0
+    position = 0
+
+    for match in pattern.finditer(data):
+        start = match.start()
+        newlines = data[position:start].count(b"\n")
+        if newlines:
+            line += newlines
+            line_start = data.rfind(b"\n", position, start) + 1
+        position = start
+
+        literal = match.group().decode("ascii")
+        try:
+            r, g, b, _ = parse_css_color(literal)
+        except InputValueError:
+            continue
+        hits.append((line, start - line_start + 1, literal, rgb_to_hex(r, g, b)))
+
+    return hits
+
+
+def scan_file(
+    path: str, digest: Optional[str] = None
+) -> Tuple[str, Optional[List[RawHit]]]:
+    """Memory-map a file and find its color literals.
+
+    Hits are also looked up in and saved to the result cache by content, so
+    files reverted to a previously scanned state are not scanned again.
+
+    :param path: File path.
+    :param digest: SHA-1 digest of the file from a previous scan, if any.
+    :return: SHA-1 digest of the file and its hits, or None in place of hits
+        if the digest matches the given one.
+    """
+    stylesheet = os.path.splitext(path)[1].lower() in STYLESHEET_EXTENSIONS
+    with open(path, "rb") as fp:
+        if os.fstat(fp.fileno()).st_size == 0:
+            return hashlib.sha1(b"").hexdigest(), []
+
+        with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            new_digest = hashlib.sha1(data).hexdigest()
+            if new_digest == digest:
+                return new_digest, None
+
+            key = get_cache_key("scan", f"{stylesheet}:{new_digest}".encode("ascii"))
+            cached_hits = load_cached_result(key)
+            if cached_hits is not None:
+                return new_digest, [tuple(hit) for hit in cached_hits]
+
+            hits = find_color_literals(data, stylesheet)
+            save_cached_result(key, hits)
+            return new_digest, hits
+
+
+def _scan_file_safely(
+    args: Tuple[str, Optional[str]],
+) -> Optional[Tuple[str, Optional[List[RawHit]]]]:
+    try:
+        return scan_file(*args)
+    except (OSError, ValueError):
+        return None
+
+
+def load_scan_index() -> Dict[str, Any]:  # pragma: no cover
+    try:
+        with open(SCAN_INDEX_FILE, "r") as fp:
+            index = json_load(fp)
+        return index if isinstance(index, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def save_scan_index(index: Dict[str, Any]) -> None:  # pragma: no cover
+    tmp_file = SCAN_INDEX_FILE.with_name(f"{SCAN_INDEX_FILE.name}.{os.getpid()}.tmp")
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(tmp_file, "w") as fp:
+            json_dump(index, fp)
+        os.replace(tmp_file, SCAN_INDEX_FILE)
+    except OSError:
+        pass
+
+
+def scan_directory(
+    root: str, workers: Optional[int] = None, use_index: bool = True
+) -> List[ScanHit]:
+    """Find the color literals in all scannable files under a directory.
+
+    Files are scanned in parallel. Files whose modification time, size and
+    content are unchanged since the last scan are not scanned again.
+
+    :param root: Root directory.
+    :param workers: Max number of worker processes (default: CPU count).
+    :param use_index: Read and update the index of previous scans.
+    :return: List of hits ordered by path, line and column.
+    """
+    if not os.path.isdir(root):
+        raise InputValueError(f'directory "{root}"', "an existing directory")
+
+    root = str(Path(root).resolve())
+    index = load_scan_index() if use_index else {}
+    entries: Dict[str, Any] = {}
+    pending: List[Tuple[str, Optional[str]]] = []
+
+    for path in iter_scannable_files(root):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+
+        entry = index.get(path)
+        if (
+            entry
+            and entry["mtime"] == stat.st_mtime_ns
+            and entry["size"] == stat.st_size
+        ):
+            entries[path] = entry
+        else:
+            entry = entry or {"digest": None, "hits": []}
+            entries[path] = dict(entry, mtime=stat.st_mtime_ns, size=stat.st_size)
+            pending.append((path, entry["digest"]))
+
+    if len(pending) < MIN_POOL_FILE_COUNT or workers == 1:
+        results = list(map(_scan_file_safely, pending))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_scan_file_safely, pending, chunksize=8))
+
+    for (path, _), result in zip(pending, results):
+        if result is None:
+            del entries[path]
+        else:
+            digest, hits = result
+            entries[path]["digest"] = digest
+            if hits is not None:
+                entries[path]["hits"] = hits
+
+    if use_index:
+        prefix = os.path.join(root, "")
+        stale = [p for p in index if p.startswith(prefix) and p not in entries]
+        if pending or stale:
+            for path in stale:
+                del index[path]
+            index.update(entries)
+            save_scan_index(index)
+
+    scan_hits = []
+    for path in sorted(entries):
+        for line, column, literal, hex_code in entries[path]["hits"]:
+            name, is_name_exact = get_hex_code_names(hex_code)
+            scan_hits.append(
+                ScanHit(path, line, column, literal, hex_code, name, is_name_exact)
+            )
+    return scan_hits
+
+
+def summarize_scan_hits(hits: List[ScanHit]) -> List[Tuple[str, int]]:
+    """Count the hits per hex code.
+
+    :param hits: Scan hits.
+    :return: List of (hex code, count) tuples, most frequent first.
+    """
+    counter = Counter(hit.hex for hit in hits)
+    return sorted(counter.items(), key=lambda item: (-item[1], item[0]))
@@ -0,0 +1,312 @@
+"""Color name search by exact name, prefix, substring and typos.
+
+Names are compared by key: lowercase letters and digits only, so "Dark
+Slate Blue", "dark-slate-blue" and "darkslateblue" are the same name.
+
+The search index of a name dictionary holds the sorted keys of all names,
+a flattened trie in which the names under a prefix form a contiguous range
+found by binary search, and trigram posting lists (the names containing
+each 3-character substring of their key), built on the first query that
+needs them.
+
+- Exact and prefix matches are the range of keys starting with the query.
+- Substring matches are found among the names containing the rarest
+  trigram of the query.
+- Fuzzy matches are names with a prefix within a few typos of the query
+  (optimal string alignment distance: Levenshtein distance with swaps of
+  adjacent characters as one typo). They are found by walking the trie with one row
+  of the edit distance matrix per node, so a branch is left as soon as no
+  name under it can be close enough, and shared prefixes are compared once.
+
+Matches are ranked exact first, then prefix matches in key order (as in a
+trie walk), substring matches shorter names first and fuzzy matches by
+typos then key order. Later kinds are only searched when earlier ones
+return too few matches, so most queries stop after a few comparisons.
+"""
+
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from itertools import islice
+from typing import Dict, List, Optional, Tuple
+
+from colorpedia.names import NameDictionary, get_name_dictionary
+
+# Max number of typos in fuzzy matches. Queries of 5 to 7 characters allow
+# 1 typo, and longer queries allow 2.
+MAX_NAME_TYPOS = 2
+
+DEFAULT_FIND_COUNT = 10
+
+# Sorts after every character of a key, to find the end of a prefix range.
+_KEY_END = "\U0010ffff"
+
+# Search indexes by name dictionary name.
+_indexes: Dict[str, "NameSearchIndex"] = {}
+
+
+@dataclass
+class NameMatch:
+    """Color name matching a search query."""
+
+    name: str
+    hex_code: str
+    kind: str
+    typos: int
+
+
+def get_name_key(name: str) -> str:
+    """Return the search key of a color name.
+
+    :param name: Color name.
+    :return: Lowercase letters and digits of the name.
+    """
+    return "".join(char for char in name.lower() if char.isalnum())
+
+
+def get_max_typos(key: str) -> int:
+    """Return the max number of typos in fuzzy matches of a query.
+
+    :param key: Query key.
+    :return: Max optimal string alignment distance.
+    """
+    return max(0, min(MAX_NAME_TYPOS, (len(key) - 2) // 3))
+
+
+def _split_trigrams(text: str) -> List[str]:
+    return [text[i : i + 3] for i in range(len(text) - 2)]
+
+
+class NameSearchIndex:
+    """Color names of a name dictionary indexed for search.
+
+    :param dictionary: Name dictionary.
+    """
+
+    __slots__ = (
+        "dictionary",
+        "names",
+        "colors",
+        "entry_keys",
+        "keys",
+        "key_entries",
+        "exact",
+        "_trigrams",
+    )
+
+    def __init__(self, dictionary: NameDictionary) -> None:
+        self.dictionary = dictionary
+        self.names: List[str] = []
+        self.colors = array("I")
+        for color in range(len(dictionary)):
+            for name in dictionary.get_names(color):
+                self.names.append(name)
+                self.colors.append(color)
+        self.entry_keys = [get_name_key(name) for name in self.names]
+
+        order = sorted(range(len(self.names)), key=self.entry_keys.__getitem__)
+        self.keys = [self.entry_keys[entry] for entry in order]
+        self.key_entries = array("I", order)
+        self.exact: Dict[str, int] = {}
+        for entry, key in enumerate(self.entry_keys):
+            self.exact.setdefault(key, entry)
+        self._trigrams: Optional[Dict[str, "array[int]"]] = None
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def get_trigrams(self) -> Dict[str, "array[int]"]:
+        """Return the trigram posting lists, building them if needed.
+
+        :return: Name entries by trigram of their key, shorter names first
+            (ties in dictionary order).
+        """
+        if self._trigrams is None:
+            entry_keys = self.entry_keys
+            trigrams: Dict[str, "array[int]"] = {}
+            for entry in sorted(
+                range(len(entry_keys)), key=lambda e: len(entry_keys[e])
+            ):
+                for trigram in set(_split_trigrams(entry_keys[entry])):
+                    entries = trigrams.get(trigram)
+                    if entries is None:
+                        entries = trigrams[trigram] = array("I")
+                    entries.append(entry)
+            self._trigrams = trigrams
+        return self._trigrams
+
+    def _get_match(self, entry: int, kind: str, typos: int = 0) -> NameMatch:
+        code = self.dictionary.codes[self.colors[entry]]
+        return NameMatch(self.names[entry], f"{code:06X}", kind, typos)
+
+    def find_exact(self, name: str) -> Optional[NameMatch]:
+        """Return the first color name with the same key as a name.
+
+        :param name: Color name.
+        :return: Exact match, or None if there is none.
+        """
+        entry = self.exact.get(get_name_key(name))
+        return None if entry is None else self._get_match(entry, "exact")
+
+    def find_fuzzy(self, key: str, max_typos: int) -> List[Tuple[int, int, int]]:
+        """Return the ranges of sorted keys with a prefix close to a query.
+
+        :param key: Query key.
+        :param max_typos: Max optimal string alignment distance between the
+            query and a prefix of the keys.
+        :return: Distance and start and end of each range in self.keys, in
+            key order.
+        """
+        keys, size = self.keys, len(key)
+        ranges = []
+        # Trie nodes as key ranges, with the depth (prefix length), the edit
+        # distances from the node prefix and its parent prefix to each
+        # prefix of the query, and the min distance from the query to the
+        # node prefix and its own prefixes.
+        no_row = [size + max_typos + 1] * (size + 1)
+        stack = [(0, len(keys), 0, list(range(size + 1)), no_row, size)]
+        while stack:
+            start, end, depth, row, parent_row, best = stack.pop()
+            # Keys ending at this node sort first in its range.
+            child_start = start
+            while child_start < end and len(keys[child_start]) == depth:
+                child_start += 1
+            if child_start > start and best <= max_typos:
+                ranges.append((best, start, child_start))
+
+            last_char = keys[start][depth - 1] if depth else ""
+            children = []
+            while child_start < end:
+                prefix = keys[child_start][: depth + 1]
+                child_end = bisect_left(keys, prefix + _KEY_END, child_start, end)
+                char = prefix[-1]
+                # Distances under this node derive from its row, or from the
+                # row of its parent through a swap of this character.
+                child_row = [row[0] + 1]
+                lowest = child_row[0]
+                for i, query_char in enumerate(key, start=1):
+                    distance = row[i - 1] if query_char == char else row[i - 1] + 1
+                    if row[i] < distance:
+                        distance = row[i] + 1
+                    if child_row[i - 1] < distance:
+                        distance = child_row[i - 1] + 1
+                    if i > 1:
+                        if query_char == char and row[i - 2] < lowest:
+                            lowest = row[i - 2] + 1
+                        # Swapped adjacent characters count as one typo.
+                        if query_char == last_char and key[i - 2] == char:
+                            if parent_row[i - 2] < distance:
+                                distance = parent_row[i - 2] + 1
+                    if distance < lowest:
+                        lowest = distance
+                    child_row.append(distance)
+                child_best = min(best, child_row[size])
+                if lowest >= child_best:
+                    # No name under this node can get closer to the query.
+                    if child_best <= max_typos:
+                        ranges.append((child_best, child_start, child_end))
+                elif lowest <= max_typos:
+                    children.append(
+                        (child_start, child_end, depth + 1, child_row, row, child_best)
+                    )
+                child_start = child_end
+            stack.extend(reversed(children))
+        ranges.sort(key=lambda item: item[1])
+        return ranges
+
+    def find(self, query: str, count: int = DEFAULT_FIND_COUNT) -> List[NameMatch]:
+        """Return the color names best matching a query.
+
+        :param query: Full or partial color name, possibly with typos.
+        :param count: Max number of matches to return.
+        :return: Matches, best first.
+        """
+        key = get_name_key(query)
+        if not key or count < 1:
+            return []
+        entry_keys, key_entries = self.entry_keys, self.key_entries
+        matches: List[NameMatch] = []
+        found = set()
+
+        # Exact and prefix matches: a contiguous range of the sorted keys.
+        start = bisect_left(self.keys, key)
+        end = min(start + count, len(self.keys))
+        end = bisect_left(self.keys, key + _KEY_END, start, end)
+        for entry in key_entries[start:end]:
+            kind = "exact" if entry_keys[entry] == key else "prefix"
+            matches.append(self._get_match(entry, kind))
+            found.add(entry)
+
+        trigrams = _split_trigrams(key)
+        if len(matches) < count and trigrams:
+            index = self.get_trigrams()
+            rarest = min((index.get(trigram, ()) for trigram in trigrams), key=len)
+            entries = (
+                entry
+                for entry in rarest
+                if entry not in found and key in entry_keys[entry]
+            )
+            for entry in islice(entries, count - len(matches)):
+                matches.append(self._get_match(entry, "substring"))
+                found.add(entry)
+
+        # Fewer typos prune more of the trie, so more are only allowed if
+        # there are too few matches.
+        for typos in range(1, get_max_typos(key) + 1):
+            if len(matches) == count:
+                break
+            for distance, start, end in self.find_fuzzy(key, typos):
+                if distance != typos:
+                    continue  # Found with fewer typos.
+                for entry in islice(key_entries, start, end):
+                    if entry not in found:
+                        matches.append(self._get_match(entry, "fuzzy", typos))
+                        if len(matches) == count:
+                            return matches
+        return matches
+
+
+def get_name_search_index(
+    dictionary: Optional[NameDictionary] = None,
+) -> NameSearchIndex:
+    """Return the search index of a name dictionary.
+
+    The index is built once per dictionary and process.
+
+    :param dictionary: Name dictionary (default: the active name dictionary).
+    :return: Name search index.
+    """
+    if dictionary is None:
+        dictionary = get_name_dictionary()
+    index = _indexes.get(dictionary.name)
+    if index is None or index.dictionary is not dictionary:
+        index = _indexes[dictionary.name] = NameSearchIndex(dictionary)
+    return index
+
+
+def find_color_names(query: str, count: int = DEFAULT_FIND_COUNT) -> List[NameMatch]:
+    """Return the color names best matching a query.
+
+    Names are searched in the active name dictionary, ignoring case, spaces
+    and punctuation.
+
+    :param query: Full or partial color name, possibly with typos.
+    :param count: Max number of matches to return.
+    :return: Exact, prefix, substring and fuzzy matches, best first.
+    """
+    return get_name_search_index().find(query, count)
+
+
+def find_color_name(name: str) -> Optional[NameMatch]:
+    """Return the color name best matching a name.
+
+    :param name: Color name, possibly partial or with typos.
+    :return: Exact match if any, else the best match of find_color_names,
+        or None if nothing matches.
+    """
+    index = get_name_search_index()
+    match = index.find_exact(name)
+    if match is None:
+        matches = index.find(name, 1)
+        match = matches[0] if matches else None
+    return match
@@ -0,0 +1,285 @@
+import asyncio
+import time
+from collections import Counter
+from json import dumps as json_dumps
+from json import loads as json_loads
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+from colorpedia.arrays import ColorArray
+from colorpedia.color import Color
+from colorpedia.config import Config
+from colorpedia.converters import hex_to_rgb, name_to_rgb
+from colorpedia.exceptions import ColorpediaError, InputValueError
+from colorpedia.inputs import normalize_hex_code, validate_rgb_value
+from colorpedia.palettes import palette_to_rgbs
+from colorpedia.parsers import parse_css_colors
+
+HTTP_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+MAX_BATCH_SIZE = 10000
+MAX_BODY_SIZE = 2**20
+MAX_HEAD_SIZE = 2**14
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+ROUTES = ("hex", "rgb", "name", "palette", "batch", "metrics")
+
+Response = Tuple[int, bytes, str]
+
+
+class Metrics:
+    """Request counts and latency histograms in Prometheus text format."""
+
+    def __init__(self) -> None:
+        self.requests: Counter = Counter()
+        self.buckets: Dict[str, List[int]] = {}
+        self.sums: Dict[str, float] = {}
+        self.counts: Counter = Counter()
+
+    def observe(self, route: str, status: int, seconds: float) -> None:
+        self.requests[route, status] += 1
+        self.counts[route] += 1
+        self.sums[route] = self.sums.get(route, 0.0) + seconds
+        buckets = self.buckets.setdefault(route, [0] * len(LATENCY_BUCKETS))
+        for i, upper_bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= upper_bound:
+                buckets[i] += 1
+
+    def render(self) -> str:
+        lines = [
+            "# HELP colorpedia_requests_total Total number of HTTP requests.",
+            "# TYPE colorpedia_requests_total counter",
+        ]
+        for (route, status), count in sorted(self.requests.items()):
+            lines.append(
+                f'colorpedia_requests_total{{route="{route}",status="{status}"}} '
+                f"{count}"
+            )
+        lines.extend(
+            (
+                "# HELP colorpedia_request_duration_seconds HTTP request latency.",
+                "# TYPE colorpedia_request_duration_seconds histogram",
+            )
+        )
+        for route in sorted(self.buckets):
+            name = "colorpedia_request_duration_seconds"
+            for upper_bound, count in zip(LATENCY_BUCKETS, self.buckets[route]):
+                lines.append(
+                    f'{name}_bucket{{route="{route}",le="{upper_bound}"}} {count}'
+                )
+            lines.append(
+                f'{name}_bucket{{route="{route}",le="+Inf"}} {self.counts[route]}'
+            )
+            lines.append(f'{name}_sum{{route="{route}"}} {self.sums[route]}')
+            lines.append(f'{name}_count{{route="{route}"}} {self.counts[route]}')
+        return "\n".join(lines) + "\n"
+
+
+def _json_response(status: int, data: Any) -> Response:
+    return status, json_dumps(data).encode("utf-8"), "application/json"
+
+
+def _error_response(status: int, message: str) -> Response:
+    return _json_response(status, {"error": message})
+
+
+class ColorServer:
+    """HTTP/1.1 JSON API server for color lookups.
+
+    The configuration is loaded once and reused for every request.
+
+    :param config: Configuration (JSON keys are used for color objects).
+    """
+
+    def __init__(self, config: Config) -> None:
+        self.config = config
+        self.metrics = Metrics()
+
+    def get_color_dict(self, r: int, g: int, b: int) -> Dict[str, Any]:
+        return Color(r, g, b).get_dict(self.config.json_keys)
+
+    def get_hex(self, hex_code: str) -> Response:
+        hex_code = normalize_hex_code(hex_code)
+        return _json_response(200, self.get_color_dict(*hex_to_rgb(hex_code)))
+
+    def get_rgb(self, r: str, g: str, b: str) -> Response:
+        try:
+            rgb = [validate_rgb_value(int(value)) for value in (r, g, b)]
+        except ValueError:
+            raise InputValueError("RGB value", "an integer between 0 and 255")
+        return _json_response(200, self.get_color_dict(*rgb))
+
+    def get_name(self, name: str) -> Response:
+        try:
+            rgb = name_to_rgb(name)
+        except ValueError as err:
+            return _error_response(404, str(err))
+        return _json_response(200, self.get_color_dict(*rgb))
+
+    def get_palette(self, name: str) -> Response:
+        try:
+            rgbs = palette_to_rgbs(name)
+        except ValueError as err:
+            return _error_response(404, str(err))
+        colors = ColorArray.from_rgbs(rgbs)
+        return _json_response(200, colors.get_dicts(self.config.json_keys))
+
+    def post_batch(self, body: bytes) -> Response:
+        try:
+            values = json_loads(body.decode("utf-8"))
+        except ValueError:
+            values = None
+        if not (
+            isinstance(values, list)
+            and len(values) <= MAX_BATCH_SIZE
+            and all(isinstance(value, str) for value in values)
+        ):
+            raise InputValueError(
+                "request body",
+                f"a JSON array of at most {MAX_BATCH_SIZE} CSS color strings",
+            )
+        rgbas = parse_css_colors(values)
+        return _json_response(200, [self.get_color_dict(*rgba[:3]) for rgba in rgbas])
+
+    def dispatch(self, method: str, target: str, body: bytes) -> Tuple[str, Response]:
+        """Route a request to its handler.
+
+        :param method: HTTP method.
+        :param target: Request target (path and query string).
+        :param body: Request body.
+        :return: Route name (for metrics) and response.
+        """
+        parts = [unquote(part) for part in urlsplit(target).path.split("/")[1:]]
+        route = parts[0] if parts and parts[0] in ROUTES else "other"
+        args = parts[1:]
+        expected_method = "POST" if route == "batch" else "GET"
+
+        if route == "other" or (route in ("batch", "metrics") and args):
+            return route, _error_response(404, f"Unknown path {target}")
+        if method != expected_method:
+            return route, _error_response(405, f"Expecting {expected_method}")
+
+        try:
+            if route == "metrics":
+                body = self.metrics.render().encode("utf-8")
+                return route, (200, body, "text/plain; version=0.0.4")
+            if route == "batch":
+                return route, self.post_batch(body)
+            if route == "rgb" and len(args) == 3:
+                return route, self.get_rgb(*args)
+            if route != "rgb" and len(args) == 1:
+                handler = getattr(self, f"get_{route}")
+                return route, handler(args[0])
+        except InputValueError as err:
+            return route, _error_response(400, str(err))
+        except ColorpediaError as err:
+            # E.g. a malformed palette file, which the client cannot fix.
+            return route, _error_response(500, str(err))
+        except Exception:
+            return route, _error_response(500, "Internal server error")
+        return route, _error_response(404, f"Unknown path {target}")
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                    break
+                start = time.perf_counter()
+
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ")
+                except ValueError:
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip().lower()
+
+                connection = headers.get("connection", "")
+                if version == "HTTP/1.1":
+                    keep_alive = connection != "close"
+                else:
+                    keep_alive = connection == "keep-alive"
+
+                try:
+                    length = int(headers.get("content-length", "0"))
+                except ValueError:
+                    length = -1
+                if 0 <= length <= MAX_BODY_SIZE:
+                    body = await reader.readexactly(length)
+                    route, (status, data, content_type) = self.dispatch(
+                        method, target, body
+                    )
+                else:
+                    keep_alive = False
+                    route = "other"
+                    status, data, content_type = _error_response(
+                        413 if length > 0 else 400, "Bad Content-Length"
+                    )
+
+                writer.write(
+                    "\r\n".join(
+                        (
+                            f"HTTP/1.1 {status} {HTTP_REASONS[status]}",
+                            f"Content-Type: {content_type}",
+                            f"Content-Length: {len(data)}",
+                            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+                            "",
+                            "",
+                        )
+                    ).encode("latin-1")
+                    + data
+                )
+                self.metrics.observe(route, status, time.perf_counter() - start)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str, port: int) -> asyncio.AbstractServer:
+        """Start listening for connections.
+
+        :param host: Host to bind to.
+        :param port: Port to bind to (0 picks a free port).
+        :return: Server object.
+        """
+        return await asyncio.start_server(
+            self.handle_connection, host, port, limit=MAX_HEAD_SIZE
+        )
+
+
+def serve(
+    config: Config, host: str, port: int, ready: Optional[Any] = None
+) -> None:  # pragma: no cover
+    """Run the HTTP server until interrupted.
+
+    :param config: Configuration.
+    :param host: Host to bind to.
+    :param port: Port to bind to.
+    :param ready: Callable invoked with the bound (host, port) once listening.
+    """
+    loop = asyncio.new_event_loop()
+    server = loop.run_until_complete(ColorServer(config).start(host, port))
+    if ready is not None:
+        # Servers of asyncio.start_server have sockets (not in AbstractServer).
+        sockets = server.sockets  # type: ignore
+        ready(sockets[0].getsockname()[:2])
+    try:
+        loop.run_forever()
+    finally:
+        server.close()
+        loop.run_until_complete(server.wait_closed())
+        loop.close()
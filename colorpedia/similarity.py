@@ -0,0 +1,308 @@
+"""Palette similarity search.
+
+The distance between two palettes is the mean Delta E (CIE76) of an
+optimal matching in CIELAB: each color of the smaller palette is matched
+to a distinct color of the larger one so that the total Delta E is
+minimal (Hungarian algorithm), and the colors of the larger palette left
+unmatched count their distance to the nearest color of the smaller one.
+Palettes are compared as sets of colors, so the distance is 0 for
+palettes with the same colors in any order.
+
+Exact distances take time cubic in the palette size, so palettes are
+ranked in stages. Each palette has an embedding computed once from the
+member index (see members.MemberIndex): the quantiles of its colors
+projected onto a few fixed directions in CIELAB, whose L1 distance
+approximates the sliced Wasserstein distance between palettes. The closest
+palettes by embedding are then ordered by their chamfer distance (the mean
+distance from each color of the larger palette to the nearest color of the
+smaller one), a lower bound of the exact distance, and the exact distance
+is computed in that order until no remaining palette can be closer.
+"""
+
+from array import array
+from bisect import insort
+from dataclasses import dataclass
+from math import inf
+from operator import sub
+from typing import List, Optional, Sequence, Tuple
+
+from colorpedia.members import MemberIndex, get_member_index
+from colorpedia.palettes import PALETTES
+from colorpedia.spatial import Point
+
+_DIAGONAL = 3**-0.5
+
+# Directions in CIELAB onto which palette colors are projected.
+EMBEDDING_DIRECTIONS: Tuple[Point, ...] = (
+    (1.0, 0.0, 0.0),
+    (0.0, 1.0, 0.0),
+    (0.0, 0.0, 1.0),
+    (_DIAGONAL, _DIAGONAL, _DIAGONAL),
+    (_DIAGONAL, -_DIAGONAL, _DIAGONAL),
+    (_DIAGONAL, _DIAGONAL, -_DIAGONAL),
+    (_DIAGONAL, -_DIAGONAL, -_DIAGONAL),
+)
+# Number of quantiles of the projected colors per direction.
+EMBEDDING_QUANTILES = 8
+EMBEDDING_SIZE = len(EMBEDDING_DIRECTIONS) * EMBEDDING_QUANTILES
+
+# Number of palettes ranked by exact distance by default, and how many
+# times more palettes are ranked by chamfer distance.
+DEFAULT_SIMILAR_CANDIDATES = 50
+DEFAULT_SIMILAR_COUNT = 10
+PREFILTER_FACTOR = 10
+
+_index: Optional["SimilarityIndex"] = None
+
+
+@dataclass
+class SimilarPalette:
+    """Palette and its distance to a query palette."""
+
+    palette: str
+    distance: float
+
+
+def _get_delta_e(lab1: Point, lab2: Point) -> float:
+    return (
+        (lab1[0] - lab2[0]) ** 2 + (lab1[1] - lab2[1]) ** 2 + (lab1[2] - lab2[2]) ** 2
+    ) ** 0.5
+
+
+def get_palette_embedding(labs: Sequence[Point]) -> List[float]:
+    """Return the embedding of a palette for similarity prefiltering.
+
+    :param labs: CIELAB colors of the palette.
+    :return: Quantiles of the colors projected onto each embedding direction
+        (all zeros if the palette is empty).
+    """
+    if not labs:
+        return [0.0] * EMBEDDING_SIZE
+    size = len(labs)
+    positions = [
+        min(int((k + 0.5) * size / EMBEDDING_QUANTILES), size - 1)
+        for k in range(EMBEDDING_QUANTILES)
+    ]
+    embedding: List[float] = []
+    for x, y, z in EMBEDDING_DIRECTIONS:
+        values = sorted(l * x + a * y + b * z for l, a, b in labs)
+        embedding.extend(values[position] for position in positions)
+    return embedding
+
+
+def get_assignment(costs: Sequence[Sequence[float]]) -> List[int]:
+    """Solve the assignment problem of a cost matrix (Hungarian algorithm).
+
+    :param costs: Cost matrix with no more rows than columns.
+    :return: Column assigned to each row, for the minimum total cost.
+    """
+    n = len(costs)
+    m = len(costs[0]) if n else 0
+    # Potentials and matching are 1-indexed, with row and column 0 as sentinels.
+    u = [0.0] * (n + 1)
+    v = [0.0] * (m + 1)
+    matched_rows = [0] * (m + 1)
+    way = [0] * (m + 1)
+    for row in range(1, n + 1):
+        matched_rows[0] = row
+        column = 0
+        min_values = [inf] * (m + 1)
+        used = [False] * (m + 1)
+        while matched_rows[column]:
+            used[column] = True
+            current_row = matched_rows[column]
+            row_costs = costs[current_row - 1]
+            row_potential = u[current_row]
+            delta = inf
+            next_column = 0
+            for j in range(1, m + 1):
+                if not used[j]:
+                    value = row_costs[j - 1] - row_potential - v[j]
+                    if value < min_values[j]:
+                        min_values[j] = value
+                        way[j] = column
+                    if min_values[j] < delta:
+                        delta = min_values[j]
+                        next_column = j
+            for j in range(m + 1):
+                if used[j]:
+                    u[matched_rows[j]] += delta
+                    v[j] -= delta
+                else:
+                    min_values[j] -= delta
+            column = next_column
+        while column:
+            previous = way[column]
+            matched_rows[column] = matched_rows[previous]
+            column = previous
+
+    assignment = [0] * n
+    for j in range(1, m + 1):
+        if matched_rows[j]:
+            assignment[matched_rows[j] - 1] = j - 1
+    return assignment
+
+
+def get_palette_distance(labs1: Sequence[Point], labs2: Sequence[Point]) -> float:
+    """Return the optimal matching distance between two palettes.
+
+    :param labs1: CIELAB colors of the first palette.
+    :param labs2: CIELAB colors of the second palette.
+    :return: Mean Delta E over the colors of the larger palette.
+    """
+    if len(labs1) > len(labs2):
+        labs1, labs2 = labs2, labs1
+    if not labs1:
+        return 0.0 if not labs2 else inf
+
+    costs = [[_get_delta_e(lab1, lab2) for lab2 in labs2] for lab1 in labs1]
+    assignment = get_assignment(costs)
+    total = sum(costs[row][column] for row, column in enumerate(assignment))
+    matched = set(assignment)
+    for column in range(len(labs2)):
+        if column not in matched:
+            total += min(row_costs[column] for row_costs in costs)
+    return total / len(labs2)
+
+
+def get_chamfer_distance(labs1: Sequence[Point], labs2: Sequence[Point]) -> float:
+    """Return the chamfer distance between two palettes.
+
+    This is a lower bound of get_palette_distance, as every color of the
+    larger palette is at least as far from its match as from its nearest
+    color in the smaller palette.
+
+    :param labs1: CIELAB colors of the first palette.
+    :param labs2: CIELAB colors of the second palette.
+    :return: Mean Delta E from each color of the larger palette to the
+        nearest color of the smaller one.
+    """
+    if len(labs1) > len(labs2):
+        labs1, labs2 = labs2, labs1
+    if not labs1:
+        return 0.0 if not labs2 else inf
+    total = sum(min(_get_delta_e(lab1, lab2) for lab1 in labs1) for lab2 in labs2)
+    return total / len(labs2)
+
+
+class SimilarityIndex:
+    """Palette embeddings for similarity search.
+
+    :param members: Member index of the palettes.
+    """
+
+    __slots__ = ("members", "palette_colors", "embeddings")
+
+    def __init__(self, members: MemberIndex) -> None:
+        self.members = members
+        palette_count = len(members.palettes)
+        self.palette_colors: List[List[int]] = [[] for _ in range(palette_count)]
+        offsets, palette_ids = members.offsets, members.palette_ids
+        for index in range(len(members)):
+            for palette_id in palette_ids[offsets[index] : offsets[index + 1]]:
+                self.palette_colors[palette_id].append(index)
+
+        self.embeddings = array("d")
+        for colors in self.palette_colors:
+            self.embeddings.extend(get_palette_embedding(self.get_labs(colors)))
+
+    def get_labs(self, colors: Sequence[int]) -> List[Point]:
+        """Return the CIELAB coordinates of colors in the member index.
+
+        :param colors: Color indices.
+        :return: CIELAB colors.
+        """
+        labs = self.members.labs
+        return [(labs[i * 3], labs[i * 3 + 1], labs[i * 3 + 2]) for i in colors]
+
+    def get_embedding_distance(self, first: int, second: int) -> float:
+        """Return the embedding distance between two palettes.
+
+        :param first: Index of the first palette.
+        :param second: Index of the second palette.
+        :return: Mean absolute difference of the embedding quantiles.
+        """
+        embeddings = self.embeddings
+        start1, start2 = first * EMBEDDING_SIZE, second * EMBEDDING_SIZE
+        differences = map(
+            sub,
+            embeddings[start1 : start1 + EMBEDDING_SIZE],
+            embeddings[start2 : start2 + EMBEDDING_SIZE],
+        )
+        return sum(map(abs, differences)) / EMBEDDING_SIZE
+
+    def find_similar(
+        self,
+        palette: str,
+        count: int = DEFAULT_SIMILAR_COUNT,
+        candidates: int = DEFAULT_SIMILAR_CANDIDATES,
+    ) -> List[SimilarPalette]:
+        """Return the palettes closest to a palette.
+
+        :param palette: Palette name.
+        :param count: Max number of palettes to return.
+        :param candidates: Max number of exact distances to compute (at
+            least the count).
+        :return: Palettes closest first (ties in palette order).
+        :raise ValueError: If the palette is not in the index.
+        """
+        try:
+            query = self.members.palettes.index(palette)
+        except ValueError:
+            raise ValueError(f'Unknown color palette "{palette}"')
+        candidates = max(candidates, count)
+
+        prefiltered = sorted(
+            (self.get_embedding_distance(query, other), other)
+            for other in range(len(self.members.palettes))
+            if other != query
+        )[: candidates * PREFILTER_FACTOR]
+        query_labs = self.get_labs(self.palette_colors[query])
+        labs = {i: self.get_labs(self.palette_colors[i]) for _, i in prefiltered}
+        lower_bounds = sorted(
+            (get_chamfer_distance(query_labs, labs[i]), i) for _, i in prefiltered
+        )
+
+        results: List[Tuple[float, int]] = []
+        for lower_bound, i in lower_bounds[:candidates]:
+            if len(results) >= count and lower_bound > results[count - 1][0]:
+                break
+            insort(results, (get_palette_distance(query_labs, labs[i]), i))
+        return [
+            SimilarPalette(self.members.palettes[i], distance)
+            for distance, i in results[:count]
+        ]
+
+
+def get_similarity_index() -> SimilarityIndex:
+    """Return the similarity index of all palettes, building it if needed.
+
+    :return: Similarity index.
+    """
+    global _index
+    members = get_member_index()
+    if _index is None or _index.members is not members:
+        _index = SimilarityIndex(members)
+    return _index
+
+
+def find_similar_palettes(
+    palette: str,
+    count: int = DEFAULT_SIMILAR_COUNT,
+    candidates: int = DEFAULT_SIMILAR_CANDIDATES,
+) -> List[SimilarPalette]:
+    """Return the palettes closest to a palette by optimal matching distance.
+
+    :param palette: Palette name.
+    :param count: Max number of palettes to return.
+    :param candidates: Number of palettes closest by embedding distance to
+        rank by exact distance (at least the count).
+    :return: Palettes closest first.
+    :raise ValueError: If the palette does not exist.
+    :raise PaletteFileError: If the palette file cannot be loaded.
+    """
+    if palette in PALETTES:
+        # Files that fail to load are left out of the index, so the error of
+        # the palette itself is raised here.
+        PALETTES[palette]
+    return get_similarity_index().find_similar(palette, count, candidates)
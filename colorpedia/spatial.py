@@ -0,0 +1,143 @@
+"""Uniform grid index for fixed-radius searches over 3D color coordinates.
+
+Points (e.g. CIELAB coordinates) are bucketed into cubic cells. A search
+within a radius no larger than the cell size only visits the 27 cells
+around the query, so finding every close pair of N points takes time
+proportional to N (plus the number of pairs) instead of N^2.
+"""
+
+from math import ceil, sqrt
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+Point = Tuple[float, float, float]
+# Cell coordinates are whole floats (floor division of float coordinates).
+Cell = Tuple[float, float, float]
+
+_OFFSETS = [(x, y, z) for x in (-1, 0, 1) for y in (-1, 0, 1) for z in (-1, 0, 1)]
+
+
+class PointGrid:
+    """Uniform grid of indexed 3D points.
+
+    :param cell_size: Edge length of the grid cells (positive number).
+    :param points: Initial points, indexed by position.
+    """
+
+    __slots__ = ("cell_size", "points", "cells")
+
+    def __init__(self, cell_size: float, points: Iterable[Point] = ()) -> None:
+        if not cell_size > 0:
+            raise ValueError("Grid cell size must be positive")
+        self.cell_size = cell_size
+        self.points: List[Point] = list(points)
+        self.cells: Dict[Cell, List[int]] = {}
+        cells = self.cells
+        for index, (x, y, z) in enumerate(self.points):
+            cell = (x // cell_size, y // cell_size, z // cell_size)
+            try:
+                cells[cell].append(index)
+            except KeyError:
+                cells[cell] = [index]
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def _get_cell(self, point: Point) -> Cell:
+        size = self.cell_size
+        return point[0] // size, point[1] // size, point[2] // size
+
+    def add(self, point: Point) -> int:
+        """Add a point to the grid.
+
+        :param point: Coordinates.
+        :return: Index of the point.
+        """
+        index = len(self.points)
+        self.points.append(point)
+        self.cells.setdefault(self._get_cell(point), []).append(index)
+        return index
+
+    def get_nearby_cells(self, point: Point) -> List[List[int]]:
+        """Return the point indices in the cell of the coordinates and around it.
+
+        These include every point within the cell size of the coordinates.
+
+        :param point: Coordinates.
+        :return: Non-empty lists of point indices, one per cell.
+        """
+        cx, cy, cz = self._get_cell(point)
+        cells = self.cells
+        return [
+            cells[cell]
+            for cell in [(cx + dx, cy + dy, cz + dz) for dx, dy, dz in _OFFSETS]
+            if cell in cells
+        ]
+
+    def iter_neighbors(
+        self, point: Point, radius: float
+    ) -> Iterator[Tuple[int, float]]:
+        """Yield the points within a radius of the given coordinates.
+
+        :param point: Coordinates.
+        :param radius: Search radius (at most the cell size).
+        :return: Iterator of point indices and distances, in no particular order.
+        :raise ValueError: If the radius is larger than the cell size.
+        """
+        if radius > self.cell_size:
+            raise ValueError("Search radius must not exceed the grid cell size")
+        return self.iter_within(point, radius)
+
+    def iter_within(self, point: Point, radius: float) -> Iterator[Tuple[int, float]]:
+        """Yield the points within any radius of the given coordinates.
+
+        Unlike iter_neighbors, the radius may exceed the cell size, in which
+        case every cell within reach of the radius is visited (or every cell,
+        if there are fewer).
+
+        :param point: Coordinates.
+        :param radius: Search radius.
+        :return: Iterator of point indices and distances, in no particular order.
+        """
+        reach = max(1, ceil(radius / self.cell_size))
+        if reach == 1:
+            cells = self.get_nearby_cells(point)
+        elif (2 * reach + 1) ** 3 > len(self.cells):
+            cells = list(self.cells.values())
+        else:
+            cx, cy, cz = self._get_cell(point)
+            steps = range(-reach, reach + 1)
+            cells = [
+                self.cells[cell]
+                for cell in [
+                    (cx + dx, cy + dy, cz + dz)
+                    for dx in steps
+                    for dy in steps
+                    for dz in steps
+                ]
+                if cell in self.cells
+            ]
+        x, y, z = point
+        points = self.points
+        limit = radius * radius
+        for cell in cells:
+            for index in cell:
+                px, py, pz = points[index]
+                distance = (px - x) ** 2 + (py - y) ** 2 + (pz - z) ** 2
+                if distance < limit:
+                    yield index, sqrt(distance)
+
+
+def iter_close_pairs(
+    points: Sequence[Point], radius: float
+) -> Iterator[Tuple[int, int, float]]:
+    """Yield every pair of points closer than a radius to each other.
+
+    :param points: Coordinates.
+    :param radius: Distance threshold (positive number).
+    :return: Iterator of index pairs (lower index first) and their distances.
+    """
+    grid = PointGrid(radius)
+    for index, point in enumerate(points):
+        for other, distance in grid.iter_neighbors(point, radius):
+            yield other, index, distance
+        grid.add(point)
@@ -0,0 +1,466 @@
+"""Readers and writers of palette files.
+
+Palette files are read and written as streams of swatches (hex code and
+name, which is empty if the format or file has none), so large files are
+never held in memory as a whole. Hex codes are normalized to 6 uppercase
+digits.
+
+Supported formats are JSON (an array of hex codes, or an object with a
+"colors" array), GIMP palettes (.gpl), Adobe Swatch Exchange (.ase) and
+CSS custom properties (e.g. "--brand-red: #E10600;"). ASE files are
+memory-mapped and parsed with struct over a memoryview, so blocks are
+never copied.
+"""
+
+import json
+import mmap
+import os
+import re
+import struct
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from colorpedia.config import MIN_POOL_FILE_COUNT
+from colorpedia.converters import cmyk_to_rgb, lab_to_rgb
+from colorpedia.exceptions import PaletteFileError
+from colorpedia.hexcodes import HEX_REGEX
+
+Swatch = Tuple[str, str]
+
+PALETTE_FILE_EXTENSIONS = (".json", ".gpl", ".ase", ".css")
+PALETTE_EXPORT_FORMATS = tuple(extension[1:] for extension in PALETTE_FILE_EXTENSIONS)
+
+ASE_SIGNATURE = b"ASEF"
+# Signature, major and minor version and block count.
+ASE_HEADER = struct.Struct(">4sHHI")
+# Block type and length.
+ASE_BLOCK_HEADER = struct.Struct(">HI")
+ASE_COLOR_BLOCK = 0x0001
+ASE_NORMAL_COLOR = 2
+# Struct of the values of each ASE color model.
+ASE_COLOR_MODELS = {
+    b"RGB ": struct.Struct(">3f"),
+    b"CMYK": struct.Struct(">4f"),
+    b"LAB ": struct.Struct(">3f"),
+    b"Gray": struct.Struct(">f"),
+}
+
+_hex_regex = re.compile(HEX_REGEX)
+_css_property_regex = re.compile(
+    r"--([\w-]+)\s*:\s*#([0-9a-fA-F]{6}|[0-9a-fA-F]{3})\s*(?=[;}]|$)"
+)
+
+
+def normalize_swatch_hex_code(value: Any) -> str:
+    """Normalize a hex code in a palette file.
+
+    :param value: Hex code with or without the hash prefix (3 or 6 digits).
+    :return: Hex code with 6 uppercase digits.
+    :raise ValueError: If the value is not a hex code.
+    """
+    if isinstance(value, str):
+        value = value.strip()
+        if value.startswith("#"):
+            value = value[1:]
+        if _hex_regex.match(value):
+            if len(value) == 3:
+                value = "".join(digit * 2 for digit in value)
+            return value.upper()
+    raise ValueError(f"Bad hex code {json.dumps(value)}")
+
+
+def read_json_palette(fp: IO[str]) -> Iterator[Swatch]:
+    """Read the swatches of a JSON palette.
+
+    :param fp: Text stream.
+    :return: Iterator of hex codes and names (always empty).
+    :raise ValueError: If the data is not a JSON palette.
+    """
+    data = json.load(fp)
+    if isinstance(data, dict):
+        data = data.get("colors")
+    if not isinstance(data, list):
+        raise ValueError('expecting an array of hex codes or a "colors" array')
+    for value in data:
+        yield normalize_swatch_hex_code(value), ""
+
+
+def read_gpl_palette(fp: IO[str]) -> Iterator[Swatch]:
+    """Read the swatches of a GIMP palette.
+
+    :param fp: Text stream.
+    :return: Iterator of hex codes and names.
+    :raise ValueError: If the data is not a GIMP palette.
+    """
+    if fp.readline().strip() != "GIMP Palette":
+        raise ValueError('expecting "GIMP Palette" on line 1')
+    for number, line in enumerate(fp, start=2):
+        line = line.strip()
+        if not line or line.startswith("#") or line.startswith(("Name:", "Columns:")):
+            continue
+        parts = line.split(None, 3)
+        try:
+            rgb = [int(value) for value in parts[:3]]
+        except ValueError:
+            rgb = []
+        if len(rgb) != 3 or not all(0 <= value <= 255 for value in rgb):
+            raise ValueError(f"expecting RGB values on line {number}")
+        name = parts[3] if len(parts) == 4 else ""
+        yield "{:02X}{:02X}{:02X}".format(*rgb), name
+
+
+def _clamp(value: float) -> int:
+    return 0 if value < 0 else 255 if value > 255 else round(value)
+
+
+def _get_ase_hex_code(model: bytes, values: Tuple[float, ...]) -> str:
+    if model == b"RGB ":
+        rgb = tuple(_clamp(value * 255) for value in values)
+    elif model == b"Gray":
+        rgb = (_clamp(values[0] * 255),) * 3
+    elif model == b"CMYK":
+        rgb = cmyk_to_rgb(*(min(max(value, 0.0), 1.0) for value in values))
+    else:
+        rgb = lab_to_rgb(values[0] * 100, values[1], values[2])
+    return "{:02X}{:02X}{:02X}".format(*rgb)
+
+
+def read_ase_palette(data: Union[bytes, mmap.mmap]) -> Iterator[Swatch]:
+    """Read the swatches of an Adobe Swatch Exchange (ASE) palette.
+
+    Group blocks are skipped, so colors in groups are read as if they were
+    not grouped. RGB, CMYK, LAB and gray colors are converted to RGB.
+
+    :param data: ASE data.
+    :return: Iterator of hex codes and names.
+    :raise ValueError: If the data is not an ASE palette.
+    """
+    with memoryview(data) as view:
+        if len(view) < ASE_HEADER.size:
+            raise ValueError("truncated ASE data")
+        signature, version, _, block_count = ASE_HEADER.unpack_from(view)
+        if signature != ASE_SIGNATURE or version != 1:
+            raise ValueError("expecting ASE version 1 data")
+
+        offset = ASE_HEADER.size
+        for _ in range(block_count):
+            if offset + ASE_BLOCK_HEADER.size > len(view):
+                raise ValueError("truncated ASE data")
+            block_type, length = ASE_BLOCK_HEADER.unpack_from(view, offset)
+            offset += ASE_BLOCK_HEADER.size
+            end = offset + length
+            if end > len(view):
+                raise ValueError("truncated ASE data")
+            if block_type == ASE_COLOR_BLOCK:
+                # Release the block view before yielding or raising, so a
+                # memory map can be closed even if a traceback is kept.
+                with view[offset:end] as block:
+                    swatch = _read_ase_color(block)
+                yield swatch
+            offset = end
+
+
+def _read_ase_color(block: memoryview) -> Swatch:
+    try:
+        (name_length,) = struct.unpack_from(">H", block)
+        model_start = 2 + name_length * 2
+        name = str(block[2:model_start], "utf-16-be").rstrip("\0")
+        model = block[model_start : model_start + 4].tobytes()
+        values_struct = ASE_COLOR_MODELS[model]
+        values = values_struct.unpack_from(block, model_start + 4)
+    except KeyError:
+        raise ValueError(f"unknown ASE color model {model!r}")
+    except (struct.error, UnicodeError):
+        raise ValueError("bad ASE color block")
+    return _get_ase_hex_code(model, values), name
+
+
+def read_css_palette(fp: IO[str]) -> Iterator[Swatch]:
+    """Read the swatches of CSS custom properties with hex code values.
+
+    Other declarations (e.g. "--gap: 4px;") are skipped.
+
+    :param fp: Text stream.
+    :return: Iterator of hex codes and property names (without dashes).
+    """
+    for line in fp:
+        for match in _css_property_regex.finditer(line):
+            name, hex_code = match.groups()
+            yield normalize_swatch_hex_code(hex_code), name
+
+
+def iter_palette_file(path: Path) -> Iterator[Swatch]:
+    """Read the swatches of a palette file, in the format of its extension.
+
+    :param path: Path to the palette file.
+    :return: Iterator of hex codes and names.
+    :raise PaletteFileError: If the file cannot be read or parsed.
+    """
+    extension = path.suffix.lower()
+    if extension not in PALETTE_FILE_EXTENSIONS:
+        raise PaletteFileError(f"Cannot load {path}: unknown palette file extension")
+    try:
+        if extension == ".ase":
+            with open(path, "rb") as fp:
+                if os.fstat(fp.fileno()).st_size == 0:
+                    raise ValueError("truncated ASE data")
+                with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    yield from read_ase_palette(data)
+        else:
+            with open(path, "r", encoding="utf-8") as fp:
+                if extension == ".json":
+                    yield from read_json_palette(fp)
+                elif extension == ".gpl":
+                    yield from read_gpl_palette(fp)
+                else:
+                    yield from read_css_palette(fp)
+    except (OSError, ValueError) as err:
+        raise PaletteFileError(f"Cannot load {path}", err)
+
+
+def read_palette_file(path: Path) -> Tuple[str, ...]:
+    """Return the distinct hex codes in a palette file.
+
+    :param path: Path to the palette file.
+    :return: Hex codes in order of first appearance.
+    :raise PaletteFileError: If the file cannot be read or parsed, or has
+        no colors.
+    """
+    hex_codes = tuple(dict.fromkeys(code for code, _ in iter_palette_file(path)))
+    if not hex_codes:
+        raise PaletteFileError(f"Cannot load {path}: no colors")
+    return hex_codes
+
+
+def _get_swatch_name(name: str, index: int, swatch_name: str) -> str:
+    return swatch_name or f"{name}-{index}"
+
+
+def write_json_palette(fp: IO[str], swatches: Iterable[Swatch], name: str) -> None:
+    """Write swatches as a JSON array of hex codes.
+
+    :param fp: Text stream.
+    :param swatches: Hex codes and names (names are not written).
+    :param name: Palette name (not written).
+    """
+    fp.write("[")
+    for index, (hex_code, _) in enumerate(swatches):
+        fp.write(f'{", " if index else ""}"#{hex_code}"')
+    fp.write("]\n")
+
+
+def write_gpl_palette(fp: IO[str], swatches: Iterable[Swatch], name: str) -> None:
+    """Write swatches as a GIMP palette.
+
+    :param fp: Text stream.
+    :param swatches: Hex codes and names. Unnamed swatches are named after
+        the palette and their position (e.g. "nord-1").
+    :param name: Palette name.
+    """
+    fp.write(f"GIMP Palette\nName: {name}\n#\n")
+    for index, (hex_code, swatch_name) in enumerate(swatches, start=1):
+        r, g, b = (int(hex_code[i : i + 2], 16) for i in (0, 2, 4))
+        swatch_name = _get_swatch_name(name, index, swatch_name)
+        fp.write(f"{r:3d} {g:3d} {b:3d}\t{swatch_name}\n")
+
+
+def write_ase_palette(fp: IO[bytes], swatches: Iterable[Swatch], name: str) -> None:
+    """Write swatches as an Adobe Swatch Exchange (ASE) palette of RGB colors.
+
+    The block count comes first, so blocks are built before writing.
+
+    :param fp: Binary stream.
+    :param swatches: Hex codes and names. Unnamed swatches are named after
+        the palette and their position (e.g. "nord-1").
+    :param name: Palette name.
+    """
+    rgb_struct = ASE_COLOR_MODELS[b"RGB "]
+    blocks = []
+    for index, (hex_code, swatch_name) in enumerate(swatches, start=1):
+        encoded_name = (_get_swatch_name(name, index, swatch_name) + "\0").encode(
+            "utf-16-be"
+        )
+        rgb = (int(hex_code[i : i + 2], 16) / 255 for i in (0, 2, 4))
+        block = b"".join(
+            (
+                struct.pack(">H", len(encoded_name) // 2),
+                encoded_name,
+                b"RGB ",
+                rgb_struct.pack(*rgb),
+                struct.pack(">H", ASE_NORMAL_COLOR),
+            )
+        )
+        blocks.append(ASE_BLOCK_HEADER.pack(ASE_COLOR_BLOCK, len(block)) + block)
+
+    fp.write(ASE_HEADER.pack(ASE_SIGNATURE, 1, 0, len(blocks)))
+    fp.writelines(blocks)
+
+
+def _get_css_property_name(name: str) -> str:
+    return re.sub(r"[^\w-]+", "-", name.strip().lower()).strip("-")
+
+
+def write_css_palette(fp: IO[str], swatches: Iterable[Swatch], name: str) -> None:
+    """Write swatches as CSS custom properties of the root element.
+
+    :param fp: Text stream.
+    :param swatches: Hex codes and names. Property names are derived from
+        swatch names (e.g. "Brand Red" becomes "--brand-red"). Unnamed
+        swatches are named after the palette and their position (e.g.
+        "--nord-1"), as are swatches with duplicate names.
+    :param name: Palette name.
+    """
+    property_names = set()
+    fp.write(":root {\n")
+    for index, (hex_code, swatch_name) in enumerate(swatches, start=1):
+        property_name = _get_css_property_name(swatch_name)
+        if not property_name or property_name in property_names:
+            property_name = _get_css_property_name(f"{name}-{index}")
+        property_names.add(property_name)
+        fp.write(f"  --{property_name}: #{hex_code};\n")
+    fp.write("}\n")
+
+
+def write_palette(
+    fp: IO[str], swatches: Iterable[Swatch], name: str, export_format: str
+) -> None:
+    """Write swatches in a palette file format.
+
+    The binary ASE format is written to the underlying buffer of the stream.
+
+    :param fp: Text stream (e.g. sys.stdout).
+    :param swatches: Hex codes and names.
+    :param name: Palette name.
+    :param export_format: One of json, gpl, ase or css.
+    :raise ValueError: If the format is unknown.
+    """
+    if export_format == "ase":
+        fp.flush()
+        write_ase_palette(fp.buffer, swatches, name)  # type: ignore
+        fp.buffer.flush()  # type: ignore
+    elif export_format == "json":
+        write_json_palette(fp, swatches, name)
+    elif export_format == "gpl":
+        write_gpl_palette(fp, swatches, name)
+    elif export_format == "css":
+        write_css_palette(fp, swatches, name)
+    else:
+        raise ValueError(f'Unknown palette file format "{export_format}"')
+
+
+def convert_palette_file(source: Path, target: Path) -> int:
+    """Convert a palette file to the format of another file's extension.
+
+    The target file is replaced atomically.
+
+    :param source: Path to the palette file.
+    :param target: Path to the converted palette file.
+    :return: Number of swatches.
+    :raise PaletteFileError: If the source file cannot be read or parsed,
+        or has no colors.
+    :raise OSError: If the target file cannot be written.
+    """
+    swatches = list(iter_palette_file(source))
+    if not swatches:
+        raise PaletteFileError(f"Cannot load {source}: no colors")
+
+    export_format = target.suffix.lower()[1:]
+    if export_format not in PALETTE_EXPORT_FORMATS:
+        raise PaletteFileError(f"Cannot save {target}: unknown palette file extension")
+    name = source.stem.lower()
+    binary = export_format == "ase"
+    fd, tmp_path = tempfile.mkstemp(dir=target.parent, suffix=".tmp")
+    try:
+        with os.fdopen(
+            fd, "wb" if binary else "w", encoding=None if binary else "utf-8"
+        ) as fp:
+            if binary:
+                write_ase_palette(fp, swatches, name)
+            else:
+                write_palette(fp, swatches, name, export_format)
+        os.replace(tmp_path, target)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return len(swatches)
+
+
+def _convert_palette_file_safely(args: Tuple[Path, Path]) -> Optional[int]:
+    try:
+        return convert_palette_file(*args)
+    except (OSError, PaletteFileError):
+        return None
+
+
+def iter_palette_paths(paths: Iterable[Path]) -> Iterator[Path]:
+    """Expand directories to the palette files directly in them.
+
+    :param paths: File and directory paths.
+    :return: Iterator of file paths, in sorted order per directory.
+    """
+    for path in paths:
+        if path.is_dir():
+            for child in sorted(path.iterdir()):
+                if child.suffix.lower() in PALETTE_FILE_EXTENSIONS and child.is_file():
+                    yield child
+        else:
+            yield path
+
+
+def _remove_shadowing_files(directory: Path, targets: Dict[str, Path]) -> None:
+    for child in directory.iterdir():
+        target = targets.get(child.stem.lower())
+        if (
+            target is not None
+            and child.name != target.name
+            and child.suffix.lower() in PALETTE_FILE_EXTENSIONS
+            and child.is_file()
+            and not child.samefile(target)  # Case-insensitive file systems.
+        ):
+            child.unlink()
+
+
+def convert_palette_files(
+    paths: Iterable[Path],
+    directory: Path,
+    extension: str = ".gpl",
+    workers: Optional[int] = None,
+) -> List[Tuple[Path, Optional[int]]]:
+    """Convert palette files into a directory, in parallel.
+
+    Each file is converted to a file named after its palette (the file name
+    without extension in lowercase) in the target directory. Of several
+    files with the same palette name, only the first one is converted.
+    Other palette files of a converted palette in the target directory are
+    removed, since the first of them by name would shadow the new file.
+
+    :param paths: Palette files and directories of palette files.
+    :param directory: Target directory (created if missing).
+    :param extension: Extension of the target files (default: .gpl).
+    :param workers: Max number of worker processes (default: CPU count).
+    :return: List of (path, number of swatches) tuples. The number is None
+        if the file could not be converted.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    targets: Dict[Path, Path] = {}
+    for path in iter_palette_paths(paths):
+        targets.setdefault(directory / f"{path.stem.lower()}{extension}", path)
+    jobs = [(path, target) for target, path in targets.items()]
+
+    if len(jobs) < MIN_POOL_FILE_COUNT or workers == 1:
+        results = list(map(_convert_palette_file_safely, jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(
+                executor.map(_convert_palette_file_safely, jobs, chunksize=8)
+            )
+    converted = {
+        target.stem: target
+        for (_, target), result in zip(jobs, results)
+        if result is not None
+    }
+    if converted:
+        _remove_shadowing_files(directory, converted)
+    return [(path, result) for (path, _), result in zip(jobs, results)]
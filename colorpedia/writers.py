@@ -0,0 +1,370 @@
+import csv
+import struct
+import sys
+from array import array
+from itertools import chain, islice
+from json import dumps as json_dumps
+from typing import (
+    IO,
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Set,
+    TextIO,
+    Tuple,
+    Union,
+)
+
+from colorpedia.arrays import ColorArray
+from colorpedia.config import FULL_FLOAT_PRECISION, Config
+
+Keys = Union[FrozenSet[str], Set[str]]
+# A color array, or an iterable of color arrays written one after another.
+Colors = Union[ColorArray, Iterable[ColorArray]]
+
+# Number of JSON objects formatted per write to the output stream.
+JSON_CHUNK_SIZE = 1024
+# Output formats written as bytes rather than text.
+BINARY_FORMATS = frozenset(("binary", "columnar"))
+
+# Table columns for each JSON key, in the same order as Color.get_dict.
+KEY_COLUMNS = (
+    ("hex", ("hex",)),
+    ("rgb", ("r", "g", "b")),
+    ("hsl", ("hsl_h", "hsl_s", "hsl_l")),
+    ("hsv", ("hsv_h", "hsv_s", "hsv_v")),
+    ("cmyk", ("cmyk_c", "cmyk_m", "cmyk_y", "cmyk_k")),
+    ("name", ("name",)),
+    ("is_name_exact", ("is_name_exact",)),
+)
+
+COLUMNAR_MAGIC = b"CLRP"
+COLUMNAR_VERSION = 1
+COLUMNAR_HEADER = struct.Struct("<4sBIB")
+# Column types: unsigned byte, 32-bit float, boolean and UTF-8 string.
+COLUMNAR_TYPES = {"B": "B", "f": "f", "?": "B", "s": "I"}
+
+
+def round_floats(value: Any, precision: int) -> Any:
+    """Round floats in a JSON-serializable value.
+
+    :param value: Float, or a list, tuple or dictionary containing floats.
+    :param precision: Number of decimal places.
+    :return: Value with rounded floats.
+    """
+    if precision >= FULL_FLOAT_PRECISION:
+        return value
+    if isinstance(value, float):
+        return round(value, precision)
+    if isinstance(value, (list, tuple)):
+        return [round_floats(item, precision) for item in value]
+    if isinstance(value, dict):
+        return {key: round_floats(item, precision) for key, item in value.items()}
+    return value
+
+
+def get_column_names(keys: Keys) -> List[str]:
+    """Return the table column names for JSON keys.
+
+    :param keys: JSON keys.
+    :return: Column names.
+    """
+    return [name for key, names in KEY_COLUMNS if key in keys for name in names]
+
+
+def _iter_chunks(colors: Colors) -> Iterable[ColorArray]:
+    return (colors,) if isinstance(colors, ColorArray) else colors
+
+
+def _get_table_columns(colors: ColorArray, keys: Keys) -> List[Tuple[str, Any]]:
+    columns: List[Tuple[str, Any]] = []
+    if "hex" in keys:
+        columns.append(("s", colors.hex_codes))
+    if "rgb" in keys:
+        columns.extend((("B", colors.r), ("B", colors.g), ("B", colors.b)))
+    for key in ("hsl", "hsv", "cmyk"):
+        if key in keys:
+            values = getattr(colors, key)
+            size = 4 if key == "cmyk" else 3
+            columns.extend(("f", [v[i] for v in values]) for i in range(size))
+    if "name" in keys:
+        columns.append(("s", ["/".join(names) for names, _ in colors.names]))
+    if "is_name_exact" in keys:
+        columns.append(("?", [is_exact for _, is_exact in colors.names]))
+    return columns
+
+
+def _encode_numbers(values: Iterable[Any], precision: int) -> List[str]:
+    if precision < FULL_FLOAT_PRECISION:
+        values = [round(value, precision) for value in values]
+    # Values repeat often (e.g. hue and saturation of shades), and formatting
+    # floats with repr (the same as the json module) is relatively slow. Only
+    # non-zero floats are cached, as 0, 0.0 and -0.0 (or 1 and 1.0) are equal
+    # keys with different representations.
+    encoded: Dict[float, str] = {}
+    result = []
+    for value in values:
+        if type(value) is float and value:
+            text = encoded.get(value)
+            if text is None:
+                text = encoded[value] = repr(value)
+            result.append(text)
+        else:
+            result.append(repr(value))
+    return result
+
+
+def iter_json_objects(colors: ColorArray, keys: Keys, precision: int) -> Iterator[str]:
+    """Yield the JSON object of each color.
+
+    Objects are formatted from the color columns with a template of
+    precomputed key fragments instead of building a dictionary per color.
+    The output is identical to json.dumps of Color.get_dict (with floats
+    rounded to the given precision).
+
+    :param colors: Colors.
+    :param keys: JSON keys.
+    :param precision: Number of decimal places for floats.
+    :return: Iterator of JSON objects.
+    """
+    fragments = []
+    columns: List[Iterable[Any]] = []
+    if "hex" in keys:
+        fragments.append('"hex": "%s"')
+        columns.append(colors.hex_codes)
+    if "rgb" in keys:
+        fragments.append('"rgb": [%d, %d, %d]')
+        columns.extend((colors.r, colors.g, colors.b))
+    for key in ("hsl", "hsv", "cmyk"):
+        if key in keys:
+            values = getattr(colors, key)
+            size = 4 if key == "cmyk" else 3
+            fragments.append(f'"{key}": [{", ".join(["%s"] * size)}]')
+            if values:
+                columns.extend(_encode_numbers(c, precision) for c in zip(*values))
+            else:
+                columns.extend([] for _ in range(size))
+    if "name" in keys:
+        encoded_names: Dict[Tuple[str, ...], str] = {}
+        for names, _ in colors.names:
+            if names not in encoded_names:
+                encoded_names[names] = json_dumps("/".join(names))
+        fragments.append('"name": %s')
+        columns.append([encoded_names[names] for names, _ in colors.names])
+    if "is_name_exact" in keys:
+        fragments.append('"is_name_exact": %s')
+        columns.append(["true" if exact else "false" for _, exact in colors.names])
+
+    template = "{" + ", ".join(fragments) + "}"
+    return (template % row for row in zip(*columns))
+
+
+def write_json(
+    fp: TextIO,
+    colors: Colors,
+    keys: Keys,
+    precision: int,
+    chunk_size: int = JSON_CHUNK_SIZE,
+) -> None:
+    """Write colors as a JSON array of objects.
+
+    Objects are written to the stream in chunks as they are formatted.
+
+    :param fp: Text stream.
+    :param colors: Color array or iterable of color arrays.
+    :param keys: JSON keys.
+    :param precision: Number of decimal places for floats.
+    :param chunk_size: Number of objects per write.
+    """
+    objects = chain.from_iterable(
+        iter_json_objects(chunk, keys, precision) for chunk in _iter_chunks(colors)
+    )
+    separator = "["
+    while True:
+        chunk = ", ".join(islice(objects, chunk_size))
+        if not chunk:
+            break
+        fp.write(separator + chunk)
+        separator = ", "
+    fp.write("[]\n" if separator == "[" else "]\n")
+
+
+def write_json_matrix(
+    fp: TextIO, rows: Iterable[ColorArray], keys: Keys, precision: int
+) -> None:
+    """Write rows of colors as a JSON array of arrays of objects.
+
+    Each row is written to the stream as soon as it is formatted.
+
+    :param fp: Text stream.
+    :param rows: Color arrays, one per row.
+    :param keys: JSON keys.
+    :param precision: Number of decimal places for floats.
+    """
+    separator = "["
+    for row in rows:
+        fp.write(separator + "[" + ", ".join(iter_json_objects(row, keys, precision)))
+        fp.write("]")
+        separator = ", "
+    fp.write("[]\n" if separator == "[" else "]\n")
+
+
+def write_binary(fp: IO[bytes], colors: Colors) -> None:
+    """Write colors as packed RGB24 bytes (no header).
+
+    :param fp: Binary stream.
+    :param colors: Color array or iterable of color arrays.
+    """
+    for chunk in _iter_chunks(colors):
+        data = bytearray(len(chunk) * 3)
+        data[0::3] = chunk.r
+        data[1::3] = chunk.g
+        data[2::3] = chunk.b
+        fp.write(data)
+
+
+def write_delimited(
+    fp: TextIO, colors: Colors, keys: Keys, precision: int, delimiter: str
+) -> None:
+    """Write colors as CSV or TSV with a header row.
+
+    :param fp: Text stream.
+    :param colors: Color array or iterable of color arrays.
+    :param keys: JSON keys selecting the columns.
+    :param precision: Number of decimal places for floats.
+    :param delimiter: Field delimiter.
+    """
+    writer = csv.writer(fp, delimiter=delimiter, lineterminator="\n")
+    writer.writerow(get_column_names(keys))
+    for chunk in _iter_chunks(colors):
+        columns = [values for _, values in _get_table_columns(chunk, keys)]
+        if precision < FULL_FLOAT_PRECISION:
+            columns = [round_floats(values, precision) for values in columns]
+        writer.writerows(zip(*columns))
+
+
+def write_columnar(fp: IO[bytes], colors: Colors, keys: Keys) -> None:
+    """Write colors in the columnar format.
+
+    The file starts with a header (magic, version, row count and column
+    count) followed by the name and type of each column. Column data comes
+    next, one column after another, in little-endian byte order. Strings are
+    stored as row count + 1 offsets into a UTF-8 blob. The row count comes
+    first, so chunks of colors are concatenated before writing.
+
+    :param fp: Binary stream.
+    :param colors: Color array or iterable of color arrays.
+    :param keys: JSON keys selecting the columns.
+    """
+    if not isinstance(colors, ColorArray):
+        colors = ColorArray.concatenate(colors)
+    names = get_column_names(keys)
+    columns = _get_table_columns(colors, keys)
+
+    fp.write(
+        COLUMNAR_HEADER.pack(
+            COLUMNAR_MAGIC, COLUMNAR_VERSION, len(colors), len(columns)
+        )
+    )
+    for name, (type_code, _) in zip(names, columns):
+        encoded_name = name.encode("ascii")
+        fp.write(bytes((len(encoded_name),)) + encoded_name + type_code.encode())
+
+    for type_code, values in columns:
+        if type_code == "s":
+            blob = "".join(values).encode("utf-8")
+            offsets = array("I", [0])
+            for value in values:
+                offsets.append(offsets[-1] + len(value.encode("utf-8")))
+            _write_array(fp, offsets)
+            fp.write(blob)
+        else:
+            _write_array(fp, array(COLUMNAR_TYPES[type_code], values))
+
+
+def _write_array(fp: IO[bytes], values: "array[Any]") -> None:
+    if sys.byteorder == "big" and values.itemsize > 1:  # pragma: no cover
+        values = array(values.typecode, values)
+        values.byteswap()
+    fp.write(values.tobytes())
+
+
+def _read_array(fp: IO[bytes], typecode: str, size: int) -> "array[Any]":
+    values = array(typecode)
+    data = fp.read(values.itemsize * size)
+    if len(data) != values.itemsize * size:
+        raise ValueError("Truncated columnar data")
+    values.frombytes(data)
+    if sys.byteorder == "big" and values.itemsize > 1:  # pragma: no cover
+        values.byteswap()
+    return values
+
+
+def read_columnar(fp: IO[bytes]) -> Dict[str, List[Any]]:
+    """Read colors written by write_columnar.
+
+    :param fp: Binary stream.
+    :return: Column values by column name.
+    :raise ValueError: If the data is not in the columnar format.
+    """
+    header = fp.read(COLUMNAR_HEADER.size)
+    if len(header) != COLUMNAR_HEADER.size:
+        raise ValueError("Truncated columnar data")
+    magic, version, row_count, column_count = COLUMNAR_HEADER.unpack(header)
+    if magic != COLUMNAR_MAGIC or version != COLUMNAR_VERSION:
+        raise ValueError("Unknown columnar data format")
+
+    schema = []
+    for _ in range(column_count):
+        size = fp.read(1)
+        name = fp.read(size[0]).decode("ascii") if size else ""
+        type_code = fp.read(1).decode("ascii")
+        if type_code not in COLUMNAR_TYPES:
+            raise ValueError("Unknown columnar data format")
+        schema.append((name, type_code))
+
+    result: Dict[str, List[Any]] = {}
+    for name, type_code in schema:
+        values = _read_array(
+            fp, COLUMNAR_TYPES[type_code], row_count + (type_code == "s")
+        )
+        if type_code == "s":
+            blob = fp.read(values[-1])
+            result[name] = [
+                blob[values[i] : values[i + 1]].decode("utf-8")
+                for i in range(row_count)
+            ]
+        elif type_code == "?":
+            result[name] = [bool(value) for value in values]
+        else:
+            result[name] = values.tolist()
+    return result
+
+
+def write_colors(fp: TextIO, colors: Colors, config: Config) -> None:
+    """Write colors in config.output_format.
+
+    Binary formats are written to the underlying buffer of the stream.
+
+    :param fp: Text stream (e.g. sys.stdout).
+    :param colors: Color array or iterable of color arrays.
+    :param config: Configuration (output format, JSON keys and precision).
+    """
+    output_format = config.output_format
+    keys = config.json_keys
+    precision = config.float_precision
+    if output_format in BINARY_FORMATS:
+        fp.flush()
+        if output_format == "binary":
+            write_binary(fp.buffer, colors)
+        else:
+            write_columnar(fp.buffer, colors, keys)
+        fp.buffer.flush()
+    elif output_format in ("csv", "tsv"):
+        delimiter = "\t" if output_format == "tsv" else ","
+        write_delimited(fp, colors, keys, precision, delimiter)
+    else:
+        write_json(fp, colors, keys, precision)
@@ -32,7 +32,7 @@ setup(
             "mkdocs-material",
             "mypy>=0.790",
             "pre-commit>=2.9.3",
-            "pytest>=6.0.0",
+            "pytest>=6.2.0",
             "pytest-cov>=2.0.0",
             "types-dataclasses",
             "types-setuptools",
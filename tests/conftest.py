@@ -0,0 +1,60 @@
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from colorpedia import cache, members, names, search, similarity
+from colorpedia.config import DEFAULT_NAME_DICTIONARY
+from colorpedia.palettes import PALETTES
+
+
+@pytest.fixture(scope="session")
+def fixture_root(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    return tmp_path_factory.mktemp("fixtures")
+
+
+def make_dir(root: Path, prefix: str) -> Path:
+    # Faster than tmp_path_factory.mktemp, which lists the base directory.
+    return Path(tempfile.mkdtemp(prefix=prefix, dir=root))
+
+
+@pytest.fixture(autouse=True)
+def result_cache_dir(fixture_root: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    directory = make_dir(fixture_root, "cache") / "results"
+    monkeypatch.setattr(cache, "RESULT_CACHE_DIR", directory)
+    return directory
+
+
+@pytest.fixture(autouse=True)
+def palettes_dir(fixture_root: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    directory = make_dir(fixture_root, "palettes") / "palettes"
+    directory.mkdir()
+    monkeypatch.setattr(PALETTES, "directory", directory)
+    monkeypatch.setattr(PALETTES, "index_file", directory.parent / "palette-index.json")
+    return directory
+
+
+@pytest.fixture(autouse=True)
+def names_dir(fixture_root: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    directory = make_dir(fixture_root, "names") / "names"
+    directory.mkdir()
+    monkeypatch.setattr(names, "NAMES_DIR", directory)
+    monkeypatch.setattr(names, "NAME_INDEX_DIR", directory.parent / "index")
+    # The built-in dictionary and its search index are kept, since most tests
+    # name colors and building them for each test is slow.
+    default = DEFAULT_NAME_DICTIONARY
+    dictionaries = {default: names.load_name_dictionary(default)}
+    monkeypatch.setattr(names, "_dictionaries", dictionaries)
+    monkeypatch.setattr(names, "_active_name", default)
+    indexes = {k: v for k, v in search._indexes.items() if k == default}
+    monkeypatch.setattr(search, "_indexes", indexes)
+    return directory
+
+
+@pytest.fixture(autouse=True)
+def member_index_file(fixture_root: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    path = make_dir(fixture_root, "members") / "palette-members.idx"
+    monkeypatch.setattr(members, "MEMBER_INDEX_FILE", path)
+    monkeypatch.setattr(members, "_index", None)
+    monkeypatch.setattr(similarity, "_index", None)
+    return path
@@ -0,0 +1,5 @@
+from random import Random
+
+
+def get_random_hex_code(random: Random) -> str:
+    return f"{random.randrange(1 << 24):06X}"
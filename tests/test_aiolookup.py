@@ -0,0 +1,105 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Awaitable, Iterable, List, TypeVar
+
+import pytest
+
+from colorpedia import aiolookup
+from colorpedia.color import Color
+from colorpedia.config import Config
+from colorpedia.exceptions import InputValueError
+
+T = TypeVar("T")
+
+config = Config()
+config.json_keys = frozenset(("hex",))
+
+
+def run(coroutine: Awaitable[T]) -> T:
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+async def aiter_values(
+    values: Iterable[Any], consumed: List[Any]
+) -> AsyncIterator[Any]:
+    for value in values:
+        consumed.append(value)
+        await asyncio.sleep(0)
+        yield value
+
+
+async def collect(results: AsyncIterator[Any]) -> List[Any]:
+    return [result async for result in results]
+
+
+@pytest.mark.parametrize("chunk_size", (1, 3, 256))
+def test_from_hexes(chunk_size: int) -> None:
+    hex_codes = [f"{i:02x}{i:02x}{i:02x}" for i in range(20)]
+    consumed: List[str] = []
+    results = run(
+        collect(
+            aiolookup.from_hexes(
+                aiter_values(hex_codes, consumed), config, True, chunk_size
+            )
+        )
+    )
+    assert results == [{"hex": code.upper()} for code in hex_codes]
+    assert consumed == hex_codes
+
+
+def test_from_rgbs_and_hsls() -> None:
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        rgbs = run(
+            collect(
+                aiolookup.from_rgbs(
+                    aiter_values([(0, 0, 0), (255, 0, 0)], []), executor=executor
+                )
+            )
+        )
+        hsls = run(
+            collect(
+                aiolookup.from_hsls(
+                    aiter_values([(120, 100, 50)], []), chunk_size=1, executor=executor
+                )
+            )
+        )
+    assert rgbs == [Color(0, 0, 0), Color(255, 0, 0)]
+    assert hsls == [Color(0, 255, 0)]
+
+
+def test_backpressure() -> None:
+    chunk_size = 4
+    max_in_flight = 2
+    consumed: List[int] = []
+
+    async def consume_slowly() -> List[int]:
+        lags = []
+        values = aiter_values([(i, i, i) for i in range(100)], consumed)
+        results = aiolookup.from_rgbs(
+            values, chunk_size=chunk_size, max_in_flight=max_in_flight
+        )
+        count = 0
+        async for _ in results:
+            count += 1
+            await asyncio.sleep(0.001)
+            lags.append(len(consumed) - count)
+        return lags
+
+    lags = run(consume_slowly())
+    assert len(lags) == 100
+    assert max(lags) <= chunk_size * max_in_flight
+
+
+def test_bad_input() -> None:
+    with pytest.raises(InputValueError):
+        run(collect(aiolookup.from_hexes(aiter_values(["FFF", "FF"], []))))
+
+    with pytest.raises(InputValueError):
+        run(collect(aiolookup.from_hexes(aiter_values([], []), chunk_size=0)))
+
+    with pytest.raises(InputValueError):
+        run(collect(aiolookup.from_hexes(aiter_values([], []), max_in_flight=0)))
@@ -0,0 +1,197 @@
+import mmap
+from array import array
+from pathlib import Path
+
+import pytest
+
+from colorpedia.arrays import ColorArray, ColorView
+from colorpedia.color import Color
+from colorpedia.config import Config
+from colorpedia.converters import rgb_to_lab
+from colorpedia.formatters import format_get_view, format_list_view
+from colorpedia.palettes import PALETTES
+
+RGBS = [(0, 0, 0), (100, 100, 100), (255, 0, 0), (100, 100, 100), (72, 61, 139)]
+KEYS = frozenset(("hex", "rgb", "hsl", "hsv", "cmyk", "name", "is_name_exact"))
+
+
+def test_color_array_columns() -> None:
+    colors = ColorArray.from_rgbs(RGBS)
+    assert len(colors) == 5
+    assert colors.r == array("B", [0, 100, 255, 100, 72])
+    assert list(colors.iter_rgbs()) == RGBS
+    assert colors.hex_codes == ["000000", "646464", "FF0000", "646464", "483D8B"]
+    assert colors.hsl == [Color(*rgb).hsl for rgb in RGBS]
+    assert colors.hsv == [Color(*rgb).hsv for rgb in RGBS]
+    assert colors.cmyk == [Color(*rgb).cmyk for rgb in RGBS]
+    assert colors.names[1] == (("dimgray", "dimgrey"), False)
+    assert repr(colors) == "ColorArray(<5 colors>)"
+
+
+def test_color_array_from_hex_codes() -> None:
+    colors = ColorArray.from_hex_codes(PALETTES["molokai"])
+    assert colors.hex_codes == list(PALETTES["molokai"])
+
+
+def test_color_array_bad_columns() -> None:
+    with pytest.raises(ValueError):
+        ColorArray([0, 1], [0], [0])
+    with pytest.raises(OverflowError):
+        ColorArray([256], [0], [0])
+
+
+@pytest.mark.parametrize("rgb", RGBS)
+def test_color_view(rgb: tuple) -> None:
+    view = ColorArray.from_rgbs([rgb])[0]
+    color = Color(*rgb)
+    assert isinstance(view, ColorView)
+    assert view == color and color == view
+    assert hash(view) == hash(color)
+    assert (view.r, view.g, view.b) == (color.r, color.g, color.b)
+    assert view.rgb == color.rgb
+    assert view.hex == color.hex
+    assert view.hsl == color.hsl
+    assert view.hsv == color.hsv
+    assert view.cmyk == color.cmyk
+    assert view.names == color.names
+    assert view.name == color.name
+    assert view.is_name_exact == color.is_name_exact
+    assert view.get_dict(KEYS) == color.get_dict(KEYS)
+    assert list(view.get_dict(KEYS)) == list(color.get_dict(KEYS))
+    assert list(view.get_shades(5)) == list(color.get_shades(5))
+    assert view != rgb
+    assert repr(view) == "ColorView(r={}, g={}, b={})".format(*rgb)
+
+
+def test_color_view_formatting() -> None:
+    config = Config()
+    for view, rgb in zip(ColorArray.from_rgbs(RGBS), RGBS):
+        assert format_get_view(config, view) == format_get_view(config, Color(*rgb))
+        assert format_list_view(config, view) == format_list_view(config, Color(*rgb))
+
+
+def test_color_array_indexing() -> None:
+    colors = ColorArray.from_rgbs(RGBS)
+    assert colors[-1].rgb == (72, 61, 139)
+    with pytest.raises(IndexError):
+        colors[5]
+    with pytest.raises(IndexError):
+        colors[-6]
+
+    assert colors[1:3] == ColorArray.from_rgbs(RGBS[1:3])
+    assert colors[::-1] == ColorArray.from_rgbs(RGBS[::-1])
+    assert colors != RGBS
+
+    # Computed columns are carried over to slices.
+    assert colors.names
+    sliced = colors[1:3]
+    assert sliced._names == [(("dimgray", "dimgrey"), False), (("red",), True)]
+    assert sliced._hsl is None
+
+
+def test_color_array_filter_and_sort() -> None:
+    colors = ColorArray.from_rgbs(RGBS)
+    assert colors.hsl and colors.hsv and colors.cmyk and colors.names
+
+    exact = colors.filter(lambda color: color.is_name_exact)
+    assert list(exact.iter_rgbs()) == [(0, 0, 0), (255, 0, 0), (72, 61, 139)]
+    assert exact._names[1] == (("red",), True)
+
+    by_red = colors.sort(key=lambda color: color.r, reverse=True)
+    assert list(by_red.iter_rgbs()) == sorted(RGBS, reverse=True)
+    assert by_red.hsl == [Color(*rgb).hsl for rgb in by_red.iter_rgbs()]
+    assert by_red.hsv == [Color(*rgb).hsv for rgb in by_red.iter_rgbs()]
+    assert by_red.cmyk == [Color(*rgb).cmyk for rgb in by_red.iter_rgbs()]
+
+    assert list(colors.take([4, 0]).iter_rgbs()) == [(72, 61, 139), (0, 0, 0)]
+
+
+def test_color_array_get_dicts() -> None:
+    colors = ColorArray.from_rgbs(RGBS)
+    keys = frozenset(("hex", "name"))
+    assert colors.get_dicts(keys) == [Color(*rgb).get_dict(keys) for rgb in RGBS]
+    assert colors.get_dicts(KEYS) == [Color(*rgb).get_dict(KEYS) for rgb in RGBS]
+
+
+@pytest.mark.parametrize("size", (1, 2, 15))
+def test_color_array_iter_shades(size: int) -> None:
+    colors = ColorArray.from_hex_codes(PALETTES["css3"])
+    rows = list(colors.iter_shades(size))
+    assert len(rows) == len(colors)
+    for rgb, row in zip(colors.iter_rgbs(), rows):
+        assert row == ColorArray.from_rgbs(c.rgb for c in Color(*rgb).get_shades(size))
+
+    grays = ColorArray.from_rgbs([(0, 0, 0), (128, 128, 128), (255, 255, 255)])
+    first, *others = grays.iter_shades(size)
+    assert all(row is first for row in others) is (size > 1)
+
+
+def test_color_array_lab() -> None:
+    colors = ColorArray.from_rgbs(RGBS)
+    expected = [rgb_to_lab(*rgb) for rgb in RGBS]
+    assert colors.lab == expected
+    assert colors[1:].lab == expected[1:]
+    assert colors.take([2, 0]).lab == [expected[2], expected[0]]
+
+
+def test_color_array_concatenate() -> None:
+    colors = ColorArray.from_rgbs(RGBS)
+    assert ColorArray.concatenate([colors[:2], colors[2:2], colors[2:]]) == colors
+    assert len(ColorArray.concatenate([])) == 0
+
+
+def test_color_array_from_buffer() -> None:
+    buffer = bytearray(b"\x00\x00\x00\xff\x00\x00\x48\x3d\x8b")
+    colors = ColorArray.from_buffer(buffer)
+    assert list(colors.iter_rgbs()) == [(0, 0, 0), (255, 0, 0), (72, 61, 139)]
+    assert [color.name for color in colors] == ["black", "red", "darkslateblue"]
+    assert colors == ColorArray.from_rgbs(list(colors.iter_rgbs()))
+
+    # The buffer is not copied.
+    buffer[0] = 255
+    assert colors[0].rgb == (255, 0, 0)
+    assert isinstance(colors.r, memoryview)
+    assert colors[1:].r.obj is colors.r.obj
+
+
+def test_color_array_from_buffer_rgba32(tmp_path: Path) -> None:
+    path = tmp_path / "pixels.bin"
+    path.write_bytes(b"\x01\x02\x03\x80\x04\x05\x06\x00")
+    with open(path, "rb") as fp:
+        with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            colors = ColorArray.from_buffer(buffer, "rgba32")
+            assert list(colors.iter_rgbs()) == [(1, 2, 3), (4, 5, 6)]
+            del colors
+
+
+def test_color_array_from_buffer_stride() -> None:
+    buffer = b"\x01\x02\x03\xaa\xbb\x04\x05\x06"
+    colors = ColorArray.from_buffer(memoryview(buffer), "rgb24", stride=5)
+    assert list(colors.iter_rgbs()) == [(1, 2, 3), (4, 5, 6)]
+
+    colors = ColorArray.from_buffer(buffer[:5], "rgb24", stride=5)
+    assert list(colors.iter_rgbs()) == [(1, 2, 3)]
+
+    assert len(ColorArray.from_buffer(b"")) == 0
+
+
+def test_color_array_from_buffer_bad_input() -> None:
+    with pytest.raises(ValueError) as err:
+        ColorArray.from_buffer(b"\x00" * 3, "rgb48")
+    assert str(err.value) == 'Unknown buffer format "rgb48"'
+
+    with pytest.raises(ValueError) as err:
+        ColorArray.from_buffer(b"\x00" * 8, "rgba32", stride=3)
+    assert str(err.value) == "Stride must be at least 4 for rgba32"
+
+    with pytest.raises(ValueError) as err:
+        ColorArray.from_buffer(b"\x00" * 7, "rgba32")
+    assert str(err.value) == "Buffer size is not a whole number of pixels"
+
+
+def test_color_array_iter_buffer() -> None:
+    buffer = bytes(range(30))
+    chunks = list(ColorArray.iter_buffer(buffer, chunk_size=4))
+    assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+    assert chunks[2][1].rgb == (27, 28, 29)
+    assert all(isinstance(chunk.g, memoryview) for chunk in chunks)
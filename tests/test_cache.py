@@ -0,0 +1,87 @@
+import os
+import time
+from pathlib import Path
+
+from colorpedia import cache
+from colorpedia.cache import (
+    clear_cache,
+    evict_cached_results,
+    get_cache_key,
+    get_cache_stats,
+    load_cached_result,
+    save_cached_result,
+)
+from colorpedia.config import Config
+
+
+def test_get_cache_key() -> None:
+    key = get_cache_key("scan", b"foo")
+    assert len(key) == 64
+    assert key == get_cache_key("scan", b"foo")
+    assert key != get_cache_key("scan", b"bar")
+    assert key != get_cache_key("palette", b"foo")
+
+    config = Config()
+    key = get_cache_key("scan", b"foo", config, ["json_keys"])
+    assert key == get_cache_key("scan", b"foo", Config(), ["json_keys"])
+    assert key != get_cache_key("scan", b"foo", config, ["uppercase_hex_codes"])
+
+    config.uppercase_hex_codes = False
+    assert key == get_cache_key("scan", b"foo", config, ["json_keys"])
+    config.json_keys = frozenset(["hex"])
+    assert key != get_cache_key("scan", b"foo", config, ["json_keys"])
+
+
+def test_save_and_load_cached_result(result_cache_dir: Path) -> None:
+    key = get_cache_key("test", b"foo")
+    assert load_cached_result(key) is None
+
+    save_cached_result(key, {"foo": [1, 2, 3]})
+    assert load_cached_result(key) == {"foo": [1, 2, 3]}
+    assert os.listdir(result_cache_dir / key[:2]) == [f"{key}.json"]
+
+    save_cached_result(key, [])
+    assert load_cached_result(key) == []
+
+    (result_cache_dir / key[:2] / f"{key}.json").write_text("{")
+    assert load_cached_result(key) is None
+
+
+def test_cache_stats_and_clear(result_cache_dir: Path) -> None:
+    assert get_cache_stats() == {
+        "directory": str(result_cache_dir),
+        "entries": 0,
+        "size": 0,
+    }
+    assert clear_cache() == 0
+
+    for i in range(3):
+        save_cached_result(get_cache_key("test", bytes([i])), i)
+    assert get_cache_stats()["entries"] == 3
+    assert get_cache_stats()["size"] == 3
+
+    assert clear_cache() == 3
+    assert get_cache_stats()["entries"] == 0
+
+
+def test_evict_cached_results() -> None:
+    keys = [get_cache_key("test", bytes([i])) for i in range(5)]
+    for key in keys:
+        save_cached_result(key, "x" * 98)  # 100 bytes in JSON
+
+    # Make the entries look accessed in order, then access the first again.
+    now = time.time()
+    for i, key in enumerate(keys):
+        assert load_cached_result(key) is not None
+        path = cache.RESULT_CACHE_DIR / key[:2] / f"{key}.json"
+        os.utime(path, (now - 100 + i, now - 100 + i))
+    assert load_cached_result(keys[0]) is not None
+
+    assert evict_cached_results(1000) == 0
+    assert evict_cached_results(300) == 2
+    assert get_cache_stats()["size"] == 300
+    assert load_cached_result(keys[0]) is not None
+    assert load_cached_result(keys[1]) is None
+    assert load_cached_result(keys[2]) is None
+    assert load_cached_result(keys[3]) is not None
+    assert load_cached_result(keys[4]) is not None
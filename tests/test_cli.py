@@ -0,0 +1,27 @@
+import json
+
+import pytest
+
+from colorpedia.cli import print_color
+from colorpedia.color import Color
+from colorpedia.config import Config
+
+
+@pytest.mark.parametrize(
+    "config",
+    [
+        Config(default_shades_count=0, always_output_json=True),
+        Config(default_shades_count=0, output_format="json"),
+        Config(default_shades_count=0, always_output_json=True, output_format="json"),
+    ],
+)
+def test_print_color_json(config: Config, capsys: pytest.CaptureFixture) -> None:
+    print_color(config, Color(255, 0, 0))
+    data = json.loads(capsys.readouterr().out)
+    assert data == json.loads(json.dumps(Color(255, 0, 0).get_dict(config.json_keys)))
+
+
+def test_print_color_json_shades(capsys: pytest.CaptureFixture) -> None:
+    print_color(Config(output_format="json", default_shades_count=2), Color(255, 0, 0))
+    data = json.loads(capsys.readouterr().out)
+    assert [item["hex"] for item in data] == ["000000", "FFFFFF"]
@@ -48,6 +48,34 @@ def test_config_set_flag_json() -> None:
     assert config.always_output_json is True
 
 
+def test_config_set_flag_grid() -> None:
+    config = Config()
+    config.set_flags(grid=None)
+    assert config.always_output_grid is False
+
+    config = Config()
+    config.set_flags(grid=True)
+    assert config.always_output_grid is True
+
+    config = Config()
+    config.always_output_grid = True
+    config.set_flags(grid=False)
+    assert config.always_output_grid is False
+
+
+def test_config_set_flag_output() -> None:
+    config = Config()
+    config.set_flags(format=None, columns=None, precision=None)
+    assert config.output_format == "default"
+    assert config.json_keys == JSON_KEYS
+    assert config.float_precision == 17
+
+    config.set_flags(format="csv", columns=frozenset(("hex",)), precision=3)
+    assert config.output_format == "csv"
+    assert config.json_keys == frozenset(("hex",))
+    assert config.float_precision == 3
+
+
 def test_config_set_flag_all() -> None:
     config = Config()
     view_keys = frozenset(("name", "hex"))
@@ -0,0 +1,96 @@
+import pytest
+
+from colorpedia.arrays import ColorArray
+from colorpedia.contrast import (
+    get_contrast_level,
+    get_contrast_matrix,
+    get_contrast_ratio,
+    get_luminances,
+    get_text_colors,
+    iter_contrast_pairs,
+    iter_contrast_rows,
+)
+from colorpedia.palettes import PALETTES
+
+CSS3 = ColorArray.from_hex_codes(PALETTES["css3"])
+
+
+def test_get_luminances() -> None:
+    colors = ColorArray.from_rgbs([(0, 0, 0), (255, 255, 255), (255, 0, 0)])
+    assert list(get_luminances(colors)) == pytest.approx([0.0, 1.0, 0.2126])
+    assert len(get_luminances(colors[:0])) == 0
+
+
+@pytest.mark.parametrize(
+    ("l1", "l2", "ratio", "level"),
+    (
+        (0.0, 1.0, 21.0, "AAA"),
+        (1.0, 0.0, 21.0, "AAA"),
+        (0.5, 0.5, 1.0, None),
+        (0.0, 0.175, 4.5, "AA"),
+        (0.0, 0.3, 7.0, "AAA"),
+    ),
+)
+def test_get_contrast_ratio(l1: float, l2: float, ratio: float, level: str) -> None:
+    assert get_contrast_ratio(l1, l2) == pytest.approx(ratio)
+    assert get_contrast_level(round(get_contrast_ratio(l1, l2), 9)) == level
+
+
+def test_get_contrast_matrix() -> None:
+    luminances = get_luminances(CSS3)
+    matrix = get_contrast_matrix(CSS3)
+    assert len(matrix) == len(CSS3)
+    for i, row in enumerate(matrix):
+        assert len(row) == len(CSS3)
+        assert row[i] == 1.0
+        for j in range(0, len(row), 7):
+            assert row[j] == matrix[j][i]
+            assert row[j] == pytest.approx(
+                get_contrast_ratio(luminances[i], luminances[j])
+            )
+    assert list(iter_contrast_rows(get_luminances(CSS3[:0]))) == []
+
+
+@pytest.mark.parametrize("level", ("AA", "AAA"))
+def test_iter_contrast_pairs(level: str) -> None:
+    luminances = get_luminances(CSS3)
+    matrix = get_contrast_matrix(CSS3)
+    threshold = 4.5 if level == "AA" else 7.0
+    expected = {
+        frozenset((i, j))
+        for i, row in enumerate(matrix)
+        for j, ratio in enumerate(row)
+        if ratio >= threshold
+    }
+    pairs = list(iter_contrast_pairs(luminances, level))
+    assert len(pairs) == len(expected)
+    assert {frozenset((p.dark, p.light)) for p in pairs} == expected
+    for pair in pairs:
+        assert luminances[pair.dark] <= luminances[pair.light]
+        assert pair.ratio == pytest.approx(matrix[pair.dark][pair.light])
+        assert pair.level == get_contrast_level(pair.ratio)
+
+
+def test_iter_contrast_pairs_at_threshold() -> None:
+    # Black and #767676 are a well known 4.54:1 pair; white and #777777 4.48:1.
+    colors = ColorArray.from_rgbs([(255, 255, 255), (118, 118, 118), (119, 119, 119)])
+    pairs = list(iter_contrast_pairs(get_luminances(colors)))
+    assert [(p.dark, p.light, p.level) for p in pairs] == [(1, 0, "AA")]
+
+    with pytest.raises(ValueError) as err:
+        list(iter_contrast_pairs(get_luminances(colors), "A"))
+    assert str(err.value) == 'Unknown WCAG level "A"'
+
+
+def test_get_text_colors() -> None:
+    luminances = get_luminances(CSS3)
+    matrix = get_contrast_matrix(CSS3)
+    text_colors = get_text_colors(luminances)
+    assert [t.background for t in text_colors] == list(range(len(CSS3)))
+    for text_color in text_colors:
+        row = matrix[text_color.background]
+        assert text_color.text != text_color.background
+        assert text_color.ratio == pytest.approx(max(row))
+        assert text_color.level == get_contrast_level(text_color.ratio)
+
+    assert get_text_colors(get_luminances(CSS3[:1])) == []
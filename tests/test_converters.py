@@ -3,19 +3,24 @@ from typing import Tuple
 
 import pytest
 
+from colorpedia import palettes
 from colorpedia.converters import (
     cmyk_to_rgb,
     hex_to_rgb,
     hsl_to_rgb,
     hsl_to_rgb_shades,
     hsv_to_rgb,
+    lab_to_rgb,
     name_to_rgb,
+    oklab_to_rgb,
     palette_to_rgbs,
     rgb_to_cmyk,
     rgb_to_hex,
     rgb_to_hsl,
     rgb_to_hsv,
+    rgb_to_lab,
     rgb_to_names,
+    rgb_to_oklab,
 )
 from colorpedia.hexcodes import HEX_CODE_TO_NAMES
 
@@ -77,15 +82,19 @@ def test_rgb_name(name: str) -> None:
         assert name in names
         assert not is_name_exact_match
 
+    assert name_to_rgb(name.upper()) == (r, g, b)
+    assert name_to_rgb(f" {name[:4]}-{name[4:]} ") == (r, g, b)
+
     with pytest.raises(ValueError) as err:
         name_to_rgb(f"not {name}")
-    assert "Unknown color name" in str(err.value)
+    assert str(err.value) == f'Unknown color name "not {name}"'
 
 
 @pytest.mark.parametrize("palette", ("red", "green", "blue"))
 def test_palette_to_rgbs(palette: str) -> None:
     rgb = name_to_rgb(palette)
     assert rgb in palette_to_rgbs(palette)
+    assert palette_to_rgbs(palette, "hue") == palettes.palette_to_rgbs(palette, "hue")
 
     with pytest.raises(ValueError) as err:
         palette_to_rgbs(palette + "invalid")
@@ -108,3 +117,34 @@ def test_hsl_to_rgbs(h: float, s: float, l: float, shades_count: int) -> None:
     assert len(rgbs) == shades_count
     assert shades_count == 1 or (0, 0, 0) in rgbs
     assert shades_count == 1 or (255, 255, 255) in rgbs
+
+
+@pytest.mark.parametrize(("r", "g", "b"), RGB_VALS)
+def test_rgb_to_lab_to_rgb(r: int, g: int, b: int) -> None:
+    assert lab_to_rgb(*rgb_to_lab(r, g, b)) == (r, g, b)
+
+
+@pytest.mark.parametrize(("r", "g", "b"), RGB_VALS)
+def test_rgb_to_oklab_to_rgb(r: int, g: int, b: int) -> None:
+    assert oklab_to_rgb(*rgb_to_oklab(r, g, b)) == (r, g, b)
+
+
+def test_rgb_to_lab() -> None:
+    assert rgb_to_lab(0, 0, 0) == (0.0, 0.0, 0.0)
+    l, a, b = rgb_to_lab(255, 255, 255)
+    assert l == pytest.approx(100.0) and abs(a) < 0.01 and abs(b) < 0.01
+    l, a, b = rgb_to_lab(255, 0, 0)
+    assert (l, a, b) == pytest.approx((53.24, 80.09, 67.20), abs=0.01)
+
+
+def test_rgb_to_oklab() -> None:
+    l, a, b = rgb_to_oklab(255, 255, 255)
+    assert l == pytest.approx(1.0) and abs(a) < 1e-4 and abs(b) < 1e-4
+    l, a, b = rgb_to_oklab(0, 0, 255)
+    assert (l, a, b) == pytest.approx((0.4520, -0.0325, -0.3115), abs=1e-4)
+
+
+def test_lab_to_rgb_out_of_gamut() -> None:
+    assert lab_to_rgb(100.0, 0.0, -200.0)[2] == 255
+    assert oklab_to_rgb(-0.1, 0.0, 0.0) == (0, 0, 0)
+    assert oklab_to_rgb(1.1, 0.0, 0.0) == (255, 255, 255)
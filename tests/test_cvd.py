@@ -0,0 +1,63 @@
+from itertools import combinations
+
+import pytest
+
+from colorpedia.arrays import ColorArray
+from colorpedia.cvd import (
+    CVD_MATRICES,
+    find_confusable_pairs,
+    get_delta_e,
+    simulate_cvd,
+)
+from colorpedia.palettes import PALETTES
+
+CSS3 = ColorArray.from_hex_codes(PALETTES["css3"])
+
+
+@pytest.mark.parametrize("deficiency", CVD_MATRICES)
+def test_simulate_cvd(deficiency: str) -> None:
+    grays = ColorArray.from_rgbs([(0, 0, 0), (255, 255, 255)])
+    # Neutral colors look (almost) the same with any deficiency.
+    for (r, g, b), rgb in zip(
+        simulate_cvd(grays, deficiency).iter_rgbs(), grays.iter_rgbs()
+    ):
+        assert max(abs(r - rgb[0]), abs(g - rgb[1]), abs(b - rgb[2])) <= 1
+
+    simulated = simulate_cvd(CSS3, deficiency)
+    assert len(simulated) == len(CSS3)
+    assert simulated != CSS3
+
+
+def test_simulate_cvd_protan() -> None:
+    colors = ColorArray.from_rgbs([(255, 0, 0), (0, 255, 0), (255, 0, 0)])
+    simulated = list(simulate_cvd(colors, "protan").iter_rgbs())
+    assert simulated[0] == simulated[2]
+    # Red and green both look yellowish (red darker) with protanopia.
+    assert simulated[0][0] > simulated[0][2] and simulated[1][0] > simulated[1][2]
+
+    with pytest.raises(ValueError) as err:
+        simulate_cvd(colors, "achroma")
+    assert str(err.value) == 'Unknown color vision deficiency "achroma"'
+
+
+def test_get_delta_e() -> None:
+    assert get_delta_e((50.0, 0.0, 0.0), (50.0, 3.0, 4.0)) == 5.0
+    assert get_delta_e((0.0, 0.0, 0.0), (0.0, 0.0, 0.0)) == 0.0
+
+
+@pytest.mark.parametrize("deficiency", CVD_MATRICES)
+@pytest.mark.parametrize("threshold", (5.0, 10.0))
+def test_find_confusable_pairs(deficiency: str, threshold: float) -> None:
+    labs = CSS3.lab
+    simulated_labs = simulate_cvd(CSS3, deficiency).lab
+    expected = {
+        (i, j)
+        for i, j in combinations(range(len(CSS3)), 2)
+        if get_delta_e(simulated_labs[i], simulated_labs[j]) < threshold
+        and get_delta_e(labs[i], labs[j]) >= threshold
+    }
+    pairs = find_confusable_pairs(CSS3, deficiency, threshold)
+    assert {(p.first, p.second) for p in pairs} == expected
+    assert pairs == sorted(pairs, key=lambda p: p.simulated_delta_e)
+    for pair in pairs:
+        assert pair.delta_e >= threshold > pair.simulated_delta_e
@@ -0,0 +1,66 @@
+from random import Random
+from typing import List, Sequence, Tuple
+
+import pytest
+
+from colorpedia.converters import hex_to_rgb, rgb_to_lab
+from colorpedia.distinct import MAX_DISTINCT_COLORS, get_distinct_colors
+from colorpedia.palettes import PALETTES
+
+RGB = Tuple[int, int, int]
+
+
+def get_distinct_colors_slowly(
+    count: int, seed: int, seed_colors: Sequence[RGB], lattice_size: int
+) -> List[RGB]:
+    values = [round(i * 255 / (lattice_size - 1)) for i in range(lattice_size)]
+    candidates = [(r, g, b) for r in values for g in values for b in values]
+    labs = [rgb_to_lab(*rgb) for rgb in candidates]
+    distances = [float("inf")] * len(candidates)
+
+    def add(lab: Tuple[float, float, float]) -> None:
+        for i, other in enumerate(labs):
+            distance = sum((x - y) ** 2 for x, y in zip(lab, other))
+            distances[i] = min(distances[i], distance)
+
+    picked = []
+    for rgb in seed_colors:
+        add(rgb_to_lab(*rgb))
+    if not seed_colors:
+        picked.append(Random(seed).randrange(len(candidates)))
+        add(labs[picked[0]])
+    while len(picked) < count:
+        # Ties go to the lowest index.
+        picked.append(distances.index(max(distances)))
+        add(labs[picked[-1]])
+    return [candidates[i] for i in picked]
+
+
+@pytest.mark.parametrize(
+    ("count", "seed", "palette"),
+    ((1, 0, None), (25, 0, None), (40, 9, None), (30, 0, "nord"), (2, 0, "red")),
+)
+def test_get_distinct_colors(count: int, seed: int, palette: str) -> None:
+    seed_colors = [hex_to_rgb(code) for code in PALETTES[palette]] if palette else []
+    colors = get_distinct_colors(count, seed, seed_colors)
+    expected = get_distinct_colors_slowly(count, seed, seed_colors, 16)
+    assert list(colors.iter_rgbs()) == expected
+    assert colors == get_distinct_colors(count, seed, seed_colors)
+
+
+def test_get_distinct_colors_large() -> None:
+    colors = get_distinct_colors(500)
+    assert len(set(colors.iter_rgbs())) == 500
+    # Colors are picked in order, so fewer colors are a prefix of more.
+    assert get_distinct_colors(20) == colors[:20]
+    assert get_distinct_colors(20, seed=1) != colors[:20]
+    assert len(set(get_distinct_colors(1000).iter_rgbs())) == 1000
+
+
+@pytest.mark.parametrize("count", (0, -1, MAX_DISTINCT_COLORS + 1))
+def test_get_distinct_colors_bad_count(count: int) -> None:
+    with pytest.raises(ValueError) as err:
+        get_distinct_colors(count)
+    assert str(err.value) == (
+        f"Color count must be between 1 and {MAX_DISTINCT_COLORS}"
+    )
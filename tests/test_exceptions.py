@@ -1,4 +1,5 @@
 from colorpedia.exceptions import (
+    CacheError,
     ConfigFileError,
     ConfigKeyError,
     ConfigValueError,
@@ -17,6 +18,17 @@ def test_config_file_error() -> None:
     assert str(error) == "A: B"
 
 
+def test_cache_error() -> None:
+    error = CacheError("A")
+    assert str(error) == "A"
+
+    error = CacheError("A", PermissionError(13, "B"))
+    assert str(error) == "A: B (errno: 13)"
+
+    error = CacheError("A", ValueError("B"))
+    assert str(error) == "A: B"
+
+
 def test_config_key_error() -> None:
     error = ConfigKeyError("A")
     assert str(error) == 'Bad configuration key "A"'
@@ -5,12 +5,15 @@ from colorpedia.config import Config
 from colorpedia.formatters import (
     format_cmyk,
     format_get_view,
+    format_grid_rows,
+    format_grid_view,
     format_hex,
     format_hsl,
     format_hsv,
     format_list_view,
     format_name,
     format_rgb,
+    get_grid_column_count,
 )
 
 default_config = Config()
@@ -178,3 +181,34 @@ def test_list_view(r: int, g: int, b: int) -> None:
 
     view = format_list_view(custom_config, color)
     assert len(view.split("|")) == len(custom_config.list_view_keys)
+
+
+@pytest.mark.parametrize(
+    ("width", "expected"),
+    ((0, 1), (12, 1), (25, 1), (26, 2), (80, 5), (200, 14)),
+)
+def test_get_grid_column_count(width: int, expected: int) -> None:
+    assert get_grid_column_count(default_config, width) == expected
+
+
+@pytest.mark.parametrize(("size", "columns"), ((1, 1), (5, 2), (6, 3), (7, 10)))
+def test_grid_rows(size: int, columns: int) -> None:
+    colors = [Color(i, i, i) for i in range(size)]
+    rows = list(format_grid_rows(default_config, iter(colors), columns))
+    assert len(rows) == -(-size // columns)
+    assert sum(row.count("#") for row in rows) == size
+    assert all(row.count("#") == columns for row in rows[:-1])
+
+
+def test_grid_view() -> None:
+    colors = [Color(0, 0, 0), Color(10, 20, 30), Color(255, 255, 255)]
+
+    view = format_grid_view(default_config, colors, 80)
+    assert view.count("\n") == 0
+    assert "#000000" in view
+    assert "#0A141E" in view
+    assert "#FFFFFF" in view
+
+    view = format_grid_view(custom_config, colors, 20)
+    assert view.count("\n") == 2
+    assert "#0a141e" in view
@@ -0,0 +1,75 @@
+from itertools import chain
+
+import pytest
+
+from colorpedia.arrays import ColorArray
+from colorpedia.converters import rgb_to_hsl
+from colorpedia.gradients import (
+    GRADIENT_SPACES,
+    get_gradient,
+    iter_gradient,
+    iter_gradient_chunks,
+)
+
+RED = (255, 0, 0)
+WHITE = (255, 255, 255)
+BLUE = (0, 0, 255)
+
+
+@pytest.mark.parametrize("space", GRADIENT_SPACES)
+@pytest.mark.parametrize("steps", (1, 2, 3, 10, 101))
+def test_iter_gradient(space: str, steps: int) -> None:
+    rgbs = list(iter_gradient([RED, WHITE, BLUE], steps, space))
+    assert len(rgbs) == steps
+    assert rgbs[0] == RED
+    if steps > 1:
+        assert rgbs[-1] == BLUE
+    if steps % 2:
+        assert rgbs[steps // 2] == (RED if steps == 1 else WHITE)
+
+
+def test_iter_gradient_rgb() -> None:
+    rgbs = list(iter_gradient([(0, 0, 0), (100, 200, 250)], 5, "rgb"))
+    assert rgbs == [
+        (0, 0, 0),
+        (25, 50, 62),
+        (50, 100, 125),
+        (75, 150, 188),
+        (100, 200, 250),
+    ]
+
+
+def test_iter_gradient_hue() -> None:
+    # Red to magenta goes the short way around the color wheel (via 330°).
+    rgbs = list(iter_gradient([RED, (255, 0, 255)], 3, "hsl"))
+    assert rgbs[1] == (255, 0, 127)
+    assert rgb_to_hsl(*rgbs[1])[0] == pytest.approx(330 / 360, abs=0.01)
+
+
+@pytest.mark.parametrize("space", GRADIENT_SPACES)
+def test_get_gradient(space: str) -> None:
+    stops = [RED, (0, 128, 0), BLUE, (20, 20, 20)]
+    rgbs = list(iter_gradient(stops, 1000, space))
+    colors = get_gradient(stops, 1000, space)
+    assert isinstance(colors, ColorArray)
+    assert list(colors.iter_rgbs()) == rgbs
+    assert list(get_gradient(stops, 1000, space, 100, 350).iter_rgbs()) == (
+        rgbs[100:350]
+    )
+
+    chunks = list(iter_gradient_chunks(stops, 1000, space, 300))
+    assert [len(chunk) for chunk in chunks] == [300, 300, 300, 100]
+    assert list(chain.from_iterable(c.iter_rgbs() for c in chunks)) == rgbs
+
+
+def test_gradient_bad_args() -> None:
+    with pytest.raises(ValueError) as err:
+        list(iter_gradient([RED, BLUE], 10, "xyz"))
+    assert str(err.value) == 'Unknown color space "xyz"'
+
+    with pytest.raises(ValueError) as err:
+        get_gradient([RED], 10, "rgb")
+    assert str(err.value) == "At least two color stops are required"
+
+    with pytest.raises(ValueError):
+        iter_gradient_chunks([RED], 10, "rgb")
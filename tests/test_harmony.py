@@ -0,0 +1,63 @@
+from random import Random
+
+import pytest
+
+from colorpedia.arrays import ColorArray
+from colorpedia.converters import hsl_to_rgb, rgb_to_hsl
+from colorpedia.harmony import HARMONY_SCHEMES, get_harmonies, iter_harmonies
+
+
+@pytest.mark.parametrize("scheme", HARMONY_SCHEMES.keys())
+def test_get_harmonies(scheme: str) -> None:
+    random = Random(scheme)
+    rgbs = [(random.randrange(256), random.randrange(256), 0) for _ in range(300)]
+    rgbs += [(0, 0, 0), (255, 255, 255), (128, 128, 128)]
+    expected = []
+    for rgb in rgbs:
+        h, s, l = rgb_to_hsl(*rgb)
+        for offset in HARMONY_SCHEMES[scheme]:
+            expected.append(hsl_to_rgb((h + offset) % 1.0, s, l))
+
+    harmonies = get_harmonies(ColorArray.from_rgbs(rgbs), scheme)
+    assert list(harmonies.iter_rgbs()) == expected
+
+
+@pytest.mark.parametrize(
+    ("scheme", "expected"),
+    (
+        ("complementary", [(255, 0, 0), (0, 255, 255)]),
+        ("triadic", [(255, 0, 0), (0, 255, 0), (0, 0, 255)]),
+        ("tetradic", [(255, 0, 0), (128, 255, 0), (0, 255, 255), (127, 0, 255)]),
+        ("analogous", [(255, 0, 128), (255, 0, 0), (255, 128, 0)]),
+        ("split", [(255, 0, 0), (0, 255, 128), (0, 127, 255)]),
+    ),
+)
+def test_get_harmonies_of_red(scheme: str, expected: list) -> None:
+    harmonies = get_harmonies(ColorArray.from_rgbs([(255, 0, 0)]), scheme)
+    assert list(harmonies.iter_rgbs()) == expected
+
+
+def test_get_harmonies_of_grays() -> None:
+    colors = ColorArray.from_rgbs([(0, 0, 0), (51, 51, 51)])
+    harmonies = get_harmonies(colors, "tetradic")
+    assert list(harmonies.iter_rgbs()) == [(0, 0, 0)] * 4 + [(51, 51, 51)] * 4
+
+
+def test_get_harmonies_empty() -> None:
+    assert len(get_harmonies(ColorArray.from_rgbs([]), "triadic")) == 0
+
+
+def test_iter_harmonies() -> None:
+    colors = ColorArray.from_rgbs([(255, 0, 0), (0, 0, 255)])
+    rows = [list(row.iter_rgbs()) for row in iter_harmonies(colors, "triadic")]
+    assert rows == [
+        [(255, 0, 0), (0, 255, 0), (0, 0, 255)],
+        [(0, 0, 255), (255, 0, 0), (0, 255, 0)],
+    ]
+
+
+def test_get_harmonies_bad_scheme() -> None:
+    colors = ColorArray.from_rgbs([(255, 0, 0)])
+    with pytest.raises(ValueError) as err:
+        get_harmonies(colors, "square")
+    assert str(err.value) == 'Unknown harmony scheme "square"'
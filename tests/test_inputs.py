@@ -9,8 +9,24 @@ from colorpedia.inputs import (
     normalize_hex_code,
     normalize_percent_value,
     validate_boolean_flag,
+    validate_color_space,
+    validate_contrast_level,
+    validate_cvd_type,
+    validate_delta_e,
+    validate_distinct_count,
     validate_editor,
+    validate_export_format,
+    validate_float_precision,
+    validate_gradient_steps,
+    validate_harmony_scheme,
     validate_indent_width,
+    validate_match_count,
+    validate_name_query,
+    validate_output_columns,
+    validate_output_format,
+    validate_palette_count,
+    validate_palette_ordering,
+    validate_random_seed,
     validate_rgb_value,
     validate_shades_count,
 )
@@ -148,3 +164,223 @@ def test_normalize_hex_code_bad_arg(bad_arg: Any) -> None:
         normalize_hex_code(bad_arg)
 
     assert str(err.value) == f"Bad hex code (expecting a string matching {HEX_REGEX})"
+
+
+@pytest.mark.parametrize("arg", (None, "default", "json", "csv", "columnar"))
+def test_validate_output_format(arg: Any) -> None:
+    assert validate_output_format(arg) == arg
+
+
+@pytest.mark.parametrize("bad_arg", ("xml", "", 1, True))
+def test_validate_output_format_bad_arg(bad_arg: Any) -> None:
+    with pytest.raises(InputValueError) as err:
+        validate_output_format(bad_arg)
+    assert str(err.value).startswith("Bad output format (expecting one of default")
+
+
+@pytest.mark.parametrize(
+    ("arg", "expected"),
+    (
+        (None, None),
+        ("hex", frozenset(("hex",))),
+        ("hex,name", frozenset(("hex", "name"))),
+        (("rgb", "hsl"), frozenset(("rgb", "hsl"))),
+        (["cmyk"], frozenset(("cmyk",))),
+    ),
+)
+def test_validate_output_columns(arg: Any, expected: Any) -> None:
+    assert validate_output_columns(arg) == expected
+
+
+@pytest.mark.parametrize("bad_arg", ("", "hex,", "color", (), 1, True))
+def test_validate_output_columns_bad_arg(bad_arg: Any) -> None:
+    with pytest.raises(InputValueError) as err:
+        validate_output_columns(bad_arg)
+    assert str(err.value).startswith("Bad columns (expecting comma-separated")
+
+
+@pytest.mark.parametrize("arg", (None, 0, 3, 17))
+def test_validate_float_precision(arg: Any) -> None:
+    assert validate_float_precision(arg) == arg
+
+
+@pytest.mark.parametrize("bad_arg", (-1, 18, "2", 1.0, True))
+def test_validate_float_precision_bad_arg(bad_arg: Any) -> None:
+    with pytest.raises(InputValueError) as err:
+        validate_float_precision(bad_arg)
+    assert str(err.value) == "Bad precision (expecting an integer between 0 and 17)"
+
+
+@pytest.mark.parametrize("arg", (None, 1, 15, 100000000))
+def test_validate_gradient_steps(arg: Any) -> None:
+    assert validate_gradient_steps(arg) == arg
+
+
+@pytest.mark.parametrize("bad_arg", (0, -1, 100000001, "2", 1.0, True))
+def test_validate_gradient_steps_bad_arg(bad_arg: Any) -> None:
+    with pytest.raises(InputValueError) as err:
+        validate_gradient_steps(bad_arg)
+    assert str(err.value) == (
+        "Bad gradient steps (expecting an integer between 1 and 100000000)"
+    )
+
+
+@pytest.mark.parametrize("arg", ("rgb", "hsl", "hsv", "lab", "oklab"))
+def test_validate_color_space(arg: str) -> None:
+    assert validate_color_space(arg) == arg
+
+
+@pytest.mark.parametrize("bad_arg", ("RGB", "xyz", None, 1))
+def test_validate_color_space_bad_arg(bad_arg: Any) -> None:
+    with pytest.raises(InputValueError) as err:
+        validate_color_space(bad_arg)
+    assert str(err.value) == (
+        "Bad color space (expecting one of rgb, hsl, hsv, lab, oklab)"
+    )
+
+
+@pytest.mark.parametrize(("arg", "expected"), (("AA", "AA"), ("aaa", "AAA")))
+def test_validate_contrast_level(arg: str, expected: str) -> None:
+    assert validate_contrast_level(arg) == expected
+
+
+@pytest.mark.parametrize("bad_arg", ("A", "AAAA", None, 1))
+def test_validate_contrast_level_bad_arg(bad_arg: Any) -> None:
+    with pytest.raises(InputValueError) as err:
+        validate_contrast_level(bad_arg)
+    assert str(err.value) == "Bad WCAG level (expecting one of AA, AAA)"
+
+
+@pytest.mark.parametrize("arg", ("protan", "deutan", "tritan"))
+def test_validate_cvd_type(arg: str) -> None:
+    assert validate_cvd_type(arg) == arg
+
+
+@pytest.mark.parametrize("bad_arg", ("Protan", "x", None, 1))
+def test_validate_cvd_type_bad_arg(bad_arg: Any) -> None:
+    with pytest.raises(InputValueError) as err:
+        validate_cvd_type(bad_arg)
+    assert str(err.value) == (
+        "Bad deficiency type (expecting one of protan, deutan, tritan)"
+    )
+
+
+@pytest.mark.parametrize("arg", (0.5, 10, 100))
+def test_validate_delta_e(arg: Union[float, int]) -> None:
+    assert validate_delta_e(arg) == arg
+
+
+@pytest.mark.parametrize("bad_arg", (0, -1, 100.5, "10", True, None))
+def test_validate_delta_e_bad_arg(bad_arg: Any) -> None:
+    with pytest.raises(InputValueError) as err:
+        validate_delta_e(bad_arg)
+    assert str(err.value) == (
+        "Bad Delta E threshold (expecting a number between 0 and 100)"
+    )
+
+
+@pytest.mark.parametrize("arg", (1, 100, 13824))
+def test_validate_distinct_count(arg: int) -> None:
+    assert validate_distinct_count(arg) == arg
+
+
+@pytest.mark.parametrize("bad_arg", (0, 13825, "5", 5.0, True))
+def test_validate_distinct_count_bad_arg(bad_arg: Any) -> None:
+    with pytest.raises(InputValueError) as err:
+        validate_distinct_count(bad_arg)
+    assert (
+        str(err.value) == "Bad color count (expecting an integer between 1 and 13824)"
+    )
+
+
+@pytest.mark.parametrize("arg", (0, -5, 2**40))
+def test_validate_random_seed(arg: int) -> None:
+    assert validate_random_seed(arg) == arg
+
+
+@pytest.mark.parametrize("bad_arg", ("1", 1.0, None, False))
+def test_validate_random_seed_bad_arg(bad_arg: Any) -> None:
+    with pytest.raises(InputValueError) as err:
+        validate_random_seed(bad_arg)
+    assert str(err.value) == "Bad random seed (expecting an integer)"
+
+
+@pytest.mark.parametrize("arg", ("complementary", "triadic", "analogous", "split"))
+def test_validate_harmony_scheme(arg: str) -> None:
+    assert validate_harmony_scheme(arg) == arg
+
+
+@pytest.mark.parametrize("bad_arg", ("Triadic", "square", None, 3))
+def test_validate_harmony_scheme_bad_arg(bad_arg: Any) -> None:
+    with pytest.raises(InputValueError) as err:
+        validate_harmony_scheme(bad_arg)
+    assert str(err.value) == (
+        "Bad harmony scheme (expecting one of complementary, triadic, tetradic, "
+        "analogous, split)"
+    )
+
+
+@pytest.mark.parametrize("arg", (None, "json", "gpl", "ase", "css"))
+def test_validate_export_format(arg: Any) -> None:
+    assert validate_export_format(arg) == arg
+
+
+@pytest.mark.parametrize("bad_arg", ("GPL", "pdf", ""))
+def test_validate_export_format_bad_arg(bad_arg: Any) -> None:
+    with pytest.raises(InputValueError) as err:
+        validate_export_format(bad_arg)
+    assert str(err.value) == "Bad export format (expecting one of json, gpl, ase, css)"
+
+
+@pytest.mark.parametrize("arg", (1, 50, 10000))
+def test_validate_palette_count(arg: int) -> None:
+    assert validate_palette_count(arg) == arg
+
+
+@pytest.mark.parametrize("bad_arg", (0, 10001, 1.0, True, "10"))
+def test_validate_palette_count_bad_arg(bad_arg: Any) -> None:
+    with pytest.raises(InputValueError) as err:
+        validate_palette_count(bad_arg)
+    assert str(err.value) == (
+        "Bad palette count (expecting an integer between 1 and 10000)"
+    )
+
+
+@pytest.mark.parametrize("arg", (None, "hue", "lightness", "hilbert", "tsp"))
+def test_validate_palette_ordering(arg: Any) -> None:
+    assert validate_palette_ordering(arg) == arg
+
+
+@pytest.mark.parametrize("bad_arg", ("Hue", "random", ""))
+def test_validate_palette_ordering_bad_arg(bad_arg: Any) -> None:
+    with pytest.raises(InputValueError) as err:
+        validate_palette_ordering(bad_arg)
+    assert str(err.value) == (
+        "Bad sort order (expecting one of hue, lightness, hilbert, tsp)"
+    )
+
+
+@pytest.mark.parametrize("arg", ("green", "Dark Slate Blue", "100 mph", "a"))
+def test_validate_name_query(arg: str) -> None:
+    assert validate_name_query(arg) == arg
+
+
+@pytest.mark.parametrize("bad_arg", ("", " - ", None, 100))
+def test_validate_name_query_bad_arg(bad_arg: Any) -> None:
+    with pytest.raises(InputValueError) as err:
+        validate_name_query(bad_arg)
+    assert str(err.value) == ("Bad color name (expecting a full or partial color name)")
+
+
+@pytest.mark.parametrize("arg", (1, 10, 1000))
+def test_validate_match_count(arg: int) -> None:
+    assert validate_match_count(arg) == arg
+
+
+@pytest.mark.parametrize("bad_arg", (0, 1001, 1.0, True, "10"))
+def test_validate_match_count_bad_arg(bad_arg: Any) -> None:
+    with pytest.raises(InputValueError) as err:
+        validate_match_count(bad_arg)
+    assert str(err.value) == (
+        "Bad match count (expecting an integer between 1 and 1000)"
+    )
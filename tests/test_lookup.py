@@ -0,0 +1,161 @@
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from colorpedia import lookup
+from colorpedia.color import Color
+from colorpedia.config import Config
+from colorpedia.exceptions import ConfigValueError, InputValueError
+from colorpedia.names import get_name_dictionary
+
+config = Config()
+config.json_keys = frozenset(("hex", "name"))
+config.default_shades_count = 3
+
+
+def test_from_hex() -> None:
+    assert lookup.from_hex("FF0000") == Color(255, 0, 0)
+    assert lookup.from_hex("f00") == Color(255, 0, 0)
+    assert lookup.from_hex("f00", config, as_dict=True) == {
+        "hex": "FF0000",
+        "name": "red",
+    }
+    assert set(lookup.from_hex("f00", as_dict=True)) == set(Config().json_keys)
+
+
+def test_from_rgb() -> None:
+    assert lookup.from_rgb(0, 0, 255) == Color(0, 0, 255)
+    assert lookup.from_rgb(0, 0, 255, config, True) == {"hex": "0000FF", "name": "blue"}
+
+
+def test_from_hsl() -> None:
+    assert lookup.from_hsl(120, 100, 50) == Color(0, 255, 0)
+    assert lookup.from_hsl(0, 0, 100, config, True) == {
+        "hex": "FFFFFF",
+        "name": "white",
+    }
+
+
+def test_from_name() -> None:
+    assert lookup.from_name("lime") == Color(0, 255, 0)
+    assert lookup.from_name("lime", config, True) == {"hex": "00FF00", "name": "lime"}
+    assert lookup.from_name("Dark Slate Blue") == Color(72, 61, 139)
+
+
+@pytest.mark.parametrize(
+    ("function", "args"),
+    (
+        (lookup.from_hex, ("FFFF",)),
+        (lookup.from_rgb, (0, 0, 256)),
+        (lookup.from_hsl, (361, 0, 0)),
+        (lookup.from_name, ("foo",)),
+        (lookup.from_name, ("slat",)),
+        (lookup.from_name, (None,)),
+        (lookup.palette, ("foo",)),
+        (lookup.palette, ("zenburn", None, False, "random")),
+        (lookup.shades, (Color(0, 0, 0), 101)),
+    ),
+)
+def test_bad_input(function: Any, args: Any) -> None:
+    with pytest.raises(InputValueError):
+        function(*args)
+
+
+def test_bulk() -> None:
+    colors = lookup.from_hexes(["FFF", "000", "FFF"])
+    assert colors == [Color(255, 255, 255), Color(0, 0, 0), Color(255, 255, 255)]
+    assert colors[0] is colors[2]
+
+    assert lookup.from_rgbs([(0, 0, 0), [255, 255, 255]], config, True) == [
+        {"hex": "000000", "name": "black"},
+        {"hex": "FFFFFF", "name": "white"},
+    ]
+    assert lookup.from_hsls(iter([(0, 100, 50)])) == [Color(255, 0, 0)]
+    assert lookup.from_hexes([]) == []
+
+    with pytest.raises(InputValueError):
+        lookup.from_rgbs([(0, 0, 0), (0, 0, -1)])
+
+
+def test_bulk_repeated_dicts() -> None:
+    results = lookup.from_hexes(["F00", "F00"], config, True)
+    assert results[0] == results[1] == {"hex": "FF0000", "name": "red"}
+    assert results[0] is not results[1]
+    results[0]["hex"] = "000000"
+    assert results[1]["hex"] == "FF0000"
+
+
+@pytest.mark.parametrize(
+    "function,values",
+    [
+        (lookup.from_hexes, [["FF0000"]]),
+        (lookup.from_rgbs, [([0], 0, 0)]),
+        (lookup.from_hsls, [([0], 0, 0)]),
+    ],
+)
+def test_bulk_unhashable_values(function, values) -> None:
+    with pytest.raises(InputValueError):
+        function(values)
+
+
+def test_palette() -> None:
+    colors = lookup.palette("zenburn")
+    assert len(colors) == 5
+    assert all(isinstance(color, Color) for color in colors)
+    assert lookup.palette("zenburn", config, True)[0] == {
+        "hex": "3F3F3F",
+        "name": "darkslategray/darkslategrey",
+    }
+    assert [c["hex"] for c in lookup.palette("zenburn", config, True, "lightness")] == [
+        "3F3F3F",
+        "8FAF9F",
+        "DCA3A3",
+        "F0DFAF",
+        "EFEFEF",
+    ]
+
+
+def test_shades() -> None:
+    color = Color(255, 0, 0)
+    assert len(lookup.shades(color)) == Config().default_shades_count
+    assert lookup.shades(color, config=config, as_dict=True) == [
+        {"hex": "000000", "name": "black"},
+        {"hex": "FF0000", "name": "red"},
+        {"hex": "FFFFFF", "name": "white"},
+    ]
+    assert len(lookup.shades(color, 5, config)) == 5
+
+
+def test_no_cli_imports() -> None:
+    code = "import sys, colorpedia.lookup; print('fire' in sys.modules)"
+    output = subprocess.check_output([sys.executable, "-c", code])
+    assert output.strip() == b"False"
+
+
+def test_name_dictionary(names_dir: Path) -> None:
+    (names_dir / "brand.json").write_text('{"brand red": "#E10600", "ink": "1B1B1B"}')
+    brand = Config(json_keys=frozenset(("hex", "name")), name_dictionary="brand")
+
+    assert lookup.from_rgb(255, 0, 0, brand, True) == {
+        "hex": "FF0000",
+        "name": "brand red",
+    }
+    assert lookup.from_hexes(["F00"], brand)[0].name == "brand red"
+    assert lookup.from_hsls([(0, 100, 50)], brand)[0].name == "brand red"
+    assert lookup.from_name("Brand Red", brand).hex == "E10600"
+    assert lookup.palette("red", brand)[0].name == "brand red"
+    assert lookup.shades(Color(255, 0, 0), 1, brand)[0].name == "brand red"
+
+    # Without a config, the active (global) name dictionary is used.
+    color = lookup.from_rgb(255, 0, 0)
+    assert color.name == "red"
+    assert lookup.shades(lookup.from_hex("F00", brand), 1)[0].name == "brand red"
+    with pytest.raises(InputValueError):
+        lookup.from_name("brand red")
+    assert get_name_dictionary().name == "css3"
+
+    with pytest.raises(ConfigValueError):
+        lookup.from_rgb(255, 0, 0, Config(name_dictionary="unknown"))
@@ -0,0 +1,154 @@
+import io
+from pathlib import Path
+from random import Random
+from typing import Dict, List, Tuple
+
+import pytest
+
+from colorpedia import members
+from colorpedia.converters import hex_to_rgb, rgb_to_lab
+from colorpedia.cvd import get_delta_e
+from colorpedia.members import (
+    MemberIndex,
+    PaletteMatch,
+    find_palettes,
+    get_member_index,
+    get_palette_digest,
+    read_member_index,
+    write_member_index,
+)
+from colorpedia.palettes import PALETTES
+from tests.helpers import get_random_hex_code
+
+PALETTES_BY_NAME = {
+    "warm": ("FF0000", "FF8000", "FFFF00"),
+    "cool": ("0000FF", "00FFFF", "FF0000", "0000FF"),
+    "gray": ("000000", "808080", "FFFFFF"),
+}
+
+
+def get_random_palettes(seed: int, count: int) -> Dict[str, Tuple[str, ...]]:
+    random = Random(seed)
+    return {
+        f"palette{i}": tuple(
+            get_random_hex_code(random) for _ in range(random.randrange(1, 9))
+        )
+        for i in range(count)
+    }
+
+
+def find_palettes_slowly(
+    palettes: Dict[str, Tuple[str, ...]], rgb: Tuple[int, int, int], threshold: float
+) -> List[Tuple[str, str, float]]:
+    lab = rgb_to_lab(*rgb)
+    matches = []
+    for name, hex_codes in palettes.items():
+        nearest = min(
+            (get_delta_e(lab, rgb_to_lab(*hex_to_rgb(code))), code)
+            for code in hex_codes
+        )
+        if nearest[0] < threshold:
+            matches.append((name, nearest[1], nearest[0]))
+    return sorted(matches, key=lambda match: match[2])
+
+
+def test_member_index() -> None:
+    index = MemberIndex.from_palettes(PALETTES_BY_NAME)
+    assert len(index) == 8
+    assert index.find((255, 0, 0), 1) == [
+        PaletteMatch("warm", "FF0000", 0.0),
+        PaletteMatch("cool", "FF0000", 0.0),
+    ]
+    assert [match.palette for match in index.find((0, 0, 250), 5)] == ["cool"]
+    assert index.find((100, 50, 150), 5) == []
+
+
+@pytest.mark.parametrize("threshold", (2.0, 5.0, 12.0, 40.0))
+def test_member_index_find(threshold: float) -> None:
+    palettes = get_random_palettes(int(threshold), 300)
+    index = MemberIndex.from_palettes(palettes)
+    random = Random(0)
+    for _ in range(50):
+        rgb = random.randrange(256), random.randrange(256), random.randrange(256)
+        matches = index.find(rgb, threshold)
+        expected = find_palettes_slowly(palettes, rgb, threshold)
+        assert [m.palette for m in matches] == [name for name, _, _ in expected]
+        assert [m.hex_code for m in matches] == [code for _, code, _ in expected]
+        for match, (_, _, delta_e) in zip(matches, expected):
+            assert match.delta_e == pytest.approx(delta_e)
+
+
+def test_member_index_empty() -> None:
+    index = MemberIndex.from_palettes({})
+    assert len(index) == 0
+    assert index.find((0, 0, 0), 100) == []
+
+
+def test_member_index_round_trip() -> None:
+    index = MemberIndex.from_palettes(get_random_palettes(0, 100), b"1" * 20)
+    fp = io.BytesIO()
+    write_member_index(fp, index)
+
+    fp.seek(0)
+    loaded = read_member_index(fp, b"1" * 20)
+    assert loaded is not None
+    assert loaded.palettes == index.palettes
+    assert loaded.codes == index.codes
+    assert loaded.labs == index.labs
+    assert loaded.offsets == index.offsets
+    assert loaded.palette_ids == index.palette_ids
+    assert loaded.find((1, 2, 3), 30) == index.find((1, 2, 3), 30)
+
+    fp.seek(0)
+    assert read_member_index(fp, b"2" * 20) is None
+
+
+@pytest.mark.parametrize("data", (b"", b"CLRM", b"XXXX" + bytes(40)))
+def test_read_member_index_bad_data(data: bytes) -> None:
+    assert read_member_index(io.BytesIO(data)) is None
+
+
+def test_read_member_index_truncated() -> None:
+    fp = io.BytesIO()
+    write_member_index(fp, MemberIndex.from_palettes(PALETTES_BY_NAME, b"1" * 20))
+    data = fp.getvalue()
+    for size in (len(data) - 1, len(data) // 2):
+        assert read_member_index(io.BytesIO(data[:size])) is None
+
+
+def test_get_palette_digest(palettes_dir: Path) -> None:
+    digest = get_palette_digest(PALETTES)
+    assert len(digest) == 20
+    assert get_palette_digest(PALETTES) == digest
+
+    path = palettes_dir / "brand.json"
+    path.write_text('["E10600"]')
+    assert get_palette_digest(PALETTES) != digest
+    digest = get_palette_digest(PALETTES)
+
+    path.write_text('["E10600", "1B1B1B"]')
+    assert get_palette_digest(PALETTES) != digest
+
+
+def test_get_member_index(palettes_dir: Path, member_index_file: Path) -> None:
+    index = get_member_index()
+    assert get_member_index() is index
+    assert member_index_file.exists()
+    assert [m.palette for m in find_palettes((225, 6, 0), 1)] == []
+
+    # The saved index is reused by other processes while palettes are unchanged.
+    members._index = None
+    assert get_member_index().codes == index.codes
+
+    (palettes_dir / "brand.json").write_text('["E10600", "1B1B1B"]')
+    assert find_palettes((225, 6, 0), 1) == [PaletteMatch("brand", "E10600", 0.0)]
+    with open(member_index_file, "rb") as fp:
+        loaded = read_member_index(fp, get_palette_digest(PALETTES))
+    assert loaded is not None and "brand" in loaded.palettes
+
+
+def test_get_member_index_bad_file(palettes_dir: Path, member_index_file: Path) -> None:
+    (palettes_dir / "bad.json").write_text("not json")
+    (palettes_dir / "brand.json").write_text('["E10600", "1B1B1B"]')
+    assert find_palettes((225, 6, 0), 1) == [PaletteMatch("brand", "E10600", 0.0)]
+    assert "bad" not in get_member_index().palettes
@@ -0,0 +1,241 @@
+import io
+import os
+import sys
+from pathlib import Path
+from random import Random
+from typing import Dict, List, Tuple
+
+import pytest
+
+from colorpedia import names
+from colorpedia.converters import rgb_to_names
+from colorpedia.exceptions import NameDictionaryError
+from colorpedia.hexcodes import HEX_CODE_TO_NAMES, NAME_TO_HEX_CODE
+from colorpedia.names import (
+    NameDictionary,
+    get_name_dictionary,
+    list_name_dictionaries,
+    load_name_dictionary,
+    parse_name_file,
+    read_name_index,
+    set_name_dictionary,
+    write_name_index,
+)
+from tests.helpers import get_random_hex_code
+
+RGB = Tuple[int, int, int]
+
+
+def get_random_items(seed: int, count: int) -> List[Tuple[str, str]]:
+    random = Random(seed)
+    return [(f"color {i}", get_random_hex_code(random)) for i in range(count)]
+
+
+def get_named_rgbs(items: List[Tuple[str, str]]) -> Dict[RGB, List[str]]:
+    named_rgbs: Dict[RGB, List[str]] = {}
+    for name, code in items:
+        rgb = int(code[:2], 16), int(code[2:4], 16), int(code[4:], 16)
+        named_rgbs.setdefault(rgb, []).append(name)
+    return named_rgbs
+
+
+def rgb_to_names_slowly(
+    named_rgbs: Dict[RGB, List[str]], r: int, g: int, b: int
+) -> Tuple[Tuple[str, ...], bool]:
+    nearest_distance, nearest_names = sys.maxsize, []
+    for (_r, _g, _b), color_names in named_rgbs.items():
+        distance = (_r - r) ** 2 + (_g - g) ** 2 + (_b - b) ** 2
+        if distance < nearest_distance:
+            nearest_distance, nearest_names = distance, color_names
+    return tuple(nearest_names), nearest_distance == 0
+
+
+@pytest.mark.parametrize("count", (1, 50, 1000, 10000))
+def test_name_dictionary_rgb_to_names(count: int) -> None:
+    items = get_random_items(count, count)
+    named_rgbs = get_named_rgbs(items)
+    dictionary = NameDictionary.from_items("test", items)
+    random = Random(0)
+    rgbs = [
+        (random.randrange(256), random.randrange(256), random.randrange(256))
+        for _ in range(200)
+    ]
+    rgbs.extend(random.sample(list(named_rgbs), min(count, 50)))
+    for rgb in rgbs:
+        assert dictionary.rgb_to_names(*rgb) == rgb_to_names_slowly(named_rgbs, *rgb)
+
+
+def test_name_dictionary_css3() -> None:
+    dictionary = NameDictionary.from_items("css3", NAME_TO_HEX_CODE.items())
+    assert len(dictionary) == len(HEX_CODE_TO_NAMES)
+    for hex_code, color_names in HEX_CODE_TO_NAMES.items():
+        rgb = int(hex_code[:2], 16), int(hex_code[2:4], 16), int(hex_code[4:], 16)
+        assert dictionary.rgb_to_names(*rgb) == (color_names, True)
+    assert dictionary.rgb_to_names(1, 2, 3) == (("black",), False)
+
+
+def test_name_dictionary_ties_go_to_first_color() -> None:
+    dictionary = NameDictionary.from_items("test", [("b", "000002"), ("a", "000000")])
+    assert dictionary.rgb_to_names(0, 0, 1) == (("b",), False)
+
+
+def test_name_dictionary_short_hex_codes() -> None:
+    dictionary = NameDictionary.from_items("test", [("red", "F00"), ("pink", "f0f")])
+    assert dictionary.rgb_to_names(255, 0, 0) == (("red",), True)
+    assert dictionary.rgb_to_names(255, 0, 255) == (("pink",), True)
+
+
+def test_name_dictionary_empty() -> None:
+    dictionary = NameDictionary.from_items("test", [])
+    assert dictionary.find_nearest(0, 0, 0) == (-1, sys.maxsize)
+    assert dictionary.rgb_to_names(0, 0, 0) == ((), False)
+
+
+def test_name_dictionary_bad_hex_code() -> None:
+    with pytest.raises(ValueError) as err:
+        NameDictionary.from_items("test", [("red", "FF00")])
+    assert str(err.value) == 'Bad hex code "FF00" for "red"'
+
+
+def test_name_index_round_trip() -> None:
+    dictionary = NameDictionary.from_items("test", get_random_items(0, 5000))
+    fp = io.BytesIO()
+    write_name_index(fp, dictionary, mtime=10, size=20)
+
+    fp.seek(0)
+    loaded = read_name_index(fp, "test", mtime=10, size=20)
+    assert loaded is not None
+    assert loaded.shift == dictionary.shift
+    assert loaded.codes == dictionary.codes
+    assert loaded.cell_offsets == dictionary.cell_offsets
+    assert loaded.cell_items == dictionary.cell_items
+    assert loaded.name_offsets == dictionary.name_offsets
+    assert loaded.name_blob == dictionary.name_blob
+    assert loaded.rgb_to_names(1, 2, 3) == dictionary.rgb_to_names(1, 2, 3)
+
+    for mtime, size in ((11, 20), (10, 21)):
+        fp.seek(0)
+        assert read_name_index(fp, "test", mtime, size) is None
+
+
+@pytest.mark.parametrize("data", (b"", b"CLRN", b"XXXX" + bytes(30)))
+def test_read_name_index_bad_data(data: bytes) -> None:
+    assert read_name_index(io.BytesIO(data), "test") is None
+
+
+def test_read_name_index_truncated() -> None:
+    fp = io.BytesIO()
+    write_name_index(fp, NameDictionary.from_items("test", get_random_items(0, 10)))
+    data = fp.getvalue()
+    for size in (len(data) - 1, len(data) // 2):
+        assert read_name_index(io.BytesIO(data[:size]), "test") is None
+
+
+def test_parse_name_file(names_dir: Path) -> None:
+    path = names_dir / "xkcd.txt"
+    path.write_text(
+        "License: http://creativecommons.org/publicdomain/zero/1.0/\n"
+        "# License: CC0\n\ncloudy blue\t#acc2d9\nblue/green #137e6d\nred F00\n"
+    )
+    assert parse_name_file(path) == [
+        ("cloudy blue", "acc2d9"),
+        ("blue/green", "137e6d"),
+        ("red", "F00"),
+    ]
+
+    path = names_dir / "brand.json"
+    path.write_text('{"brand red": "#E10600", "brand ink": "1B1B1B"}')
+    assert parse_name_file(path) == [("brand red", "E10600"), ("brand ink", "1B1B1B")]
+
+
+@pytest.mark.parametrize(
+    ("file_name", "content", "message"),
+    (
+        ("bad.txt", "red\n", "expecting a name and hex code on line 1"),
+        ("bad.json", "[]", "expecting an object of hex codes"),
+        ("bad.json", '{"red": 1}', "expecting an object of hex codes"),
+        ("bad.json", "{", "Expecting property name"),
+    ),
+)
+def test_parse_name_file_bad_content(
+    names_dir: Path, file_name: str, content: str, message: str
+) -> None:
+    path = names_dir / file_name
+    path.write_text(content)
+    with pytest.raises(NameDictionaryError) as err:
+        parse_name_file(path)
+    assert str(err.value).startswith(f"Cannot load {path}: {message}")
+
+
+def test_set_name_dictionary_xkcd_header(names_dir: Path) -> None:
+    (names_dir / "xkcd.txt").write_text(
+        "License: http://creativecommons.org/publicdomain/zero/1.0/\n"
+        "cloudy blue\t#acc2d9\n"
+        "dark pastel green\t#56ae57\n"
+    )
+    set_name_dictionary("xkcd")
+    assert rgb_to_names(0xAC, 0xC2, 0xD9) == (("cloudy blue",), True)
+    assert len(get_name_dictionary()) == 2
+
+
+def test_list_name_dictionaries(names_dir: Path) -> None:
+    assert list_name_dictionaries() == ["css3"]
+    (names_dir / "xkcd.txt").write_text("")
+    (names_dir / "brand.json").write_text("{}")
+    (names_dir / "notes.md").write_text("")
+    (names_dir / "css3.txt").write_text("")
+    assert list_name_dictionaries() == ["css3", "brand", "xkcd"]
+
+
+def test_load_name_dictionary(names_dir: Path) -> None:
+    path = names_dir / "xkcd.txt"
+    path.write_text("cloudy blue #acc2d9\nblue/green #137e6d\n")
+    dictionary = load_name_dictionary("xkcd")
+    assert dictionary.rgb_to_names(19, 126, 109) == (("blue/green",), True)
+    assert load_name_dictionary("xkcd") is dictionary
+
+    index_path = names.NAME_INDEX_DIR / "xkcd.idx"
+    with open(index_path, "rb") as fp:
+        loaded = read_name_index(fp, "xkcd")
+    assert loaded is not None and loaded.codes == dictionary.codes
+
+    # The index is reused while the file is unchanged and rebuilt after.
+    names._dictionaries.clear()
+    index_mtime = os.stat(index_path).st_mtime_ns
+    assert load_name_dictionary("xkcd").codes == dictionary.codes
+    assert os.stat(index_path).st_mtime_ns == index_mtime
+
+    names._dictionaries.clear()
+    path.write_text("cloudy blue #acc2d9\nblue/green #137e6d\ndark red #800\n")
+    assert load_name_dictionary("xkcd").rgb_to_names(130, 0, 0) == (
+        ("dark red",),
+        False,
+    )
+
+
+def test_load_name_dictionary_bad_name() -> None:
+    with pytest.raises(ValueError) as err:
+        load_name_dictionary("xkcd")
+    assert str(err.value) == 'Unknown name dictionary "xkcd"'
+
+
+@pytest.mark.parametrize("hex_code", ("#FF00", "FF00"))
+def test_load_name_dictionary_bad_file(names_dir: Path, hex_code: str) -> None:
+    (names_dir / "xkcd.txt").write_text(f"red {hex_code}\n")
+    with pytest.raises(NameDictionaryError) as err:
+        load_name_dictionary("xkcd")
+    assert str(err.value).endswith('Bad hex code "FF00" for "red"')
+
+
+def test_set_name_dictionary(names_dir: Path) -> None:
+    assert get_name_dictionary().name == "css3"
+    assert rgb_to_names(255, 0, 0) == (("red",), True)
+
+    (names_dir / "brand.json").write_text('{"brand red": "#E10600"}')
+    set_name_dictionary("brand")
+    assert get_name_dictionary().name == "brand"
+    assert rgb_to_names(255, 0, 0) == (("brand red",), False)
+
+    with pytest.raises(ValueError):
+        set_name_dictionary("unknown")
+    assert get_name_dictionary().name == "brand"
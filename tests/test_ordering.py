@@ -0,0 +1,119 @@
+from itertools import permutations
+from random import Random
+from typing import List, Tuple
+
+import pytest
+
+from colorpedia.converters import rgb_to_lab
+from colorpedia.ordering import (
+    get_hilbert_key,
+    get_hue_key,
+    get_lightness_key,
+    get_palette_order,
+    get_tsp_order,
+)
+
+Lab = Tuple[float, float, float]
+
+
+def get_path_length(labs: List[Lab], path: List[int]) -> float:
+    return sum(
+        sum((x - y) ** 2 for x, y in zip(labs[i], labs[j])) ** 0.5
+        for i, j in zip(path, path[1:])
+    )
+
+
+def get_nearest_neighbor_path(labs: List[Lab]) -> List[int]:
+    path = [min(range(len(labs)), key=lambda i: labs[i][0])]
+    while len(path) < len(labs):
+        last = labs[path[-1]]
+        path.append(
+            min(
+                (i for i in range(len(labs)) if i not in path),
+                key=lambda i: sum((x - y) ** 2 for x, y in zip(labs[i], last)),
+            )
+        )
+    return path
+
+
+@pytest.mark.parametrize("bits", (1, 2, 3, 4))
+def test_get_hilbert_key(bits: int) -> None:
+    size = 1 << bits
+    points = {
+        get_hilbert_key(r, g, b, bits): (r, g, b)
+        for r in range(size)
+        for g in range(size)
+        for b in range(size)
+    }
+    assert sorted(points) == list(range(size**3))
+    # Consecutive points along the curve are adjacent in the cube.
+    for key in range(size**3 - 1):
+        point, next_point = points[key], points[key + 1]
+        assert sum(abs(x - y) for x, y in zip(point, next_point)) == 1
+
+
+def test_get_hilbert_key_8_bits() -> None:
+    assert get_hilbert_key(0, 0, 0) == 0
+    assert get_hilbert_key(255, 255, 255) < 1 << 24
+    keys = {get_hilbert_key(r, r, r) for r in range(256)}
+    assert len(keys) == 256
+
+
+def test_get_hue_key() -> None:
+    assert get_hue_key(0, 0, 0) < get_hue_key(128, 128, 128) < get_hue_key(255, 0, 0)
+    assert get_hue_key(255, 0, 0) < get_hue_key(255, 255, 0)
+    assert get_hue_key(255, 255, 0) < get_hue_key(0, 255, 0) < get_hue_key(0, 0, 255)
+
+
+def test_get_lightness_key() -> None:
+    assert get_lightness_key(0, 0, 0) == 0
+    assert get_lightness_key(0, 0, 255) < get_lightness_key(255, 0, 0)
+    assert get_lightness_key(255, 255, 255) == pytest.approx(100)
+
+
+@pytest.mark.parametrize("size", (0, 1, 2, 7))
+def test_get_tsp_order_small(size: int) -> None:
+    random = Random(size)
+    labs = [rgb_to_lab(*(random.randrange(256) for _ in range(3))) for _ in range(size)]
+    path = get_tsp_order(labs)
+    assert sorted(path) == list(range(size))
+    if size:
+        assert labs[path[0]][0] == min(lab[0] for lab in labs)
+    if size == 7:
+        # 2-opt is optimal for a few colors most of the time, and close always.
+        shortest = min(
+            get_path_length(labs, [path[0], *rest]) for rest in permutations(path[1:])
+        )
+        assert get_path_length(labs, path) <= shortest * 1.1
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_get_tsp_order(seed: int) -> None:
+    random = Random(seed)
+    labs = [rgb_to_lab(*(random.randrange(256) for _ in range(3))) for _ in range(80)]
+    path = get_tsp_order(labs)
+    assert sorted(path) == list(range(len(labs)))
+    assert get_path_length(labs, path) <= get_path_length(
+        labs, get_nearest_neighbor_path(labs)
+    )
+
+
+def test_get_palette_order() -> None:
+    hex_codes = ("FFFFFF", "FF0000", "000000", "0000FF", "808080")
+    assert get_palette_order(hex_codes, "lightness") == (2, 3, 1, 4, 0)
+    assert get_palette_order(hex_codes, "hue") == (2, 4, 0, 1, 3)
+    assert get_palette_order(hex_codes, "hilbert")[0] == 2
+    assert get_palette_order(hex_codes, "tsp")[0] == 2
+    assert get_palette_order(hex_codes, "tsp") is get_palette_order(hex_codes, "tsp")
+    assert get_palette_order((), "hue") == ()
+
+    with pytest.raises(ValueError) as err:
+        get_palette_order(hex_codes, "random")
+    assert str(err.value) == 'Unknown palette ordering "random"'
+
+
+def test_get_palette_order_ties() -> None:
+    hex_codes = ("FF0000", "00FF00", "FF0000")
+    for ordering in ("hue", "lightness", "hilbert"):
+        order = get_palette_order(hex_codes, ordering)
+        assert order.index(0) + 1 == order.index(2)
@@ -1,4 +1,12 @@
-from colorpedia.palettes import PALETTES
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from colorpedia.converters import name_to_rgb
+from colorpedia.exceptions import PaletteFileError
+from colorpedia.palettes import PALETTES, PaletteLibrary, palette_to_rgbs
 
 
 def test_palette() -> None:
@@ -13,3 +21,98 @@ def test_palette() -> None:
         for hex_code in hex_codes:
             assert isinstance(hex_code, str)
             assert hex_code.isdigit() or hex_code.isupper()
+
+
+@pytest.mark.parametrize("palette", ("red", "green", "blue"))
+def test_palette_to_rgbs(palette: str) -> None:
+    rgb = name_to_rgb(palette)
+    assert rgb in palette_to_rgbs(palette)
+
+    with pytest.raises(ValueError) as err:
+        palette_to_rgbs(palette + "invalid")
+    assert "Unknown color palette" in str(err.value)
+
+
+@pytest.mark.parametrize("ordering", ("hue", "lightness", "hilbert", "tsp"))
+def test_palette_to_rgbs_sorted(ordering: str) -> None:
+    rgbs = palette_to_rgbs("css3")
+    sorted_rgbs = palette_to_rgbs("css3", ordering)
+    assert sorted(sorted_rgbs) == sorted(rgbs)
+    assert sorted_rgbs != rgbs
+
+    with pytest.raises(ValueError) as err:
+        palette_to_rgbs("css3", "random")
+    assert str(err.value) == 'Unknown palette ordering "random"'
+
+
+def test_palette_library(palettes_dir: Path) -> None:
+    library = PaletteLibrary(
+        {"nord": ("2E3440",), "red": ("FF0000",)},
+        palettes_dir,
+        palettes_dir.parent / "index.json",
+    )
+    assert list(library) == ["nord", "red"]
+
+    (palettes_dir / "Brand.gpl").write_text("GIMP Palette\n225 6 0 Red\n")
+    (palettes_dir / "nord.json").write_text('["#88C0D0"]')
+    (palettes_dir / "brand.json").write_text('["#000000"]')
+    (palettes_dir / "notes.txt").write_text("")
+    os.utime(palettes_dir, ns=(1, 1))
+
+    assert list(library) == ["nord", "red", "brand"]
+    assert len(library) == 3
+    assert "brand" in library and "Brand" not in library
+    assert library["brand"] == ("E10600",)
+    assert library["nord"] == ("88C0D0",)
+    assert library["red"] == ("FF0000",)
+    assert library.get_path("brand") == palettes_dir / "Brand.gpl"
+    with pytest.raises(KeyError):
+        library["notes"]
+
+    # Parsed palettes are reused until their files change.
+    (palettes_dir / "Brand.gpl").write_text("GIMP Palette\n27 27 27 Ink\n")
+    assert library["brand"] == ("1B1B1B",)
+
+
+def test_palette_library_manifest(palettes_dir: Path) -> None:
+    index_file = palettes_dir.parent / "manifest.json"
+    (palettes_dir / "brand.json").write_text('["E10600"]')
+    os.utime(palettes_dir, ns=(1, 1))
+    assert list(PaletteLibrary({}, palettes_dir, index_file)) == ["brand"]
+    with open(index_file) as fp:
+        assert json.load(fp) == {
+            "directory": str(palettes_dir),
+            "mtime": 1,
+            "files": {"brand": "brand.json"},
+        }
+
+    # The manifest is used instead of scanning the directory until the
+    # modification time of the directory changes.
+    (palettes_dir / "ink.json").write_text('["1B1B1B"]')
+    os.utime(palettes_dir, ns=(1, 1))
+    assert list(PaletteLibrary({}, palettes_dir, index_file)) == ["brand"]
+
+    os.utime(palettes_dir, ns=(2, 2))
+    assert list(PaletteLibrary({}, palettes_dir, index_file)) == ["brand", "ink"]
+
+
+def test_palette_library_missing_directory(tmp_path: Path) -> None:
+    library = PaletteLibrary({"red": ("FF0000",)}, tmp_path / "x", tmp_path / "y")
+    assert list(library) == ["red"]
+    assert "blue" not in library
+    assert not (tmp_path / "y").exists()
+
+
+def test_palette_library_bad_file(palettes_dir: Path) -> None:
+    library = PaletteLibrary({}, palettes_dir, palettes_dir.parent / "index.json")
+    (palettes_dir / "brand.json").write_text("[]")
+    assert "brand" in library
+    with pytest.raises(PaletteFileError) as err:
+        library["brand"]
+    assert str(err.value).endswith("brand.json: no colors")
+
+
+def test_user_palettes(palettes_dir: Path) -> None:
+    (palettes_dir / "brand.json").write_text('["E10600", "1B1B1B"]')
+    assert PALETTES["brand"] == ("E10600", "1B1B1B")
+    assert palette_to_rgbs("brand") == [(225, 6, 0), (27, 27, 27)]
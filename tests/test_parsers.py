@@ -0,0 +1,107 @@
+from typing import Any, Tuple
+
+import pytest
+
+from colorpedia.exceptions import InputValueError
+from colorpedia.parsers import (
+    parse_color_argument,
+    parse_css_color,
+    parse_css_colors,
+)
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    (
+        ("#fff", (255, 255, 255, 1.0)),
+        ("#F00", (255, 0, 0, 1.0)),
+        ("#0f08", (0, 255, 0, 0.5333333333333333)),
+        ("#102030", (16, 32, 48, 1.0)),
+        (" #102030FF ", (16, 32, 48, 1.0)),
+        ("#10203000", (16, 32, 48, 0.0)),
+        ("rgb(1,2,3)", (1, 2, 3, 1.0)),
+        ("rgba(1, 2, 3, .5)", (1, 2, 3, 0.5)),
+        ("RGB(1 2 3)", (1, 2, 3, 1.0)),
+        ("rgb(1 2 3 / 40%)", (1, 2, 3, 0.4)),
+        ("rgb(100%, 0%, 50%)", (255, 0, 128, 1.0)),
+        ("rgb(300 -5 1e2)", (255, 0, 100, 1.0)),
+        ("rgba(0, 0, 0, 2)", (0, 0, 0, 1.0)),
+        ("hsl(0, 100%, 50%)", (255, 0, 0, 1.0)),
+        ("hsl(120 100% 50%)", (0, 255, 0, 1.0)),
+        ("hsl(240deg 100% 50% / 0.5)", (0, 0, 255, 0.5)),
+        ("hsla(0.5turn, 100%, 50%, 1)", (0, 255, 255, 1.0)),
+        ("hsl(-120, 100%, 50%)", (0, 0, 255, 1.0)),
+        ("hsl(0 0% 100%)", (255, 255, 255, 1.0)),
+        ("red", (255, 0, 0, 1.0)),
+        ("DarkSlateBlue", (72, 61, 139, 1.0)),
+        ("transparent", (0, 0, 0, 0.0)),
+    ),
+)
+def test_parse_css_color(value: str, expected: Tuple[int, int, int, float]) -> None:
+    assert parse_css_color(value) == expected
+
+
+@pytest.mark.parametrize(
+    "bad_value",
+    (
+        "",
+        "#",
+        "#ff",
+        "#fffff",
+        "#ggg",
+        "#f f",
+        "foo",
+        "rgb(1, 2)",
+        "rgb(1, 2, 3, 4, 5)",
+        "rgb(1 2 3",
+        "rgb(1px 2 3)",
+        "rgb(1, 2, 3 / 0.5)",
+        "rgb(1 2 3 /)",
+        "rgb(1 2 3 / 1px)",
+        "hsl(1foo 2% 3%)",
+        "hsl(1 2px 3%)",
+        "lab(1 2 3)",
+        1,
+        None,
+    ),
+)
+def test_parse_css_color_bad_value(bad_value: Any) -> None:
+    with pytest.raises(InputValueError) as err:
+        parse_css_color(bad_value)
+    assert str(err.value).startswith(f'Bad CSS color "{bad_value}"')
+
+
+def test_parse_css_colors() -> None:
+    values = ["#fff", "red", "#fff", "rgb(0 0 0)"] * 1000
+    colors = parse_css_colors(values)
+    assert len(colors) == len(values)
+    assert colors[:4] == [
+        (255, 255, 255, 1.0),
+        (255, 0, 0, 1.0),
+        (255, 255, 255, 1.0),
+        (0, 0, 0, 1.0),
+    ]
+    assert parse_css_colors([]) == []
+
+    with pytest.raises(InputValueError):
+        parse_css_colors(["#fff", "#ff"])
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    (
+        ("FFF", (255, 255, 255)),
+        ("102030", (16, 32, 48)),
+        ("#0f08", (0, 255, 0)),
+        ("red", (255, 0, 0)),
+        ("hsl(120 100% 25%)", (0, 128, 0)),
+    ),
+)
+def test_parse_color_argument(value: str, expected: Tuple[int, int, int]) -> None:
+    assert parse_color_argument(value) == expected
+
+
+@pytest.mark.parametrize("bad_value", ("FFFF0", "foo", 1, None))
+def test_parse_color_argument_bad_value(bad_value: Any) -> None:
+    with pytest.raises(InputValueError):
+        parse_color_argument(bad_value)
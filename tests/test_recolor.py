@@ -0,0 +1,129 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from colorpedia import scanner
+from colorpedia.exceptions import InputValueError
+from colorpedia.recolor import (
+    get_nearest_palette_rgb,
+    recolor_file,
+    recolor_files,
+    recolor_literal,
+)
+
+STYLESHEET = """a {
+  color: #FFF;
+  background: rgba(10, 20, 30, .5);
+  border-color: red;
+  fill: $variable;
+}\r
+"""
+
+
+@pytest.mark.parametrize(
+    ("literal", "expected"),
+    (
+        ("#fff", "#fdf6e3"),
+        ("#FFF", "#FDF6E3"),
+        ("#000", "#002B36"),
+        ("#ABCD", "#93A1A1DD"),
+        ("#aabbcc", "#93a1a1"),
+        ("#AABBCC80", "#93A1A180"),
+        ("rgb(10, 20, 30)", "rgb(0, 43, 54)"),
+        ("RGBA(10,20,30,.5)", "RGBA(0,43,54,.5)"),
+        ("rgba(1,2,3,0.5)", "rgba(0,43,54,0.5)"),
+        ("rgb(10 20 30)", "rgb(0 43 54)"),
+        ("rgb(10 20 30 / 50%)", "rgb(0 43 54 / 50%)"),
+        ("rgb(50%, 20%, 10%)", "rgb(79.6%, 29.4%, 8.6%)"),
+        ("rgb(100%,0,0)", "rgb(86.3%,50,47)"),
+        ("hsl(120, 50%, 50%)", "hsl(175.5, 58.6%, 39.8%)"),
+        ("hsl(120deg, 50%, 50%)", "hsl(175.5deg, 58.6%, 39.8%)"),
+        ("HSL(120DEG,50%,50%)", "HSL(175.5DEG,58.6%,39.8%)"),
+        ("hsl(2.1rad 50% 50%)", "hsl(3.062rad 58.6% 39.8%)"),
+        ("hsl(0.33turn 50 50)", "hsl(0.487turn 58.6 39.8)"),
+        ("hsla(120 50% 50% / 0.2)", "hsla(175.5 58.6% 39.8% / 0.2)"),
+        ("red", "#dc322f"),
+        ("RED", "#DC322F"),
+        ("transparent", "transparent"),
+        ("rgb($r, $g, $b)", "rgb($r, $g, $b)"),
+    ),
+)
+def test_recolor_literal(literal: str, expected: str) -> None:
+    assert recolor_literal(literal, "solarized") == expected
+
+
+@pytest.mark.parametrize(
+    ("literal", "expected"),
+    (("#fff", "#fff"), ("#F00", "#F00"), ("#f00f", "#f00f"), ("maroon", "maroon")),
+)
+def test_recolor_literal_exact(literal: str, expected: str) -> None:
+    assert recolor_literal(literal, "css3") == expected
+
+
+def test_get_nearest_palette_rgb() -> None:
+    assert get_nearest_palette_rgb("red", 255, 0, 0) == (255, 0, 0)
+    assert get_nearest_palette_rgb("red", 250, 1, 1) == (255, 0, 0)
+    assert get_nearest_palette_rgb("gray", 0, 0, 0) == (0, 0, 0)
+
+
+def test_recolor_file(tmp_path: Path) -> None:
+    path = tmp_path / "main.css"
+    path.write_bytes(STYLESHEET.encode("utf-8"))
+    os.chmod(path, 0o640)
+
+    assert recolor_file(str(path), "solarized", dry_run=True) == 3
+    assert path.read_bytes() == STYLESHEET.encode("utf-8")
+
+    assert recolor_file(str(path), "solarized") == 3
+    assert path.read_bytes() == (
+        b"a {\n"
+        b"  color: #FDF6E3;\n"
+        b"  background: rgba(0, 43, 54, .5);\n"
+        b"  border-color: #dc322f;\n"
+        b"  fill: $variable;\n"
+        b"}\r\n"
+    )
+    assert os.stat(path).st_mode & 0o777 == 0o640
+
+    assert recolor_file(str(path), "solarized") == 0
+    assert os.listdir(tmp_path) == ["main.css"]
+
+
+def test_recolor_file_comments(tmp_path: Path) -> None:
+    path = tmp_path / "main.css"
+    path.write_text(
+        "/* red border */ a { color: red; }\n"
+        "/* #000 and\n"
+        "   white */ b { color: white; /* red */ }\n"
+    )
+    assert recolor_file(str(path), "solarized") == 3
+    assert path.read_text() == (
+        "/* red border */ a { color: #dc322f; }\n"
+        "/* #002B36 and\n"
+        "   white */ b { color: #fdf6e3; /* red */ }\n"
+    )
+
+
+@pytest.mark.parametrize("workers", (1, None))
+def test_recolor_files(tmp_path: Path, workers: int) -> None:
+    paths = []
+    for i in range(scanner.MIN_POOL_FILE_COUNT):
+        path = tmp_path / f"style{i}.scss"
+        path.write_bytes(STYLESHEET.encode("utf-8"))
+        paths.append(str(path))
+    (tmp_path / "notes.txt").write_bytes(STYLESHEET.encode("utf-8"))
+
+    results = recolor_files([str(tmp_path), paths[0]], "solarized", workers=workers)
+    assert sorted(results) == sorted((path, 3) for path in paths)
+    assert (tmp_path / "notes.txt").read_bytes() == STYLESHEET.encode("utf-8")
+
+
+def test_recolor_files_bad_input(tmp_path: Path) -> None:
+    with pytest.raises(InputValueError) as err:
+        recolor_files([str(tmp_path)], "unknown")
+    assert str(err.value).startswith("Bad palette name")
+
+    with pytest.raises(InputValueError) as err:
+        recolor_files([str(tmp_path / "missing.css")], "solarized")
+    assert str(err.value).startswith("Bad path")
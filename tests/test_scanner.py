@@ -0,0 +1,176 @@
+from pathlib import Path
+
+import pytest
+
+from colorpedia import scanner
+from colorpedia.exceptions import InputValueError
+from colorpedia.scanner import (
+    find_color_literals,
+    iter_scannable_files,
+    scan_directory,
+    scan_file,
+    summarize_scan_hits,
+)
+
+STYLESHEET = b"""body {
+  color: #FFF;
+  background: rgb(0 0 0 / 50%);
+}
+.red { border: 1px solid Red; }
+a { color: #12345; fill: hsl(120, 100%, 50%); }
+"""
+
+SOURCE = b"""THEME = {"primary": "#0A141E", "text": "red"}
+# Entity &#123; and #define are not colors.
+"""
+
+
+@pytest.fixture
+def tree(tmp_path: Path) -> Path:
+    (tmp_path / "styles").mkdir()
+    (tmp_path / "styles" / "main.css").write_bytes(STYLESHEET)
+    (tmp_path / "theme.py").write_bytes(SOURCE)
+    (tmp_path / "empty.json").write_bytes(b"")
+    (tmp_path / "notes.txt").write_bytes(b"#FFFFFF")
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".git" / "x.css").write_bytes(STYLESHEET)
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / "node_modules" / "x.css").write_bytes(STYLESHEET)
+    return tmp_path
+
+
+def test_find_color_literals() -> None:
+    assert find_color_literals(STYLESHEET, stylesheet=True) == [
+        (2, 10, "#FFF", "FFFFFF"),
+        (3, 15, "rgb(0 0 0 / 50%)", "000000"),
+        (5, 26, "Red", "FF0000"),
+        (6, 26, "hsl(120, 100%, 50%)", "00FF00"),
+    ]
+    assert find_color_literals(STYLESHEET) == [
+        (2, 10, "#FFF", "FFFFFF"),
+        (3, 15, "rgb(0 0 0 / 50%)", "000000"),
+        (6, 26, "hsl(120, 100%, 50%)", "00FF00"),
+    ]
+    assert find_color_literals(SOURCE) == [(1, 22, "#0A141E", "0A141E")]
+    assert find_color_literals(b"") == []
+
+
+def test_find_color_literals_non_ascii() -> None:
+    data = "#ff0000 /* rgb(é) hsl(\u2014) */ #00ff00".encode("utf-8")
+    assert find_color_literals(data) == [
+        (1, 1, "#ff0000", "FF0000"),
+        (1, 32, "#00ff00", "00FF00"),
+    ]
+
+
+def test_scan_file_non_ascii(tmp_path: Path) -> None:
+    path = tmp_path / "theme.css"
+    path.write_bytes(b"a { color: #ff0000; } /* rgb(\xe9) */\nb { color: red; }\n")
+    assert scan_file(str(path))[1] == [
+        (1, 12, "#ff0000", "FF0000"),
+        (2, 12, "red", "FF0000"),
+    ]
+
+
+def test_iter_scannable_files(tree: Path) -> None:
+    assert list(iter_scannable_files(str(tree))) == [
+        str(tree / "empty.json"),
+        str(tree / "theme.py"),
+        str(tree / "styles" / "main.css"),
+    ]
+
+
+def test_scan_file(tree: Path) -> None:
+    digest, hits = scan_file(str(tree / "theme.py"))
+    assert hits == [(1, 22, "#0A141E", "0A141E")]
+    assert scan_file(str(tree / "theme.py"), digest) == (digest, None)
+    assert scan_file(str(tree / "empty.json")) == (
+        "da39a3ee5e6b4b0d3255bfef95601890afd80709",
+        [],
+    )
+
+
+@pytest.mark.parametrize("workers", (1, None))
+def test_scan_directory(tree: Path, workers: int) -> None:
+    for i in range(scanner.MIN_POOL_FILE_COUNT):
+        (tree / f"module{i}.py").write_bytes(SOURCE)
+
+    hits = scan_directory(str(tree), workers=workers, use_index=False)
+    assert len(hits) == 5 + scanner.MIN_POOL_FILE_COUNT
+    assert hits[0].path == str(tree.resolve() / "module0.py")
+    assert hits[0].name == "black"
+    assert hits[0].is_name_exact is False
+
+    hit = hits[-2]
+    assert hit.get_dict() == {
+        "path": str(tree.resolve() / "styles" / "main.css"),
+        "line": 6,
+        "column": 26,
+        "literal": "hsl(120, 100%, 50%)",
+        "hex": "00FF00",
+        "name": "lime",
+        "is_name_exact": True,
+    }
+    assert summarize_scan_hits(hits) == [
+        ("0A141E", scanner.MIN_POOL_FILE_COUNT + 1),
+        ("000000", 1),
+        ("00FF00", 1),
+        ("FF0000", 1),
+        ("FFFFFF", 1),
+    ]
+
+
+def test_scan_directory_with_index(
+    tree: Path,
+    tmp_path_factory: pytest.TempPathFactory,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    cache_dir = tmp_path_factory.mktemp("cache")
+    monkeypatch.setattr(scanner, "CACHE_DIR", cache_dir)
+    monkeypatch.setattr(scanner, "SCAN_INDEX_FILE", cache_dir / "scan-index.json")
+
+    calls = []
+    original_scan_file = scanner.scan_file
+
+    def scan_file_spy(path, digest=None):  # type: ignore
+        calls.append((Path(path).name, digest is not None))
+        return original_scan_file(path, digest)
+
+    monkeypatch.setattr(scanner, "scan_file", scan_file_spy)
+
+    hits = scan_directory(str(tree))
+    assert len(hits) == 5
+    assert sorted(calls) == [
+        ("empty.json", False),
+        ("main.css", False),
+        ("theme.py", False),
+    ]
+
+    calls.clear()
+    assert scan_directory(str(tree)) == hits
+    assert calls == []
+
+    (tree / "theme.py").write_bytes(SOURCE + b"COLOR = 'rgb(1, 2, 3)'\n")
+    (tree / "empty.json").unlink()
+    hits = scan_directory(str(tree))
+    assert len(hits) == 6
+    assert calls == [("theme.py", True)]
+    assert str(tree.resolve() / "empty.json") not in scanner.load_scan_index()
+
+
+def test_scan_directory_bad_root(tmp_path: Path) -> None:
+    with pytest.raises(InputValueError) as err:
+        scan_directory(str(tmp_path / "missing"))
+    assert str(err.value).startswith("Bad directory")
+
+
+def test_scan_file_result_cache(tree: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    copy = tree / "copy.py"
+    copy.write_bytes(SOURCE)
+    digest, hits = scan_file(str(tree / "theme.py"))
+
+    def find_color_literals_fail(*_):  # type: ignore
+        raise AssertionError("file content should be cached")
+
+    monkeypatch.setattr(scanner, "find_color_literals", find_color_literals_fail)
+    assert scan_file(str(copy)) == (digest, hits)
@@ -0,0 +1,192 @@
+from pathlib import Path
+from random import Random
+from typing import List, Tuple
+
+import pytest
+
+from colorpedia.hexcodes import NAME_TO_HEX_CODE
+from colorpedia.names import NameDictionary, set_name_dictionary
+from colorpedia.search import (
+    MAX_NAME_TYPOS,
+    NameMatch,
+    NameSearchIndex,
+    find_color_name,
+    find_color_names,
+    get_max_typos,
+    get_name_key,
+    get_name_search_index,
+)
+from tests.helpers import get_random_hex_code
+
+LETTERS = "abcdeilmnorstu"
+
+
+def get_osa_distance(a: str, b: str) -> int:
+    rows = [list(range(len(b) + 1))]
+    for i in range(1, len(a) + 1):
+        row = [i]
+        for j in range(1, len(b) + 1):
+            distance = min(
+                rows[i - 1][j] + 1,
+                row[j - 1] + 1,
+                rows[i - 1][j - 1] + (a[i - 1] != b[j - 1]),
+            )
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                distance = min(distance, rows[i - 2][j - 2] + 1)
+            row.append(distance)
+        rows.append(row)
+    return min(rows[-1])
+
+
+def get_random_index(seed: int, count: int) -> NameSearchIndex:
+    random = Random(seed)
+    items = [
+        (
+            "".join(random.choice(LETTERS) for _ in range(random.randint(1, 9))),
+            get_random_hex_code(random),
+        )
+        for _ in range(count)
+    ]
+    return NameSearchIndex(NameDictionary.from_items("test", items))
+
+
+def find_slowly(index: NameSearchIndex, query: str) -> List[Tuple[str, str, int]]:
+    key = get_name_key(query)
+    matches = []
+    for name in index.names:
+        name_key = get_name_key(name)
+        if name_key == key:
+            matches.append((name, "exact", 0))
+        elif name_key.startswith(key):
+            matches.append((name, "prefix", 0))
+        elif len(key) >= 3 and key in name_key:
+            matches.append((name, "substring", 0))
+        elif get_max_typos(key):
+            typos = get_osa_distance(key, name_key)
+            if typos <= get_max_typos(key):
+                matches.append((name, "fuzzy", typos))
+    return matches
+
+
+@pytest.mark.parametrize(
+    ("name", "key"),
+    (
+        ("Dark Slate Blue", "darkslateblue"),
+        ("dark-slate_blue!", "darkslateblue"),
+        ("100 Mph", "100mph"),
+        ("Café Noir", "cafénoir"),
+        (" - ", ""),
+    ),
+)
+def test_get_name_key(name: str, key: str) -> None:
+    assert get_name_key(name) == key
+
+
+@pytest.mark.parametrize(
+    ("key", "max_typos"),
+    (("", 0), ("red", 0), ("blue", 0), ("green", 1), ("magenta", 1), ("darkblue", 2)),
+)
+def test_get_max_typos(key: str, max_typos: int) -> None:
+    assert get_max_typos(key) == max_typos
+    assert get_max_typos(key * 10) == (MAX_NAME_TYPOS if key else 0)
+
+
+def test_find_color_names() -> None:
+    assert find_color_names("Dark Slate Blue") == [
+        NameMatch("darkslateblue", "483D8B", "exact", 0)
+    ]
+    assert [(m.name, m.kind) for m in find_color_names("slat", 5)] == [
+        ("slateblue", "prefix"),
+        ("slategray", "prefix"),
+        ("slategrey", "prefix"),
+        ("darkslateblue", "substring"),
+        ("darkslategray", "substring"),
+    ]
+    assert [(m.name, m.kind) for m in find_color_names("white", 3)] == [
+        ("white", "exact"),
+        ("whitesmoke", "prefix"),
+        ("ghostwhite", "substring"),
+    ]
+    assert [(m.name, m.kind, m.typos) for m in find_color_names("GRAEN")] == [
+        ("green", "fuzzy", 1),
+        ("greenyellow", "fuzzy", 1),
+    ]
+    assert [(m.name, m.typos) for m in find_color_names("wihte smoke")] == [
+        ("whitesmoke", 1)
+    ]
+    assert find_color_names("drkslategrey")[0] == NameMatch(
+        "darkslategrey", "2F4F4F", "fuzzy", 1
+    )
+    assert find_color_names("zzz") == []
+    assert find_color_names("") == []
+    assert find_color_names("red", 0) == []
+
+
+def test_find_color_name() -> None:
+    assert find_color_name("Light Goldenrod Yellow") == NameMatch(
+        "lightgoldenrodyellow", "FAFAD2", "exact", 0
+    )
+    assert find_color_name("tan") == NameMatch("tan", "D2B48C", "exact", 0)
+    assert find_color_name("aqumarine") == NameMatch("aquamarine", "7FFFD4", "fuzzy", 1)
+    assert find_color_name("xyz") is None
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_name_search_index_find(seed: int) -> None:
+    index = get_random_index(seed, 150)
+    random = Random(seed)
+    queries = [
+        "".join(random.choice(LETTERS) for _ in range(random.randint(1, 9)))
+        for _ in range(50)
+    ]
+    for query in queries + index.names[:10]:
+        expected = find_slowly(index, query)
+        matches = index.find(query, len(index))
+        assert sorted((m.name, m.kind, m.typos) for m in matches) == sorted(expected)
+        # Matches are ranked by kind, then by typos.
+        kinds = [m.kind for m in matches]
+        assert kinds == sorted(
+            kinds, key=("exact", "prefix", "substring", "fuzzy").index
+        )
+        assert [m.typos for m in matches if m.kind == "fuzzy"] == sorted(
+            m.typos for m in matches if m.kind == "fuzzy"
+        )
+        # Fewer matches are the best ones.
+        for count in (1, 3):
+            assert index.find(query, count) == matches[:count]
+
+
+def test_name_search_index_empty() -> None:
+    index = NameSearchIndex(NameDictionary.from_items("empty", []))
+    assert len(index) == 0
+    assert index.find("green") == []
+    assert index.find_exact("green") is None
+
+
+def test_get_name_search_index(names_dir: Path) -> None:
+    index = get_name_search_index()
+    assert index is get_name_search_index()
+    assert len(index) == len(NAME_TO_HEX_CODE)
+
+    (names_dir / "brand.txt").write_text("Brand Red #E10600\nBrand Ink 1B1B1B\n")
+    set_name_dictionary("brand")
+    index = get_name_search_index()
+    assert index.names == ["Brand Red", "Brand Ink"]
+    assert find_color_names("brand") == [
+        NameMatch("Brand Ink", "1B1B1B", "prefix", 0),
+        NameMatch("Brand Red", "E10600", "prefix", 0),
+    ]
+    assert find_color_name("brandred") == NameMatch("Brand Red", "E10600", "exact", 0)
+
+
+def test_name_search_index_ties() -> None:
+    dictionary = NameDictionary.from_items(
+        "test", [("Sea Green", "2E8B57"), ("seagreen", "2E8B57"), ("sea", "000")]
+    )
+    index = NameSearchIndex(dictionary)
+    assert index.find_exact("SEA-GREEN") == NameMatch("Sea Green", "2E8B57", "exact", 0)
+    assert [(m.name, m.kind) for m in index.find("sea")] == [
+        ("sea", "exact"),
+        ("Sea Green", "prefix"),
+        ("seagreen", "prefix"),
+    ]
@@ -0,0 +1,143 @@
+import asyncio
+from json import dumps as json_dumps
+from json import loads as json_loads
+from pathlib import Path
+from typing import Any, List, Tuple
+
+import pytest
+
+from colorpedia.config import Config
+from colorpedia.server import ColorServer, Metrics
+
+config = Config()
+config.json_keys = frozenset(("hex", "name"))
+
+
+@pytest.mark.parametrize(
+    ("method", "target", "body", "status", "expected"),
+    (
+        ("GET", "/hex/fff", b"", 200, {"hex": "FFFFFF", "name": "white"}),
+        ("GET", "/hex/FF0000?x=1", b"", 200, {"hex": "FF0000", "name": "red"}),
+        ("GET", "/rgb/0/0/255", b"", 200, {"hex": "0000FF", "name": "blue"}),
+        ("GET", "/name/lime", b"", 200, {"hex": "00FF00", "name": "lime"}),
+        ("GET", "/palette/zenburn", b"", 200, 5),
+        ("POST", "/batch", b'["red", "#00f"]', 200, 2),
+        ("POST", "/batch", b"[]", 200, 0),
+        ("GET", "/hex/fffff", b"", 400, None),
+        ("GET", "/rgb/0/0/256", b"", 400, None),
+        ("GET", "/rgb/0/0/x", b"", 400, None),
+        ("POST", "/batch", b'["red", "#00"]', 400, None),
+        ("POST", "/batch", b'{"red": 1}', 400, None),
+        ("POST", "/batch", b"[", 400, None),
+        ("GET", "/rgb/0/0", b"", 404, None),
+        ("GET", "/name/foo", b"", 404, None),
+        ("GET", "/palette/foo", b"", 404, None),
+        ("GET", "/foo", b"", 404, None),
+        ("GET", "/", b"", 404, None),
+        ("GET", "/metrics/foo", b"", 404, None),
+        ("POST", "/hex/fff", b"", 405, None),
+        ("GET", "/batch", b"", 405, None),
+    ),
+)
+def test_dispatch(
+    method: str, target: str, body: bytes, status: int, expected: Any
+) -> None:
+    server = ColorServer(config)
+    _, (response_status, data, content_type) = server.dispatch(method, target, body)
+    assert response_status == status
+    assert content_type == "application/json"
+
+    result = json_loads(data)
+    if status != 200:
+        assert "error" in result
+    elif isinstance(expected, int):
+        assert len(result) == expected
+    else:
+        assert result == expected
+
+
+def test_dispatch_bad_palette_file(palettes_dir: Path) -> None:
+    (palettes_dir / "bad.json").write_text("not json")
+    server = ColorServer(config)
+    route, (status, data, _) = server.dispatch("GET", "/palette/bad", b"")
+    assert (route, status) == ("palette", 500)
+    assert "bad.json" in json_loads(data)["error"]
+
+    _, (status, _, _) = server.dispatch("GET", "/palette/zenburn", b"")
+    assert status == 200
+
+
+def test_metrics() -> None:
+    metrics = Metrics()
+    assert "colorpedia_requests_total{" not in metrics.render()
+
+    metrics.observe("hex", 200, 0.0001)
+    metrics.observe("hex", 200, 0.002)
+    metrics.observe("hex", 400, 5)
+    text = metrics.render()
+    assert 'colorpedia_requests_total{route="hex",status="200"} 2' in text
+    assert 'colorpedia_requests_total{route="hex",status="400"} 1' in text
+    assert (
+        'colorpedia_request_duration_seconds_bucket{route="hex",le="0.0005"} 1' in text
+    )
+    assert (
+        'colorpedia_request_duration_seconds_bucket{route="hex",le="0.0025"} 2' in text
+    )
+    assert 'colorpedia_request_duration_seconds_bucket{route="hex",le="+Inf"} 3' in text
+    assert 'colorpedia_request_duration_seconds_count{route="hex"} 3' in text
+
+
+async def request(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    method: str,
+    target: str,
+    body: bytes = b"",
+    headers: Tuple[str, ...] = (),
+) -> Tuple[int, List[str], bytes]:
+    lines = [f"{method} {target} HTTP/1.1", f"Content-Length: {len(body)}"]
+    writer.write("\r\n".join(lines + list(headers) + ["", ""]).encode() + body)
+    head = (await reader.readuntil(b"\r\n\r\n")).decode().split("\r\n")
+    length = int(next(h for h in head if h.startswith("Content-Length")).split()[1])
+    return int(head[0].split()[1]), head, await reader.readexactly(length)
+
+
+def test_server_keep_alive() -> None:
+    async def run() -> None:
+        server = ColorServer(config)
+        tcp_server = await server.start("127.0.0.1", 0)
+        port = tcp_server.sockets[0].getsockname()[1]
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            status, head, body = await request(reader, writer, "GET", "/hex/000")
+            assert status == 200
+            assert "Connection: keep-alive" in head
+            assert json_loads(body) == {"hex": "000000", "name": "black"}
+
+            data = json_dumps(["white", "rgb(0 0 0)"]).encode()
+            status, _, body = await request(reader, writer, "POST", "/batch", data)
+            assert status == 200
+            assert [c["name"] for c in json_loads(body)] == ["white", "black"]
+
+            status, head, body = await request(
+                reader, writer, "GET", "/metrics", headers=("Connection: close",)
+            )
+            assert status == 200
+            assert "Connection: close" in head
+            assert b'route="batch",status="200"} 1' in body
+            assert await reader.read() == b""
+            writer.close()
+
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"POST /batch HTTP/1.1\r\nContent-Length: 9999999\r\n\r\n")
+            assert (await reader.readline()).startswith(b"HTTP/1.1 413")
+            writer.close()
+        finally:
+            tcp_server.close()
+            await tcp_server.wait_closed()
+
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(run())
+    finally:
+        loop.close()
@@ -0,0 +1,144 @@
+from itertools import permutations
+from pathlib import Path
+from random import Random
+from typing import Dict, List, Tuple
+
+import pytest
+
+from colorpedia.converters import hex_to_rgb, rgb_to_lab
+from colorpedia.exceptions import PaletteFileError
+from colorpedia.members import MemberIndex
+from colorpedia.similarity import (
+    EMBEDDING_SIZE,
+    SimilarityIndex,
+    SimilarPalette,
+    find_similar_palettes,
+    get_assignment,
+    get_chamfer_distance,
+    get_palette_distance,
+    get_palette_embedding,
+    get_similarity_index,
+)
+from colorpedia.spatial import Point
+from tests.helpers import get_random_hex_code
+
+
+def get_labs(hex_codes: List[str]) -> List[Point]:
+    return [rgb_to_lab(*hex_to_rgb(hex_code)) for hex_code in hex_codes]
+
+
+def get_palette_families(seed: int, count: int) -> Dict[str, List[str]]:
+    random = Random(seed)
+
+    def jitter(hex_code: str) -> str:
+        return "{:02X}{:02X}{:02X}".format(
+            *(
+                min(max(v + random.randint(-20, 20), 0), 255)
+                for v in hex_to_rgb(hex_code)
+            )
+        )
+
+    palettes = {}
+    for family in range(count):
+        base = [get_random_hex_code(random) for _ in range(random.randint(3, 8))]
+        for variant in range(4):
+            colors = [jitter(hex_code) for hex_code in base]
+            if variant == 3:
+                colors = colors[1:]
+            random.shuffle(colors)
+            palettes[f"family{family}-{variant}"] = colors
+    return palettes
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_get_assignment(seed: int) -> None:
+    random = Random(seed)
+    n = random.randint(1, 5)
+    m = random.randint(n, 6)
+    costs = [[random.random() for _ in range(m)] for _ in range(n)]
+    assignment = get_assignment(costs)
+    assert len(set(assignment)) == n
+    expected = min(
+        sum(costs[row][column] for row, column in enumerate(columns))
+        for columns in permutations(range(m), n)
+    )
+    assert sum(costs[row][column] for row, column in enumerate(assignment)) == (
+        pytest.approx(expected)
+    )
+
+
+def test_get_assignment_empty() -> None:
+    assert get_assignment([]) == []
+
+
+def test_get_palette_distance() -> None:
+    red, blue, white = get_labs(["FF0000", "0000FF", "FFFFFF"])
+    assert get_palette_distance([red, blue], [blue, red]) == 0
+    assert get_palette_distance([red], [red, red]) == 0
+    assert get_palette_distance([], []) == 0
+    assert get_palette_distance([red], []) == float("inf")
+
+    # Red is matched to red, and the extra white to its nearest color.
+    distance = get_palette_distance([red], [white, red])
+    assert distance == get_palette_distance([white, red], [red])
+    assert distance == pytest.approx(
+        sum((x - y) ** 2 for x, y in zip(red, white)) ** 0.5 / 2
+    )
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_get_chamfer_distance_is_lower_bound(seed: int) -> None:
+    random = Random(seed)
+    labs1 = get_labs([get_random_hex_code(random) for _ in range(5)])
+    labs2 = get_labs([get_random_hex_code(random) for _ in range(8)])
+    chamfer_distance = get_chamfer_distance(labs1, labs2)
+    assert chamfer_distance == get_chamfer_distance(labs2, labs1)
+    assert chamfer_distance <= get_palette_distance(labs1, labs2) + 1e-9
+
+
+def test_get_palette_embedding() -> None:
+    labs = get_labs(["FF0000", "00FF00", "0000FF"])
+    embedding = get_palette_embedding(labs)
+    assert len(embedding) == EMBEDDING_SIZE
+    assert embedding == get_palette_embedding(labs[::-1])
+    assert get_palette_embedding([]) == [0.0] * EMBEDDING_SIZE
+
+
+def test_similarity_index_find_similar() -> None:
+    palettes = get_palette_families(0, 40)
+    index = SimilarityIndex(MemberIndex.from_palettes(palettes))
+    names = list(palettes)
+    labs = {name: get_labs(hex_codes) for name, hex_codes in palettes.items()}
+    for name in names[::7]:
+        results = index.find_similar(name, count=3)
+        expected: List[Tuple[float, str]] = sorted(
+            (get_palette_distance(labs[name], labs[other]), other)
+            for other in names
+            if other != name
+        )[:3]
+        assert [result.palette for result in results] == [n for _, n in expected]
+        for result, (distance, _) in zip(results, expected):
+            assert result.distance == pytest.approx(distance)
+
+
+def test_similarity_index_find_similar_bad_palette() -> None:
+    index = SimilarityIndex(MemberIndex.from_palettes({"warm": ["FF0000"]}))
+    assert index.find_similar("warm") == []
+    with pytest.raises(ValueError) as err:
+        index.find_similar("cool")
+    assert str(err.value) == 'Unknown color palette "cool"'
+
+
+def test_find_similar_palettes_bad_file(palettes_dir: Path) -> None:
+    (palettes_dir / "bad.json").write_text("not json")
+    assert find_similar_palettes("gray", count=1) == [SimilarPalette("grey", 0.0)]
+    with pytest.raises(PaletteFileError):
+        find_similar_palettes("bad")
+
+
+def test_find_similar_palettes() -> None:
+    index = get_similarity_index()
+    assert get_similarity_index() is index
+    results = find_similar_palettes("gray", count=2)
+    assert results[0] == SimilarPalette("grey", 0.0)
+    assert len(results) == 2
@@ -0,0 +1,62 @@
+import random
+from itertools import combinations
+
+import pytest
+
+from colorpedia.spatial import Point, PointGrid, iter_close_pairs
+
+
+def distance(p: Point, q: Point) -> float:
+    return sum((x - y) ** 2 for x, y in zip(p, q)) ** 0.5
+
+
+def test_point_grid() -> None:
+    grid = PointGrid(10.0, [(0.0, 0.0, 0.0), (5.0, 5.0, 5.0), (-8.0, 0.0, 0.0)])
+    assert len(grid) == 3
+    assert grid.add((100.0, 0.0, 0.0)) == 3
+    assert sorted(i for i, _ in grid.iter_neighbors((1.0, 0.0, 0.0), 10.0)) == [0, 1, 2]
+    assert [i for i, _ in grid.iter_neighbors((95.0, 0.0, 0.0), 5.5)] == [3]
+    assert list(grid.iter_neighbors((50.0, 50.0, 50.0), 10.0)) == []
+
+    with pytest.raises(ValueError):
+        list(grid.iter_neighbors((0.0, 0.0, 0.0), 11.0))
+    with pytest.raises(ValueError):
+        PointGrid(0)
+
+
+@pytest.mark.parametrize("radius", (1.0, 5.0, 20.0))
+def test_iter_close_pairs(radius: float) -> None:
+    rng = random.Random(radius)
+    points = [
+        (rng.uniform(0, 100), rng.uniform(-50, 50), rng.uniform(-50, 50))
+        for _ in range(300)
+    ]
+    expected = {
+        (i, j): distance(points[i], points[j])
+        for i, j in combinations(range(len(points)), 2)
+        if distance(points[i], points[j]) < radius
+    }
+    pairs = {(i, j): d for i, j, d in iter_close_pairs(points, radius)}
+    assert pairs.keys() == expected.keys()
+    for key, value in pairs.items():
+        assert value == pytest.approx(expected[key])
+
+
+@pytest.mark.parametrize("radius", (3.0, 10.0, 25.0, 500.0))
+def test_point_grid_iter_within(radius: float) -> None:
+    rng = random.Random(radius)
+    points = [
+        (rng.uniform(0, 100), rng.uniform(-50, 50), rng.uniform(-50, 50))
+        for _ in range(300)
+    ]
+    grid = PointGrid(5.0, points)
+    for query in points[:20] + [(50.0, 0.0, 0.0), (-200.0, 0.0, 0.0)]:
+        expected = {
+            i: distance(query, point)
+            for i, point in enumerate(points)
+            if distance(query, point) < radius
+        }
+        neighbors = dict(grid.iter_within(query, radius))
+        assert neighbors.keys() == expected.keys()
+        for key, value in neighbors.items():
+            assert value == pytest.approx(expected[key])
@@ -0,0 +1,350 @@
+import io
+import os
+import struct
+from pathlib import Path
+from typing import Any, List
+
+import pytest
+
+from colorpedia import swatches
+from colorpedia.config import MIN_POOL_FILE_COUNT
+from colorpedia.exceptions import PaletteFileError
+from colorpedia.palettes import palette_to_rgbs
+from colorpedia.swatches import (
+    Swatch,
+    convert_palette_file,
+    convert_palette_files,
+    iter_palette_file,
+    normalize_swatch_hex_code,
+    read_ase_palette,
+    read_css_palette,
+    read_gpl_palette,
+    read_json_palette,
+    read_palette_file,
+    write_ase_palette,
+    write_css_palette,
+    write_gpl_palette,
+    write_json_palette,
+    write_palette,
+)
+
+GPL_PALETTE = """GIMP Palette
+Name: Brand
+Columns: 2
+#
+225   6   0\tBrand Red
+ 27  27  27 Ink
+
+255 255 255
+"""
+
+CSS_PALETTE = """:root {
+  --brand-red: #e10600;
+  --ink:#1B1B1B; --gap: 4px;
+  --paper: #fff
+}
+a { color: var(--ink); border-color: #000; }
+"""
+
+SWATCHES = [("E10600", "Brand Red"), ("1B1B1B", "Ink"), ("FFFFFF", "")]
+
+
+def get_ase_block(block_type: int, name: str = "", body: bytes = b"") -> bytes:
+    data = (name + "\0").encode("utf-16-be") if name else b""
+    if name:
+        data = struct.pack(">H", len(data) // 2) + data
+    data += body
+    return struct.pack(">HI", block_type, len(data)) + data
+
+
+def get_ase_data(*blocks: bytes) -> bytes:
+    return struct.pack(">4sHHI", b"ASEF", 1, 0, len(blocks)) + b"".join(blocks)
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    (("#abc", "AABBCC"), ("e10600", "E10600"), (" #1B1B1B ", "1B1B1B")),
+)
+def test_normalize_swatch_hex_code(value: str, expected: str) -> None:
+    assert normalize_swatch_hex_code(value) == expected
+
+
+@pytest.mark.parametrize("bad_value", ("#abcd", "red", "", 123, None))
+def test_normalize_swatch_hex_code_bad_value(bad_value: Any) -> None:
+    with pytest.raises(ValueError) as err:
+        normalize_swatch_hex_code(bad_value)
+    assert str(err.value).startswith("Bad hex code")
+
+
+@pytest.mark.parametrize(
+    "data",
+    ('["#E10600", "1b1b1b"]', '{"name": "brand", "colors": ["E10600", "1B1B1B"]}'),
+)
+def test_read_json_palette(data: str) -> None:
+    swatches = list(read_json_palette(io.StringIO(data)))
+    assert swatches == [("E10600", ""), ("1B1B1B", "")]
+
+
+@pytest.mark.parametrize("data", ('{"colors": "E10600"}', '"E10600"', "{}"))
+def test_read_json_palette_bad_data(data: str) -> None:
+    with pytest.raises(ValueError) as err:
+        list(read_json_palette(io.StringIO(data)))
+    assert "expecting an array of hex codes" in str(err.value)
+
+
+def test_read_gpl_palette() -> None:
+    swatches = list(read_gpl_palette(io.StringIO(GPL_PALETTE)))
+    assert swatches == [("E10600", "Brand Red"), ("1B1B1B", "Ink"), ("FFFFFF", "")]
+
+
+@pytest.mark.parametrize(
+    ("data", "message"),
+    (
+        ("Palette\n", 'expecting "GIMP Palette" on line 1'),
+        ("GIMP Palette\n1 2\n", "expecting RGB values on line 2"),
+        ("GIMP Palette\n#\n1 2 256 x\n", "expecting RGB values on line 3"),
+        ("GIMP Palette\nred 2 3\n", "expecting RGB values on line 2"),
+    ),
+)
+def test_read_gpl_palette_bad_data(data: str, message: str) -> None:
+    with pytest.raises(ValueError) as err:
+        list(read_gpl_palette(io.StringIO(data)))
+    assert str(err.value) == message
+
+
+def test_read_palette_file(tmp_path: Path) -> None:
+    path = tmp_path / "brand.gpl"
+    path.write_text(GPL_PALETTE + "225 6 0 Brand Red Again\n")
+    assert list(iter_palette_file(path))[-1] == ("E10600", "Brand Red Again")
+    assert read_palette_file(path) == ("E10600", "1B1B1B", "FFFFFF")
+
+    path = tmp_path / "BRAND.JSON"
+    path.write_text('["E10600"]')
+    assert read_palette_file(path) == ("E10600",)
+
+
+@pytest.mark.parametrize(
+    ("file_name", "content", "message"),
+    (
+        ("brand.txt", "", "unknown palette file extension"),
+        ("brand.json", "[]", "no colors"),
+        ("brand.json", '["red"]', 'Bad hex code "red"'),
+        ("brand.gpl", "GIMP\n", 'expecting "GIMP Palette" on line 1'),
+    ),
+)
+def test_read_palette_file_bad_file(
+    tmp_path: Path, file_name: str, content: str, message: str
+) -> None:
+    path = tmp_path / file_name
+    path.write_text(content)
+    with pytest.raises(PaletteFileError) as err:
+        read_palette_file(path)
+    assert str(err.value) == f"Cannot load {path}: {message}"
+
+
+def test_read_palette_file_missing_file(tmp_path: Path) -> None:
+    with pytest.raises(PaletteFileError) as err:
+        read_palette_file(tmp_path / "brand.gpl")
+    assert "No such file or directory" in str(err.value)
+
+
+def test_read_ase_palette() -> None:
+    data = get_ase_data(
+        get_ase_block(0xC001, "Brand"),
+        get_ase_block(1, "Red", b"RGB " + struct.pack(">3fH", 1, 0.0235, 0, 0)),
+        get_ase_block(1, "Ink", b"CMYK" + struct.pack(">4fH", 0, 0, 0, 0.9, 0)),
+        get_ase_block(0xC002),
+        get_ase_block(1, "Gray", b"Gray" + struct.pack(">fH", 0.5, 2)),
+        get_ase_block(1, "Lab", b"LAB " + struct.pack(">3fH", 1, 0, 0, 2)),
+    )
+    assert list(read_ase_palette(data)) == [
+        ("FF0600", "Red"),
+        ("1A1A1A", "Ink"),
+        ("808080", "Gray"),
+        ("FFFFFF", "Lab"),
+    ]
+
+
+@pytest.mark.parametrize(
+    ("data", "message"),
+    (
+        (b"ASEF", "truncated ASE data"),
+        (b"ASEF" + struct.pack(">HHI", 2, 0, 0), "expecting ASE version 1 data"),
+        (b"8BPS" + struct.pack(">HHI", 1, 0, 0), "expecting ASE version 1 data"),
+        (get_ase_data(get_ase_block(1, "Red"))[:-1], "truncated ASE data"),
+        (get_ase_data(get_ase_block(1, "Red"))[:14], "truncated ASE data"),
+        (get_ase_data(get_ase_block(1, "Red", b"RGB ")), "bad ASE color block"),
+        (
+            get_ase_data(get_ase_block(1, "Red", b"HSV " + bytes(14))),
+            "unknown ASE color model b'HSV '",
+        ),
+    ),
+)
+def test_read_ase_palette_bad_data(data: bytes, message: str) -> None:
+    with pytest.raises(ValueError) as err:
+        list(read_ase_palette(data))
+    assert str(err.value) == message
+
+
+@pytest.mark.parametrize(
+    ("body", "message"),
+    (
+        (b"XYZ " + bytes(14), "unknown ASE color model b'XYZ '"),
+        (b"RGB " + bytes(3), "bad ASE color block"),
+    ),
+)
+def test_read_palette_file_bad_ase_file(
+    tmp_path: Path, body: bytes, message: str
+) -> None:
+    path = tmp_path / "brand.ase"
+    path.write_bytes(get_ase_data(get_ase_block(1, "Red", body)))
+    with pytest.raises(PaletteFileError) as err:
+        read_palette_file(path)
+    assert str(err.value) == f"Cannot load {path}: {message}"
+
+
+def test_read_css_palette() -> None:
+    assert list(read_css_palette(io.StringIO(CSS_PALETTE))) == [
+        ("E10600", "brand-red"),
+        ("1B1B1B", "ink"),
+        ("FFFFFF", "paper"),
+    ]
+
+
+def test_write_ase_palette() -> None:
+    fp = io.BytesIO()
+    write_ase_palette(fp, SWATCHES, "brand")
+    assert list(read_ase_palette(fp.getvalue())) == SWATCHES[:2] + [
+        ("FFFFFF", "brand-3")
+    ]
+
+
+def test_write_gpl_palette() -> None:
+    fp = io.StringIO()
+    write_gpl_palette(fp, SWATCHES, "brand")
+    assert fp.getvalue() == (
+        "GIMP Palette\nName: brand\n#\n"
+        "225   6   0\tBrand Red\n"
+        " 27  27  27\tInk\n"
+        "255 255 255\tbrand-3\n"
+    )
+    fp.seek(0)
+    assert list(read_gpl_palette(fp)) == SWATCHES[:2] + [("FFFFFF", "brand-3")]
+
+
+def test_write_css_palette() -> None:
+    fp = io.StringIO()
+    write_css_palette(fp, SWATCHES + [("000000", "ink!")], "Brand")
+    assert fp.getvalue() == (
+        ":root {\n"
+        "  --brand-red: #E10600;\n"
+        "  --ink: #1B1B1B;\n"
+        "  --brand-3: #FFFFFF;\n"
+        "  --brand-4: #000000;\n"
+        "}\n"
+    )
+
+
+def test_write_json_palette() -> None:
+    fp = io.StringIO()
+    write_json_palette(fp, SWATCHES, "brand")
+    fp.seek(0)
+    assert list(read_json_palette(fp)) == [(code, "") for code, _ in SWATCHES]
+
+
+@pytest.mark.parametrize("export_format", ("json", "gpl", "ase", "css"))
+def test_write_palette(export_format: str) -> None:
+    fp = io.TextIOWrapper(io.BytesIO(), encoding="utf-8")
+    write_palette(fp, SWATCHES, "brand", export_format)
+    fp.flush()
+    data = fp.buffer.getvalue()  # type: ignore
+    if export_format == "ase":
+        written: List[Swatch] = list(read_ase_palette(data))
+    else:
+        reader = getattr(swatches, f"read_{export_format}_palette")
+        written = list(reader(io.StringIO(data.decode("utf-8"))))
+    assert [code for code, _ in written] == [code for code, _ in SWATCHES]
+
+
+def test_write_palette_bad_format() -> None:
+    with pytest.raises(ValueError) as err:
+        write_palette(io.StringIO(), SWATCHES, "brand", "pdf")
+    assert str(err.value) == 'Unknown palette file format "pdf"'
+
+
+@pytest.mark.parametrize("extension", (".json", ".gpl", ".ase", ".css"))
+def test_convert_palette_file(tmp_path: Path, extension: str) -> None:
+    source = tmp_path / "Brand.gpl"
+    source.write_text(GPL_PALETTE)
+    target = tmp_path / f"converted{extension}"
+    assert convert_palette_file(source, target) == 3
+    assert read_palette_file(target) == ("E10600", "1B1B1B", "FFFFFF")
+    assert sorted(os.listdir(tmp_path)) == sorted(["Brand.gpl", target.name])
+
+
+def test_convert_palette_file_bad_file(tmp_path: Path) -> None:
+    source = tmp_path / "brand.css"
+    source.write_text("a { color: #000; }")
+    with pytest.raises(PaletteFileError) as err:
+        convert_palette_file(source, tmp_path / "brand.gpl")
+    assert str(err.value) == f"Cannot load {source}: no colors"
+
+    source.write_text(CSS_PALETTE)
+    with pytest.raises(PaletteFileError) as err:
+        convert_palette_file(source, tmp_path / "brand.txt")
+    assert "unknown palette file extension" in str(err.value)
+    assert os.listdir(tmp_path) == ["brand.css"]
+
+
+@pytest.mark.parametrize("workers", (1, None))
+def test_convert_palette_files(tmp_path: Path, workers: int) -> None:
+    source_dir = tmp_path / "source"
+    source_dir.mkdir()
+    paths = []
+    for i in range(MIN_POOL_FILE_COUNT):
+        path = source_dir / f"Palette{i}.css"
+        path.write_text(CSS_PALETTE)
+        paths.append(path)
+    (source_dir / "notes.txt").write_text(CSS_PALETTE)
+    (source_dir / "bad.json").write_text("[")
+    (source_dir / "broken.ase").write_bytes(
+        get_ase_data(get_ase_block(1, "Red", b"XYZ " + bytes(14)))
+    )
+    ase_path = tmp_path / "brand.ase"
+    with open(ase_path, "wb") as fp:
+        write_ase_palette(fp, SWATCHES, "brand")
+
+    target_dir = tmp_path / "target"
+    results = convert_palette_files(
+        [source_dir, ase_path, paths[0]], target_dir, workers=workers
+    )
+    assert sorted(results, key=str) == sorted(
+        [(source_dir / "bad.json", None), (source_dir / "broken.ase", None)]
+        + [(ase_path, 3)]
+        + [(path, 3) for path in paths],
+        key=str,
+    )
+    assert sorted(os.listdir(target_dir)) == sorted(
+        [f"palette{i}.gpl" for i in range(len(paths))] + ["brand.gpl"]
+    )
+    assert list(iter_palette_file(target_dir / "brand.gpl")) == [
+        ("E10600", "Brand Red"),
+        ("1B1B1B", "Ink"),
+        ("FFFFFF", "brand-3"),
+    ]
+
+
+def test_convert_palette_files_replace(tmp_path: Path, palettes_dir: Path) -> None:
+    (palettes_dir / "foo.css").write_text(CSS_PALETTE)
+    (palettes_dir / "Foo.json").write_text('["#FFFFFF"]')
+    (palettes_dir / "bar.css").write_text(CSS_PALETTE)
+    assert palette_to_rgbs("foo") == [(255, 255, 255)]  # Foo.json sorts first.
+
+    (tmp_path / "foo.json").write_text('["#000000"]')
+    (tmp_path / "bar.json").write_text("[")
+    results = convert_palette_files(
+        [tmp_path / "foo.json", tmp_path / "bar.json"], palettes_dir
+    )
+    assert results == [(tmp_path / "foo.json", 1), (tmp_path / "bar.json", None)]
+    assert sorted(os.listdir(palettes_dir)) == ["bar.css", "foo.gpl"]
+    assert palette_to_rgbs("foo") == [(0, 0, 0)]
@@ -0,0 +1,211 @@
+import io
+import json
+import random
+import struct
+from itertools import combinations
+
+import pytest
+
+from colorpedia.arrays import ColorArray
+from colorpedia.color import Color
+from colorpedia.config import JSON_KEYS, Config
+from colorpedia.writers import (
+    get_column_names,
+    iter_json_objects,
+    read_columnar,
+    round_floats,
+    write_binary,
+    write_colors,
+    write_columnar,
+    write_delimited,
+    write_json,
+    write_json_matrix,
+)
+
+RGBS = [(0, 0, 0), (100, 100, 100), (72, 61, 139)]
+colors = ColorArray.from_rgbs(RGBS)
+
+
+def test_round_floats() -> None:
+    value = {"a": [0.12345, 1, (0.5, 0.98765)], "b": "x", "c": True}
+    assert round_floats(value, 2) == {"a": [0.12, 1, [0.5, 0.99]], "b": "x", "c": True}
+    assert round_floats(value, 17) is value
+    assert round_floats(0.5, 0) == 0.0
+
+
+def test_get_column_names() -> None:
+    assert get_column_names(JSON_KEYS) == [
+        "hex",
+        "r",
+        "g",
+        "b",
+        "hsl_h",
+        "hsl_s",
+        "hsl_l",
+        "hsv_h",
+        "hsv_s",
+        "hsv_v",
+        "cmyk_c",
+        "cmyk_m",
+        "cmyk_y",
+        "cmyk_k",
+        "name",
+        "is_name_exact",
+    ]
+    assert get_column_names({"name", "hex"}) == ["hex", "name"]
+
+
+def test_write_json() -> None:
+    fp = io.StringIO()
+    write_json(fp, colors, JSON_KEYS, 17)
+    assert json.loads(fp.getvalue()) == json.loads(
+        json.dumps([Color(*rgb).get_dict(JSON_KEYS) for rgb in RGBS])
+    )
+
+    fp = io.StringIO()
+    write_json(fp, colors, frozenset(("hex", "hsl")), 2)
+    assert fp.getvalue() == (
+        '[{"hex": "000000", "hsl": [0.0, 0.0, 0.0]}, '
+        '{"hex": "646464", "hsl": [0.0, 0.0, 0.39]}, '
+        '{"hex": "483D8B", "hsl": [0.69, 0.39, 0.39]}]\n'
+    )
+
+
+@pytest.mark.parametrize("precision", (0, 3, 17))
+def test_iter_json_objects(precision: int) -> None:
+    rng = random.Random(precision)
+    rgbs = [(0, 0, 0), (255, 255, 255), (0, 0, 1), (255, 0, 0)]
+    rgbs += [tuple(rng.randrange(256) for _ in range(3)) for _ in range(200)]
+    colors = ColorArray.from_rgbs(rgbs)  # type: ignore
+    reference = [Color(*rgb) for rgb in rgbs]
+
+    for size in range(1, len(JSON_KEYS) + 1):
+        for keys in combinations(sorted(JSON_KEYS), size):
+            expected = [
+                json.dumps(round_floats(color.get_dict(set(keys)), precision))
+                for color in reference
+            ]
+            assert list(iter_json_objects(colors, set(keys), precision)) == expected
+
+
+def test_write_json_chunks() -> None:
+    expected = json.dumps([Color(*rgb).get_dict(JSON_KEYS) for rgb in RGBS]) + "\n"
+    for chunk_size in (1, 2, 3, 1024):
+        fp = io.StringIO()
+        write_json(fp, colors, JSON_KEYS, 17, chunk_size)
+        assert fp.getvalue() == expected
+
+    fp = io.StringIO()
+    write_json(fp, colors[:0], JSON_KEYS, 17)
+    assert fp.getvalue() == "[]\n"
+
+
+def test_write_json_matrix() -> None:
+    keys = frozenset(("hex", "hsl"))
+    rows = [colors, colors[1:], colors[:0]]
+    expected = [[Color(*c.rgb).get_dict(keys) for c in row] for row in rows]
+    fp = io.StringIO()
+    write_json_matrix(fp, iter(rows), keys, 17)
+    assert fp.getvalue() == json.dumps(expected) + "\n"
+
+    fp = io.StringIO()
+    write_json_matrix(fp, [], keys, 17)
+    assert fp.getvalue() == "[]\n"
+
+
+def test_write_binary() -> None:
+    fp = io.BytesIO()
+    write_binary(fp, colors)
+    assert fp.getvalue() == bytes((0, 0, 0, 100, 100, 100, 72, 61, 139))
+    assert ColorArray.from_buffer(fp.getvalue()) == colors
+
+
+def test_write_delimited() -> None:
+    fp = io.StringIO()
+    write_delimited(fp, colors, frozenset(("hex", "cmyk", "name")), 3, ",")
+    assert fp.getvalue() == (
+        "hex,cmyk_c,cmyk_m,cmyk_y,cmyk_k,name\n"
+        "000000,0,0,0,1,black\n"
+        "646464,0.0,0.0,0.0,0.608,dimgray/dimgrey\n"
+        "483D8B,0.482,0.561,0.0,0.455,darkslateblue\n"
+    )
+
+    fp = io.StringIO()
+    write_delimited(fp, colors[:1], frozenset(("rgb", "is_name_exact")), 17, "\t")
+    assert fp.getvalue() == "r\tg\tb\tis_name_exact\n0\t0\t0\tTrue\n"
+
+
+def test_write_columnar() -> None:
+    fp = io.BytesIO()
+    write_columnar(fp, colors, JSON_KEYS)
+    fp.seek(0)
+    columns = read_columnar(fp)
+    assert list(columns) == get_column_names(JSON_KEYS)
+    assert columns["hex"] == ["000000", "646464", "483D8B"]
+    assert columns["r"] == [0, 100, 72]
+    assert columns["name"] == ["black", "dimgray/dimgrey", "darkslateblue"]
+    assert columns["is_name_exact"] == [True, False, True]
+    assert columns["cmyk_k"][0] == 1.0
+    assert columns["hsl_l"] == pytest.approx([hsl[2] for hsl in colors.hsl])
+
+    fp = io.BytesIO()
+    write_columnar(fp, ColorArray([], [], []), frozenset(("name",)))
+    fp.seek(0)
+    assert read_columnar(fp) == {"name": []}
+
+
+@pytest.mark.parametrize(
+    "data",
+    (
+        b"",
+        b"CLRQ\x01\x00\x00\x00\x00\x00",
+        b"CLRP\x02\x00\x00\x00\x00\x00",
+        b"CLRP\x01\x00\x00\x00\x00\x01\x01xz",
+        b"CLRP\x01\x02\x00\x00\x00\x01\x01xB\x00",
+    ),
+)
+def test_read_columnar_bad_data(data: bytes) -> None:
+    with pytest.raises(ValueError):
+        read_columnar(io.BytesIO(data))
+
+
+def test_write_color_chunks() -> None:
+    chunks = [colors[:1], colors[1:1], colors[1:]]
+    for write in (
+        lambda fp, c: write_json(fp, c, JSON_KEYS, 3),
+        lambda fp, c: write_delimited(fp, c, JSON_KEYS, 3, ","),
+    ):
+        expected, actual = io.StringIO(), io.StringIO()
+        write(expected, colors)
+        write(actual, iter(chunks))
+        assert actual.getvalue() == expected.getvalue()
+
+    for write in (
+        write_binary,
+        lambda fp, c: write_columnar(fp, c, JSON_KEYS),
+    ):
+        expected, actual = io.BytesIO(), io.BytesIO()
+        write(expected, colors)
+        write(actual, iter(chunks))
+        assert actual.getvalue() == expected.getvalue()
+
+
+@pytest.mark.parametrize("output_format", ("json", "csv", "tsv", "binary", "columnar"))
+def test_write_colors(output_format: str) -> None:
+    config = Config()
+    config.set_flags(format=output_format, columns=frozenset(("rgb",)))
+    fp = io.TextIOWrapper(io.BytesIO(), encoding="utf-8")
+    write_colors(fp, colors, config)
+    fp.flush()
+    data = fp.buffer.getvalue()  # type: ignore
+
+    if output_format == "json":
+        assert json.loads(data) == [{"rgb": list(rgb)} for rgb in RGBS]
+    elif output_format == "csv":
+        assert data == b"r,g,b\n0,0,0\n100,100,100\n72,61,139\n"
+    elif output_format == "tsv":
+        assert data.startswith(b"r\tg\tb\n0\t0\t0\n")
+    elif output_format == "binary":
+        assert data == bytes(sum(RGBS, ()))
+    else:
+        assert struct.unpack("<4sBIB", data[:10]) == (b"CLRP", 1, 3, 3)